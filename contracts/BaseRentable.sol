@@ -0,0 +1,564 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.7;
+
+// Inheritance
+import {IRentableEvents} from "./interfaces/IRentableEvents.sol";
+import {BaseSecurityInitializable} from "./security/BaseSecurityInitializable.sol";
+import {RentableStorageV2} from "./RentableStorageV2.sol";
+import {ReentrancyGuardUpgradeable} from "@openzeppelin/contracts-upgradeable/security/ReentrancyGuardUpgradeable.sol";
+
+// Libraries
+import {SafeERC20Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC20/utils/SafeERC20Upgradeable.sol";
+import {Address} from "@openzeppelin/contracts/utils/Address.sol";
+
+// References
+import {IERC721Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC721/IERC721Upgradeable.sol";
+import {IERC20Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC20/IERC20Upgradeable.sol";
+import {IERC1155Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC1155/IERC1155Upgradeable.sol";
+import {IERC721ReadOnlyProxy} from "./interfaces/IERC721ReadOnlyProxy.sol";
+import {IERC721ExistExtension} from "./interfaces/IERC721ExistExtension.sol";
+import {ICollectionLibrary} from "./collections/ICollectionLibrary.sol";
+
+import {IWalletFactory} from "./wallet/IWalletFactory.sol";
+import {SimpleWallet} from "./wallet/SimpleWallet.sol";
+import {RentableTypes} from "./RentableTypes.sol";
+
+/// @title Rentable shared logic
+/// @author Rentable Team <hello@rentable.world>
+/// @custom:security Rentable Security Team <security@rentable.world>
+/// @notice Storage layout and internal logic of Rentable
+/// @dev Shared with RentableBatch, which runs on the Rentable storage through
+/// delegatecall, so both must keep this exact inheritance
+abstract contract BaseRentable is
+    IRentableEvents,
+    BaseSecurityInitializable,
+    ReentrancyGuardUpgradeable,
+    RentableStorageV2
+{
+    /* ========== LIBRARIES ========== */
+
+    using Address for address;
+    using SafeERC20Upgradeable for IERC20Upgradeable;
+
+    /* ========== MODIFIERS ========== */
+
+    /// @dev Prevents calling a library when not set for the respective wrapped token
+    /// @param tokenAddress wrapped token address
+    // slither-disable-next-line incorrect-modifier
+    modifier skipIfLibraryNotSet(address tokenAddress) {
+        if (_libraries[tokenAddress] != address(0)) {
+            _;
+        }
+    }
+
+    /* ========== VIEWS ========== */
+
+    /* ---------- Internal ---------- */
+
+    /// @dev Get and check (reverting) otoken exist for a specific token
+    /// @param tokenAddress wrapped token address
+    /// @return oRentable otoken instance
+    function _getExistingORentable(address tokenAddress)
+        internal
+        view
+        returns (address oRentable)
+    {
+        oRentable = _orentables[tokenAddress];
+        require(oRentable != address(0), "Token currently not supported");
+    }
+
+    /// @dev Get and check (reverting) otoken user ownership
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param user user to verify ownership
+    /// @return oRentable otoken instance
+    function _getExistingORentableCheckOwnership(
+        address tokenAddress,
+        uint256 tokenId,
+        address user
+    ) internal view returns (address oRentable) {
+        oRentable = _getExistingORentable(tokenAddress);
+
+        require(
+            IERC721Upgradeable(oRentable).ownerOf(tokenId) == user,
+            "The token must be yours"
+        );
+    }
+
+    /// @dev Show rental validity
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @return true if is expired, false otw
+    function _isExpired(address tokenAddress, uint256 tokenId)
+        internal
+        view
+        returns (bool)
+    {
+        // slither-disable-next-line timestamp
+        return block.timestamp >= (_rentals[tokenAddress][tokenId].expiresAt);
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /* ---------- Internal ---------- */
+
+    /// @dev Create user wallet address
+    /// @param user user address
+    /// @return wallet address
+    function _createWalletForUser(address user)
+        internal
+        returns (address payable wallet)
+    {
+        // slither-disable-next-line reentrancy-benign
+        wallet = IWalletFactory(_walletFactory).createWallet(
+            address(this),
+            user
+        );
+
+        require(
+            wallet != address(0),
+            "Wallet Factory is not returning a valid wallet address"
+        );
+
+        _wallets[user] = wallet;
+
+        // slither-disable-next-line reentrancy-events
+        emit WalletCreated(user, wallet);
+
+        return wallet;
+    }
+
+    /// @dev Get user wallet address (create if not exist)
+    /// @param user user address
+    /// @return wallet address
+    function _getOrCreateWalletForUser(address user)
+        internal
+        returns (address payable wallet)
+    {
+        wallet = _wallets[user];
+
+        if (wallet == address(0)) {
+            wallet = _createWalletForUser(user);
+        }
+
+        return wallet;
+    }
+
+    /// @dev Deposit only a wrapped token and mint respective OToken
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param to user to mint
+    function _deposit(
+        address tokenAddress,
+        uint256 tokenId,
+        address to
+    ) internal {
+        address oRentable = _getExistingORentable(tokenAddress);
+
+        require(
+            IERC721Upgradeable(tokenAddress).ownerOf(tokenId) == address(this),
+            "Token not deposited"
+        );
+
+        IERC721ReadOnlyProxy(oRentable).mint(to, tokenId);
+
+        _postDeposit(tokenAddress, tokenId, to);
+
+        emit Deposit(to, tokenAddress, tokenId);
+    }
+
+    /// @dev Deposit and list a wrapped token
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param to user to mint
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    function _depositAndList(
+        address tokenAddress,
+        uint256 tokenId,
+        address to,
+        RentableTypes.RentalConditions memory rc
+    ) internal {
+        _deposit(tokenAddress, tokenId, to);
+
+        _createOrUpdateRentalConditions(to, tokenAddress, tokenId, rc);
+    }
+
+    /// @dev Set rental conditions for a wrapped token
+    /// @param user who is changing the conditions
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    function _createOrUpdateRentalConditions(
+        address user,
+        address tokenAddress,
+        uint256 tokenId,
+        RentableTypes.RentalConditions memory rc
+    ) internal {
+        _checkRentalConditions(rc);
+
+        _setRentalConditions(user, tokenAddress, tokenId, rc);
+
+        _emitUpdateRentalConditions(tokenAddress, tokenId, rc);
+    }
+
+    /// @dev Emit UpdateRentalConditions for a wrapped token
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    function _emitUpdateRentalConditions(
+        address tokenAddress,
+        uint256 tokenId,
+        RentableTypes.RentalConditions memory rc
+    ) internal {
+        emit UpdateRentalConditions(
+            tokenAddress,
+            tokenId,
+            rc.paymentTokenAddress,
+            rc.paymentTokenId,
+            rc.minTimeDuration,
+            rc.maxTimeDuration,
+            rc.pricePerSecond,
+            rc.privateRenter
+        );
+    }
+
+    /// @dev Check (reverting) rental conditions are acceptable
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    function _checkRentalConditions(RentableTypes.RentalConditions memory rc)
+        internal
+        view
+    {
+        require(
+            _paymentTokenAllowlist[rc.paymentTokenAddress] != NOT_ALLOWED_TOKEN,
+            "Not supported payment token"
+        );
+
+        require(
+            rc.minTimeDuration <= rc.maxTimeDuration,
+            "Minimum duration cannot be greater than maximum"
+        );
+    }
+
+    /// @dev Store already checked rental conditions, without emitting events
+    /// @param user who is changing the conditions
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    function _setRentalConditions(
+        address user,
+        address tokenAddress,
+        uint256 tokenId,
+        RentableTypes.RentalConditions memory rc
+    ) internal {
+        _putRentalConditions(
+            tokenAddress,
+            tokenId,
+            rc,
+            _rentals[tokenAddress][tokenId].expiresAt
+        );
+
+        _postList(
+            tokenAddress,
+            tokenId,
+            user,
+            rc.minTimeDuration,
+            rc.maxTimeDuration,
+            rc.pricePerSecond
+        );
+    }
+
+    /// @dev Cancel rental conditions for a wrapped token
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    function _deleteRentalConditions(address tokenAddress, uint256 tokenId)
+        internal
+    {
+        PackedRental storage rental = _rentals[tokenAddress][tokenId];
+
+        // save gas instead of dropping all the structure
+        rental.maxTimeDuration = 0;
+        if (rental.unpacked) {
+            _rentalConditions[tokenAddress][tokenId].maxTimeDuration = 0;
+        }
+    }
+
+    /// @dev Expire explicitely rental and update data structures for a specific wrapped token
+    /// @param currentUserHolder (optional) current user holder address
+    /// @param oTokenOwner (optional) otoken owner address
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param skipExistCheck assume or not wtoken id exists (gas optimization)
+    /// @return currentlyRented true if rental is not expired
+    // slither-disable-next-line calls-loop
+    function _expireRental(
+        address currentUserHolder,
+        address oTokenOwner,
+        address tokenAddress,
+        uint256 tokenId,
+        bool skipExistCheck
+    ) internal returns (bool currentlyRented) {
+        if (
+            skipExistCheck ||
+            IERC721ExistExtension(_wrentables[tokenAddress]).exists(tokenId)
+        ) {
+            if (_isExpired(tokenAddress, tokenId)) {
+                address currentRentee = oTokenOwner == address(0)
+                    ? IERC721Upgradeable(_orentables[tokenAddress]).ownerOf(
+                        tokenId
+                    )
+                    : oTokenOwner;
+
+                // recover asset from renter smart wallet to rentable contracts
+                address wRentable = _wrentables[tokenAddress];
+                // cannot be 0x0 because transferFrom avoid it
+                address renter = currentUserHolder == address(0)
+                    ? IERC721ExistExtension(wRentable).ownerOf(tokenId, true)
+                    : currentUserHolder;
+                address payable renterWallet = _wallets[renter];
+                // slither-disable-next-line unused-return
+                SimpleWallet(renterWallet).execute(
+                    tokenAddress,
+                    0,
+                    abi.encodeWithSelector(
+                        IERC721Upgradeable.transferFrom.selector, // we don't want to trigger onERC721Receiver
+                        renterWallet,
+                        address(this),
+                        tokenId
+                    ),
+                    false
+                );
+
+                // burn
+                IERC721ReadOnlyProxy(_wrentables[tokenAddress]).burn(tokenId);
+
+                // post
+                _postExpireRental(tokenAddress, tokenId, currentRentee);
+                emit RentEnds(tokenAddress, tokenId);
+            } else {
+                currentlyRented = true;
+            }
+        }
+
+        return currentlyRented;
+    }
+
+    /// @dev Execute custom logic after deposit via wrapped token library
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param user depositor
+    function _postDeposit(
+        address tokenAddress,
+        uint256 tokenId,
+        address user
+    ) internal skipIfLibraryNotSet(tokenAddress) {
+        // slither-disable-next-line unused-return
+        _libraries[tokenAddress].functionDelegateCall(
+            abi.encodeWithSelector(
+                ICollectionLibrary.postDeposit.selector,
+                tokenAddress,
+                tokenId,
+                user
+            ),
+            ""
+        );
+    }
+
+    /// @dev Execute custom logic after listing via wrapped token library
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param user lister
+    /// @param maxTimeDuration max duration allowed for the rental
+    /// @param pricePerSecond price per second in payment token units
+    function _postList(
+        address tokenAddress,
+        uint256 tokenId,
+        address user,
+        uint256 minTimeDuration,
+        uint256 maxTimeDuration,
+        uint256 pricePerSecond
+    ) internal skipIfLibraryNotSet(tokenAddress) {
+        // slither-disable-next-line unused-return
+        _libraries[tokenAddress].functionDelegateCall(
+            abi.encodeWithSelector(
+                ICollectionLibrary.postList.selector,
+                tokenAddress,
+                tokenId,
+                user,
+                minTimeDuration,
+                maxTimeDuration,
+                pricePerSecond
+            ),
+            ""
+        );
+    }
+
+    /// @dev Execute custom logic after rent via wrapped token library
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param duration rental duration
+    /// @param from rentee
+    /// @param to renter
+    /// @param toWallet receiver wallet
+    function _postRent(
+        address tokenAddress,
+        uint256 tokenId,
+        uint256 duration,
+        address from,
+        address to,
+        address toWallet
+    ) internal skipIfLibraryNotSet(tokenAddress) {
+        // slither-disable-next-line unused-return
+        _libraries[tokenAddress].functionDelegateCall(
+            abi.encodeWithSelector(
+                ICollectionLibrary.postRent.selector,
+                tokenAddress,
+                tokenId,
+                duration,
+                from,
+                to,
+                toWallet
+            ),
+            ""
+        );
+    }
+
+    /// @dev Execute custom logic after rent expires via wrapped token library
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param from rentee
+    // slither-disable-next-line calls-loop
+    function _postExpireRental(
+        address tokenAddress,
+        uint256 tokenId,
+        address from
+    ) internal skipIfLibraryNotSet(tokenAddress) {
+        // slither-disable-next-line unused-return
+        _libraries[tokenAddress].functionDelegateCall(
+            abi.encodeWithSelector(
+                ICollectionLibrary.postExpireRental.selector,
+                tokenAddress,
+                tokenId,
+                from
+            ),
+            ""
+        );
+    }
+
+    /// @dev Validate a rental and mint the wtoken to the renter
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param duration rental duration
+    /// @return rentee otoken owner
+    /// @return rcs rental conditions
+    function _rent(
+        address tokenAddress,
+        uint256 tokenId,
+        uint256 duration
+    )
+        internal
+        returns (
+            address payable rentee,
+            RentableTypes.RentalConditions memory rcs
+        )
+    {
+        // 1. check token is deposited and available for rental
+        address oRentable = _getExistingORentable(tokenAddress);
+        rentee = payable(IERC721Upgradeable(oRentable).ownerOf(tokenId));
+
+        rcs = _getRentalConditions(tokenAddress, tokenId);
+        require(rcs.maxTimeDuration > 0, "Not available");
+
+        require(
+            !_expireRental(address(0), rentee, tokenAddress, tokenId, false),
+            "Current rent still pending"
+        );
+
+        // 2. validate renter offer with rentee conditions
+        require(duration > 0, "Duration cannot be zero");
+
+        require(
+            duration >= rcs.minTimeDuration,
+            "Duration lower than conditions"
+        );
+
+        require(
+            duration <= rcs.maxTimeDuration,
+            "Duration greater than conditions"
+        );
+
+        require(
+            rcs.privateRenter == address(0) || rcs.privateRenter == msg.sender,
+            "Rental reserved for another user"
+        );
+
+        // 3. mint wtoken
+        // only full width conditions allow durations beyond uint48
+        _rentals[tokenAddress][tokenId].expiresAt = uint48(
+            _clamp(block.timestamp + duration, type(uint48).max)
+        );
+        IERC721ReadOnlyProxy(_wrentables[tokenAddress]).mint(
+            msg.sender,
+            tokenId
+        );
+    }
+
+    /// @dev Pay from renter, ETH is paid from msg.value
+    /// @param paymentTokenAddress payment token address
+    /// @param paymentTokenId payment token id
+    /// @param payee payment receiver
+    /// @param amount amount in payment token units
+    // slither-disable-next-line calls-loop
+    function _pay(
+        address paymentTokenAddress,
+        uint256 paymentTokenId,
+        address payable payee,
+        uint256 amount
+    ) internal {
+        if (paymentTokenAddress == address(0)) {
+            Address.sendValue(payee, amount);
+        } else if (_paymentTokenAllowlist[paymentTokenAddress] == ERC20_TOKEN) {
+            IERC20Upgradeable(paymentTokenAddress).safeTransferFrom(
+                msg.sender,
+                payee,
+                amount
+            );
+        } else {
+            IERC1155Upgradeable(paymentTokenAddress).safeTransferFrom(
+                msg.sender,
+                payee,
+                paymentTokenId,
+                amount,
+                ""
+            );
+        }
+    }
+
+    /// @dev Withdraw a deposited token, ownership already checked
+    /// @param oRentable otoken instance
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param user otoken owner
+    function _withdraw(
+        address oRentable,
+        address tokenAddress,
+        uint256 tokenId,
+        address user
+    ) internal {
+        require(
+            !_expireRental(address(0), user, tokenAddress, tokenId, false),
+            "Current rent still pending"
+        );
+
+        _deleteRentalConditions(tokenAddress, tokenId);
+
+        IERC721ReadOnlyProxy(oRentable).burn(tokenId);
+
+        IERC721Upgradeable(tokenAddress).safeTransferFrom(
+            address(this),
+            user,
+            tokenId
+        );
+
+        emit Withdraw(tokenAddress, tokenId);
+    }
+}
@@ -7,43 +7,41 @@ import {IRentableAdminEvents} from "./interfaces/IRentableAdminEvents.sol";
 import {IRentableHooks} from "./interfaces/IRentableHooks.sol";
 import {IORentableHooks} from "./interfaces/IORentableHooks.sol";
 import {IWRentableHooks} from "./interfaces/IWRentableHooks.sol";
-import {BaseSecurityInitializable} from "./security/BaseSecurityInitializable.sol";
-import {RentableStorageV1} from "./RentableStorageV1.sol";
-import {ReentrancyGuardUpgradeable} from "@openzeppelin/contracts-upgradeable/security/ReentrancyGuardUpgradeable.sol";
+import {BaseRentable} from "./BaseRentable.sol";
 
 // Libraries
-import {SafeERC20Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC20/utils/SafeERC20Upgradeable.sol";
 import {Address} from "@openzeppelin/contracts/utils/Address.sol";
 
 // References
 import {IERC721Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC721/IERC721Upgradeable.sol";
-import {IERC20Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC20/IERC20Upgradeable.sol";
-import {IERC1155Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC1155/IERC1155Upgradeable.sol";
-import {IERC721ReadOnlyProxy} from "./interfaces/IERC721ReadOnlyProxy.sol";
 import {IERC721ExistExtension} from "./interfaces/IERC721ExistExtension.sol";
 import {ICollectionLibrary} from "./collections/ICollectionLibrary.sol";
 
-import {IWalletFactory} from "./wallet/IWalletFactory.sol";
 import {SimpleWallet} from "./wallet/SimpleWallet.sol";
+import {RentableBatch} from "./RentableBatch.sol";
 import {RentableTypes} from "./RentableTypes.sol";
 
 /// @title Rentable main contract
 /// @author Rentable Team <hello@rentable.world>
 /// @custom:security Rentable Security Team <security@rentable.world>
 /// @notice Main entry point to interact with Rentable protocol
+/// @dev Batch entrypoints live in RentableBatch, see fallback
 contract Rentable is
     IRentable,
     IRentableAdminEvents,
     IORentableHooks,
     IWRentableHooks,
-    BaseSecurityInitializable,
-    ReentrancyGuardUpgradeable,
-    RentableStorageV1
+    BaseRentable
 {
     /* ========== LIBRARIES ========== */
 
     using Address for address;
-    using SafeERC20Upgradeable for IERC20Upgradeable;
+
+    /* ========== CONSTANTS ========== */
+
+    // batch entrypoints deployed with this implementation, sharing its storage layout
+    // slither-disable-next-line naming-convention
+    address internal immutable _rentableBatch;
 
     /* ========== MODIFIERS ========== */
 
@@ -86,15 +84,6 @@ contract Rentable is
         _;
     }
 
-    /// @dev Prevents calling a library when not set for the respective wrapped token
-    /// @param tokenAddress wrapped token address
-    // slither-disable-next-line incorrect-modifier
-    modifier skipIfLibraryNotSet(address tokenAddress) {
-        if (_libraries[tokenAddress] != address(0)) {
-            _;
-        }
-    }
-
     /* ========== CONSTRUCTOR ========== */
 
     /// @dev Instatiate Rentable
@@ -102,6 +91,7 @@ contract Rentable is
     /// @param operator address for operator role
     constructor(address governance, address operator) {
         _initialize(governance, operator);
+        _rentableBatch = address(new RentableBatch());
     }
 
     /* ---------- INITIALIZER ---------- */
@@ -124,6 +114,36 @@ contract Rentable is
         __ReentrancyGuard_init();
     }
 
+    /* ========== FALLBACK ========== */
+
+    /// @notice Batch entrypoints, see RentableBatch
+    /// @dev Delegate selectors not found here to RentableBatch,
+    /// which runs on this storage with the same msg.sender and msg.value
+    // slither-disable-next-line locked-ether
+    fallback() external payable {
+        address rentableBatch = _rentableBatch;
+        // slither-disable-next-line assembly
+        assembly {
+            calldatacopy(0, 0, calldatasize())
+            let result := delegatecall(
+                gas(),
+                rentableBatch,
+                0,
+                calldatasize(),
+                0,
+                0
+            )
+            returndatacopy(0, 0, returndatasize())
+            switch result
+            case 0 {
+                revert(0, returndatasize())
+            }
+            default {
+                return(0, returndatasize())
+            }
+        }
+    }
+
     /* ========== SETTERS ========== */
 
     /// @dev Associate the event hooks library to the specific wrapped token
@@ -273,55 +293,31 @@ contract Rentable is
         );
     }
 
-    /* ========== VIEWS ========== */
-
-    /* ---------- Internal ---------- */
-
-    /// @dev Get and check (reverting) otoken exist for a specific token
-    /// @param tokenAddress wrapped token address
-    /// @return oRentable otoken instance
-    function _getExistingORentable(address tokenAddress)
-        internal
-        view
-        returns (address oRentable)
+    /// @dev Execute a batch of governance calls (e.g. collection onboarding)
+    /// @param data encoded calls on this contract
+    /// @return results return data of each call
+    function governanceMulticall(bytes[] calldata data)
+        external
+        onlyGovernance
+        returns (bytes[] memory results)
     {
-        oRentable = _orentables[tokenAddress];
-        require(oRentable != address(0), "Token currently not supported");
+        results = new bytes[](data.length);
+        for (uint256 i = 0; i < data.length; i++) {
+            // delegatecall keeps governance as msg.sender for each setter
+            results[i] = address(this).functionDelegateCall(data[i]);
+        }
     }
 
-    /// @dev Get and check (reverting) otoken user ownership
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param user user to verify ownership
-    /// @return oRentable otoken instance
-    function _getExistingORentableCheckOwnership(
-        address tokenAddress,
-        uint256 tokenId,
-        address user
-    ) internal view returns (address oRentable) {
-        oRentable = _getExistingORentable(tokenAddress);
+    /* ========== VIEWS ========== */
 
-        require(
-            IERC721Upgradeable(oRentable).ownerOf(tokenId) == user,
-            "The token must be yours"
-        );
-    }
+    /* ---------- Public ---------- */
 
-    /// @dev Show rental validity
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @return true if is expired, false otw
-    function _isExpired(address tokenAddress, uint256 tokenId)
-        internal
-        view
-        returns (bool)
-    {
-        // slither-disable-next-line timestamp
-        return block.timestamp >= (_expiresAt[tokenAddress][tokenId]);
+    /// @notice Get the batch entrypoints contract, called through this one
+    /// @return RentableBatch address
+    function getRentableBatch() external view returns (address) {
+        return _rentableBatch;
     }
 
-    /* ---------- Public ---------- */
-
     /// @notice Get library address for the specific wrapped token
     /// @param tokenAddress wrapped token address
     /// @return library address
@@ -340,12 +336,11 @@ contract Rentable is
         return _orentables[tokenAddress];
     }
 
-    /// @notice Get WToken address associated to the specific wrapped token
-    /// @param tokenAddress wrapped token address
-    /// @return WToken address
+    /// @inheritdoc IRentable
     function getWRentable(address tokenAddress)
         external
         view
+        override
         returns (address)
     {
         return _wrentables[tokenAddress];
@@ -409,7 +404,7 @@ contract Rentable is
         override
         returns (RentableTypes.RentalConditions memory)
     {
-        return _rentalConditions[tokenAddress][tokenId];
+        return _getRentalConditions(tokenAddress, tokenId);
     }
 
     /// @inheritdoc IRentable
@@ -419,7 +414,7 @@ contract Rentable is
         override
         returns (uint256)
     {
-        return _expiresAt[tokenAddress][tokenId];
+        return _rentals[tokenAddress][tokenId].expiresAt;
     }
 
     /// @inheritdoc IRentable
@@ -434,305 +429,6 @@ contract Rentable is
 
     /* ========== MUTATIVE FUNCTIONS ========== */
 
-    /* ---------- Internal ---------- */
-
-    /// @dev Create user wallet address
-    /// @param user user address
-    /// @return wallet address
-    function _createWalletForUser(address user)
-        internal
-        returns (address payable wallet)
-    {
-        // slither-disable-next-line reentrancy-benign
-        wallet = IWalletFactory(_walletFactory).createWallet(
-            address(this),
-            user
-        );
-
-        require(
-            wallet != address(0),
-            "Wallet Factory is not returning a valid wallet address"
-        );
-
-        _wallets[user] = wallet;
-
-        // slither-disable-next-line reentrancy-events
-        emit WalletCreated(user, wallet);
-
-        return wallet;
-    }
-
-    /// @dev Get user wallet address (create if not exist)
-    /// @param user user address
-    /// @return wallet address
-    function _getOrCreateWalletForUser(address user)
-        internal
-        returns (address payable wallet)
-    {
-        wallet = _wallets[user];
-
-        if (wallet == address(0)) {
-            wallet = _createWalletForUser(user);
-        }
-
-        return wallet;
-    }
-
-    /// @dev Deposit only a wrapped token and mint respective OToken
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param to user to mint
-    function _deposit(
-        address tokenAddress,
-        uint256 tokenId,
-        address to
-    ) internal {
-        address oRentable = _getExistingORentable(tokenAddress);
-
-        require(
-            IERC721Upgradeable(tokenAddress).ownerOf(tokenId) == address(this),
-            "Token not deposited"
-        );
-
-        IERC721ReadOnlyProxy(oRentable).mint(to, tokenId);
-
-        _postDeposit(tokenAddress, tokenId, to);
-
-        emit Deposit(to, tokenAddress, tokenId);
-    }
-
-    /// @dev Deposit and list a wrapped token
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param to user to mint
-    /// @param rc rental conditions see RentableTypes.RentalConditions
-    function _depositAndList(
-        address tokenAddress,
-        uint256 tokenId,
-        address to,
-        RentableTypes.RentalConditions memory rc
-    ) internal {
-        _deposit(tokenAddress, tokenId, to);
-
-        _createOrUpdateRentalConditions(to, tokenAddress, tokenId, rc);
-    }
-
-    /// @dev Set rental conditions for a wrapped token
-    /// @param user who is changing the conditions
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param rc rental conditions see RentableTypes.RentalConditions
-    function _createOrUpdateRentalConditions(
-        address user,
-        address tokenAddress,
-        uint256 tokenId,
-        RentableTypes.RentalConditions memory rc
-    ) internal {
-        require(
-            _paymentTokenAllowlist[rc.paymentTokenAddress] != NOT_ALLOWED_TOKEN,
-            "Not supported payment token"
-        );
-
-        require(
-            rc.minTimeDuration <= rc.maxTimeDuration,
-            "Minimum duration cannot be greater than maximum"
-        );
-
-        _rentalConditions[tokenAddress][tokenId] = rc;
-
-        _postList(
-            tokenAddress,
-            tokenId,
-            user,
-            rc.minTimeDuration,
-            rc.maxTimeDuration,
-            rc.pricePerSecond
-        );
-
-        emit UpdateRentalConditions(
-            tokenAddress,
-            tokenId,
-            rc.paymentTokenAddress,
-            rc.paymentTokenId,
-            rc.minTimeDuration,
-            rc.maxTimeDuration,
-            rc.pricePerSecond,
-            rc.privateRenter
-        );
-    }
-
-    /// @dev Cancel rental conditions for a wrapped token
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    function _deleteRentalConditions(address tokenAddress, uint256 tokenId)
-        internal
-    {
-        // save gas instead of dropping all the structure
-        (_rentalConditions[tokenAddress][tokenId]).maxTimeDuration = 0;
-    }
-
-    /// @dev Expire explicitely rental and update data structures for a specific wrapped token
-    /// @param currentUserHolder (optional) current user holder address
-    /// @param oTokenOwner (optional) otoken owner address
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param skipExistCheck assume or not wtoken id exists (gas optimization)
-    /// @return currentlyRented true if rental is not expired
-    // slither-disable-next-line calls-loop
-    function _expireRental(
-        address currentUserHolder,
-        address oTokenOwner,
-        address tokenAddress,
-        uint256 tokenId,
-        bool skipExistCheck
-    ) internal returns (bool currentlyRented) {
-        if (
-            skipExistCheck ||
-            IERC721ExistExtension(_wrentables[tokenAddress]).exists(tokenId)
-        ) {
-            if (_isExpired(tokenAddress, tokenId)) {
-                address currentRentee = oTokenOwner == address(0)
-                    ? IERC721Upgradeable(_orentables[tokenAddress]).ownerOf(
-                        tokenId
-                    )
-                    : oTokenOwner;
-
-                // recover asset from renter smart wallet to rentable contracts
-                address wRentable = _wrentables[tokenAddress];
-                // cannot be 0x0 because transferFrom avoid it
-                address renter = currentUserHolder == address(0)
-                    ? IERC721ExistExtension(wRentable).ownerOf(tokenId, true)
-                    : currentUserHolder;
-                address payable renterWallet = _wallets[renter];
-                // slither-disable-next-line unused-return
-                SimpleWallet(renterWallet).execute(
-                    tokenAddress,
-                    0,
-                    abi.encodeWithSelector(
-                        IERC721Upgradeable.transferFrom.selector, // we don't want to trigger onERC721Receiver
-                        renterWallet,
-                        address(this),
-                        tokenId
-                    ),
-                    false
-                );
-
-                // burn
-                IERC721ReadOnlyProxy(_wrentables[tokenAddress]).burn(tokenId);
-
-                // post
-                _postExpireRental(tokenAddress, tokenId, currentRentee);
-                emit RentEnds(tokenAddress, tokenId);
-            } else {
-                currentlyRented = true;
-            }
-        }
-
-        return currentlyRented;
-    }
-
-    /// @dev Execute custom logic after deposit via wrapped token library
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param user depositor
-    function _postDeposit(
-        address tokenAddress,
-        uint256 tokenId,
-        address user
-    ) internal skipIfLibraryNotSet(tokenAddress) {
-        // slither-disable-next-line unused-return
-        _libraries[tokenAddress].functionDelegateCall(
-            abi.encodeWithSelector(
-                ICollectionLibrary.postDeposit.selector,
-                tokenAddress,
-                tokenId,
-                user
-            ),
-            ""
-        );
-    }
-
-    /// @dev Execute custom logic after listing via wrapped token library
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param user lister
-    /// @param maxTimeDuration max duration allowed for the rental
-    /// @param pricePerSecond price per second in payment token units
-    function _postList(
-        address tokenAddress,
-        uint256 tokenId,
-        address user,
-        uint256 minTimeDuration,
-        uint256 maxTimeDuration,
-        uint256 pricePerSecond
-    ) internal skipIfLibraryNotSet(tokenAddress) {
-        // slither-disable-next-line unused-return
-        _libraries[tokenAddress].functionDelegateCall(
-            abi.encodeWithSelector(
-                ICollectionLibrary.postList.selector,
-                tokenAddress,
-                tokenId,
-                user,
-                minTimeDuration,
-                maxTimeDuration,
-                pricePerSecond
-            ),
-            ""
-        );
-    }
-
-    /// @dev Execute custom logic after rent via wrapped token library
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param duration rental duration
-    /// @param from rentee
-    /// @param to renter
-    /// @param toWallet receiver wallet
-    function _postRent(
-        address tokenAddress,
-        uint256 tokenId,
-        uint256 duration,
-        address from,
-        address to,
-        address toWallet
-    ) internal skipIfLibraryNotSet(tokenAddress) {
-        // slither-disable-next-line unused-return
-        _libraries[tokenAddress].functionDelegateCall(
-            abi.encodeWithSelector(
-                ICollectionLibrary.postRent.selector,
-                tokenAddress,
-                tokenId,
-                duration,
-                from,
-                to,
-                toWallet
-            ),
-            ""
-        );
-    }
-
-    /// @dev Execute custom logic after rent expires via wrapped token library
-    /// @param tokenAddress wrapped token address
-    /// @param tokenId wrapped token id
-    /// @param from rentee
-    // slither-disable-next-line calls-loop
-    function _postExpireRental(
-        address tokenAddress,
-        uint256 tokenId,
-        address from
-    ) internal skipIfLibraryNotSet(tokenAddress) {
-        // slither-disable-next-line unused-return
-        _libraries[tokenAddress].functionDelegateCall(
-            abi.encodeWithSelector(
-                ICollectionLibrary.postExpireRental.selector,
-                tokenAddress,
-                tokenId,
-                from
-            ),
-            ""
-        );
-    }
-
     /* ---------- Public ---------- */
 
     /// @inheritdoc IRentable
@@ -779,29 +475,13 @@ contract Rentable is
         whenNotPaused
         nonReentrant
     {
-        address user = msg.sender;
         address oRentable = _getExistingORentableCheckOwnership(
             tokenAddress,
             tokenId,
-            user
-        );
-
-        require(
-            !_expireRental(address(0), user, tokenAddress, tokenId, false),
-            "Current rent still pending"
-        );
-
-        _deleteRentalConditions(tokenAddress, tokenId);
-
-        IERC721ReadOnlyProxy(oRentable).burn(tokenId);
-
-        IERC721Upgradeable(tokenAddress).safeTransferFrom(
-            address(this),
-            user,
-            tokenId
+            msg.sender
         );
 
-        emit Withdraw(tokenAddress, tokenId);
+        _withdraw(oRentable, tokenAddress, tokenId, msg.sender);
     }
 
     /// @inheritdoc IRentable
@@ -829,47 +509,11 @@ contract Rentable is
         uint256 tokenId,
         uint256 duration
     ) external payable override whenNotPaused nonReentrant {
-        // 1. check token is deposited and available for rental
-        address oRentable = _getExistingORentable(tokenAddress);
-        address payable rentee = payable(
-            IERC721Upgradeable(oRentable).ownerOf(tokenId)
-        );
-
-        RentableTypes.RentalConditions memory rcs = _rentalConditions[
-            tokenAddress
-        ][tokenId];
-        require(rcs.maxTimeDuration > 0, "Not available");
-
-        require(
-            !_expireRental(address(0), rentee, tokenAddress, tokenId, false),
-            "Current rent still pending"
-        );
-
-        // 2. validate renter offer with rentee conditions
-        require(duration > 0, "Duration cannot be zero");
-
-        require(
-            duration >= rcs.minTimeDuration,
-            "Duration lower than conditions"
-        );
-
-        require(
-            duration <= rcs.maxTimeDuration,
-            "Duration greater than conditions"
-        );
-
-        require(
-            rcs.privateRenter == address(0) || rcs.privateRenter == msg.sender,
-            "Rental reserved for another user"
-        );
-
-        // 3. mint wtoken
-        uint256 eta = block.timestamp + duration;
-        _expiresAt[tokenAddress][tokenId] = eta;
-        IERC721ReadOnlyProxy(_wrentables[tokenAddress]).mint(
-            msg.sender,
-            tokenId
-        );
+        // 1-3. validate and mint wtoken
+        (
+            address payable rentee,
+            RentableTypes.RentalConditions memory rcs
+        ) = _rent(tokenAddress, tokenId, duration);
 
         // 4. transfer token to the renter smart wallet
         address renterWallet = _getOrCreateWalletForUser(msg.sender);
@@ -885,56 +529,32 @@ contract Rentable is
         uint256 paymentQty = rcs.pricePerSecond * duration;
         // protocol and rentee fees calc
         uint256 feesForFeeCollector = (paymentQty * _fee) / BASE_FEE;
-        uint256 feesForRentee = paymentQty - feesForFeeCollector;
 
         if (rcs.paymentTokenAddress == address(0)) {
             require(msg.value >= paymentQty, "Not enough funds");
-            if (feesForFeeCollector > 0) {
-                Address.sendValue(_feeCollector, feesForFeeCollector);
-            }
-
-            Address.sendValue(rentee, feesForRentee);
-
-            // refund eventual remaining
-            if (msg.value > paymentQty) {
-                Address.sendValue(payable(msg.sender), msg.value - paymentQty);
-            }
-        } else if (
-            _paymentTokenAllowlist[rcs.paymentTokenAddress] == ERC20_TOKEN
-        ) {
-            if (feesForFeeCollector > 0) {
-                IERC20Upgradeable(rcs.paymentTokenAddress).safeTransferFrom(
-                    msg.sender,
-                    _feeCollector,
-                    feesForFeeCollector
-                );
-            }
-
-            IERC20Upgradeable(rcs.paymentTokenAddress).safeTransferFrom(
-                msg.sender,
-                rentee,
-                feesForRentee
-            );
-        } else {
-            if (feesForFeeCollector > 0) {
-                IERC1155Upgradeable(rcs.paymentTokenAddress).safeTransferFrom(
-                    msg.sender,
-                    _feeCollector,
-                    rcs.paymentTokenId,
-                    feesForFeeCollector,
-                    ""
-                );
-            }
+        }
 
-            IERC1155Upgradeable(rcs.paymentTokenAddress).safeTransferFrom(
-                msg.sender,
-                rentee,
+        if (feesForFeeCollector > 0) {
+            _pay(
+                rcs.paymentTokenAddress,
                 rcs.paymentTokenId,
-                feesForRentee,
-                ""
+                _feeCollector,
+                feesForFeeCollector
             );
         }
 
+        _pay(
+            rcs.paymentTokenAddress,
+            rcs.paymentTokenId,
+            rentee,
+            paymentQty - feesForFeeCollector
+        );
+
+        // refund eventual remaining
+        if (rcs.paymentTokenAddress == address(0) && msg.value > paymentQty) {
+            Address.sendValue(payable(msg.sender), msg.value - paymentQty);
+        }
+
         // 6. after rent custom logic
         _postRent(
             tokenAddress,
@@ -952,7 +572,7 @@ contract Rentable is
             tokenId,
             rcs.paymentTokenAddress,
             rcs.paymentTokenId,
-            eta
+            block.timestamp + duration
         );
     }
 
@@ -0,0 +1,395 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.7;
+
+// Inheritance
+import {BaseRentable} from "./BaseRentable.sol";
+
+// Libraries
+import {Address} from "@openzeppelin/contracts/utils/Address.sol";
+
+// References
+import {IERC721Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC721/IERC721Upgradeable.sol";
+import {IERC721ReadOnlyProxy} from "./interfaces/IERC721ReadOnlyProxy.sol";
+import {RentableTypes} from "./RentableTypes.sol";
+
+/// @title Rentable batch entrypoints
+/// @author Rentable Team <hello@rentable.world>
+/// @custom:security Rentable Security Team <security@rentable.world>
+/// @notice Batch calls and storage migration of Rentable, sent to the Rentable address
+/// @dev Deployed by Rentable and reached through its fallback with delegatecall,
+/// kept apart so both contracts fit the EIP-170 size limit. Called directly it
+/// has no collections nor governance set, every entrypoint reverts
+contract RentableBatch is BaseRentable {
+    /* ========== SETTERS ========== */
+
+    /// @dev Move rentals from the RentableStorageV1 layout after the upgrade.
+    /// Must cover every deposited token before unpausing, not migrated ones
+    /// look unlisted and expired
+    /// @param tokenAddresses array of wrapped token addresses
+    /// @param tokenIds array of wrapped token ids
+    /// @return migrated number of tokens with data moved
+    function migrateRentals(
+        address[] calldata tokenAddresses,
+        uint256[] calldata tokenIds
+    ) external onlyGovernance whenPaused returns (uint256 migrated) {
+        require(
+            tokenAddresses.length == tokenIds.length,
+            "Arrays length mismatch"
+        );
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            if (_migrateRental(tokenAddresses[i], tokenIds[i])) {
+                migrated++;
+            }
+        }
+    }
+
+    /* ========== VIEWS ========== */
+
+    /* ---------- Internal ---------- */
+
+    /// @dev Get and check user ownership of a token, reusing the otoken
+    /// already looked up for the previous token of a batch
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param user user to verify ownership
+    /// @param cachedORentable otoken of tokenAddress if known, 0x0 otw
+    /// @return oRentable otoken instance
+    function _getExistingORentableCheckOwnership(
+        address tokenAddress,
+        uint256 tokenId,
+        address user,
+        address cachedORentable
+    ) internal view returns (address oRentable) {
+        oRentable = cachedORentable == address(0)
+            ? _getExistingORentable(tokenAddress)
+            : cachedORentable;
+
+        require(
+            IERC721Upgradeable(oRentable).ownerOf(tokenId) == user,
+            "The token must be yours"
+        );
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /* ---------- Internal ---------- */
+
+    /// @dev Add amount to the payment to payee, or append a new one
+    /// @param payments payments so far
+    /// @param count number of payments so far
+    /// @param paymentTokenAddress payment token address
+    /// @param paymentTokenId payment token id
+    /// @param payee payment receiver
+    /// @param amount amount in payment token units
+    /// @return new number of payments
+    function _addPayment(
+        RentableTypes.Payment[] memory payments,
+        uint256 count,
+        address paymentTokenAddress,
+        uint256 paymentTokenId,
+        address payable payee,
+        uint256 amount
+    ) internal pure returns (uint256) {
+        for (uint256 i = 0; i < count; i++) {
+            RentableTypes.Payment memory payment = payments[i];
+            if (
+                payment.payee == payee &&
+                payment.paymentTokenAddress == paymentTokenAddress &&
+                payment.paymentTokenId == paymentTokenId
+            ) {
+                payment.amount += amount;
+                return count;
+            }
+        }
+
+        payments[count] = RentableTypes.Payment(
+            paymentTokenAddress,
+            paymentTokenId,
+            payee,
+            amount
+        );
+        return count + 1;
+    }
+
+    /// @dev Rent one token of a batch, payments are added to the batch ones
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param duration rental duration
+    /// @param renterWallet renter smart wallet
+    /// @param payments batch payments
+    /// @param count number of batch payments
+    /// @return new number of batch payments
+    function _rentInBatch(
+        address tokenAddress,
+        uint256 tokenId,
+        uint256 duration,
+        address renterWallet,
+        RentableTypes.Payment[] memory payments,
+        uint256 count
+    ) internal returns (uint256) {
+        (
+            address payable rentee,
+            RentableTypes.RentalConditions memory rcs
+        ) = _rent(tokenAddress, tokenId, duration);
+
+        IERC721Upgradeable(tokenAddress).safeTransferFrom(
+            address(this),
+            renterWallet,
+            tokenId,
+            ""
+        );
+
+        {
+            uint256 paymentQty = rcs.pricePerSecond * duration;
+            uint256 feesForFeeCollector = (paymentQty * _fee) / BASE_FEE;
+
+            if (feesForFeeCollector > 0) {
+                count = _addPayment(
+                    payments,
+                    count,
+                    rcs.paymentTokenAddress,
+                    rcs.paymentTokenId,
+                    _feeCollector,
+                    feesForFeeCollector
+                );
+            }
+            count = _addPayment(
+                payments,
+                count,
+                rcs.paymentTokenAddress,
+                rcs.paymentTokenId,
+                rentee,
+                paymentQty - feesForFeeCollector
+            );
+        }
+
+        _postRent(
+            tokenAddress,
+            tokenId,
+            duration,
+            rentee,
+            msg.sender,
+            renterWallet
+        );
+
+        emit Rent(
+            rentee,
+            msg.sender,
+            tokenAddress,
+            tokenId,
+            rcs.paymentTokenAddress,
+            rcs.paymentTokenId,
+            block.timestamp + duration
+        );
+
+        return count;
+    }
+
+    /* ---------- Public ---------- */
+
+    /// @notice Deposit many tokens of the same collection, listing them
+    /// with shared or per token rental conditions
+    /// @dev Tokens are pulled with transferFrom (no onERC721Received),
+    /// Rentable must be approved for them. Emits the same per token events
+    /// as single deposits
+    /// @param tokenAddress wrapped token address
+    /// @param tokenIds array of wrapped token ids
+    /// @param rcs rental conditions see RentableTypes.RentalConditions,
+    /// empty to deposit only, one entry shared by all tokens or one per token
+    function depositAndListBatch(
+        address tokenAddress,
+        uint256[] calldata tokenIds,
+        RentableTypes.RentalConditions[] calldata rcs
+    ) external whenNotPaused nonReentrant {
+        require(
+            rcs.length <= 1 || rcs.length == tokenIds.length,
+            "Arrays length mismatch"
+        );
+
+        address oRentable = _getExistingORentable(tokenAddress);
+
+        // shared conditions are checked once
+        RentableTypes.RentalConditions memory rc;
+        if (rcs.length == 1) {
+            rc = rcs[0];
+            _checkRentalConditions(rc);
+        }
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            // reverts when not owned or not approved
+            IERC721Upgradeable(tokenAddress).transferFrom(
+                msg.sender,
+                address(this),
+                tokenIds[i]
+            );
+
+            IERC721ReadOnlyProxy(oRentable).mint(msg.sender, tokenIds[i]);
+
+            _postDeposit(tokenAddress, tokenIds[i], msg.sender);
+
+            emit Deposit(msg.sender, tokenAddress, tokenIds[i]);
+
+            if (rcs.length > 1) {
+                rc = rcs[i];
+                _checkRentalConditions(rc);
+            }
+
+            if (rcs.length > 0) {
+                _setRentalConditions(msg.sender, tokenAddress, tokenIds[i], rc);
+                _emitUpdateRentalConditions(tokenAddress, tokenIds[i], rc);
+            }
+        }
+    }
+
+    /// @notice Batch withdraw
+    /// @param tokenAddresses array of wrapped token addresses
+    /// @param tokenIds array of wrapped token ids
+    function withdrawBatch(
+        address[] calldata tokenAddresses,
+        uint256[] calldata tokenIds
+    ) external whenNotPaused nonReentrant {
+        require(
+            tokenAddresses.length == tokenIds.length,
+            "Arrays length mismatch"
+        );
+
+        address oRentable = address(0);
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            oRentable = _getExistingORentableCheckOwnership(
+                tokenAddresses[i],
+                tokenIds[i],
+                msg.sender,
+                i > 0 && tokenAddresses[i] == tokenAddresses[i - 1]
+                    ? oRentable
+                    : address(0)
+            );
+
+            _withdraw(oRentable, tokenAddresses[i], tokenIds[i], msg.sender);
+        }
+    }
+
+    /// @notice Batch createOrUpdateRentalConditions
+    /// @param tokenAddresses array of wrapped token addresses
+    /// @param tokenIds array of wrapped token ids
+    /// @param rcs array of rental conditions see RentableTypes.RentalConditions
+    function createOrUpdateRentalConditionsBatch(
+        address[] calldata tokenAddresses,
+        uint256[] calldata tokenIds,
+        RentableTypes.RentalConditions[] calldata rcs
+    ) external whenNotPaused nonReentrant {
+        require(
+            tokenAddresses.length == tokenIds.length &&
+                tokenIds.length == rcs.length,
+            "Arrays length mismatch"
+        );
+
+        address oRentable = address(0);
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            oRentable = _getExistingORentableCheckOwnership(
+                tokenAddresses[i],
+                tokenIds[i],
+                msg.sender,
+                i > 0 && tokenAddresses[i] == tokenAddresses[i - 1]
+                    ? oRentable
+                    : address(0)
+            );
+
+            _createOrUpdateRentalConditions(
+                msg.sender,
+                tokenAddresses[i],
+                tokenIds[i],
+                rcs[i]
+            );
+        }
+    }
+
+    /// @notice Batch deleteRentalConditions
+    /// @param tokenAddresses array of wrapped token addresses
+    /// @param tokenIds array of wrapped token ids
+    function deleteRentalConditionsBatch(
+        address[] calldata tokenAddresses,
+        uint256[] calldata tokenIds
+    ) external whenNotPaused nonReentrant {
+        require(
+            tokenAddresses.length == tokenIds.length,
+            "Arrays length mismatch"
+        );
+
+        address oRentable = address(0);
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            oRentable = _getExistingORentableCheckOwnership(
+                tokenAddresses[i],
+                tokenIds[i],
+                msg.sender,
+                i > 0 && tokenAddresses[i] == tokenAddresses[i - 1]
+                    ? oRentable
+                    : address(0)
+            );
+
+            _deleteRentalConditions(tokenAddresses[i], tokenIds[i]);
+        }
+    }
+
+    /// @notice Batch rent, payments are grouped by payment token and payee
+    /// @dev ETH due for all the rentals is taken from msg.value, the remaining refunded
+    /// @param tokenAddresses array of wrapped token addresses
+    /// @param tokenIds array of wrapped token ids
+    /// @param durations array of rental durations
+    function rentBatch(
+        address[] calldata tokenAddresses,
+        uint256[] calldata tokenIds,
+        uint256[] calldata durations
+    ) external payable whenNotPaused nonReentrant {
+        require(
+            tokenAddresses.length == tokenIds.length &&
+                tokenIds.length == durations.length,
+            "Arrays length mismatch"
+        );
+
+        address renterWallet = _getOrCreateWalletForUser(msg.sender);
+
+        // one for the fee collector and one for the rentee per rental at most
+        RentableTypes.Payment[] memory payments = new RentableTypes.Payment[](
+            2 * tokenIds.length
+        );
+        uint256 count = 0;
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            count = _rentInBatch(
+                tokenAddresses[i],
+                tokenIds[i],
+                durations[i],
+                renterWallet,
+                payments,
+                count
+            );
+        }
+
+        uint256 ethQty = 0;
+        for (uint256 i = 0; i < count; i++) {
+            if (payments[i].paymentTokenAddress == address(0)) {
+                ethQty += payments[i].amount;
+            }
+        }
+
+        require(msg.value >= ethQty, "Not enough funds");
+
+        for (uint256 i = 0; i < count; i++) {
+            RentableTypes.Payment memory payment = payments[i];
+            if (payment.amount > 0) {
+                _pay(
+                    payment.paymentTokenAddress,
+                    payment.paymentTokenId,
+                    payment.payee,
+                    payment.amount
+                );
+            }
+        }
+
+        // refund eventual remaining
+        if (msg.value > ethQty) {
+            Address.sendValue(payable(msg.sender), msg.value - ethQty);
+        }
+    }
+}
@@ -0,0 +1,179 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity >=0.8.7;
+
+// Inheritance
+import {RentableStorageV1} from "./RentableStorageV1.sol";
+
+// References
+import {RentableTypes} from "./RentableTypes.sol";
+
+/// @title Rentable Storage contract, packed rentals
+/// @author Rentable Team <hello@rentable.world>
+/// @custom:security Rentable Security Team <security@rentable.world>
+/// @notice Rental conditions and expiration of a token in 3 slots instead of 7,
+/// durations, price and expiration (what rent and expiration need) in the first one
+/// @dev RentableStorageV1 _rentalConditions and _expiresAt are kept for layout
+/// compatibility. _expiresAt is only read by the migration, _rentalConditions
+/// also holds the full width conditions which do not fit the packed layout
+contract RentableStorageV2 is RentableStorageV1 {
+    /* ========== TYPES ========== */
+
+    struct PackedRental {
+        // slot 0
+        uint40 minTimeDuration; // min duration allowed for the rental
+        uint40 maxTimeDuration; // max duration allowed for the rental, 0 when not listed
+        uint48 expiresAt; // rental expiration time
+        uint128 pricePerSecond; // price per second in payment token units
+        // slot 1
+        address paymentTokenAddress; // payment token address allowed for the rental
+        uint96 paymentTokenId; // payment token id allowed for the rental (0 for ETH and ERC20)
+        // slot 2
+        address privateRenter; // restrict rent only to this address
+        bool unpacked; // conditions out of the packed ranges, full width in _rentalConditions
+    }
+
+    /* ========== STATE VARIABLES ========== */
+
+    // (token address, token id) => rental conditions and expiration
+    // slither-disable-next-line naming-convention
+    mapping(address => mapping(uint256 => PackedRental)) internal _rentals;
+
+    /* ========== VIEWS ========== */
+
+    /// @dev Check rental conditions fit the packed layout
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    /// @return true if they fit, false otw
+    function _fitsPackedRental(RentableTypes.RentalConditions memory rc)
+        internal
+        pure
+        returns (bool)
+    {
+        return
+            rc.minTimeDuration <= type(uint40).max &&
+            rc.maxTimeDuration <= type(uint40).max &&
+            rc.pricePerSecond <= type(uint128).max &&
+            rc.paymentTokenId <= type(uint96).max;
+    }
+
+    /// @dev Unpack rental conditions of a wrapped token
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @return rc rental conditions see RentableTypes.RentalConditions
+    function _getRentalConditions(address tokenAddress, uint256 tokenId)
+        internal
+        view
+        returns (RentableTypes.RentalConditions memory rc)
+    {
+        PackedRental storage rental = _rentals[tokenAddress][tokenId];
+
+        if (rental.unpacked) {
+            return _rentalConditions[tokenAddress][tokenId];
+        }
+
+        rc.minTimeDuration = rental.minTimeDuration;
+        rc.maxTimeDuration = rental.maxTimeDuration;
+        rc.pricePerSecond = rental.pricePerSecond;
+        rc.paymentTokenId = rental.paymentTokenId;
+        rc.paymentTokenAddress = rental.paymentTokenAddress;
+        rc.privateRenter = rental.privateRenter;
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /// @dev Clamp a value to a packed field width
+    /// @param value value to clamp
+    /// @param max field max value
+    /// @return value or max if greater
+    function _clamp(uint256 value, uint256 max)
+        internal
+        pure
+        returns (uint256)
+    {
+        return value < max ? value : max;
+    }
+
+    /// @dev Pack rental conditions of a wrapped token, keeping its expiration.
+    /// Conditions not fitting the packed layout are stored full width in
+    /// _rentalConditions, the packed fields keep them clamped
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @param rc rental conditions see RentableTypes.RentalConditions
+    /// @param expiresAt rental expiration time, clamped to uint48
+    function _putRentalConditions(
+        address tokenAddress,
+        uint256 tokenId,
+        RentableTypes.RentalConditions memory rc,
+        uint256 expiresAt
+    ) internal {
+        bool unpacked = !_fitsPackedRental(rc);
+
+        if (unpacked) {
+            _rentalConditions[tokenAddress][tokenId] = rc;
+        } else if (_rentals[tokenAddress][tokenId].unpacked) {
+            delete _rentalConditions[tokenAddress][tokenId];
+        }
+
+        _rentals[tokenAddress][tokenId] = PackedRental({
+            minTimeDuration: uint40(
+                _clamp(rc.minTimeDuration, type(uint40).max)
+            ),
+            maxTimeDuration: uint40(
+                _clamp(rc.maxTimeDuration, type(uint40).max)
+            ),
+            expiresAt: uint48(_clamp(expiresAt, type(uint48).max)),
+            pricePerSecond: uint128(
+                _clamp(rc.pricePerSecond, type(uint128).max)
+            ),
+            paymentTokenAddress: rc.paymentTokenAddress,
+            paymentTokenId: uint96(
+                _clamp(rc.paymentTokenId, type(uint96).max)
+            ),
+            privateRenter: rc.privateRenter,
+            unpacked: unpacked
+        });
+    }
+
+    /// @dev Move rental conditions and expiration of a wrapped token from
+    /// the RentableStorageV1 mappings, clearing them. Tokens already
+    /// listed or rented in the packed layout keep their data. Conditions
+    /// out of the packed ranges stay in _rentalConditions as full width
+    /// ones, expirations beyond uint48 are clamped
+    /// @param tokenAddress wrapped token address
+    /// @param tokenId wrapped token id
+    /// @return migrated true if there was something to move, false otw
+    function _migrateRental(address tokenAddress, uint256 tokenId)
+        internal
+        returns (bool migrated)
+    {
+        PackedRental storage rental = _rentals[tokenAddress][tokenId];
+
+        // full width conditions of the packed layout, not V1 ones
+        if (rental.unpacked) {
+            return false;
+        }
+
+        RentableTypes.RentalConditions memory rc = _rentalConditions[
+            tokenAddress
+        ][tokenId];
+        uint256 expiresAt = _expiresAt[tokenAddress][tokenId];
+
+        if (rc.maxTimeDuration == 0 && expiresAt == 0) {
+            return false;
+        }
+
+        delete _expiresAt[tokenAddress][tokenId];
+
+        if (rental.maxTimeDuration == 0 && rental.expiresAt == 0) {
+            // keeps _rentalConditions when they do not fit
+            _putRentalConditions(tokenAddress, tokenId, rc, expiresAt);
+            if (rental.unpacked) {
+                return true;
+            }
+        }
+
+        delete _rentalConditions[tokenAddress][tokenId];
+
+        return true;
+    }
+}
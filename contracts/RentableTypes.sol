@@ -13,4 +13,11 @@ library RentableTypes {
         address paymentTokenAddress; // payment token address allowed for the rental
         address privateRenter; // restrict rent only to this address
     }
+
+    struct Payment {
+        address paymentTokenAddress; // payment token address (0 for ETH)
+        uint256 paymentTokenId; // payment token id (0 for ETH and ERC20)
+        address payable payee; // payment receiver
+        uint256 amount; // amount in payment token units
+    }
 }
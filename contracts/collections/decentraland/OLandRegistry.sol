@@ -8,6 +8,7 @@ import {ORentable} from "../../tokenization/ORentable.sol";
 // References
 import {IRentable} from "../../interfaces/IRentable.sol";
 import {IORentableHooks} from "../../interfaces/IORentableHooks.sol";
+import {IERC721ExistExtension} from "../../interfaces/IERC721ExistExtension.sol";
 import {ILandRegistry} from "./ILandRegistry.sol";
 
 /// @title OToken for Decentraland LAND
@@ -52,4 +53,55 @@ contract OLandRegistry is ORentable {
             abi.encode(tokenId, operator)
         );
     }
+
+    /// @notice Restore the depositor as land operator, e.g. after rentals
+    /// expired without any hook to reset the operator
+    /// @dev Expired rentals are settled, their library hook restores the
+    /// operator. Only operators left empty or still pointing at the expired
+    /// renter are reset, others are delegations by the depositor. Lands
+    /// still rented out or withdrawn are skipped
+    /// @param tokenIds land identifiers
+    function syncUpdateOperators(uint256[] calldata tokenIds)
+        external
+        onlyOwner
+    {
+        address wrapped = getWrapped();
+        address rentable = getRentable();
+        address wrentable = IRentable(rentable).getWRentable(wrapped);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            uint256 tokenId = tokenIds[i];
+
+            if (!_exists(tokenId)) continue;
+
+            // renter of a rental not settled yet, burnt by the expiration
+            address renter;
+            // slither-disable-next-line calls-loop
+            if (IERC721ExistExtension(wrentable).exists(tokenId)) {
+                // slither-disable-next-line calls-loop
+                renter = IERC721ExistExtension(wrentable).ownerOf(
+                    tokenId,
+                    true
+                );
+            }
+
+            // slither-disable-next-line calls-loop
+            if (IRentable(rentable).expireRental(wrapped, tokenId)) continue;
+
+            address depositor = ownerOf(tokenId);
+            // slither-disable-next-line calls-loop
+            address operator = ILandRegistry(wrapped).updateOperator(tokenId);
+            if (
+                operator != depositor &&
+                (operator == address(0) || operator == renter)
+            ) {
+                // slither-disable-next-line calls-loop,unused-return
+                IORentableHooks(rentable).proxyCall(
+                    wrapped,
+                    ILandRegistry(wrapped).setUpdateOperator.selector,
+                    abi.encode(tokenId, depositor)
+                );
+            }
+        }
+    }
 }
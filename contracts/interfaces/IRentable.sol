@@ -20,6 +20,11 @@ interface IRentable is IRentableEvents, IERC721ReceiverUpgradeable {
     /// @return wallet address
     function userWallet(address user) external view returns (address payable);
 
+    /// @notice Get WToken address associated to the specific wrapped token
+    /// @param tokenAddress wrapped token address
+    /// @return WToken address
+    function getWRentable(address tokenAddress) external view returns (address);
+
     /// @notice Show current rental conditions for a specific wrapped token
     /// @param tokenAddress wrapped token address
     /// @param tokenId wrapped token id
@@ -0,0 +1,112 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {DSTest} from "ds-test/test.sol";
+import {Vm} from "forge-std/Vm.sol";
+
+import {TestHelper} from "./TestHelper.t.sol";
+
+import {SimpleWallet} from "../wallet/SimpleWallet.sol";
+import {DeterministicWalletFactory} from "../wallet/DeterministicWalletFactory.sol";
+
+import {UpgradeableBeacon} from "@openzeppelin/contracts/proxy/beacon/UpgradeableBeacon.sol";
+
+contract DeterministicWalletFactoryTest is DSTest, TestHelper {
+    Vm public constant vm = Vm(HEVM_ADDRESS);
+
+    address owner;
+    address user;
+
+    SimpleWallet simpleWalletLogic;
+    UpgradeableBeacon simpleWalletBeacon;
+    DeterministicWalletFactory walletFactory;
+
+    function setUp() public {
+        owner = getNewAddress();
+        user = getNewAddress();
+
+        vm.startPrank(owner);
+
+        simpleWalletLogic = new SimpleWallet(owner, user);
+        simpleWalletBeacon = new UpgradeableBeacon(address(simpleWalletLogic));
+        walletFactory = new DeterministicWalletFactory(
+            address(simpleWalletBeacon)
+        );
+    }
+
+    function testCreateWalletAtPredictedAddress() public {
+        address walletOwner = getNewAddress();
+        address walletUser = getNewAddress();
+
+        address predicted = walletFactory.predictWallet(
+            owner,
+            walletOwner,
+            walletUser
+        );
+
+        address payable newWallet = payable(
+            walletFactory.createWallet(walletOwner, walletUser)
+        );
+
+        assertEq(predicted, newWallet);
+
+        assertEq(walletOwner, SimpleWallet(newWallet).owner());
+        assertEq(walletUser, SimpleWallet(newWallet).getUser());
+    }
+
+    function testCannotCreateTwice() public {
+        address walletOwner = getNewAddress();
+        address walletUser = getNewAddress();
+
+        walletFactory.createWallet(walletOwner, walletUser);
+
+        vm.expectRevert();
+        walletFactory.createWallet(walletOwner, walletUser);
+    }
+
+    function testCreatorIsPartOfTheAddress() public {
+        address walletOwner = getNewAddress();
+        address walletUser = getNewAddress();
+
+        // someone else creating a wallet for the same owner and user
+        // does not take the creator address
+        switchUser(getNewAddress());
+        address other = walletFactory.createWallet(walletOwner, walletUser);
+
+        switchUser(owner);
+        address wallet = walletFactory.createWallet(walletOwner, walletUser);
+
+        assertTrue(other != wallet);
+        assertEq(
+            wallet,
+            walletFactory.predictWallet(owner, walletOwner, walletUser)
+        );
+    }
+
+    function testPredictionFollowsBeacon() public {
+        address walletOwner = getNewAddress();
+        address walletUser = getNewAddress();
+
+        address predicted = walletFactory.predictWallet(
+            owner,
+            walletOwner,
+            walletUser
+        );
+
+        walletFactory.setBeacon(
+            address(new UpgradeableBeacon(address(simpleWalletLogic)))
+        );
+
+        address repredicted = walletFactory.predictWallet(
+            owner,
+            walletOwner,
+            walletUser
+        );
+        assertTrue(predicted != repredicted);
+
+        assertEq(
+            repredicted,
+            walletFactory.createWallet(walletOwner, walletUser)
+        );
+    }
+}
@@ -240,4 +240,79 @@ contract RentableDecentraland is SharedSetup {
         wrentable.safeTransferFrom(renter, newRenter, tokenId);
         assertEq(testLand.updateOperator(tokenId), orentable.ownerOf(tokenId));
     }
+
+    function _depositLand(address owner, uint256 tokenId) internal {
+        switchUser(owner);
+        testLand.mint(owner, tokenId);
+        testLand.safeTransferFrom(
+            owner,
+            address(rentable),
+            tokenId,
+            abi.encode(
+                RentableTypes.RentalConditions({
+                    minTimeDuration: 0,
+                    maxTimeDuration: 10,
+                    pricePerSecond: 0.1 ether,
+                    paymentTokenId: 0,
+                    paymentTokenAddress: address(0),
+                    privateRenter: address(0)
+                })
+            )
+        );
+    }
+
+    function testSyncUpdateOperators() public {
+        address owner = getNewAddress();
+        address renter = getNewAddress();
+        address delegate = getNewAddress();
+        vm.warp(1);
+
+        // 1 rented and expired, 2 rented, 3 operator reset, 4 withdrawn,
+        // 5 delegated, 6 rented, settled then delegated
+        uint256[] memory tokenIds = new uint256[](6);
+        for (uint256 i = 0; i < 6; i++) {
+            tokenIds[i] = i + 1;
+            _depositLand(owner, tokenIds[i]);
+        }
+
+        switchUser(renter);
+        depositAndApprove(renter, 1.1 ether, address(0), 0);
+        rentable.rent{value: 0.5 ether}(address(testLand), tokenIds[0], 5);
+        rentable.rent{value: 0.1 ether}(address(testLand), tokenIds[5], 1);
+        vm.warp(4);
+        rentable.rent{value: 0.5 ether}(address(testLand), tokenIds[1], 5);
+
+        switchUser(address(rentable));
+        testLand.setUpdateOperator(tokenIds[2], address(0));
+
+        switchUser(owner);
+        rentable.withdraw(address(testLand), tokenIds[3]);
+        OLandRegistry(address(orentable)).setUpdateOperator(
+            tokenIds[4],
+            delegate
+        );
+        OLandRegistry(address(orentable)).setUpdateOperator(
+            tokenIds[5],
+            delegate
+        );
+        assertTrue(!wrentable.exists(tokenIds[5]));
+
+        vm.warp(7);
+        assertEq(testLand.updateOperator(tokenIds[0]), renter);
+
+        switchUser(renter);
+        vm.expectRevert(bytes("Ownable: caller is not the owner"));
+        OLandRegistry(address(orentable)).syncUpdateOperators(tokenIds);
+
+        switchUser(governance);
+        OLandRegistry(address(orentable)).syncUpdateOperators(tokenIds);
+
+        assertEq(testLand.updateOperator(tokenIds[0]), owner);
+        assertEq(testLand.updateOperator(tokenIds[1]), renter);
+        assertEq(testLand.updateOperator(tokenIds[2]), owner);
+        assertEq(testLand.ownerOf(tokenIds[3]), owner);
+        assertEq(testLand.updateOperator(tokenIds[4]), delegate);
+        assertEq(testLand.updateOperator(tokenIds[5]), delegate);
+        assertTrue(!wrentable.exists(tokenIds[0]));
+    }
 }
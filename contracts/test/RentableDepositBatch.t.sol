@@ -0,0 +1,223 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {SharedSetup} from "./SharedSetup.t.sol";
+
+import {RentableTypes} from "./../RentableTypes.sol";
+
+contract RentableDepositBatch is SharedSetup {
+    function _mintBatch(uint256 size)
+        internal
+        returns (uint256[] memory tokenIds)
+    {
+        tokenIds = new uint256[](size);
+        for (uint256 i = 0; i < size; i++) {
+            prepareTestDeposit();
+            tokenIds[i] = tokenId;
+        }
+        testNFT.setApprovalForAll(address(rentable), true);
+    }
+
+    function _conditions(uint256 size, uint256 _pricePerSecond)
+        internal
+        pure
+        returns (RentableTypes.RentalConditions[] memory rcs)
+    {
+        rcs = new RentableTypes.RentalConditions[](size);
+        for (uint256 i = 0; i < size; i++) {
+            rcs[i] = RentableTypes.RentalConditions({
+                paymentTokenAddress: address(0),
+                paymentTokenId: 0,
+                minTimeDuration: 1,
+                maxTimeDuration: 10 days,
+                pricePerSecond: _pricePerSecond + i,
+                privateRenter: address(0)
+            });
+        }
+    }
+
+    function _expectEvents(
+        uint256[] memory tokenIds,
+        RentableTypes.RentalConditions[] memory rcs
+    ) internal {
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            vm.expectEmit(true, true, true, true);
+            emit Deposit(user, address(testNFT), tokenIds[i]);
+
+            if (rcs.length > 0) {
+                RentableTypes.RentalConditions memory rc = rcs[
+                    rcs.length == 1 ? 0 : i
+                ];
+                vm.expectEmit(true, true, true, true);
+                emit UpdateRentalConditions(
+                    address(testNFT),
+                    tokenIds[i],
+                    rc.paymentTokenAddress,
+                    rc.paymentTokenId,
+                    rc.minTimeDuration,
+                    rc.maxTimeDuration,
+                    rc.pricePerSecond,
+                    rc.privateRenter
+                );
+            }
+        }
+    }
+
+    function _assertDeposited(uint256[] memory tokenIds) internal {
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(testNFT.ownerOf(tokenIds[i]), address(rentable));
+            assertEq(orentable.ownerOf(tokenIds[i]), user);
+        }
+    }
+
+    function testDepositBatch() public executeByUser(user) {
+        uint256[] memory tokenIds = _mintBatch(3);
+        RentableTypes.RentalConditions[]
+            memory rcs = new RentableTypes.RentalConditions[](0);
+
+        _expectEvents(tokenIds, rcs);
+
+        rentableBatch.depositAndListBatch(address(testNFT), tokenIds, rcs);
+
+        _assertDeposited(tokenIds);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(
+                rentable
+                    .rentalConditions(address(testNFT), tokenIds[i])
+                    .maxTimeDuration,
+                0
+            );
+        }
+    }
+
+    function testDepositAndListBatchShared() public executeByUser(user) {
+        uint256[] memory tokenIds = _mintBatch(3);
+        RentableTypes.RentalConditions[] memory rcs = _conditions(1, 1 gwei);
+
+        _expectEvents(tokenIds, rcs);
+
+        rentableBatch.depositAndListBatch(address(testNFT), tokenIds, rcs);
+
+        _assertDeposited(tokenIds);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            RentableTypes.RentalConditions memory rc = rentable
+                .rentalConditions(address(testNFT), tokenIds[i]);
+            assertEq(rc.minTimeDuration, 1);
+            assertEq(rc.maxTimeDuration, 10 days);
+            assertEq(rc.pricePerSecond, 1 gwei);
+        }
+    }
+
+    function testDepositAndListBatchPerToken() public executeByUser(user) {
+        uint256[] memory tokenIds = _mintBatch(3);
+        RentableTypes.RentalConditions[] memory rcs = _conditions(3, 1 gwei);
+        rcs[2].paymentTokenAddress = address(weth);
+
+        _expectEvents(tokenIds, rcs);
+
+        rentableBatch.depositAndListBatch(address(testNFT), tokenIds, rcs);
+
+        _assertDeposited(tokenIds);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            RentableTypes.RentalConditions memory rc = rentable
+                .rentalConditions(address(testNFT), tokenIds[i]);
+            assertEq(rc.pricePerSecond, 1 gwei + i);
+            assertEq(rc.paymentTokenAddress, rcs[i].paymentTokenAddress);
+        }
+    }
+
+    function testDepositAndListBatchThenRent() public {
+        switchUser(user);
+        uint256[] memory tokenIds = _mintBatch(2);
+        rentableBatch.depositAndListBatch(
+            address(testNFT),
+            tokenIds,
+            _conditions(1, 1 gwei)
+        );
+
+        renter = getNewAddress();
+        switchUser(renter);
+        vm.deal(renter, 1 ether);
+        rentable.rent{value: 1 gwei * 1 days}(
+            address(testNFT),
+            tokenIds[1],
+            1 days
+        );
+
+        assertEq(testNFT.ownerOf(tokenIds[1]), rentable.userWallet(renter));
+    }
+
+    function testCannotDepositAndListBatchChecks() public executeByUser(user) {
+        uint256[] memory tokenIds = _mintBatch(3);
+
+        vm.expectRevert(bytes("Arrays length mismatch"));
+        rentableBatch.depositAndListBatch(
+            address(testNFT),
+            tokenIds,
+            _conditions(2, 1)
+        );
+
+        RentableTypes.RentalConditions[] memory rcs = _conditions(3, 1);
+        rcs[2].paymentTokenAddress = getNewAddress();
+        vm.expectRevert(bytes("Not supported payment token"));
+        rentableBatch.depositAndListBatch(address(testNFT), tokenIds, rcs);
+
+        rcs = _conditions(1, 1);
+        rcs[0].minTimeDuration = 11 days;
+        vm.expectRevert(
+            bytes("Minimum duration cannot be greater than maximum")
+        );
+        rentableBatch.depositAndListBatch(address(testNFT), tokenIds, rcs);
+
+        vm.expectRevert(bytes("Token currently not supported"));
+        rentableBatch.depositAndListBatch(getNewAddress(), tokenIds, rcs);
+    }
+
+    function testCannotDepositBatchNotOwnedOrApproved()
+        public
+        executeByUser(user)
+    {
+        uint256[] memory tokenIds = _mintBatch(2);
+        testNFT.transferFrom(user, getNewAddress(), tokenIds[1]);
+
+        vm.expectRevert(
+            bytes("ERC721: transfer caller is not owner nor approved")
+        );
+        rentableBatch.depositAndListBatch(
+            address(testNFT),
+            tokenIds,
+            _conditions(1, 1)
+        );
+
+        testNFT.setApprovalForAll(address(rentable), false);
+        uint256[] memory owned = new uint256[](1);
+        owned[0] = tokenIds[0];
+
+        vm.expectRevert(
+            bytes("ERC721: transfer caller is not owner nor approved")
+        );
+        rentableBatch.depositAndListBatch(
+            address(testNFT),
+            owned,
+            _conditions(1, 1)
+        );
+    }
+
+    function testCannotDepositBatchWhenPaused() public {
+        uint256[] memory tokenIds = new uint256[](0);
+
+        switchUser(governance);
+        rentable.SCRAM();
+
+        switchUser(user);
+        vm.expectRevert(bytes("Pausable: paused"));
+        rentableBatch.depositAndListBatch(
+            address(testNFT),
+            tokenIds,
+            _conditions(1, 1)
+        );
+    }
+}
@@ -0,0 +1,183 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {SharedSetup} from "./SharedSetup.t.sol";
+
+contract RentableEnumeration is SharedSetup {
+    function _enableEnumeration() internal {
+        switchUser(governance);
+        orentable.enableEnumeration();
+        wrentable.enableEnumeration();
+        switchUser(user);
+    }
+
+    function _depositMany(uint256 size)
+        internal
+        returns (uint256[] memory tokenIds)
+    {
+        tokenIds = new uint256[](size);
+        for (uint256 i = 0; i < size; i++) {
+            prepareTestDeposit();
+            testNFT.safeTransferFrom(user, address(rentable), tokenId);
+            tokenIds[i] = tokenId;
+        }
+    }
+
+    function _rentMany(address _renter, uint256[] memory durations)
+        internal
+        returns (uint256[] memory tokenIds)
+    {
+        tokenIds = new uint256[](durations.length);
+        for (uint256 i = 0; i < durations.length; i++) {
+            _prepareRent(_renter);
+            tokenIds[i] = tokenId;
+
+            uint256 value = durations[i] * pricePerSecond;
+            switchUser(_renter);
+            vm.deal(_renter, value);
+            rentable.rent{value: value}(
+                address(testNFT),
+                tokenId,
+                durations[i]
+            );
+            switchUser(user);
+        }
+    }
+
+    function testEnumerationDisabledByDefault() public executeByUser(user) {
+        _depositMany(1);
+        assertTrue(!orentable.isEnumerable());
+
+        vm.expectRevert(bytes("Enumeration disabled"));
+        orentable.ownedTokensCount(user);
+        vm.expectRevert(bytes("Enumeration disabled"));
+        orentable.tokensOfOwner(user, 0, 1);
+        vm.expectRevert(bytes("Enumeration disabled"));
+        wrentable.activeRentalsOf(user);
+
+        vm.expectRevert(bytes("Ownable: caller is not the owner"));
+        orentable.enableEnumeration();
+    }
+
+    function testTokensOfOwner() public executeByUser(user) {
+        _enableEnumeration();
+        uint256[] memory tokenIds = _depositMany(5);
+        assertEq(orentable.ownedTokensCount(user), 5);
+
+        uint256[] memory page = orentable.tokensOfOwner(user, 0, 2);
+        assertEq(page.length, 2);
+        assertEq(page[0], tokenIds[0]);
+        assertEq(page[1], tokenIds[1]);
+
+        page = orentable.tokensOfOwner(user, 4, 10);
+        assertEq(page.length, 1);
+        assertEq(page[0], tokenIds[4]);
+
+        assertEq(orentable.tokensOfOwner(user, 5, 1).length, 0);
+        assertEq(
+            orentable.tokensOfOwner(user, 1, type(uint256).max).length,
+            4
+        );
+
+        // transfer moves the last token in place of the transferred one
+        address other = getNewAddress();
+        orentable.transferFrom(user, other, tokenIds[1]);
+        assertEq(orentable.ownedTokensCount(user), 4);
+        assertEq(orentable.ownedTokensCount(other), 1);
+        assertEq(orentable.tokensOfOwner(other, 0, 1)[0], tokenIds[1]);
+
+        page = orentable.tokensOfOwner(user, 0, 10);
+        assertEq(page.length, 4);
+        assertEq(page[0], tokenIds[0]);
+        assertEq(page[1], tokenIds[4]);
+        assertEq(page[2], tokenIds[2]);
+        assertEq(page[3], tokenIds[3]);
+
+        // burn on withdraw
+        rentable.withdraw(address(testNFT), tokenIds[0]);
+        page = orentable.tokensOfOwner(user, 0, 10);
+        assertEq(page.length, 3);
+        assertEq(page[0], tokenIds[3]);
+        assertEq(page[1], tokenIds[4]);
+        assertEq(page[2], tokenIds[2]);
+    }
+
+    function testActiveRentalsOf() public executeByUser(user) {
+        _enableEnumeration();
+        address _renter = getNewAddress();
+        uint256[] memory durations = new uint256[](3);
+        durations[0] = 100;
+        durations[1] = 200;
+        durations[2] = 300;
+
+        uint256 start = block.timestamp;
+        uint256[] memory rented = _rentMany(_renter, durations);
+        assertEq(wrentable.ownedTokensCount(_renter), 3);
+
+        (uint256[] memory tokenIds, uint256[] memory expirations) = wrentable
+            .activeRentalsOf(_renter);
+        assertEq(tokenIds.length, 3);
+        for (uint256 i = 0; i < 3; i++) {
+            assertEq(tokenIds[i], rented[i]);
+            assertEq(expirations[i], start + durations[i]);
+        }
+
+        vm.warp(start + 150);
+
+        (tokenIds, expirations) = wrentable.activeRentalsOf(_renter);
+        assertEq(tokenIds.length, 2);
+        assertEq(expirations.length, 2);
+        assertEq(tokenIds[0], rented[1]);
+        assertEq(tokenIds[1], rented[2]);
+
+        // expired rentals are skipped within the page
+        (tokenIds, ) = wrentable.activeRentalsOf(_renter, 0, 1);
+        assertEq(tokenIds.length, 0);
+        (tokenIds, ) = wrentable.activeRentalsOf(_renter, 1, 1);
+        assertEq(tokenIds.length, 1);
+        assertEq(tokenIds[0], rented[1]);
+
+        // settled rentals leave the enumeration
+        assertEq(wrentable.ownedTokensCount(_renter), 3);
+        rentable.expireRental(address(testNFT), rented[0]);
+        assertEq(wrentable.ownedTokensCount(_renter), 2);
+
+        vm.warp(start + 300);
+        (tokenIds, ) = wrentable.activeRentalsOf(_renter);
+        assertEq(tokenIds.length, 0);
+    }
+
+    function testIndexTokens() public executeByUser(user) {
+        // deposited before the enumeration is enabled
+        uint256[] memory tokenIds = _depositMany(2);
+        _enableEnumeration();
+        assertEq(orentable.ownedTokensCount(user), 0);
+
+        uint256[] memory toIndex = new uint256[](3);
+        toIndex[0] = tokenIds[0];
+        toIndex[1] = tokenIds[1];
+        toIndex[2] = tokenIds[1] + 100;
+
+        vm.expectRevert(bytes("Ownable: caller is not the owner"));
+        orentable.indexTokens(toIndex);
+
+        // not existing tokens are skipped, already enumerated ones too so
+        // the backfill can be run again
+        switchUser(governance);
+        orentable.indexTokens(toIndex);
+        assertEq(orentable.ownedTokensCount(user), 2);
+        orentable.indexTokens(toIndex);
+        assertEq(orentable.ownedTokensCount(user), 2);
+        switchUser(user);
+
+        uint256[] memory page = orentable.tokensOfOwner(user, 0, 10);
+        assertEq(page.length, 2);
+        assertEq(page[0], tokenIds[0]);
+        assertEq(page[1], tokenIds[1]);
+
+        // backfilled tokens leave the enumeration like the others
+        rentable.withdraw(address(testNFT), tokenIds[0]);
+        assertEq(orentable.ownedTokensCount(user), 1);
+        assertEq(orentable.tokensOfOwner(user, 0, 10)[0], tokenIds[1]);
+    }
+}
@@ -0,0 +1,238 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {SharedSetup} from "./SharedSetup.t.sol";
+
+import {RentableTypes} from "./../RentableTypes.sol";
+
+import {ReentrantCollectionLibrary} from "./mocks/ReentrantCollectionLibrary.sol";
+
+contract RentableInventoryBatch is SharedSetup {
+    function _depositBatch(uint256 size)
+        internal
+        returns (address[] memory tokenAddresses, uint256[] memory tokenIds)
+    {
+        tokenAddresses = new address[](size);
+        tokenIds = new uint256[](size);
+
+        for (uint256 i = 0; i < size; i++) {
+            prepareTestDeposit();
+            testNFT.safeTransferFrom(user, address(rentable), tokenId);
+            tokenAddresses[i] = address(testNFT);
+            tokenIds[i] = tokenId;
+        }
+    }
+
+    function _conditions(uint256 size, uint256 _pricePerSecond)
+        internal
+        pure
+        returns (RentableTypes.RentalConditions[] memory rcs)
+    {
+        rcs = new RentableTypes.RentalConditions[](size);
+        for (uint256 i = 0; i < size; i++) {
+            rcs[i] = RentableTypes.RentalConditions({
+                paymentTokenAddress: address(0),
+                paymentTokenId: 0,
+                minTimeDuration: 0,
+                maxTimeDuration: 10 days,
+                pricePerSecond: _pricePerSecond + i,
+                privateRenter: address(0)
+            });
+        }
+    }
+
+    function testWithdrawBatch() public executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(3);
+
+        vm.expectEmit(true, true, true, true);
+        emit Withdraw(address(testNFT), tokenIds[2]);
+
+        rentableBatch.withdrawBatch(tokenAddresses, tokenIds);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(testNFT.ownerOf(tokenIds[i]), user);
+        }
+
+        vm.expectRevert(bytes("ERC721: owner query for nonexistent token"));
+        orentable.ownerOf(tokenIds[0]);
+    }
+
+    function testCannotWithdrawBatchNotOwned() public executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(2);
+
+        orentable.transferFrom(user, getNewAddress(), tokenIds[1]);
+
+        vm.expectRevert(bytes("The token must be yours"));
+        rentableBatch.withdrawBatch(tokenAddresses, tokenIds);
+    }
+
+    function testCannotWithdrawBatchOnRent() public executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(2);
+
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            _conditions(2, 1)
+        );
+
+        renter = getNewAddress();
+        vm.deal(renter, 1 ether);
+        switchUser(renter);
+        // pricePerSecond is 2 for the second token
+        rentable.rent{value: 20}(address(testNFT), tokenIds[1], 10);
+
+        switchUser(user);
+        vm.expectRevert(bytes("Current rent still pending"));
+        rentableBatch.withdrawBatch(tokenAddresses, tokenIds);
+    }
+
+    function testCreateOrUpdateRentalConditionsBatch()
+        public
+        executeByUser(user)
+    {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(3);
+
+        RentableTypes.RentalConditions[] memory rcs = _conditions(3, 100);
+
+        vm.expectEmit(true, true, true, true);
+        emit UpdateRentalConditions(
+            address(testNFT),
+            tokenIds[0],
+            address(0),
+            0,
+            0,
+            10 days,
+            100,
+            address(0)
+        );
+
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            rcs
+        );
+
+        // reprice
+        rcs = _conditions(3, 200);
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            rcs
+        );
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(
+                rentable
+                    .rentalConditions(address(testNFT), tokenIds[i])
+                    .pricePerSecond,
+                200 + i
+            );
+        }
+    }
+
+    function testCreateOrUpdateRentalConditionsBatchChecks()
+        public
+        executeByUser(user)
+    {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(2);
+
+        RentableTypes.RentalConditions[] memory rcs = _conditions(2, 1);
+        rcs[1].paymentTokenAddress = getNewAddress();
+
+        vm.expectRevert(bytes("Not supported payment token"));
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            rcs
+        );
+
+        vm.expectRevert(bytes("Arrays length mismatch"));
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            _conditions(1, 1)
+        );
+
+        switchUser(getNewAddress());
+        vm.expectRevert(bytes("The token must be yours"));
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            _conditions(2, 1)
+        );
+    }
+
+    function testDeleteRentalConditionsBatch() public executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(3);
+
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            _conditions(3, 1)
+        );
+
+        rentableBatch.deleteRentalConditionsBatch(tokenAddresses, tokenIds);
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(
+                rentable
+                    .rentalConditions(address(testNFT), tokenIds[i])
+                    .maxTimeDuration,
+                0
+            );
+        }
+    }
+
+    function _reenterFromPostList(bool reenterDelete) internal {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds
+        ) = _depositBatch(2);
+
+        switchUser(governance);
+        rentable.setLibrary(
+            address(testNFT),
+            address(new ReentrantCollectionLibrary(reenterDelete))
+        );
+
+        switchUser(user);
+        vm.expectRevert(bytes("ReentrancyGuard: reentrant call"));
+        rentableBatch.createOrUpdateRentalConditionsBatch(
+            tokenAddresses,
+            tokenIds,
+            _conditions(2, 1)
+        );
+    }
+
+    function testCannotReenterCreateOrUpdateRentalConditionsBatch()
+        public
+        executeByUser(user)
+    {
+        _reenterFromPostList(false);
+    }
+
+    function testCannotReenterDeleteRentalConditionsBatch()
+        public
+        executeByUser(user)
+    {
+        _reenterFromPostList(true);
+    }
+}
@@ -0,0 +1,217 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {SharedSetup} from "./SharedSetup.t.sol";
+
+import {RentableBatch} from "../RentableBatch.sol";
+import {RentableTypes} from "../RentableTypes.sol";
+
+contract RentableRentBatch is SharedSetup {
+    function _prepareBatch(address _renter, uint256 size)
+        internal
+        returns (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            uint256[] memory durations
+        )
+    {
+        tokenAddresses = new address[](size);
+        tokenIds = new uint256[](size);
+        durations = new uint256[](size);
+
+        for (uint256 i = 0; i < size; i++) {
+            _prepareRent(_renter);
+            tokenAddresses[i] = address(testNFT);
+            tokenIds[i] = tokenId;
+            durations[i] = 60 + i * 20;
+        }
+    }
+
+    function _due(uint256[] memory durations)
+        internal
+        view
+        returns (uint256 paymentQty, uint256 fees)
+    {
+        for (uint256 i = 0; i < durations.length; i++) {
+            uint256 itemQty = durations[i] * pricePerSecond;
+            paymentQty += itemQty;
+            // fees are rounded per rental, as for separate rents
+            fees += (itemQty * rentable.getFee()) / 10_000;
+        }
+    }
+
+    function testRentBatch()
+        public
+        payable
+        protocolFeeCoverage
+        paymentTokensCoverage
+        executeByUser(user)
+    {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            uint256[] memory durations
+        ) = _prepareBatch(getNewAddress(), 3);
+
+        (uint256 paymentQty, uint256 fees) = _due(durations);
+
+        switchUser(renter);
+        depositAndApprove(
+            renter,
+            paymentQty,
+            paymentTokenAddress,
+            paymentTokenId
+        );
+
+        uint256 preBalanceUser = getBalance(
+            user,
+            paymentTokenAddress,
+            paymentTokenId
+        );
+        uint256 preBalanceFeeCollector = getBalance(
+            feeCollector,
+            paymentTokenAddress,
+            paymentTokenId
+        );
+        uint256 preBalanceRenter = getBalance(
+            renter,
+            paymentTokenAddress,
+            paymentTokenId
+        );
+
+        // Test event emitted
+        vm.expectEmit(true, true, true, true);
+        emit Rent(
+            user,
+            renter,
+            address(testNFT),
+            tokenIds[2],
+            paymentTokenAddress,
+            paymentTokenId,
+            block.timestamp + durations[2]
+        );
+
+        rentableBatch.rentBatch{
+            value: paymentTokenAddress == address(0) ? paymentQty : 0
+        }(tokenAddresses, tokenIds, durations);
+
+        switchUser(user);
+
+        assertEq(
+            preBalanceRenter -
+                getBalance(renter, paymentTokenAddress, paymentTokenId),
+            paymentQty
+        );
+        assertEq(
+            getBalance(feeCollector, paymentTokenAddress, paymentTokenId) -
+                preBalanceFeeCollector,
+            fees
+        );
+        assertEq(
+            getBalance(user, paymentTokenAddress, paymentTokenId) -
+                preBalanceUser,
+            paymentQty - fees
+        );
+
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            assertEq(wrentable.ownerOf(tokenIds[i]), renter);
+            assertEq(
+                testNFT.ownerOf(tokenIds[i]),
+                rentable.userWallet(renter)
+            );
+            assertEq(
+                rentable.expiresAt(address(testNFT), tokenIds[i]),
+                block.timestamp + durations[i]
+            );
+        }
+    }
+
+    function testRentBatchRefund() public payable executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            uint256[] memory durations
+        ) = _prepareBatch(getNewAddress(), 2);
+
+        (uint256 paymentQty, ) = _due(durations);
+
+        switchUser(renter);
+        vm.deal(renter, paymentQty + 1 ether);
+
+        rentableBatch.rentBatch{value: paymentQty + 1 ether}(
+            tokenAddresses,
+            tokenIds,
+            durations
+        );
+
+        assertEq(renter.balance, 1 ether);
+    }
+
+    function testRentBatchNotEnoughFunds() public payable executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            uint256[] memory durations
+        ) = _prepareBatch(getNewAddress(), 2);
+
+        (uint256 paymentQty, ) = _due(durations);
+
+        switchUser(renter);
+        vm.deal(renter, paymentQty);
+
+        vm.expectRevert(bytes("Not enough funds"));
+        rentableBatch.rentBatch{value: paymentQty - 1}(
+            tokenAddresses,
+            tokenIds,
+            durations
+        );
+    }
+
+    function testCannotRentBatchSameTokenTwice()
+        public
+        payable
+        executeByUser(user)
+    {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            uint256[] memory durations
+        ) = _prepareBatch(getNewAddress(), 2);
+        tokenIds[1] = tokenIds[0];
+
+        switchUser(renter);
+        vm.deal(renter, 1 ether);
+
+        vm.expectRevert(bytes("Current rent still pending"));
+        rentableBatch.rentBatch{value: 1 ether}(
+            tokenAddresses,
+            tokenIds,
+            durations
+        );
+    }
+
+    function testRentBatchLengthMismatch() public payable executeByUser(user) {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+
+        ) = _prepareBatch(getNewAddress(), 2);
+
+        switchUser(renter);
+
+        vm.expectRevert(bytes("Arrays length mismatch"));
+        rentableBatch.rentBatch(tokenAddresses, tokenIds, new uint256[](1));
+    }
+
+    function testRentableBatchDirectCall() public executeByUser(user) {
+        // no collections on its own storage, only usable through Rentable
+        RentableBatch direct = RentableBatch(rentable.getRentableBatch());
+
+        vm.expectRevert(bytes("Token currently not supported"));
+        direct.depositAndListBatch(
+            address(testNFT),
+            new uint256[](1),
+            new RentableTypes.RentalConditions[](0)
+        );
+    }
+}
@@ -109,6 +109,39 @@ contract RentableSetters is SharedSetup {
         assertEq(rentable.getWRentable(address(testNFT)), token);
     }
 
+    function testGovernanceMulticall() public {
+        address token = getNewAddress();
+        address oRentable = getNewAddress();
+        address wRentable = getNewAddress();
+        address lib = getNewAddress();
+
+        bytes[] memory calls = new bytes[](3);
+        calls[0] = abi.encodeWithSelector(
+            rentable.setORentable.selector,
+            token,
+            oRentable
+        );
+        calls[1] = abi.encodeWithSelector(
+            rentable.setWRentable.selector,
+            token,
+            wRentable
+        );
+        calls[2] = abi.encodeWithSelector(
+            rentable.setLibrary.selector,
+            token,
+            lib
+        );
+
+        _onlyGovernance(
+            rentable.governanceMulticall.selector,
+            abi.encode(calls)
+        );
+
+        assertEq(rentable.getORentable(token), oRentable);
+        assertEq(rentable.getWRentable(token), wRentable);
+        assertEq(rentable.getLibrary(token), lib);
+    }
+
     function _onlyGovernance(bytes4 selector, bytes memory data)
         internal
         executeByUser(governance)
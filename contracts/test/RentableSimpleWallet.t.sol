@@ -6,6 +6,7 @@ import {SharedSetup} from "./SharedSetup.t.sol";
 import {SimpleWallet} from "../wallet/SimpleWallet.sol";
 
 import {IWalletFactory} from "../wallet/IWalletFactory.sol";
+import {DeterministicWalletFactory} from "../wallet/DeterministicWalletFactory.sol";
 import {ProxyAdmin, TransparentUpgradeableProxy} from "@openzeppelin/contracts/proxy/transparent/ProxyAdmin.sol";
 
 contract RentableSimpleWallet is SharedSetup {
@@ -48,4 +49,26 @@ contract RentableSimpleWallet is SharedSetup {
         );
         rentable.createWalletForUser(getNewAddress());
     }
+
+    function testDeterministicWalletForUser() public {
+        DeterministicWalletFactory deterministicFactory = new DeterministicWalletFactory(
+                address(simpleWalletBeacon)
+            );
+
+        vm.prank(governance);
+        rentable.setWalletFactory(address(deterministicFactory));
+
+        address aUser = getNewAddress();
+        address predicted = deterministicFactory.predictWallet(
+            address(rentable),
+            address(rentable),
+            aUser
+        );
+
+        // squatting the address from outside Rentable is not possible
+        deterministicFactory.createWallet(address(rentable), aUser);
+
+        assertEq(rentable.createWalletForUser(aUser), predicted);
+        assertEq(rentable.userWallet(aUser), predicted);
+    }
 }
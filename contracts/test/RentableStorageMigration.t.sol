@@ -0,0 +1,308 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity >=0.8.7;
+
+import {SharedSetup} from "./SharedSetup.t.sol";
+
+import {DummyRentableV1Storage} from "./mocks/DummyRentableV1Storage.sol";
+import {TransparentUpgradeableProxy} from "@openzeppelin/contracts/proxy/transparent/ProxyAdmin.sol";
+
+import {RentableTypes} from "./../RentableTypes.sol";
+
+contract RentableStorageMigration is SharedSetup {
+    function _upgrade(address implementation) internal {
+        switchUser(governance);
+        proxyAdmin.upgrade(
+            TransparentUpgradeableProxy(payable(address(rentable))),
+            implementation
+        );
+    }
+
+    function _assertEq(
+        RentableTypes.RentalConditions memory a,
+        RentableTypes.RentalConditions memory b
+    ) internal {
+        assertEq(a.minTimeDuration, b.minTimeDuration);
+        assertEq(a.maxTimeDuration, b.maxTimeDuration);
+        assertEq(a.pricePerSecond, b.pricePerSecond);
+        assertEq(a.paymentTokenId, b.paymentTokenId);
+        assertEq(a.paymentTokenAddress, b.paymentTokenAddress);
+        assertEq(a.privateRenter, b.privateRenter);
+    }
+
+    /// @dev listed, listed and rented, deposited only tokens with their
+    /// data moved to the V1 mappings as before the upgrade
+    function _prepareLegacy()
+        internal
+        returns (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            RentableTypes.RentalConditions[] memory rcs,
+            uint256[] memory expirations
+        )
+    {
+        tokenAddresses = new address[](3);
+        tokenIds = new uint256[](3);
+        rcs = new RentableTypes.RentalConditions[](3);
+        expirations = new uint256[](3);
+
+        switchUser(user);
+        _prepareRent(getNewAddress());
+        tokenIds[0] = tokenId;
+
+        _prepareRent(getNewAddress());
+        tokenIds[1] = tokenId;
+
+        prepareTestDeposit();
+        testNFT.safeTransferFrom(user, address(rentable), tokenId);
+        tokenIds[2] = tokenId;
+
+        switchUser(renter);
+        vm.deal(renter, pricePerSecond * 1 days);
+        rentable.rent{value: pricePerSecond * 1 days}(
+            address(testNFT),
+            tokenIds[1],
+            1 days
+        );
+
+        for (uint256 i = 0; i < 3; i++) {
+            tokenAddresses[i] = address(testNFT);
+            rcs[i] = rentable.rentalConditions(address(testNFT), tokenIds[i]);
+            expirations[i] = rentable.expiresAt(address(testNFT), tokenIds[i]);
+        }
+
+        _upgrade(
+            address(new DummyRentableV1Storage(governance, address(0)))
+        );
+        for (uint256 i = 0; i < 3; i++) {
+            DummyRentableV1Storage(address(rentable)).setLegacyRental(
+                address(testNFT),
+                tokenIds[i],
+                rcs[i],
+                expirations[i]
+            );
+        }
+        _upgrade(address(rentableLogic));
+    }
+
+    function testMigrateRentals() public {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            RentableTypes.RentalConditions[] memory rcs,
+            uint256[] memory expirations
+        ) = _prepareLegacy();
+
+        // not migrated yet, looks unlisted
+        assertEq(
+            rentable
+                .rentalConditions(address(testNFT), tokenIds[0])
+                .maxTimeDuration,
+            0
+        );
+        assertEq(rentable.expiresAt(address(testNFT), tokenIds[1]), 0);
+
+        switchUser(governance);
+        rentable.SCRAM();
+        assertEq(rentableBatch.migrateRentals(tokenAddresses, tokenIds), 2);
+
+        for (uint256 i = 0; i < 3; i++) {
+            _assertEq(
+                rentable.rentalConditions(address(testNFT), tokenIds[i]),
+                rcs[i]
+            );
+            assertEq(
+                rentable.expiresAt(address(testNFT), tokenIds[i]),
+                expirations[i]
+            );
+        }
+
+        // V1 mappings are cleared, nothing left to move
+        assertEq(rentableBatch.migrateRentals(tokenAddresses, tokenIds), 0);
+
+        rentable.unpause();
+
+        // pending rental is still pending
+        switchUser(user);
+        vm.expectRevert(bytes("Current rent still pending"));
+        rentable.withdraw(address(testNFT), tokenIds[1]);
+
+        // listing is still available
+        switchUser(renter);
+        vm.deal(renter, pricePerSecond * 1 days);
+        rentable.rent{value: pricePerSecond * 1 days}(
+            address(testNFT),
+            tokenIds[0],
+            1 days
+        );
+        assertEq(
+            rentable.expiresAt(address(testNFT), tokenIds[0]),
+            block.timestamp + 1 days
+        );
+    }
+
+    function testMigrateRentalsKeepsNewListings() public {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            RentableTypes.RentalConditions[] memory rcs,
+
+        ) = _prepareLegacy();
+
+        RentableTypes.RentalConditions memory rc = rcs[0];
+        rc.pricePerSecond = rc.pricePerSecond * 2;
+
+        switchUser(user);
+        rentable.createOrUpdateRentalConditions(
+            address(testNFT),
+            tokenIds[0],
+            rc
+        );
+
+        switchUser(governance);
+        rentable.SCRAM();
+        rentableBatch.migrateRentals(tokenAddresses, tokenIds);
+
+        _assertEq(
+            rentable.rentalConditions(address(testNFT), tokenIds[0]),
+            rc
+        );
+    }
+
+    function testCannotMigrateRentals() public {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            ,
+
+        ) = _prepareLegacy();
+
+        switchUser(governance);
+        vm.expectRevert(bytes("Pausable: not paused"));
+        rentableBatch.migrateRentals(tokenAddresses, tokenIds);
+
+        rentable.SCRAM();
+
+        vm.expectRevert(bytes("Arrays length mismatch"));
+        rentableBatch.migrateRentals(tokenAddresses, new uint256[](1));
+
+        switchUser(user);
+        vm.expectRevert(bytes("Only Governance"));
+        rentableBatch.migrateRentals(tokenAddresses, tokenIds);
+    }
+
+    function testMigrateRentalsOutOfRange() public {
+        (
+            address[] memory tokenAddresses,
+            uint256[] memory tokenIds,
+            RentableTypes.RentalConditions[] memory rcs,
+            uint256[] memory expirations
+        ) = _prepareLegacy();
+
+        // V1 accepted any width
+        rcs[0].paymentTokenId = uint256(type(uint96).max) + 1;
+        rcs[0].pricePerSecond = uint256(type(uint128).max) + 1;
+        expirations[1] = uint256(type(uint48).max) + 1;
+
+        _upgrade(
+            address(new DummyRentableV1Storage(governance, address(0)))
+        );
+        for (uint256 i = 0; i < 2; i++) {
+            DummyRentableV1Storage(address(rentable)).setLegacyRental(
+                address(testNFT),
+                tokenIds[i],
+                rcs[i],
+                expirations[i]
+            );
+        }
+        _upgrade(address(rentableLogic));
+
+        // the batch goes through
+        switchUser(governance);
+        rentable.SCRAM();
+        assertEq(rentableBatch.migrateRentals(tokenAddresses, tokenIds), 2);
+
+        _assertEq(
+            rentable.rentalConditions(address(testNFT), tokenIds[0]),
+            rcs[0]
+        );
+        _assertEq(
+            rentable.rentalConditions(address(testNFT), tokenIds[1]),
+            rcs[1]
+        );
+        assertEq(
+            rentable.expiresAt(address(testNFT), tokenIds[1]),
+            type(uint48).max
+        );
+
+        // full width conditions are not taken for V1 ones again
+        assertEq(rentableBatch.migrateRentals(tokenAddresses, tokenIds), 0);
+        _assertEq(
+            rentable.rentalConditions(address(testNFT), tokenIds[0]),
+            rcs[0]
+        );
+
+        rentable.unpause();
+
+        switchUser(user);
+        rentable.deleteRentalConditions(address(testNFT), tokenIds[0]);
+        assertEq(
+            rentable
+                .rentalConditions(address(testNFT), tokenIds[0])
+                .maxTimeDuration,
+            0
+        );
+    }
+
+    function testListOutOfRange() public executeByUser(user) {
+        _prepareRent(getNewAddress());
+
+        RentableTypes.RentalConditions memory packed = rentable
+            .rentalConditions(address(testNFT), tokenId);
+        RentableTypes.RentalConditions memory rc = rentable.rentalConditions(
+            address(testNFT),
+            tokenId
+        );
+
+        // kept full width
+        rc.maxTimeDuration = uint256(type(uint40).max) + 1;
+        rentable.createOrUpdateRentalConditions(address(testNFT), tokenId, rc);
+        _assertEq(rentable.rentalConditions(address(testNFT), tokenId), rc);
+
+        rc.paymentTokenId = uint256(type(uint96).max) + 1;
+        rc.pricePerSecond = uint256(type(uint128).max) + 1;
+        rentable.createOrUpdateRentalConditions(address(testNFT), tokenId, rc);
+        _assertEq(rentable.rentalConditions(address(testNFT), tokenId), rc);
+
+        // back to the packed layout
+        rentable.createOrUpdateRentalConditions(
+            address(testNFT),
+            tokenId,
+            packed
+        );
+        _assertEq(rentable.rentalConditions(address(testNFT), tokenId), packed);
+
+        // rent within full width conditions
+        rc = rentable.rentalConditions(address(testNFT), tokenId);
+        rc.maxTimeDuration = type(uint256).max;
+        rentable.createOrUpdateRentalConditions(address(testNFT), tokenId, rc);
+
+        switchUser(renter);
+        vm.deal(renter, pricePerSecond * 1 days);
+        rentable.rent{value: pricePerSecond * 1 days}(
+            address(testNFT),
+            tokenId,
+            1 days
+        );
+        assertEq(
+            rentable.expiresAt(address(testNFT), tokenId),
+            block.timestamp + 1 days
+        );
+
+        switchUser(user);
+        rentable.deleteRentalConditions(address(testNFT), tokenId);
+        assertEq(
+            rentable.rentalConditions(address(testNFT), tokenId).maxTimeDuration,
+            0
+        );
+    }
+}
@@ -13,6 +13,7 @@ import {IRentable} from "../interfaces/IRentable.sol";
 import {BaseTokenInitializable} from "../tokenization/BaseTokenInitializable.sol";
 
 import {Rentable} from "../Rentable.sol";
+import {RentableBatch} from "../RentableBatch.sol";
 import {ORentable} from "../tokenization/ORentable.sol";
 import {WRentable} from "../tokenization/WRentable.sol";
 
@@ -50,6 +51,7 @@ abstract contract SharedSetup is DSTest, TestHelper, IRentableEvents {
     ProxyAdmin proxyAdmin;
 
     Rentable rentable;
+    RentableBatch rentableBatch;
     ORentable orentable;
     WRentable wrentable;
 
@@ -144,6 +146,7 @@ abstract contract SharedSetup is DSTest, TestHelper, IRentableEvents {
                 )
             )
         );
+        rentableBatch = RentableBatch(address(rentable));
 
         orentableLogic = new ORentable(
             address(testNFT),
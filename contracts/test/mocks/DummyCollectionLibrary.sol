@@ -24,7 +24,7 @@ contract DummyCollectionLibrary is ICollectionLibrary {
         uint256 minTimeDuration,
         uint256 maxTimeDuration,
         uint256 pricePerSecond
-    ) external override {}
+    ) external virtual override {}
 
     function postRent(
         address tokenAddress,
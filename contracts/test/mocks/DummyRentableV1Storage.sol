@@ -0,0 +1,25 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity >=0.8.7;
+
+import {Rentable} from "../../Rentable.sol";
+import {RentableTypes} from "../../RentableTypes.sol";
+
+/// @dev Rentable implementation able to move a rental back to the
+/// RentableStorageV1 mappings, to seed a proxy with pre-upgrade listings and rentals
+contract DummyRentableV1Storage is Rentable {
+    constructor(address governance, address operator)
+        Rentable(governance, operator)
+    {}
+
+    function setLegacyRental(
+        address tokenAddress,
+        uint256 tokenId,
+        RentableTypes.RentalConditions calldata rc,
+        uint256 expiresAt
+    ) external {
+        _rentalConditions[tokenAddress][tokenId] = rc;
+        _expiresAt[tokenAddress][tokenId] = expiresAt;
+        delete _rentals[tokenAddress][tokenId];
+    }
+}
@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity >=0.8.7;
+
+/// @notice aggregate3 subset of Multicall3, deployed by scripts on dev chains
+contract Multicall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(Call3[] calldata calls)
+        external
+        returns (Result[] memory returnData)
+    {
+        returnData = new Result[](calls.length);
+        for (uint256 i = 0; i < calls.length; i++) {
+            Result memory result = returnData[i];
+            (result.success, result.returnData) = calls[i].target.call(
+                calls[i].callData
+            );
+            require(
+                calls[i].allowFailure || result.success,
+                "Multicall3: call failed"
+            );
+        }
+    }
+}
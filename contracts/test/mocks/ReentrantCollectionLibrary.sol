@@ -0,0 +1,39 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity >=0.8.7;
+
+import {DummyCollectionLibrary} from "./DummyCollectionLibrary.sol";
+
+import {RentableBatch} from "../../RentableBatch.sol";
+import {RentableTypes} from "../../RentableTypes.sol";
+
+contract ReentrantCollectionLibrary is DummyCollectionLibrary {
+    bool public immutable reenterDelete;
+
+    constructor(bool _reenterDelete) DummyCollectionLibrary(false) {
+        reenterDelete = _reenterDelete;
+    }
+
+    function postList(
+        address,
+        uint256,
+        address,
+        uint256,
+        uint256,
+        uint256
+    ) external override {
+        // delegatecalled by Rentable, call back into its batch entrypoints
+        if (reenterDelete) {
+            RentableBatch(address(this)).deleteRentalConditionsBatch(
+                new address[](0),
+                new uint256[](0)
+            );
+        } else {
+            RentableBatch(address(this)).createOrUpdateRentalConditionsBatch(
+                new address[](0),
+                new uint256[](0),
+                new RentableTypes.RentalConditions[](0)
+            );
+        }
+    }
+}
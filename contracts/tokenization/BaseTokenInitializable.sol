@@ -5,6 +5,9 @@ pragma solidity >=0.8.7;
 // Inheritance
 import {ERC721ReadOnlyProxy} from "./ERC721ReadOnlyProxy.sol";
 
+// References
+import {ERC721Upgradeable} from "@openzeppelin/contracts-upgradeable/token/ERC721/ERC721Upgradeable.sol";
+
 /// @title BaseToken for O/W tokens
 /// @author Rentable Team <hello@rentable.world>
 /// @custom:security Rentable Security Team <security@rentable.world>
@@ -13,6 +16,17 @@ abstract contract BaseTokenInitializable is ERC721ReadOnlyProxy {
     /* ========== STATE VARIABLES ========== */
     // rentable reference
     address private _rentable;
+    // owner enumeration enabled, packed with _rentable
+    bool private _enumerable;
+
+    // owner enumeration, opt-in per collection, taken from the reserved
+    // storage below
+    // owner => index => token id
+    mapping(address => mapping(uint256 => uint256)) private _ownedTokens;
+    // token id => index + 1 in the owner enumeration, 0 when not enumerated
+    mapping(uint256 => uint256) private _ownedTokensIndex;
+    // owner => enumerated tokens
+    mapping(address => uint256) private _ownedTokensCount;
 
     /* ========== MODIFIERS ========== */
     modifier onlyRentable() {
@@ -20,6 +34,11 @@ abstract contract BaseTokenInitializable is ERC721ReadOnlyProxy {
         _;
     }
 
+    modifier whenEnumerable() {
+        require(_enumerable, "Enumeration disabled");
+        _;
+    }
+
     /* ========== CONSTRUCTOR ========== */
 
     /// @notice Instantiate a token
@@ -71,6 +90,55 @@ abstract contract BaseTokenInitializable is ERC721ReadOnlyProxy {
         _setMinter(rentable);
     }
 
+    /// @dev Add a token to the enumeration of its owner
+    /// @param to token owner
+    /// @param tokenId token id
+    function _addToOwnerEnumeration(address to, uint256 tokenId) private {
+        uint256 length = _ownedTokensCount[to];
+        _ownedTokens[to][length] = tokenId;
+        _ownedTokensIndex[tokenId] = length + 1;
+        _ownedTokensCount[to] = length + 1;
+    }
+
+    /// @dev Remove a token from the enumeration of its owner, swapping the last
+    /// token in its place. Tokens not enumerated are skipped
+    /// @param from token owner
+    /// @param tokenId token id
+    function _removeFromOwnerEnumeration(address from, uint256 tokenId)
+        private
+    {
+        uint256 index = _ownedTokensIndex[tokenId];
+        // minted before the enumeration and never indexed
+        if (index == 0) return;
+
+        uint256 lastIndex = _ownedTokensCount[from] - 1;
+        if (index - 1 != lastIndex) {
+            uint256 lastTokenId = _ownedTokens[from][lastIndex];
+            _ownedTokens[from][index - 1] = lastTokenId;
+            _ownedTokensIndex[lastTokenId] = index;
+        }
+
+        delete _ownedTokens[from][lastIndex];
+        delete _ownedTokensIndex[tokenId];
+        _ownedTokensCount[from] = lastIndex;
+    }
+
+    /// @inheritdoc ERC721Upgradeable
+    function _beforeTokenTransfer(
+        address from,
+        address to,
+        uint256 tokenId
+    ) internal virtual override {
+        super._beforeTokenTransfer(from, to, tokenId);
+
+        // collections without enumeration only read the flag, in the slot of
+        // _rentable every mint, burn and transfer reads anyway
+        if (!_enumerable) return;
+
+        if (from != address(0)) _removeFromOwnerEnumeration(from, tokenId);
+        if (to != address(0)) _addToOwnerEnumeration(to, tokenId);
+    }
+
     /* ---------- Public ---------- */
 
     /// @dev Set rentable address
@@ -79,6 +147,33 @@ abstract contract BaseTokenInitializable is ERC721ReadOnlyProxy {
         _setRentable(rentable);
     }
 
+    /// @notice Enable the owner enumeration, tokens minted so far are added
+    /// with indexTokens
+    /// @dev Can't be disabled, the enumeration would miss later transfers.
+    /// Mint, burn and transfer cost more gas once enabled
+    function enableEnumeration() external onlyOwner {
+        _enumerable = true;
+    }
+
+    /// @notice Add to the owner enumeration tokens minted before it was enabled
+    /// @dev Tokens not existing or already enumerated are skipped
+    /// @param tokenIds token ids
+    function indexTokens(uint256[] calldata tokenIds)
+        external
+        onlyOwner
+        whenEnumerable
+    {
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            uint256 tokenId = tokenIds[i];
+            if (_exists(tokenId) && _ownedTokensIndex[tokenId] == 0) {
+                _addToOwnerEnumeration(
+                    ERC721Upgradeable.ownerOf(tokenId),
+                    tokenId
+                );
+            }
+        }
+    }
+
     /* ========== VIEWS ========== */
 
     /* ---------- Internal ---------- */
@@ -95,7 +190,47 @@ abstract contract BaseTokenInitializable is ERC721ReadOnlyProxy {
         return _rentable;
     }
 
+    /// @notice Get whether the owner enumeration is enabled
+    /// @return true when enabled
+    function isEnumerable() external view returns (bool) {
+        return _enumerable;
+    }
+
+    /// @notice Get the number of enumerated tokens of an owner
+    /// @param owner token owner
+    /// @return number of tokens available via tokensOfOwner
+    function ownedTokensCount(address owner)
+        external
+        view
+        whenEnumerable
+        returns (uint256)
+    {
+        return _ownedTokensCount[owner];
+    }
+
+    /// @notice Get a page of the tokens of an owner
+    /// @dev Order changes on transfers (swap and pop), reverts when the
+    /// enumeration is disabled
+    /// @param owner token owner
+    /// @param offset index of the first token
+    /// @param limit max number of tokens returned
+    /// @return tokenIds token ids
+    function tokensOfOwner(
+        address owner,
+        uint256 offset,
+        uint256 limit
+    ) public view whenEnumerable returns (uint256[] memory tokenIds) {
+        uint256 count = _ownedTokensCount[owner];
+        if (offset >= count) return new uint256[](0);
+
+        uint256 end = limit > count - offset ? count : offset + limit;
+        tokenIds = new uint256[](end - offset);
+        for (uint256 i = offset; i < end; i++) {
+            tokenIds[i - offset] = _ownedTokens[owner][i];
+        }
+    }
+
     // Reserved storage space to allow for layout changes in the future.
     // slither-disable-next-line unused-state
-    uint256[50] private _gap;
+    uint256[47] private _gap;
 }
@@ -80,6 +80,62 @@ contract WRentable is IERC721ExistExtension, BaseTokenInitializable {
         return super._exists(tokenId);
     }
 
+    /// @notice Get the rentals of a user not expired yet, paginated over
+    /// tokensOfOwner
+    /// @dev Expired rentals still to be settled are skipped, a page can hold
+    /// less than limit rentals before the last one
+    /// @param user renter
+    /// @param offset index of the first token in tokensOfOwner
+    /// @param limit max number of tokens checked
+    /// @return tokenIds token ids of the active rentals
+    /// @return expirations rental expirations (timestamp)
+    function activeRentalsOf(
+        address user,
+        uint256 offset,
+        uint256 limit
+    )
+        public
+        view
+        returns (uint256[] memory tokenIds, uint256[] memory expirations)
+    {
+        tokenIds = tokensOfOwner(user, offset, limit);
+        expirations = new uint256[](tokenIds.length);
+
+        IRentable rentable = IRentable(getRentable());
+        address wrapped = getWrapped();
+        uint256 active = 0;
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            uint256 expiresAt = rentable.expiresAt(wrapped, tokenIds[i]);
+            // slither-disable-next-line timestamp
+            if (block.timestamp < expiresAt) {
+                tokenIds[active] = tokenIds[i];
+                expirations[active] = expiresAt;
+                active++;
+            }
+        }
+
+        // shrink to the active rentals
+        // slither-disable-next-line assembly
+        assembly {
+            mstore(tokenIds, active)
+            mstore(expirations, active)
+        }
+    }
+
+    /// @notice Get all the rentals of a user not expired yet
+    /// @dev Bounded by the call gas limit, use the paginated version for
+    /// large portfolios
+    /// @param user renter
+    /// @return tokenIds token ids of the active rentals
+    /// @return expirations rental expirations (timestamp)
+    function activeRentalsOf(address user)
+        external
+        view
+        returns (uint256[] memory tokenIds, uint256[] memory expirations)
+    {
+        return activeRentalsOf(user, 0, type(uint256).max);
+    }
+
     /* ========== MUTATIVE FUNCTIONS ========== */
 
     /* ---------- Internal ---------- */
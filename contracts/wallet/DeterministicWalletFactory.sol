@@ -0,0 +1,81 @@
+// SPDX-License-Identifier: MIT
+pragma solidity >=0.8.7;
+
+// Inheritance
+import {WalletFactory} from "./WalletFactory.sol";
+
+// Libraries
+import {Create2} from "@openzeppelin/contracts/utils/Create2.sol";
+
+// References
+import {BeaconProxy} from "@openzeppelin/contracts/proxy/beacon/BeaconProxy.sol";
+
+/// @title Rentable deterministic wallet factory
+/// @author Rentable Team <hello@rentable.world>
+/// @custom:security Rentable Security Team <security@rentable.world>
+/// @notice Wallet factory deploying wallets with CREATE2
+/// @dev Wallet address depends on creator, owner, user and current beacon,
+/// it can be computed before the wallet exists (see predictWallet)
+contract DeterministicWalletFactory is WalletFactory {
+    /* ========== CONSTRUCTOR ========== */
+
+    /// @dev Instatiate DeterministicWalletFactory
+    /// @param beacon beacon address
+    constructor(address beacon) WalletFactory(beacon) {}
+
+    /* ========== VIEWS ========== */
+
+    /// @dev Salt for a wallet, the creator is part of it so only
+    /// the creator can occupy its users' addresses
+    /// @param creator wallet creator (i.e. Rentable)
+    /// @param user address for user role
+    /// @return salt CREATE2 salt
+    function _salt(address creator, address user)
+        internal
+        pure
+        returns (bytes32 salt)
+    {
+        return keccak256(abi.encode(creator, user));
+    }
+
+    /// @notice Predict wallet address
+    /// @param creator wallet creator (i.e. Rentable)
+    /// @param owner address for owner role
+    /// @param user address for user role
+    /// @return wallet address the wallet has or will have with the current beacon
+    function predictWallet(
+        address creator,
+        address owner,
+        address user
+    ) external view returns (address wallet) {
+        return
+            Create2.computeAddress(
+                _salt(creator, user),
+                keccak256(
+                    abi.encodePacked(
+                        type(BeaconProxy).creationCode,
+                        abi.encode(_beacon, _walletData(owner, user))
+                    )
+                )
+            );
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /// @inheritdoc WalletFactory
+    function createWallet(address owner, address user)
+        external
+        override
+        returns (address payable wallet)
+    {
+        return
+            payable(
+                address(
+                    new BeaconProxy{salt: _salt(msg.sender, user)}(
+                        _beacon,
+                        _walletData(owner, user)
+                    )
+                )
+            );
+    }
+}
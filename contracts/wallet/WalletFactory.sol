@@ -18,7 +18,7 @@ contract WalletFactory is Ownable, IWalletFactory {
     /* ========== STATE VARIABLES ========== */
 
     // beacon for new wallets
-    address private _beacon;
+    address internal _beacon;
 
     /* ========== EVENTS ========== */
 
@@ -72,18 +72,35 @@ contract WalletFactory is Ownable, IWalletFactory {
 
     /* ========== MUTATIVE FUNCTIONS ========== */
 
+    /* ---------- Internal ---------- */
+
+    /// @dev Wallet initializer calldata
+    /// @param owner address for owner role
+    /// @param user address for user role
+    /// @return data initializer calldata
+    function _walletData(address owner, address user)
+        internal
+        pure
+        returns (bytes memory data)
+    {
+        return
+            abi.encodeWithSelector(
+                SimpleWallet.initialize.selector,
+                owner,
+                user
+            );
+    }
+
+    /* ---------- Public ---------- */
+
     /// @inheritdoc IWalletFactory
     function createWallet(address owner, address user)
         external
+        virtual
         override
         returns (address payable wallet)
     {
-        bytes memory _data = abi.encodeWithSelector(
-            SimpleWallet.initialize.selector,
-            owner,
-            user
-        );
-
-        return payable(address(new BeaconProxy(_beacon, _data)));
+        return
+            payable(address(new BeaconProxy(_beacon, _walletData(owner, user))));
     }
 }
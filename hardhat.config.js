@@ -24,8 +24,12 @@ module.exports = {
   networks: {
     hardhat: {
       forking: {
-        url: `https://mainnet.infura.io/v3/${process.env.WEB3_INFURA_PROJECT_ID}`
+        url: `https://mainnet.infura.io/v3/${process.env.WEB3_INFURA_PROJECT_ID}`,
+        // FORK=false runs offline, e.g. to replay saved traffic
+        enabled: process.env.FORK !== "false"
       },
+      // replayed blocks can't be older than the node start
+      initialDate: process.env.INITIAL_DATE,
     initialBaseFeePerGas: 0
     }
   }
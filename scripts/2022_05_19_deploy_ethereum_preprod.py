@@ -1,8 +1,8 @@
 import click
 
 from brownie import (
+    Wei,
     accounts,
-    network,
     Rentable,
     ORentable,
     WRentable,
@@ -15,6 +15,8 @@ from brownie import (
     project,
 )
 
+from scripts.helpers.fees import CostReport, useNetworkFees
+
 oz = project.load("./lib/openzeppelin-contracts")
 UpgradeableBeacon = oz.UpgradeableBeacon
 ProxyAdmin = oz.ProxyAdmin
@@ -28,7 +30,7 @@ def main():
     governance = dev
     operator = dev
     feeCollector = dev
-    network.gas_price("10 gwei")
+    fees = useNetworkFees(maxFeePerGas=Wei("10 gwei"))
 
     initialDeployerBalance = dev.balance()
     click.echo(
@@ -36,7 +38,8 @@ def main():
         ---- Params ----
      Deployer: {dev.address}
       Balance: {initialDeployerBalance/1e18} ETH
-    Gas Price: {network.gas_price()/1e9} gwei
+      Max Fee: {fees.maxFeePerGas/1e9} gwei
+ Priority Fee: {fees.maxPriorityFeePerGas/1e9} gwei
         ----------------
     """
     )
@@ -206,17 +209,4 @@ def main():
          """
     )
 
-    totalGasUsed = 0
-    for tx in history:
-        totalGasUsed += tx.gas_used
-
-    click.echo(
-        f"""
-            -------- Stats --------
-              TotalGas: {totalGasUsed}
-              GasPrice: {network.gas_price()/1e9} gwei
-Final Balance Deployer: {dev.balance()/1e18} ETH
-           Total Spent: {(initialDeployerBalance - dev.balance())/1e18} ETH
-            -----------------------
-         """
-    )
+    CostReport.fromHistory(history).echo(dev, initialDeployerBalance)
@@ -1,20 +1,22 @@
 import click
 
 from brownie import (
+    Wei,
     accounts,
-    network,
     Rentable,
     WalletFactory,
     history,
 )
 
+from scripts.helpers.fees import CostReport, useNetworkFees
+
 
 def main():
     dev = accounts.load("rentable-deployer")
     accounts.default = dev
 
     # params
-    network.gas_price("54 gwei")
+    fees = useNetworkFees(maxFeePerGas=Wei("54 gwei"))
 
     initialDeployerBalance = dev.balance()
     click.echo(
@@ -22,7 +24,8 @@ def main():
         ---- Params ----
      Deployer: {dev.address}
       Balance: {initialDeployerBalance/1e18} ETH
-    Gas Price: {network.gas_price()/1e9} gwei
+      Max Fee: {fees.maxFeePerGas/1e9} gwei
+ Priority Fee: {fees.maxPriorityFeePerGas/1e9} gwei
         ----------------
     """
     )
@@ -45,17 +48,4 @@ def main():
          """
     )
 
-    totalGasUsed = 0
-    for tx in history:
-        totalGasUsed += tx.gas_used
-
-    click.echo(
-        f"""
-            -------- Stats --------
-              TotalGas: {totalGasUsed}
-              GasPrice: {network.gas_price()/1e9} gwei
-Final Balance Deployer: {dev.balance()/1e18} ETH
-           Total Spent: {(initialDeployerBalance - dev.balance())/1e18} ETH
-            -----------------------
-         """
-    )
+    CostReport.fromHistory(history).echo(dev, initialDeployerBalance)
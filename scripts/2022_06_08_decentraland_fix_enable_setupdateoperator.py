@@ -1,19 +1,22 @@
 import click
 
 from brownie import (
+    Wei,
     accounts,
-    network,
     Rentable,
     history,
 )
 
+from scripts.helpers.codec import selector
+from scripts.helpers.fees import CostReport, useNetworkFees
+
 
 def main():
     dev = accounts.load("rentable-deployer")
     accounts.default = dev
 
     # params
-    network.gas_price("51 gwei")
+    fees = useNetworkFees(maxFeePerGas=Wei("51 gwei"))
 
     initialDeployerBalance = dev.balance()
     click.echo(
@@ -21,7 +24,8 @@ def main():
         ---- Params ----
      Deployer: {dev.address}
       Balance: {initialDeployerBalance/1e18} ETH
-    Gas Price: {network.gas_price()/1e9} gwei
+      Max Fee: {fees.maxFeePerGas/1e9} gwei
+ Priority Fee: {fees.maxPriorityFeePerGas/1e9} gwei
         ----------------
     """
     )
@@ -32,20 +36,7 @@ def main():
     oLand = "0xcE6AC4D01d18B99BF7926a2cdFa87D03d271d3d8"
 
     # Enable updateOperator from ORentable
-    r.enableProxyCall(oLand, "0x9d40b850", False)  # disable updateOperator signature
-    r.enableProxyCall(oLand, "0xb0b02c60", True)  # enable setUpdateOperator signature
-
-    totalGasUsed = 0
-    for tx in history:
-        totalGasUsed += tx.gas_used
+    r.enableProxyCall(oLand, selector("updateOperator(uint256)"), False)
+    r.enableProxyCall(oLand, selector("setUpdateOperator(uint256,address)"), True)
 
-    click.echo(
-        f"""
-            -------- Stats --------
-              TotalGas: {totalGasUsed}
-              GasPrice: {network.gas_price()/1e9} gwei
-Final Balance Deployer: {dev.balance()/1e18} ETH
-           Total Spent: {(initialDeployerBalance - dev.balance())/1e18} ETH
-            -----------------------
-         """
-    )
+    CostReport.fromHistory(history).echo(dev, initialDeployerBalance)
@@ -1,6 +1,8 @@
 import json
 
-from brownie import accounts, network, Rentable, history, project, interface
+from brownie import Wei, accounts, Rentable, history, project, interface
+
+from scripts.helpers.fees import CostReport, useNetworkFees
 
 address0 = "0x0000000000000000000000000000000000000000"
 
@@ -12,7 +14,7 @@ ProxyAdmin = oz.ProxyAdmin
 def main():
     dev = accounts.load("rentable-deployer")
     accounts.default = dev
-    network.gas_price("77 gwei")
+    useNetworkFees(Wei("77 gwei"))
 
     deployment = json.load(open("deployments/ethereum-mainnet.json"))
     print(f"Deployed contracts: {len(deployment)}")
@@ -82,9 +84,9 @@ def main():
         contractAdmin = proxyAdmin.getProxyAdmin(
             contractAddress
         )  ## todo use proxyadmin to get the effective admin
-        print(f"{contractName} owner: {contractAdmin}")
+        print(f"{contractName} admin: {contractAdmin}")
         print(f"{contractName} expected admin: {expectedAdmin}")
-        if contractOwner != expectedAdmin and contractAdmin != address0:
+        if contractAdmin == expectedAdmin:
             print("OK!")
         else:
             print("NOT OK!")
@@ -107,8 +109,4 @@ def main():
         else:
             print("OK!")
 
-    totalGasUsed = 0
-    for tx in history:
-        totalGasUsed += tx.gas_used
-
-    print(f"Total gas used {totalGasUsed}")
+    CostReport.fromHistory(history).echo(dev)
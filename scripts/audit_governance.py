@@ -0,0 +1,32 @@
+import json
+
+from scripts.helpers.audit import GovernanceAudit
+from scripts.helpers.rpc import AsyncRpc
+
+
+def main(
+    deploymentPath="deployments/ethereum-mainnet.json",
+    governance="0xC08618375bb20ac1C4BB806Baa027a4362156fE6",
+    operator=None,
+    reportPath=None,
+    rpcUrls=None,
+):
+    # comma separated endpoints, tried in order of load and health
+    rpc = AsyncRpc(rpcUrls.split(",")) if rpcUrls else None
+    deployment = json.load(open(deploymentPath))
+    audit = GovernanceAudit(deployment, governance, operator, rpc=rpc)
+    audit.read()
+    drifts = audit.drifts()
+    audit.report(drifts)
+
+    if reportPath:
+        with open(reportPath, "w") as f:
+            f.write(audit.toJson(drifts))
+
+    # governance is a multisig, fixes are submitted from there
+    for d in drifts:
+        if d.fix is not None:
+            print(
+                f"Fix {d.name}.{d.field}\n"
+                f"  from: {d.fix.sender}\n  to: {d.fix.to}\n  data: {d.fix.data()}"
+            )
@@ -0,0 +1,39 @@
+import json
+import time
+
+import click
+
+from scripts.helpers.availability import AvailabilityIndex, serve
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+from scripts.helpers.local_stack import eth
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    fromBlock=mainnetStartBlock,
+    host="127.0.0.1",
+    port=8088,
+    pollInterval=12,
+):
+    deployment = json.load(open(deploymentPath))
+    indexer = RentableIndexer(
+        dbPath,
+        deployment.values(),
+        fromBlock=int(fromBlock),
+        rentable=deployment["Rentable"],
+    )
+    index = AvailabilityIndex()
+
+    # sqlite is bound to this thread, the server only reads the index
+    indexer.sync()
+    index.refresh(indexer)
+    serve(index, host, int(port))
+    click.echo(f"Serving on http://{host}:{port} (paymentToken defaults to {eth})")
+
+    while True:
+        time.sleep(int(pollInterval))
+        indexer.sync(verbose=False)
+        updated = index.refresh(indexer)
+        if updated:
+            click.echo(f"block {index.lastBlock}: {updated} tokens updated")
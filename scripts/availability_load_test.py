@@ -0,0 +1,109 @@
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from eth_utils import to_checksum_address
+
+from scripts.helpers.availability import AvailabilityIndex, serve
+from scripts.helpers.keeper import percentile
+from scripts.helpers.local_stack import eth
+
+day = 24 * 60 * 60
+
+
+def syntheticIndex(collections=10, listings=100000, seed=0):
+    """An index filled with random listings, as if loaded from the store."""
+    rng = random.Random(seed)
+    index = AvailabilityIndex()
+    now = int(time.time())
+    addresses = [to_checksum_address(f"0x{c + 1:040x}") for c in range(collections)]
+    for tokenId in range(listings):
+        index._upsert(
+            {
+                "tokenAddress": addresses[tokenId % collections],
+                "tokenId": tokenId,
+                "deposited": 1,
+                "listed": 1,
+                "paymentTokenAddress": eth,
+                "paymentTokenId": "0",
+                "minTimeDuration": 1,
+                "maxTimeDuration": rng.randrange(day, 15 * day, day // 2),
+                "pricePerSecond": str(rng.randrange(10**12, 6 * 10**13)),
+                "privateRenter": eth,
+                # a third currently rented
+                "expiresAt": now + rng.randrange(day) if rng.random() < 0.3 else 0,
+            }
+        )
+    return index, addresses
+
+
+def _queries(addresses, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield (
+            rng.choice(addresses),
+            rng.randrange(10**12, 6 * 10**13),
+            rng.randrange(0, 15 * day),
+        )
+
+
+def _report(title, latencies, elapsed):
+    latencies = [latency * 1000 for latency in latencies]
+    click.echo(
+        f"""
+            -------- {title} --------
+              Requests: {len(latencies)}
+                   p50: {percentile(latencies, 50):.3f} ms
+                   p99: {percentile(latencies, 99):.3f} ms
+                   max: {max(latencies):.3f} ms
+               Req/sec: {len(latencies) / elapsed:.0f}
+         """
+    )
+
+
+def main(
+    url=None,
+    collections="",
+    requests=5000,
+    concurrency=8,
+    listings=100000,
+    seed=0,
+):
+    requests, concurrency = int(requests), int(concurrency)
+    server = None
+    if url is None:
+        index, addresses = syntheticIndex(listings=int(listings), seed=int(seed))
+        server = serve(index, port=0)
+        url = "http://%s:%d" % server.server_address
+
+        # in-process latency, what the index itself costs
+        latencies = []
+        startedAt = time.time()
+        for tokenAddress, maxPrice, minDuration in _queries(addresses, requests, seed):
+            t = time.perf_counter()
+            index.available(tokenAddress, maxPrice, minDuration, limit=50)
+            latencies.append(time.perf_counter() - t)
+        _report("Index", latencies, time.time() - startedAt)
+    else:
+        addresses = collections.split(",")
+
+    def request(query):
+        tokenAddress, maxPrice, minDuration = query
+        t = time.perf_counter()
+        with urllib.request.urlopen(
+            f"{url}/available?collection={tokenAddress}"
+            f"&maxPrice={maxPrice}&minDuration={minDuration}&limit=50"
+        ) as response:
+            json.load(response)
+        return time.perf_counter() - t
+
+    startedAt = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(request, _queries(addresses, requests, seed)))
+    _report("HTTP", latencies, time.time() - startedAt)
+
+    if server is not None:
+        server.shutdown()
@@ -0,0 +1,29 @@
+import json
+
+import click
+
+from scripts.helpers.multicall import Multicall, RentableReader, owners
+
+collections = {
+    "LAND": "0xF87E31492Faf9A91B02Ee0dEAAd50d51d56D5d4d",
+    "Meebits": "0x7Bd29408f11D2bFC23c34f18275bBf23bB716Bc7",
+    "LobsterDAO": "0x026224A2940bFE258D0dbE947919B62fE321F042",
+}
+
+
+def main(deploymentPath="deployments/ethereum-mainnet.json"):
+    multicall = Multicall()
+
+    deployment = json.load(open(deploymentPath))
+    reader = RentableReader(deployment["Rentable"], multicall)
+
+    click.echo(reader.protocol())
+    for name, c in zip(collections, reader.collections(collections.values())):
+        click.echo(f"{name}: {c}")
+    for (name, address), owner in zip(
+        deployment.items(), owners(multicall, deployment.values())
+    ):
+        click.echo(f"{name} owner: {owner}")
+
+    click.echo(f"Round trips: {multicall.roundTrips}")
+    multicall.close()
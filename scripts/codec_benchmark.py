@@ -0,0 +1,93 @@
+import random
+import time
+
+import click
+import eth_abi
+from eth_utils import to_checksum_address
+
+from scripts.helpers.indexer import CODEC, EVENTS
+
+RENT = dict(EVENTS)["Rent"]
+
+
+def _word(value):
+    return value.to_bytes(32, "big")
+
+
+def syntheticRentLogs(count, seed=0, users=1000, collections=20):
+    """Raw Rent logs, as returned by eth_getLogs through web3."""
+    rng = random.Random(seed)
+    users = [_word(rng.getrandbits(160)) for _ in range(users)]
+    collections = [_word(rng.getrandbits(160)) for _ in range(collections)]
+    rentTopic = CODEC["Rent"].topic
+
+    logs = []
+    for _ in range(count):
+        logs.append(
+            {
+                "topics": [
+                    rentTopic,
+                    rng.choice(users),
+                    rng.choice(collections),
+                    _word(rng.randrange(2**32)),
+                ],
+                "data": rng.choice(users)
+                + _word(0)
+                + _word(0)
+                + _word(1650000000 + rng.randrange(10**7)),
+            }
+        )
+    return logs
+
+
+def naiveDecode(log):
+    """Per-log eth_abi decode, what the scripts did before the codec."""
+    indexed = [(t, f) for t, f, i in RENT if i]
+    notIndexed = [(t, f) for t, f, i in RENT if not i]
+    args = {}
+    for (abiType, field), value in zip(indexed, log["topics"][1:]):
+        args[field] = eth_abi.decode_abi([abiType], value)[0]
+    values = eth_abi.decode_abi([t for t, _ in notIndexed], log["data"])
+    for (abiType, field), value in zip(notIndexed, values):
+        args[field] = value
+    for field in ("from", "to", "tokenAddress", "paymentTokenAddress"):
+        args[field] = to_checksum_address(args[field])
+    return args
+
+
+def _rate(title, count, elapsed, baseline=None):
+    speedup = f" ({count / elapsed / baseline:.1f}x)" if baseline else ""
+    click.echo(f"  {title:<28} {count / elapsed:>12,.0f} logs/s{speedup}")
+    return count / elapsed
+
+
+def main(logs=1000000, naiveSample=100000, seed=0):
+    logs, naiveSample = int(logs), int(naiveSample)
+    stream = syntheticRentLogs(logs, int(seed))
+
+    # eth_abi is slow enough to measure on a sample
+    sample = stream[:naiveSample]
+    startedAt = time.time()
+    expected = [naiveDecode(log) for log in sample]
+    baseline = _rate("naive eth_abi (sample)", len(sample), time.time() - startedAt)
+
+    startedAt = time.time()
+    decoded = 0
+    for _ in CODEC.decode(stream):
+        decoded += 1
+    _rate("codec generator", decoded, time.time() - startedAt, baseline)
+
+    startedAt = time.time()
+    columns = CODEC.columns(stream, "Rent")
+    _rate("codec columns", logs, time.time() - startedAt, baseline)
+
+    # same values either way
+    for i, args in enumerate(expected[:1000]):
+        row = {
+            k: v.item() if hasattr(v, "item") else v
+            for k, v in ((k, c[i]) for k, c in columns.items())
+        }
+        if args != row or args != CODEC["Rent"].decode(
+            sample[i]["topics"], sample[i]["data"]
+        ):
+            raise SystemExit(f"log {i} decodes differently from eth_abi")
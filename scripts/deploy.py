@@ -0,0 +1,50 @@
+import os
+
+import click
+
+from brownie import Wei, accounts
+
+from scripts.helpers.deploy_engine import DeployEngine, loadManifest
+from scripts.helpers.local_stack import isDevelopment
+from scripts.helpers.rpc import AsyncRpc
+
+
+def apply(manifest, dev, dryRun=False, rpc=None):
+    engine = DeployEngine(manifest, dev, rpc=rpc)
+    # gasPrice sends legacy transactions, otw type-2 capped to maxFeePerGas
+    gasPrice, maxFee = manifest.get("gasPrice"), manifest.get("maxFeePerGas")
+    engine.apply(
+        Wei(gasPrice) if gasPrice is not None else None,
+        dryRun=dryRun,
+        maxFeePerGas=Wei(maxFee) if maxFee is not None else None,
+    )
+    engine.report()
+
+    calls = engine.governanceCalls()
+    if calls:
+        click.echo("Governance calls to submit:")
+        for (to, data), step in zip(calls, engine.deferred):
+            click.echo(f"  {step.name}\n    to: {to}\n    data: {data}")
+
+    return engine
+
+
+def main(manifestPath="manifests/ethereum-mainnet.yaml", dryRun="false", rpcUrls=None):
+    dryRun = str(dryRun).lower() in ("1", "true", "yes")
+
+    if isDevelopment():
+        dev = accounts[0]
+        manifest = loadManifest("manifests/development.yaml")
+
+        # fresh chain, fresh deployment file
+        if os.path.exists(manifest["deployment"]):
+            os.remove(manifest["deployment"])
+
+        apply(manifest, dev)
+        return
+
+    dev = accounts.load("rentable-deployer")
+    accounts.default = dev
+
+    rpc = AsyncRpc(rpcUrls.split(",")) if rpcUrls else None
+    apply(loadManifest(manifestPath), dev, dryRun=dryRun, rpc=rpc)
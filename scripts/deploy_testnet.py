@@ -14,6 +14,8 @@ from brownie import (
     project,
 )
 
+from scripts.helpers.fees import CostReport
+
 oz = project.load("./lib/openzeppelin-contracts")
 UpgradeableBeacon = oz.UpgradeableBeacon
 ProxyAdmin = oz.ProxyAdmin
@@ -89,9 +91,7 @@ def main():
     r.enablePaymentToken(eth)
     r.setFeeCollector(feeCollector)
 
-    totalGasUsed = 0
-    for tx in history:
-        totalGasUsed += tx.gas_used
+    costs = CostReport.fromHistory(history)
 
     click.echo(
         f"""
@@ -111,6 +111,7 @@ def main():
               Rentable: {r.address}
          RentableLogic: {rLogic.address}
             ProxyAdmin: {proxyAdmin.address}
-              TotalGas: {totalGasUsed}
+              TotalGas: {costs.gasUsed}
+             Total Fee: {costs.cost/1e18} ETH
     """
     )
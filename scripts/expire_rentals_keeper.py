@@ -0,0 +1,32 @@
+import json
+
+from brownie import accounts, Rentable
+
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+from scripts.helpers.keeper import ExpiryKeeper
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    gasBudget=8000000,
+    pollInterval=12,
+    checkpointPath="checkpoints/expire-rentals.jsonl",
+):
+    deployment = json.load(open(deploymentPath))
+    dev = accounts.load("rentable-deployer")
+
+    indexer = RentableIndexer(dbPath, deployment.values(), fromBlock=mainnetStartBlock)
+    keeper = ExpiryKeeper(
+        indexer,
+        Rentable.at(deployment["Rentable"]),
+        dev,
+        gasBudget=int(gasBudget),
+        checkpointPath=checkpointPath,
+    )
+
+    try:
+        keeper.run(pollInterval=int(pollInterval))
+    except KeyboardInterrupt:
+        keeper.stop()
+        keeper.report()
@@ -0,0 +1,43 @@
+import json
+
+import click
+
+from scripts.helpers.analytics import (
+    byCollection,
+    byPaymentToken,
+    byRentee,
+    byRenter,
+    loadRentals,
+    rollup,
+)
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+
+
+def report(rentals, freq):
+    for title, table in (
+        ("Totals", rollup(rentals)),
+        ("By collection", byCollection(rentals)),
+        (f"By payment token ({freq})", byPaymentToken(rentals, freq)),
+        ("By renter", byRenter(rentals)),
+        ("By rentee", byRentee(rentals)),
+    ):
+        click.echo(f"\n-------- {title} --------")
+        click.echo(table.to_string(index=False))
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    freq="D",
+    csvPath=None,
+):
+    deployment = json.load(open(deploymentPath))
+
+    indexer = RentableIndexer(dbPath, deployment.values(), fromBlock=mainnetStartBlock)
+    indexer.sync()
+    rentals = loadRentals(indexer)
+    report(rentals, freq)
+
+    if csvPath is not None:
+        rentals.to_csv(csvPath, index=False)
+        click.echo(f"\n{len(rentals)} rentals written to {csvPath}")
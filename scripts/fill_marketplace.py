@@ -1,11 +1,23 @@
-import eth_abi
-import random
+import os
+import time
+
+import click
 
 from brownie import (
     accounts,
     TestNFT,
 )
 
+from scripts.helpers.listing_plan import (
+    encodePayloads,
+    generatePlan,
+    iterBatches,
+    iterListings,
+    loadPlan,
+    savePlan,
+)
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
 
 def chunks(lst, n):
     """Yield successive n-sized chunks from lst."""
@@ -13,73 +25,90 @@ def chunks(lst, n):
         yield lst[i : i + n]
 
 
-def listOnMarket(
-    user,
-    token,
-    rentable,
-    tokenId,
-    maxTimeDuration,
-    pricePerSecond,
-    paymentTokenId,
-    paymentTokenAddress,
-    privateRenter,
+def listOnMarket(user, token, rentable, tokenId, rc):
+    """Deposit and list a token, rc is a RentalConditions."""
+    token.safeTransferFrom(user, rentable, tokenId, rc.encode(), {"from": user})
+
+
+def bulkListOnMarket(pipeline, user, token, rentable, listings, gas=None):
+    """Send deposit-and-list transfers through the pipeline.
+
+    listings: iterable of (tokenId, rental conditions encoded data)
+    """
+    safeTransferFrom = token.safeTransferFrom["address,address,uint256,bytes"]
+
+    for tokenId, data in listings:
+        pipeline.send(
+            f"{token.address}:{tokenId}",
+            token.address,
+            safeTransferFrom.encode_input(user, rentable, tokenId, data),
+            gas=gas,
+        )
+
+        if pipeline.sent and pipeline.sent % 100 == 0:
+            click.echo(
+                f"sent {pipeline.sent} confirmed {pipeline.confirmed} "
+                f"({pipeline.rate():.2f} listings/s)"
+            )
+
+
+def bulkDepositAndList(
+    pipeline, user, token, rentable, plan, payloads=None, batchSize=100, gas=None
 ):
-    data = eth_abi.encode_abi(
-        [
-            "uint256",
-            "uint256",
-            "uint256",
-            "uint256",
-            "address",
-            "address",
-        ],
-        (
-            1,
-            maxTimeDuration,
-            pricePerSecond,
-            paymentTokenId,
-            paymentTokenAddress,
-            privateRenter,
-        ),
-    ).hex()
-    token.safeTransferFrom(user, rentable, tokenId, data, {"from": user})
-
-
-def main():
+    """Send depositAndListBatch calls through the pipeline, batchSize tokens each.
+
+    Rentable pulls the tokens itself, so it is approved for all first.
+    """
+    if not token.isApprovedForAll(user, rentable):
+        token.setApprovalForAll(rentable, True, {"from": user})
+
+    for tokenIds, data in iterBatches(token.address, plan, payloads, batchSize):
+        pipeline.send(
+            f"{token.address}:{tokenIds[0]}-{tokenIds[-1]}",
+            str(rentable),
+            data,
+            gas=gas,
+        )
+
+
+def main(batchSize=0):
+    batchSize = int(batchSize)
+
+    startId = 1
+    endId = 51
+
     dev = accounts.load("rentable-deployer")
     testNFT = TestNFT.at("0x8fA4d7B0C204B8f03C9f037E05Cece57decE2214")
     rentable = "0xb8Cd02CbCc05Ac25D77F63FAbB2501Bb71f9e2BB"
 
-    startId = 1
-    endId = 51
+    # listing plan, replayed when already generated
+    planPath = f"plans/fill_marketplace-{testNFT.address}-{startId}-{endId}.npz"
 
-    day = 24 * 60 * 60
-    maxTimeDurationLow = 3 * day
-    maxTimeDurationHigh = 15 * day
-    timeStep = day / 2
+    t = time.time()
+    if os.path.exists(planPath):
+        plan = loadPlan(planPath)
+    else:
+        plan = generatePlan(range(startId, endId), seed=startId)
+        os.makedirs(os.path.dirname(planPath), exist_ok=True)
+        savePlan(planPath, plan)
+    payloads = encodePayloads(plan)
 
-    eth = 1e18
-    minPrice = int(0.1 * eth / day)
-    maxPrice = int(5 * eth / day)
-    priceStep = int(0.2 * eth / day)
+    click.echo(
+        f"Plan {planPath}: {len(payloads)} listings ready in {(time.time() - t)*1000:.1f} ms"
+    )
 
-    for c in range(startId, endId):
-        print(c)
-        maxTimeDuration = random.randrange(
-            maxTimeDurationLow, maxTimeDurationHigh, timeStep
-        )
-        pricePerSecond = random.randrange(minPrice, maxPrice, priceStep)
-        paymentTokenId = 0
-        paymentTokenAddress = "0x0000000000000000000000000000000000000000"
-        privateRenter = "0x0000000000000000000000000000000000000000"
-        listOnMarket(
-            dev,
-            testNFT,
-            rentable,
-            c,
-            maxTimeDuration,
-            pricePerSecond,
-            paymentTokenId,
-            paymentTokenAddress,
-            privateRenter,
-        )
+    checkpoint = Checkpoint(
+        f"checkpoints/fill_marketplace-{testNFT.address}-{rentable}.jsonl"
+    )
+
+    pipeline = TxPipeline(dev, window=64, checkpoint=checkpoint)
+    if batchSize > 0:
+        bulkDepositAndList(pipeline, dev, testNFT, rentable, plan, payloads, batchSize)
+    else:
+        bulkListOnMarket(pipeline, dev, testNFT, rentable, iterListings(plan, payloads))
+    pipeline.join()
+
+    pipeline.report("batches" if batchSize > 0 else "listings")
+
+    for key, txHash in pipeline.failures:
+        click.echo(f"FAILED {key} {txHash}")
@@ -0,0 +1,78 @@
+import click
+
+from brownie import accounts
+
+from scripts.helpers.gas_profile import (
+    GasBenchmark,
+    compare,
+    loadBaseline,
+    plotExpireCurve,
+    saveResults,
+    savings,
+)
+from scripts.helpers.local_stack import isDevelopment
+
+
+def main(
+    baselinePath="benchmarks/gas-baseline.json",
+    threshold=0.02,
+    update="false",
+    plotPath="benchmarks/expireRentals.png",
+):
+    if not isDevelopment():
+        raise SystemExit("gas benchmark runs on the development network")
+    update = str(update).lower() in ("1", "true", "yes")
+
+    benchmark = GasBenchmark(accounts[0], accounts[1], accounts[2])
+    benchmark.run()
+    curve = benchmark.expireCurve()
+    rentCurve = benchmark.rentBatchCurve()
+    depositCurve = benchmark.depositBatchCurve()
+    # last, the enumeration stays enabled
+    enumeration = benchmark.enumerationCost()
+
+    baseline = loadBaseline(baselinePath)
+    regressions = compare(benchmark.results, baseline, float(threshold))
+    benchmark.report(regressions)
+
+    click.echo("  rentBatch vs separate rent calls")
+    for size, separate, batched in rentCurve:
+        click.echo(
+            f"  {size:>4} tokens {separate:>10} {batched:>10}"
+            f" ({1 - batched / separate:.1%} saved)"
+        )
+
+    # saves the transaction and callback overhead of each safeTransferFrom,
+    # the O token mint, conditions storage and events are still per token
+    click.echo(
+        "  gas per token: depositAndListBatch (shared, per token conditions)"
+        " vs safeTransferFrom"
+    )
+    for size, separate, shared, perToken in depositCurve:
+        click.echo(
+            f"  {size:>4} tokens {separate // size:>8} {shared // size:>8}"
+            f" {perToken // size:>8}"
+            f" ({separate / shared:.2f}x, {separate / perToken:.2f}x cheaper)"
+        )
+
+    click.echo("  O/W owner enumeration (opt-in per collection)")
+    for name, disabled, enabled in enumeration:
+        click.echo(f"  {name:<32} {disabled:>9} {enabled:>9} {enabled - disabled:>+8}")
+
+    if baseline:
+        click.echo("  hot paths vs baseline")
+        for name, before, after in savings(benchmark.results, baseline):
+            click.echo(f"  {name:<32} {before:>9} {after:>9} {before - after:>+8}")
+
+    plotExpireCurve(curve, plotPath)
+    click.echo(f"expireRentals plot: {plotPath}")
+
+    if update or not baseline:
+        saveResults(baselinePath, benchmark.results)
+        click.echo(f"Baseline written to {baselinePath}")
+    elif regressions:
+        raise SystemExit(f"{len(regressions)} gas regressions above {threshold}")
+
+    missing = sorted(set(benchmark.results) - set(baseline))
+    if baseline and missing:
+        click.echo(f"Not in baseline: {', '.join(missing)}")
@@ -0,0 +1,151 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+# RentableStorageV1.BASE_FEE
+BASE_FEE = 10000
+
+# blockNumber/logIndex packed in a single sortable key
+LOG_INDEX_BITS = 20
+
+AMOUNTS = ["paymentQty", "feesForFeeCollector", "feesForRentee"]
+
+# low cardinality keys, categories make group-bys several times faster
+CATEGORIES = [
+    "tokenAddress",
+    "rentee",
+    "renter",
+    "paymentTokenAddress",
+    "paymentTokenId",
+]
+
+
+def _events(db, name):
+    rows = db.execute(
+        "SELECT blockNumber, logIndex, args FROM events WHERE event = ? "
+        "ORDER BY blockNumber, logIndex",
+        (name,),
+    ).fetchall()
+    blockNumber = np.array([b for b, _, _ in rows], dtype=np.int64)
+    logIndex = np.array([i for _, i, _ in rows], dtype=np.int64)
+
+    frame = pd.DataFrame([json.loads(args) for _, _, args in rows])
+    frame["blockNumber"] = blockNumber
+    frame["position"] = (blockNumber << LOG_INDEX_BITS) | logIndex
+    return frame
+
+
+def loadRentals(indexer):
+    """One row per Rent event with price, duration and fee split rebuilt.
+
+    pricePerSecond is the one of the last UpdateRentalConditions before the
+    rent for the same token, the fee the one of the last FeeChanged (0
+    before any). Amounts are float64 in payment token units, exact to
+    about 15 significant digits, which is what rollups need.
+    """
+    db = indexer.db
+    rents = _events(db, "Rent")
+    if rents.empty:
+        return pd.DataFrame(
+            columns=[
+                "timestamp",
+                "tokenAddress",
+                "tokenId",
+                "rentee",
+                "renter",
+                "paymentTokenAddress",
+                "paymentTokenId",
+                "duration",
+                "pricePerSecond",
+                "fee",
+            ]
+            + AMOUNTS
+        )
+
+    rents = rents.rename(columns={"from": "rentee", "to": "renter"})
+    rents["tokenId"] = rents["tokenId"].astype(str)
+
+    conditions = _events(db, "UpdateRentalConditions")[
+        ["position", "tokenAddress", "tokenId", "pricePerSecond"]
+    ]
+    conditions["tokenId"] = conditions["tokenId"].astype(str)
+    rentals = pd.merge_asof(
+        rents.sort_values("position"),
+        conditions.sort_values("position"),
+        on="position",
+        by=["tokenAddress", "tokenId"],
+        allow_exact_matches=False,
+    )
+
+    fees = _events(db, "FeeChanged")
+    if fees.empty:
+        rentals["fee"] = 0
+    else:
+        rentals = pd.merge_asof(
+            rentals,
+            fees[["position", "newFee"]].sort_values("position"),
+            on="position",
+            allow_exact_matches=False,
+        ).rename(columns={"newFee": "fee"})
+        rentals["fee"] = rentals["fee"].fillna(0)
+    rentals["fee"] = rentals["fee"].astype(np.int64)
+
+    # block timestamps come from the store, only new blocks hit the node
+    timestamps = indexer.timestamps(rentals["blockNumber"].unique().tolist())
+    rentals["timestamp"] = rentals["blockNumber"].map(timestamps).astype(np.int64)
+
+    # eta = block.timestamp + duration
+    expiresAt = rentals["expiresAt"].astype(np.float64)
+    rentals["duration"] = (expiresAt - rentals["timestamp"]).astype(np.int64)
+
+    pricePerSecond = rentals["pricePerSecond"].astype(np.float64)
+    rentals["pricePerSecond"] = pricePerSecond
+    rentals["paymentQty"] = pricePerSecond * rentals["duration"]
+    rentals["feesForFeeCollector"] = np.floor(
+        rentals["paymentQty"] * rentals["fee"] / BASE_FEE
+    )
+    rentals["feesForRentee"] = rentals["paymentQty"] - rentals["feesForFeeCollector"]
+    rentals["time"] = pd.to_datetime(rentals["timestamp"], unit="s", utc=True)
+
+    rentals["paymentTokenId"] = rentals["paymentTokenId"].astype(str)
+    for column in CATEGORIES:
+        rentals[column] = rentals[column].astype("category")
+
+    return rentals
+
+
+def rollup(rentals, by=(), freq=None):
+    """Sum amounts and count rentals by columns and optional time bucket.
+
+    freq is a pandas offset alias, e.g. "D", "W" or "M".
+    """
+    keys = list(by)
+    if freq is not None:
+        keys.append(pd.Grouper(key="time", freq=freq))
+
+    if not keys:
+        totals = rentals[AMOUNTS + ["duration"]].sum().to_frame().T
+        totals.insert(0, "rentals", len(rentals))
+        return totals
+
+    grouped = rentals.groupby(keys, observed=True)
+    result = grouped[AMOUNTS + ["duration"]].sum()
+    result.insert(0, "rentals", grouped.size())
+    return result[result["rentals"] > 0].reset_index()
+
+
+def byCollection(rentals, freq=None):
+    return rollup(rentals, ["tokenAddress", "paymentTokenAddress"], freq)
+
+
+def byRenter(rentals, freq=None):
+    return rollup(rentals, ["renter", "paymentTokenAddress"], freq)
+
+
+def byRentee(rentals, freq=None):
+    return rollup(rentals, ["rentee", "paymentTokenAddress"], freq)
+
+
+def byPaymentToken(rentals, freq="D"):
+    return rollup(rentals, ["paymentTokenAddress", "paymentTokenId"], freq)
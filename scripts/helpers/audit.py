@@ -0,0 +1,281 @@
+import json
+import time
+from typing import NamedTuple
+
+import click
+from eth_utils import to_checksum_address
+
+from brownie import web3
+
+from scripts.helpers.local_stack import eth
+from scripts.helpers.multicall import Call, Multicall
+from scripts.helpers.pipeline import TxPipeline
+
+# EIP-1967 slots, bytes32(uint256(keccak256("eip1967.proxy.<name>")) - 1)
+SLOTS = {
+    "implementationSlot": "0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc",
+    "beacon": "0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50",
+}
+
+# field => (signature, output type), unsupported ones come back as None
+PROBES = {
+    "owner": ("owner()", "address"),
+    "governance": ("getGovernance()", "address"),
+    "pendingGovernance": ("getPendingGovernance()", "address"),
+    "operator": ("getOperator()", "address"),
+    "paused": ("paused()", "bool"),
+    "minter": ("getMinter()", "address"),
+    "rentable": ("getRentable()", "address"),
+    "implementation": ("implementation()", "address"),
+}
+
+
+class Fix(NamedTuple):
+    sender: str
+    to: str
+    signature: str
+    args: tuple
+
+    def data(self):
+        return "0x" + Call(self.to, self.signature, self.args, ()).encode().hex()
+
+
+class Drift(NamedTuple):
+    name: str
+    address: str
+    field: str
+    actual: object
+    expected: object
+    fix: Fix = None
+
+
+def _address(value):
+    return to_checksum_address(value) if isinstance(value, str) else value
+
+
+class GovernanceAudit:
+    """Read every role of every deployed contract in batched calls.
+
+    Owners, governance, operators, minters, paused flags, beacon and
+    proxy admin/implementation are read with one Multicall pass (plus
+    storage reads for beacons), then checked against the expected
+    governance. Each drift carries the transaction that fixes it, if any.
+    """
+
+    def __init__(
+        self,
+        deployment,
+        governance,
+        operator=None,
+        multicall=None,
+        pausedLogic=("RentableLogic",),
+        allowedOwners=("Rentable",),
+        rpc=None,
+    ):
+        self.deployment = {k: _address(v) for k, v in deployment.items()}
+        self.governance = _address(governance)
+        self.operator = _address(operator) if operator else None
+        self.multicall = multicall or Multicall(rpc=rpc)
+        self.rpc = rpc or self.multicall.rpc
+        self.pausedLogic = set(pausedLogic)
+        self.proxyAdmin = self.deployment.get("ProxyAdmin")
+        self.rentable = self.deployment.get("Rentable")
+        # e.g. SimpleWalletLogic is owned by Rentable
+        self.allowedOwners = {
+            self.deployment[n] for n in allowedOwners if n in self.deployment
+        }
+        self.state = {}
+        self.elapsed = 0
+
+    def read(self):
+        startedAt = time.time()
+        names = list(self.deployment)
+
+        calls = []
+        for name in names:
+            address = self.deployment[name]
+            for signature, output in PROBES.values():
+                calls.append(Call(address, signature, (), (output,)))
+            if self.proxyAdmin is not None:
+                for signature in (
+                    "getProxyAdmin(address)",
+                    "getProxyImplementation(address)",
+                ):
+                    calls.append(
+                        Call(self.proxyAdmin, signature, (address,), ("address",))
+                    )
+
+        # storage reads do not go through Multicall, run them alongside
+        reads = [(self.deployment[n], slot) for n in names for slot in SLOTS.values()]
+        if self.rpc is not None:
+            slots = [
+                bytes.fromhex(v[2:])
+                for v in self.rpc.map(
+                    "eth_getStorageAt", [(a, s, "latest") for a, s in reads]
+                )
+            ]
+        else:
+            slots = list(
+                self.multicall.pool.map(
+                    lambda args: web3.eth.get_storage_at(*args), reads
+                )
+            )
+        values = self.multicall.call(calls)
+
+        width = len(PROBES) + (2 if self.proxyAdmin is not None else 0)
+        for i, name in enumerate(names):
+            row = values[i * width : (i + 1) * width]
+            state = {field: _address(v) for field, v in zip(PROBES, row[: len(PROBES)])}
+            if self.proxyAdmin is not None:
+                state["proxyAdmin"], state["proxyImplementation"] = map(
+                    _address, row[len(PROBES) :]
+                )
+            for j, field in enumerate(SLOTS):
+                value = to_checksum_address(bytes(slots[i * len(SLOTS) + j])[-20:])
+                state[field] = value if int(value, 16) else None
+            self.state[name] = state
+
+        self.elapsed = time.time() - startedAt
+        return self.state
+
+    def drifts(self):
+        drifts = []
+        g = self.governance
+        for name, s in self.state.items():
+            address = self.deployment[name]
+
+            def drift(field, expected, fix=None):
+                drifts.append(Drift(name, address, field, s[field], expected, fix))
+
+            if (
+                s["owner"] not in (None, eth, g)
+                and s["owner"] not in self.allowedOwners
+            ):
+                drift(
+                    "owner",
+                    g,
+                    Fix(s["owner"], address, "transferOwnership(address)", (g,)),
+                )
+
+            if s["governance"] is not None and s["governance"] != g:
+                if s["pendingGovernance"] == g:
+                    fix = Fix(g, address, "acceptGovernance()", ())
+                else:
+                    fix = Fix(s["governance"], address, "setGovernance(address)", (g,))
+                drift("governance", g, fix)
+
+            if (
+                self.operator is not None
+                and s["operator"] is not None
+                and s["operator"] != self.operator
+            ):
+                drift(
+                    "operator",
+                    self.operator,
+                    Fix(
+                        s["governance"],
+                        address,
+                        "setOperator(address)",
+                        (self.operator,),
+                    ),
+                )
+
+            if s["paused"] is not None:
+                expectPaused = name in self.pausedLogic
+                if s["paused"] != expectPaused:
+                    fix = (
+                        Fix(s["governance"], address, "SCRAM()", ())
+                        if expectPaused
+                        else Fix(s["governance"], address, "unpause()", ())
+                    )
+                    drift("paused", expectPaused, fix)
+
+            # O/W proxies: the rentable reference and the minter role
+            if s["rentable"] not in (None, eth) and self.rentable is not None:
+                if s["rentable"] != self.rentable:
+                    drift(
+                        "rentable",
+                        self.rentable,
+                        Fix(
+                            s["owner"],
+                            address,
+                            "setRentable(address)",
+                            (self.rentable,),
+                        ),
+                    )
+                if s["minter"] != self.rentable:
+                    drift(
+                        "minter",
+                        self.rentable,
+                        Fix(
+                            s["owner"],
+                            address,
+                            "setMinter(address)",
+                            (self.rentable,),
+                        ),
+                    )
+
+            # proxies: the admin is immutable, a wrong one needs a redeploy
+            isProxy = s["implementationSlot"] or s["beacon"]
+            if isProxy and s.get("proxyAdmin") != self.proxyAdmin:
+                drift("proxyAdmin", self.proxyAdmin)
+
+        return drifts
+
+    def apply(self, drifts, accounts, window=16):
+        """Send the fixes whose sender is in accounts ({address: account})."""
+        sent, pending = [], []
+        pipelines = {}
+        for d in drifts:
+            if d.fix is None:
+                continue
+            account = accounts.get(d.fix.sender)
+            if account is None:
+                pending.append(d)
+                continue
+            if account.address not in pipelines:
+                pipelines[account.address] = TxPipeline(account, window=window)
+            pipelines[account.address].send(
+                f"{d.name}.{d.field}", d.fix.to, d.fix.data()
+            )
+            sent.append(d)
+
+        for pipeline in pipelines.values():
+            pipeline.join()
+        return sent, pending
+
+    def report(self, drifts):
+        for d in drifts:
+            fix = "no automatic fix"
+            if d.fix is not None:
+                fix = f"{d.fix.signature} from {d.fix.sender}"
+            click.echo(
+                f"  {d.name}.{d.field}: {d.actual} (expected {d.expected}) -> {fix}"
+            )
+        click.echo(
+            f"""
+            -------- Audit --------
+             Contracts: {len(self.state)}
+                Drifts: {len(drifts)}
+                 Fixes: {sum(1 for d in drifts if d.fix is not None)}
+           Round trips: {self.multicall.roundTrips}
+               Elapsed: {self.elapsed:.2f} s
+            -----------------------
+         """
+        )
+
+    def toJson(self, drifts):
+        return json.dumps(
+            {
+                "governance": self.governance,
+                "state": self.state,
+                "drifts": [
+                    dict(
+                        d._asdict(),
+                        fix=dict(d.fix._asdict(), data=d.fix.data()) if d.fix else None,
+                    )
+                    for d in drifts
+                ],
+            },
+            indent=2,
+        )
@@ -0,0 +1,312 @@
+import json
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from eth_utils import to_checksum_address
+
+eth = "0x0000000000000000000000000000000000000000"
+
+INF = float("inf")
+
+ROW_COLUMNS = (
+    "tokenAddress",
+    "tokenId",
+    "deposited",
+    "listed",
+    "paymentTokenAddress",
+    "paymentTokenId",
+    "minTimeDuration",
+    "maxTimeDuration",
+    "pricePerSecond",
+    "privateRenter",
+    "expiresAt",
+)
+
+
+class Listing(NamedTuple):
+    tokenId: int
+    pricePerSecond: int
+    minTimeDuration: int
+    maxTimeDuration: int
+    expiresAt: int
+    privateRenter: str
+
+
+class Book:
+    """Listings of one collection for one payment token.
+
+    byPrice and byExpiry are sorted lists of (value, tokenId), lookups are
+    bisects. Durations, expirations and visibility are also kept as numpy
+    columns aligned with byPrice, rebuilt lazily after changes, so a
+    price range is filtered in one vectorized pass.
+    """
+
+    def __init__(self):
+        self.listings = {}
+        self.byPrice = []
+        self.byExpiry = []
+        self._columns = None
+
+    def add(self, listing):
+        self.listings[listing.tokenId] = listing
+        insort(self.byPrice, (listing.pricePerSecond, listing.tokenId))
+        insort(self.byExpiry, (listing.expiresAt, listing.tokenId))
+        self._columns = None
+
+    def remove(self, tokenId):
+        listing = self.listings.pop(tokenId)
+        for entries, value in (
+            (self.byPrice, listing.pricePerSecond),
+            (self.byExpiry, listing.expiresAt),
+        ):
+            del entries[bisect_left(entries, (value, tokenId))]
+        self._columns = None
+
+    def columns(self):
+        """(maxTimeDuration, expiresAt, privateRenter) in price order."""
+        if self._columns is None:
+            listings = [self.listings[tokenId] for _, tokenId in self.byPrice]
+            self._columns = (
+                np.array([x.maxTimeDuration for x in listings], dtype=np.int64),
+                np.array([x.expiresAt for x in listings], dtype=np.int64),
+                np.array([x.privateRenter or eth for x in listings], dtype=object),
+            )
+        return self._columns
+
+    def __len__(self):
+        return len(self.listings)
+
+
+class AvailabilityIndex:
+    """In-memory index of rentable tokens, fed from the RentableIndexer store.
+
+    Answers "available tokens of a collection under a price with a
+    minimum max duration" with a bisect on the price-sorted book and a
+    vectorized filter of that range. refresh() only reads
+    tokens updated since the last call and reloads after a reorg.
+    """
+
+    def __init__(self):
+        self.books = {}
+        self.tokens = {}
+        self.lastBlock = -1
+        self.rollbacks = 0
+        self.lock = threading.RLock()
+
+    def _bookKey(self, row):
+        return (
+            row["tokenAddress"],
+            row["paymentTokenAddress"],
+            int(row["paymentTokenId"]),
+        )
+
+    def _upsert(self, row):
+        key = (row["tokenAddress"], int(row["tokenId"]))
+        previous = self.tokens.pop(key, None)
+        if previous is not None:
+            self.books[previous].remove(key[1])
+
+        if not (row["deposited"] and row["listed"]):
+            return
+
+        bookKey = self._bookKey(row)
+        self.books.setdefault(bookKey, Book()).add(
+            Listing(
+                key[1],
+                int(row["pricePerSecond"]),
+                row["minTimeDuration"],
+                row["maxTimeDuration"],
+                row["expiresAt"],
+                row["privateRenter"],
+            )
+        )
+        self.tokens[key] = bookKey
+
+    def refresh(self, indexer):
+        """Apply the tokens updated since the last refresh, returns how many."""
+        lastBlock = indexer.lastBlock()
+        rollbacks = indexer.rollbacks()
+
+        with self.lock:
+            if rollbacks != self.rollbacks:
+                self.books, self.tokens = {}, {}
+                self.lastBlock = -1
+                self.rollbacks = rollbacks
+
+            rows = indexer.db.execute(
+                f"SELECT {', '.join(ROW_COLUMNS)} FROM tokens WHERE updatedBlock > ?",
+                (self.lastBlock,),
+            ).fetchall()
+            for row in rows:
+                self._upsert(dict(zip(ROW_COLUMNS, row)))
+            self.lastBlock = lastBlock
+        return len(rows)
+
+    def available(
+        self,
+        tokenAddress,
+        maxPrice=None,
+        minDuration=0,
+        paymentToken=eth,
+        paymentTokenId=0,
+        renter=None,
+        at=None,
+        limit=50,
+        cursor=None,
+    ):
+        """(listings, next cursor) available at `at`, cheapest first.
+
+        cursor is the (pricePerSecond, tokenId) of the last listing of the
+        previous page.
+        """
+        at = int(time.time()) if at is None else at
+        maxPrice = INF if maxPrice is None else maxPrice
+        after = cursor or (-1, -1)
+
+        with self.lock:
+            book = self.books.get((tokenAddress, paymentToken, paymentTokenId))
+            if book is None:
+                return [], None
+
+            start = bisect_right(book.byPrice, after)
+            end = bisect_right(book.byPrice, (maxPrice, INF))
+            durations, expirations, privateRenters = book.columns()
+
+            mask = (durations[start:end] >= minDuration) & (
+                expirations[start:end] <= at
+            )
+            visible = privateRenters[start:end] == eth
+            if renter is not None:
+                visible |= privateRenters[start:end] == renter
+            matches = np.flatnonzero(mask & visible)[: limit + 1]
+            page = [book.listings[book.byPrice[start + i][1]] for i in matches]
+
+        if len(page) > limit:
+            last = page[limit - 1]
+            return page[:limit], (last.pricePerSecond, last.tokenId)
+        return page, None
+
+    def availableSoon(
+        self, tokenAddress, paymentToken=eth, paymentTokenId=0, at=None, limit=50
+    ):
+        """Rented listings by expiration, the first to become available first."""
+        at = int(time.time()) if at is None else at
+        with self.lock:
+            book = self.books.get((tokenAddress, paymentToken, paymentTokenId))
+            if book is None:
+                return []
+            start = bisect_right(book.byExpiry, (at, INF))
+            return [
+                book.listings[tokenId]
+                for _, tokenId in book.byExpiry[start : start + limit]
+            ]
+
+    def counts(self):
+        with self.lock:
+            return len(self.books), len(self.tokens)
+
+
+def _listingJson(listing):
+    # token ids and prices do not fit JSON numbers on the client side
+    return {
+        "tokenId": str(listing.tokenId),
+        "pricePerSecond": str(listing.pricePerSecond),
+        "minTimeDuration": listing.minTimeDuration,
+        "maxTimeDuration": listing.maxTimeDuration,
+        "expiresAt": listing.expiresAt,
+        "privateRenter": listing.privateRenter,
+    }
+
+
+def _cursor(value):
+    if not value:
+        return None
+    price, tokenId = value.split(":")
+    return int(price), int(tokenId)
+
+
+class AvailabilityHandler(BaseHTTPRequestHandler):
+    """GET /available, /soon and /health, JSON responses."""
+
+    index = None
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == "/health":
+                books, tokens = self.index.counts()
+                return self._reply(
+                    200,
+                    {
+                        "lastBlock": self.index.lastBlock,
+                        "books": books,
+                        "listings": tokens,
+                    },
+                )
+
+            tokenAddress = to_checksum_address(params["collection"])
+            paymentToken = to_checksum_address(params.get("paymentToken", eth))
+            paymentTokenId = int(params.get("paymentTokenId", 0))
+            at = int(params["at"]) if "at" in params else None
+            limit = min(int(params.get("limit", 50)), 1000)
+
+            if url.path == "/available":
+                listings, nextCursor = self.index.available(
+                    tokenAddress,
+                    maxPrice=int(params["maxPrice"]) if "maxPrice" in params else None,
+                    minDuration=int(params.get("minDuration", 0)),
+                    paymentToken=paymentToken,
+                    paymentTokenId=paymentTokenId,
+                    renter=to_checksum_address(params["renter"])
+                    if "renter" in params
+                    else None,
+                    at=at,
+                    limit=limit,
+                    cursor=_cursor(params.get("cursor")),
+                )
+                return self._reply(
+                    200,
+                    {
+                        "items": [_listingJson(listing) for listing in listings],
+                        "cursor": "%d:%d" % nextCursor if nextCursor else None,
+                    },
+                )
+
+            if url.path == "/soon":
+                listings = self.index.availableSoon(
+                    tokenAddress, paymentToken, paymentTokenId, at, limit
+                )
+                return self._reply(
+                    200, {"items": [_listingJson(listing) for listing in listings]}
+                )
+
+            return self._reply(404, {"error": "not found"})
+        except (KeyError, ValueError) as e:
+            return self._reply(400, {"error": f"bad request: {e}"})
+
+    def log_message(self, format, *args):
+        # one line per request is too much under load
+        pass
+
+
+def serve(index, host="127.0.0.1", port=8088):
+    """Start the HTTP endpoint in a background thread, returns the server."""
+    handler = type("Handler", (AvailabilityHandler,), {"index": index})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,311 @@
+import json
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+import eth_abi
+import numpy as np
+from eth_utils import keccak
+
+from scripts.sdk.structs import RentalConditions
+from scripts.sdk.words import ADDRESSES
+
+# brownie and forge artifact folders, in lookup order
+ARTIFACT_PATHS = ("build/contracts", "build/interfaces", "out")
+
+# RentableTypes.RentalConditions
+RENTAL_CONDITIONS = list(RentalConditions.TYPES)
+RENTAL_CONDITIONS_TUPLE = f"({','.join(RENTAL_CONDITIONS)})"
+
+
+@lru_cache(maxsize=None)
+def selector(signature):
+    return keccak(text=signature)[:4]
+
+
+@lru_cache(maxsize=None)
+def topic(signature):
+    return keccak(text=signature)
+
+
+@lru_cache(maxsize=None)
+def signatureTypes(signature):
+    """Top level argument types of "name(types)", tuples kept whole."""
+    args = signature[signature.index("(") + 1 : -1]
+    types, depth, start = [], 0, 0
+    for i, c in enumerate(args):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            types.append(args[start:i])
+            start = i + 1
+    if args:
+        types.append(args[start:])
+    return tuple(types)
+
+
+def abiType(param):
+    """Canonical type string of an ABI param, structs as tuples."""
+    if not param["type"].startswith("tuple"):
+        return param["type"]
+    inner = ",".join(abiType(c) for c in param["components"])
+    return f"({inner}){param['type'][len('tuple'):]}"
+
+
+def abiSignature(entry):
+    return f"{entry['name']}({','.join(abiType(p) for p in entry['inputs'])})"
+
+
+def loadAbi(name, paths=ARTIFACT_PATHS):
+    """ABI of a compiled contract from the brownie or forge build folders."""
+    for path in paths:
+        for candidate in (
+            os.path.join(path, f"{name}.json"),
+            os.path.join(path, f"{name}.sol", f"{name}.json"),
+        ):
+            if os.path.exists(candidate):
+                with open(candidate) as f:
+                    return json.load(f)["abi"]
+    raise FileNotFoundError(f"no build artifact for {name} in {', '.join(paths)}")
+
+
+def eventAbi(name, fields):
+    """ABI entry from (type, name, indexed) fields, as in indexer.EVENTS."""
+    return {
+        "type": "event",
+        "name": name,
+        "inputs": [
+            {"type": t, "name": field, "indexed": indexed}
+            for t, field, indexed in fields
+        ],
+    }
+
+
+def _bytes(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+
+def _wordDecoder(abiType):
+    """Decoder of one 32 bytes word for static types, None otherwise."""
+    if abiType.endswith("]"):
+        return None
+    if abiType.startswith("uint"):
+        return lambda word: int.from_bytes(word, "big")
+    if abiType.startswith("int"):
+        return lambda word: int.from_bytes(word, "big", signed=True)
+    if abiType == "address":
+        return lambda word: ADDRESSES[word[12:]]
+    if abiType == "bool":
+        return lambda word: word[31] != 0
+    if abiType.startswith("bytes") and abiType != "bytes":
+        size = int(abiType[len("bytes") :])
+        return lambda word: word[:size]
+    return None
+
+
+class FunctionCodec:
+    def __init__(self, entry):
+        self.name = entry["name"]
+        self.signature = abiSignature(entry)
+        self.selector = selector(self.signature)
+        self.inputTypes = [abiType(p) for p in entry["inputs"]]
+        self.outputTypes = [abiType(p) for p in entry.get("outputs", [])]
+
+    def encode(self, *args):
+        return self.selector + eth_abi.encode_abi(self.inputTypes, args)
+
+    def decodeInput(self, data):
+        data = _bytes(data)
+        if data[:4] != self.selector:
+            raise ValueError(f"not a {self.signature} call")
+        return eth_abi.decode_abi(self.inputTypes, data[4:])
+
+    def decodeOutput(self, data):
+        values = eth_abi.decode_abi(self.outputTypes, _bytes(data))
+        return values[0] if len(values) == 1 else values
+
+
+class EventCodec:
+    """Decoder of one event, static fields are sliced out word by word."""
+
+    def __init__(self, entry):
+        self.name = entry["name"]
+        self.signature = abiSignature(entry)
+        self.topic = topic(self.signature)
+
+        inputs = entry["inputs"]
+        self.indexed = [(abiType(p), p["name"]) for p in inputs if p["indexed"]]
+        self.data = [(abiType(p), p["name"]) for p in inputs if not p["indexed"]]
+        self.dataTypes = [t for t, _ in self.data]
+
+        # dynamic indexed values are topics of their hash, keep them raw
+        self._topicDecoders = [
+            (field, _wordDecoder(t) or bytes) for t, field in self.indexed
+        ]
+        decoders = [(field, _wordDecoder(t)) for t, field in self.data]
+        self._dataDecoders = (
+            decoders if all(d is not None for _, d in decoders) else None
+        )
+
+    def decode(self, topics, data):
+        args = {
+            field: decode(_bytes(value))
+            for (field, decode), value in zip(self._topicDecoders, topics[1:])
+        }
+        data = _bytes(data)
+        if self._dataDecoders is None:
+            values = eth_abi.decode_abi(self.dataTypes, data)
+            for (abiType, field), value in zip(self.data, values):
+                args[field] = ADDRESSES[value] if abiType == "address" else value
+        else:
+            for i, (field, decode) in enumerate(self._dataDecoders):
+                args[field] = decode(data[32 * i : 32 * i + 32])
+        return args
+
+    def columns(self, logs):
+        """Decode logs of this event into {field: array}, one pass per field.
+
+        Integers fitting 64 bits come back as uint64/int64 arrays, larger
+        ones as object arrays of Python ints, addresses as object arrays of
+        checksummed strings.
+        """
+        if self._dataDecoders is None:
+            raise ValueError(f"{self.name} has dynamic fields, decode its logs instead")
+        n = len(logs)
+        columns = {}
+        for k, (abiType, field) in enumerate(self.indexed, start=1):
+            raw = b"".join(_bytes(log["topics"][k]) for log in logs)
+            matrix = np.frombuffer(raw, dtype=np.uint8).reshape(n, 32)
+            columns[field] = _column(abiType, matrix)
+
+        raw = b"".join(_bytes(log["data"]) for log in logs)
+        data = np.frombuffer(raw, dtype=np.uint8).reshape(n, 32 * len(self.data))
+        for i, (abiType, field) in enumerate(self.data):
+            columns[field] = _column(abiType, data[:, 32 * i : 32 * i + 32])
+        return columns
+
+
+def _column(abiType, matrix):
+    if abiType == "address":
+        raw = np.ascontiguousarray(matrix[:, 12:]).tobytes()
+        return np.array(
+            [ADDRESSES[raw[j : j + 20]] for j in range(0, len(raw), 20)],
+            dtype=object,
+        )
+    if abiType == "bool":
+        return matrix[:, 31] != 0
+    if abiType.startswith("uint") or abiType.startswith("int"):
+        signed = abiType.startswith("int")
+        high, sign = matrix[:, :24], matrix[:, 24] >> 7
+        if signed:
+            fits = (
+                ((high == 0).all(axis=1) & (sign == 0))
+                | ((high == 0xFF).all(axis=1) & (sign == 1))
+            ).all()
+        else:
+            fits = not high.any()
+        if fits:
+            low = np.ascontiguousarray(matrix[:, 24:])
+            return (
+                low.view(">i8" if signed else ">u8")
+                .ravel()
+                .astype(np.int64 if signed else np.uint64)
+            )
+        raw = np.ascontiguousarray(matrix).tobytes()
+        return np.array(
+            [
+                int.from_bytes(raw[j : j + 32], "big", signed=signed)
+                for j in range(0, len(raw), 32)
+            ],
+            dtype=object,
+        )
+    # bytesN
+    size = int(abiType[len("bytes") :])
+    return np.array([bytes(row[:size]) for row in matrix], dtype=object)
+
+
+class Event(NamedTuple):
+    name: str
+    args: dict
+    log: dict
+
+
+class Codec:
+    """Encoders and decoders of a set of ABIs, keyed by selector and topic.
+
+    Codecs are also looked up by signature, or by bare name when it is not
+    overloaded.
+    """
+
+    def __init__(self, abi):
+        self.events = {}
+        self.functions = {}
+        for entry in abi:
+            if entry["type"] == "event" and not entry.get("anonymous"):
+                codec = EventCodec(entry)
+                self.events[codec.topic] = codec
+            elif entry["type"] == "function":
+                codec = FunctionCodec(entry)
+                self.functions[codec.selector] = codec
+
+        self._byName = {}
+        overloads = {}
+        for codec in [*self.events.values(), *self.functions.values()]:
+            self._byName[codec.signature] = codec
+            overloads.setdefault(codec.name, []).append(codec.signature)
+        for name, signatures in overloads.items():
+            if len(signatures) == 1:
+                self._byName[name] = self._byName[signatures[0]]
+        # bare names of several functions or events, only their signatures work
+        self._overloads = {
+            name: signatures
+            for name, signatures in overloads.items()
+            if len(signatures) > 1
+        }
+
+    @classmethod
+    def fromArtifacts(cls, *names):
+        return cls([entry for name in names for entry in loadAbi(name)])
+
+    def __getitem__(self, name):
+        """Function or event codec by signature, or by name if not overloaded."""
+        if name in self._overloads:
+            raise KeyError(
+                f"{name} is overloaded, use one of {', '.join(self._overloads[name])}"
+            )
+        return self._byName[name]
+
+    def topics(self):
+        return ["0x" + t.hex() for t in self.events]
+
+    def decode(self, logs):
+        """Lazily decode a log stream, logs of unknown events are skipped."""
+        events = self.events
+        for log in logs:
+            topics = log["topics"]
+            if not topics:
+                continue
+            codec = events.get(_bytes(topics[0]))
+            if codec is not None:
+                yield Event(codec.name, codec.decode(topics, log["data"]), log)
+
+    def columns(self, logs, name):
+        """Batch decode the logs of one event into column arrays."""
+        codec = self[name]
+        logs = [
+            log
+            for log in logs
+            if log["topics"] and _bytes(log["topics"][0]) == codec.topic
+        ]
+        return codec.columns(logs)
+
+    def decodeCall(self, data):
+        data = _bytes(data)
+        codec = self.functions[data[:4]]
+        return codec.name, codec.decodeInput(data)
@@ -0,0 +1,560 @@
+import asyncio
+import json
+import os
+import time
+from typing import NamedTuple
+
+import brownie
+import click
+import eth_abi
+import rlp
+import yaml
+from eth_utils import keccak, to_bytes, to_checksum_address
+
+from brownie import web3
+from brownie.convert.normalize import format_input
+from brownie.convert.utils import build_function_selector, get_type_strings
+
+from scripts.helpers.codec import FunctionCodec
+from scripts.helpers.local_stack import eth, loadOz
+from scripts.helpers.pipeline import TxPipeline
+
+
+class Ref(NamedTuple):
+    """Address of a contract in the manifest or in the deployment file."""
+
+    name: str
+
+
+class Encoded(NamedTuple):
+    """Calldata for `contract.method(*args)`, e.g. a proxy initializer."""
+
+    contract: str
+    method: str
+    args: tuple
+
+
+class Step(NamedTuple):
+    """A contract deployment (target is None) or a call on a deployed contract.
+
+    Calls are skipped when `check` = (view, args, expected) already holds.
+    Calls restricted to some roles list them in `signers` as (getter,
+    address) pairs, read on the target once deployed: the deployer only
+    sends them when it holds one of the roles.
+    """
+
+    name: str
+    contract: str
+    args: tuple = ()
+    target: Ref = None
+    method: str = None
+    check: tuple = None
+    signers: tuple = None
+
+
+def container(name):
+    c = getattr(brownie, name, None)
+    return c if c is not None else loadOz()[name]
+
+
+def encodeCall(contract, method, args):
+    abi = next(
+        i
+        for i in container(contract).abi
+        if i["type"] == "function"
+        and i["name"] == method
+        and len(i["inputs"]) == len(args)
+    )
+    data = eth_abi.encode_abi(get_type_strings(abi["inputs"]), format_input(abi, args))
+    return build_function_selector(abi) + data.hex()
+
+
+def _normalize(value):
+    # eth_abi and brownie disagree on address case
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, (tuple, list)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def deployData(contract, *args):
+    """Creation calldata (bytecode + constructor args) for a container."""
+    data = contract.deploy.encode_input(*args)
+    return data if data.startswith("0x") else "0x" + data
+
+
+def createAddress(sender, nonce):
+    return to_checksum_address(
+        keccak(rlp.encode([to_bytes(hexstr=sender), nonce]))[12:]
+    )
+
+
+def loadManifest(path):
+    with open(path) as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return yaml.safe_load(f)
+
+
+def _value(value, roles):
+    # "$Name" is a reference, role names and "eth" are resolved in place
+    if isinstance(value, list):
+        return tuple(_value(v, roles) for v in value)
+    if isinstance(value, str):
+        if value.startswith("$"):
+            return Ref(value[1:])
+        if value in roles:
+            return roles[value]
+        if value == "eth":
+            return eth
+    return value
+
+
+def expandManifest(manifest, deployer):
+    """Turn a manifest into a list of steps named as in deployments/*.json."""
+    roles = {"deployer": deployer}
+    for role, value in manifest.get("roles", {}).items():
+        roles[role] = _value(value, roles)
+
+    governance = roles.setdefault("governance", deployer)
+    operator = roles.setdefault("operator", deployer)
+    feeCollector = roles.setdefault("feeCollector", deployer)
+
+    core = manifest.get("core", {})
+    logicToken = _value(core.get("logicToken", "eth"), roles)
+    R = Ref("Rentable")
+    onlyGovernance = (("getGovernance", governance),)
+
+    steps = [
+        Step("ProxyAdmin", "ProxyAdmin"),
+        Step("RentableLogic", "Rentable", (governance, operator)),
+        Step(
+            "RentableLogic.SCRAM",
+            "Rentable",
+            target=Ref("RentableLogic"),
+            method="SCRAM",
+            check=("paused", (), True),
+            signers=(("getGovernance", governance), ("getOperator", operator)),
+        ),
+        Step(
+            "Rentable",
+            "ImmutableAdminTransparentUpgradeableProxy",
+            (
+                Ref("RentableLogic"),
+                Ref("ProxyAdmin"),
+                Encoded("Rentable", "initialize", (governance, operator)),
+            ),
+        ),
+        Step("OLogic", "ORentable", (logicToken, eth, eth)),
+        Step("OBeacon", "UpgradeableBeacon", (Ref("OLogic"),)),
+        Step("WLogic", "WRentable", (logicToken, eth, eth)),
+        Step("WBeacon", "UpgradeableBeacon", (Ref("WLogic"),)),
+        Step("SimpleWalletLogic", "SimpleWallet", (R, eth)),
+        Step("SimpleWalletBeacon", "UpgradeableBeacon", (Ref("SimpleWalletLogic"),)),
+        Step("WalletFactory", "WalletFactory", (Ref("SimpleWalletBeacon"),)),
+        Step(
+            "Rentable.setWalletFactory",
+            "Rentable",
+            (Ref("WalletFactory"),),
+            R,
+            "setWalletFactory",
+            ("getWalletFactory", (), Ref("WalletFactory")),
+        ),
+        Step(
+            "Rentable.setFeeCollector",
+            "Rentable",
+            (feeCollector,),
+            R,
+            "setFeeCollector",
+            ("getFeeCollector", (), feeCollector),
+        ),
+    ]
+
+    for name, spec in manifest.get("contracts", {}).items():
+        steps.append(Step(name, spec["contract"], _value(spec.get("args", []), roles)))
+
+    for method, status, key in (
+        ("enablePaymentToken", 1, "paymentTokens"),
+        ("enable1155PaymentToken", 2, "paymentTokens1155"),
+    ):
+        for token in manifest.get(key, []):
+            token = _value(token, roles)
+            steps.append(
+                Step(
+                    f"Rentable.{method}({token})",
+                    "Rentable",
+                    (token,),
+                    R,
+                    method,
+                    ("getPaymentTokenAllowlist", (token,), status),
+                )
+            )
+
+    for name, spec in manifest.get("collections", {}).items():
+        token = _value(spec["token"], roles)
+        for kind, contract in (("o", "ORentable"), ("w", "WRentable")):
+            proxyName = spec.get(f"{kind}Rentable", f"{kind.upper()}{name}")
+            beacon = Ref(spec.get(f"{kind}Beacon", f"{kind.upper()}Beacon"))
+            setter = "setORentable" if kind == "o" else "setWRentable"
+            steps.append(
+                Step(
+                    proxyName,
+                    "ImmutableAdminUpgradeableBeaconProxy",
+                    (
+                        beacon,
+                        Ref("ProxyAdmin"),
+                        Encoded(contract, "initialize", (token, governance, R)),
+                    ),
+                )
+            )
+            steps.append(
+                Step(
+                    f"Rentable.{setter}({name})",
+                    "Rentable",
+                    (token, Ref(proxyName)),
+                    R,
+                    setter,
+                    (f"get{contract}", (token,), Ref(proxyName)),
+                )
+            )
+
+        if "library" in spec:
+            library = Ref(spec["library"])
+            steps.append(
+                Step(
+                    f"Rentable.setLibrary({name})",
+                    "Rentable",
+                    (token, library),
+                    R,
+                    "setLibrary",
+                    ("getLibrary", (token,), library),
+                )
+            )
+
+    return [s._replace(signers=onlyGovernance) if s.target == R else s for s in steps]
+
+
+def _refs(value):
+    if isinstance(value, Ref):
+        yield value.name
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            yield from _refs(v)
+
+
+def dependencies(step):
+    return set(_refs((step.args, step.target, step.check)))
+
+
+def levels(steps):
+    """Group steps in DAG levels, each level only depends on previous ones."""
+    byName = {s.name: s for s in steps}
+    depth = {}
+
+    def visit(name, path):
+        if name in depth:
+            return depth[name]
+        if name in path:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        deps = [d for d in dependencies(byName[name]) if d in byName]
+        depth[name] = 1 + max((visit(d, path + [name]) for d in deps), default=-1)
+        return depth[name]
+
+    for s in steps:
+        visit(s.name, [])
+
+    grouped = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for s in steps:
+        grouped[depth[s.name]].append(s)
+    return grouped
+
+
+class DeployEngine:
+    """Apply a manifest, sending only what is missing from the deployment file.
+
+    Contract addresses are known before sending (CREATE address from the
+    pre-assigned nonce), so independent transactions of a DAG level are
+    sent together and the engine only waits once per level. Calls needing
+    a role the deployer doesn't hold (governance, or governance/operator
+    for SCRAM) are returned as calldata instead.
+
+    With an AsyncRpc, the code of every known contract and the checks of
+    every call on them are read in one JSON-RPC batch before planning.
+    """
+
+    def __init__(self, manifest, account, deploymentPath=None, window=64, rpc=None):
+        self.manifest = manifest
+        self.account = account
+        self.deploymentPath = deploymentPath or manifest["deployment"]
+        self.window = window
+        self.rpc = rpc
+        self._codes = {}
+        self._checks = {}
+
+        self.addresses = {}
+        if os.path.exists(self.deploymentPath):
+            with open(self.deploymentPath) as f:
+                self.addresses = json.load(f)
+
+        self.steps = expandManifest(manifest, account.address)
+        self.byName = {s.name: s for s in self.steps}
+        for s in self.steps:
+            for d in dependencies(s):
+                if d not in self.byName and d not in self.addresses:
+                    raise ValueError(f"{s.name}: unknown reference ${d}")
+
+        self.predicted = dict(self.addresses)
+        self.deferred = []
+        self.levels = 0
+        self.sent = 0
+        self.gasUsed = 0
+        self.elapsed = 0
+
+    def resolve(self, value, addresses):
+        if isinstance(value, Ref):
+            return addresses[value.name]
+        if isinstance(value, Encoded):
+            return encodeCall(
+                value.contract, value.method, self.resolve(value.args, addresses)
+            )
+        if isinstance(value, tuple):
+            return tuple(self.resolve(v, addresses) for v in value)
+        return value
+
+    def _deployed(self, name):
+        address = self.addresses.get(name)
+        if address is None:
+            return False
+        if address in self._codes:
+            return self._codes[address]
+        return len(web3.eth.get_code(address)) > 0
+
+    def _checkCodec(self, step):
+        view, args, _ = step.check
+        return FunctionCodec(
+            next(
+                i
+                for i in container(step.contract).abi
+                if i["type"] == "function"
+                and i["name"] == view
+                and len(i["inputs"]) == len(args)
+            )
+        )
+
+    def _prefetch(self):
+        """Read codes, then checks on deployed targets, in two batches."""
+        addresses = sorted(set(self.addresses.values()))
+
+        def deployed(name):
+            return self._codes.get(self.addresses.get(name), False)
+
+        async def run():
+            async with self.rpc as rpc:
+                codes = await rpc.gather(
+                    ("eth_getCode", (a, "latest")) for a in addresses
+                )
+                self._codes = {a: c not in ("0x", "") for a, c in zip(addresses, codes)}
+
+                checks = [
+                    s
+                    for s in self.steps
+                    if s.target is not None
+                    and s.check is not None
+                    and deployed(s.target.name)
+                    and all(deployed(d) for d in _refs(s.check[1]))
+                ]
+                calls = [
+                    rpc.request(
+                        "eth_call",
+                        (
+                            {
+                                "to": self.addresses[s.target.name],
+                                "data": "0x"
+                                + self._checkCodec(s)
+                                .encode(*self.resolve(s.check[1], self.addresses))
+                                .hex(),
+                            },
+                            "latest",
+                        ),
+                    )
+                    for s in checks
+                ]
+                # a reverting view fails its item only, left to the serial path
+                results = await asyncio.gather(*calls, return_exceptions=True)
+                return {
+                    s.name: raw
+                    for s, raw in zip(checks, results)
+                    if not isinstance(raw, Exception)
+                }
+
+        self._codes, self._checks = {}, {}
+        self._checks = asyncio.run(run())
+
+    def _holds(self, step, addresses):
+        view, args, expected = step.check
+        if step.name in self._checks:
+            raw = self._checks[step.name]
+            if raw in ("0x", ""):
+                return False
+            value = self._checkCodec(step).decodeOutput(raw)
+            return _normalize(value) == _normalize(self.resolve(expected, addresses))
+        target = container(step.contract).at(addresses[step.target.name])
+        value = getattr(target, view)(*self.resolve(args, addresses))
+        return value == self.resolve(expected, addresses)
+
+    def _canSend(self, step):
+        """Whether the deployer holds one of the roles the step needs."""
+        if step.signers is None:
+            return True
+        target = step.target.name
+        if self._deployed(target):
+            contract = container(step.contract).at(self.addresses[target])
+            allowed = [getattr(contract, getter)() for getter, _ in step.signers]
+        else:
+            allowed = [address for _, address in step.signers]
+        return self.account.address.lower() in {a.lower() for a in allowed}
+
+    def plan(self):
+        """Pending steps by level, with pre-assigned nonces and addresses."""
+        if self.rpc is not None:
+            self._prefetch()
+        nonce = web3.eth.get_transaction_count(self.account.address, "pending")
+        predicted = dict(self.addresses)
+        pending = []
+        self.deferred = []
+
+        for level in levels(self.steps):
+            todo = []
+            for s in level:
+                if s.target is None:
+                    if self._deployed(s.name):
+                        continue
+                    predicted[s.name] = createAddress(self.account.address, nonce)
+                elif self._deployed(s.target.name) and self._holds(s, predicted):
+                    continue
+                elif not self._canSend(s):
+                    self.deferred.append(s)
+                    continue
+
+                todo.append((s, nonce))
+                nonce += 1
+            if todo:
+                pending.append(todo)
+
+        self.predicted = predicted
+        return pending, predicted
+
+    def _data(self, step, addresses):
+        args = self.resolve(step.args, addresses)
+        if step.target is None:
+            return deployData(container(step.contract), *args)
+        return encodeCall(step.contract, step.method, args)
+
+    def save(self):
+        os.makedirs(
+            os.path.dirname(os.path.abspath(self.deploymentPath)), exist_ok=True
+        )
+        with open(self.deploymentPath, "w") as f:
+            json.dump(self.addresses, f, indent=4)
+
+    def apply(self, gasPrice=None, dryRun=False, maxFeePerGas=None):
+        pending, predicted = self.plan()
+        startedAt = time.time()
+
+        for i, level in enumerate(pending):
+            for s, nonce in level:
+                where = predicted[s.name] if s.target is None else s.target.name
+                click.echo(f"  [{i}] nonce {nonce}: {s.name} -> {where}")
+
+        if dryRun or not pending:
+            return predicted
+
+        # a resynced nonce would deploy away from the predicted addresses
+        pipeline = TxPipeline(
+            self.account,
+            window=self.window,
+            gasPrice=gasPrice,
+            maxFeePerGas=maxFeePerGas,
+            resync=False,
+        )
+        for level in pending:
+            hashes = []
+            for s, nonce in level:
+                if pipeline.nonce != nonce:
+                    raise ValueError(
+                        f"Nonce moved ({pipeline.nonce} != {nonce}), re-run to re-plan"
+                    )
+                to = None
+                if s.target is not None:
+                    to = predicted[s.target.name]
+                hashes.append(pipeline.send(s.name, to, self._data(s, predicted)))
+
+            pipeline.drain()
+            self.levels += 1
+
+            failed = []
+            for (s, _), (status, gasUsed, contractAddress) in zip(
+                level, self._receipts(hashes)
+            ):
+                self.gasUsed += gasUsed
+                if status != 1:
+                    failed.append(s.name)
+                elif s.target is None:
+                    if contractAddress != predicted[s.name]:
+                        pipeline.join()
+                        raise ValueError(
+                            f"{s.name} deployed at {contractAddress}, predicted"
+                            f" {predicted[s.name]}, re-run to re-plan"
+                        )
+                    self.addresses[s.name] = contractAddress
+            self.sent += len(level)
+
+            # what got deployed is kept even when the level failed
+            self.save()
+            if failed:
+                pipeline.join()
+                raise ValueError(f"Failed steps: {', '.join(failed)}")
+
+        pipeline.join()
+        self.elapsed = time.time() - startedAt
+        return self.addresses
+
+    def _receipts(self, hashes):
+        """(status, gasUsed, contractAddress) of sent transactions."""
+        if self.rpc is None:
+            receipts = [web3.eth.get_transaction_receipt(h) for h in hashes]
+            return [(r.status, r.gasUsed, r.contractAddress) for r in receipts]
+
+        receipts = self.rpc.map("eth_getTransactionReceipt", [(h,) for h in hashes])
+        return [
+            (
+                int(r["status"], 16),
+                int(r["gasUsed"], 16),
+                to_checksum_address(r["contractAddress"])
+                if r["contractAddress"]
+                else None,
+            )
+            for r in receipts
+        ]
+
+    def governanceCalls(self):
+        """(to, data) for the role restricted calls the deployer could not send."""
+        return [
+            (self.predicted[s.target.name], self._data(s, self.predicted))
+            for s in self.deferred
+        ]
+
+    def report(self):
+        click.echo(
+            f"""
+            -------- Deploy --------
+                 Steps: {len(self.steps)}
+                  Sent: {self.sent}
+                Levels: {self.levels}
+              Deferred: {len(self.deferred)}
+              TotalGas: {self.gasUsed}
+               Elapsed: {self.elapsed:.2f} s
+            ------------------------
+         """
+        )
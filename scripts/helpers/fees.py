@@ -0,0 +1,199 @@
+import time
+from typing import NamedTuple
+
+import click
+
+from brownie import network, web3
+
+# replacements must raise both fees by at least 10% (geth), 12.5% is safe
+BUMP_NUMERATOR = 9
+BUMP_DENOMINATOR = 8
+
+
+def nextBaseFee(block):
+    """EIP-1559 base fee of the block after `block`."""
+    baseFee = block["baseFeePerGas"]
+    target = block["gasLimit"] // 2
+    used = block["gasUsed"]
+    if used == target:
+        return baseFee
+    if used > target:
+        return baseFee + max(1, baseFee * (used - target) // target // 8)
+    return baseFee - baseFee * (target - used) // target // 8
+
+
+def london():
+    """Whether the connected chain has a base fee (type-2 transactions)."""
+    return web3.eth.get_block("latest").get("baseFeePerGas") is not None
+
+
+class Fees(NamedTuple):
+    baseFee: int  # of the next block
+    maxFeePerGas: int
+    maxPriorityFeePerGas: int
+
+    def expected(self):
+        """Gas price paid if mined in the next block."""
+        return min(self.maxFeePerGas, self.baseFee + self.maxPriorityFeePerGas)
+
+    def params(self):
+        return {
+            "maxFeePerGas": self.maxFeePerGas,
+            "maxPriorityFeePerGas": self.maxPriorityFeePerGas,
+        }
+
+    def bump(self):
+        """Fees of a replacement transaction (same nonce)."""
+        return Fees(
+            self.baseFee,
+            self.maxFeePerGas * BUMP_NUMERATOR // BUMP_DENOMINATOR + 1,
+            self.maxPriorityFeePerGas * BUMP_NUMERATOR // BUMP_DENOMINATOR + 1,
+        )
+
+
+class FeeEstimator:
+    """Estimate type-2 fees from the last `blocks` blocks (eth_feeHistory).
+
+    The priority fee is the median of the `percentile` rewards paid in those
+    blocks, at least `minPriorityFee`. The max fee is `headroom` times the
+    next base fee plus the priority fee: 2x stays above the base fee through
+    6 full blocks in a row. `history` replaces eth_feeHistory, e.g. to
+    simulate base fee changes on a dev chain.
+    """
+
+    def __init__(
+        self,
+        blocks=10,
+        percentile=50,
+        headroom=2,
+        minPriorityFee=10**9,
+        maxAge=2,
+        history=None,
+    ):
+        self.blocks = blocks
+        self.percentile = percentile
+        self.headroom = headroom
+        self.minPriorityFee = minPriorityFee
+        self.maxAge = maxAge
+        self.history = history or self._feeHistory
+
+        self._fees = None
+        self._at = 0
+
+    def _feeHistory(self, blocks, percentiles):
+        try:
+            return web3.eth.fee_history(blocks, "latest", percentiles)
+        except ValueError:
+            # node without eth_feeHistory, base fee of the latest block only
+            block = web3.eth.get_block("latest")
+            return {"baseFeePerGas": [block.baseFeePerGas, nextBaseFee(block)]}
+
+    def estimate(self, fresh=False):
+        if (
+            not fresh
+            and self._fees is not None
+            and time.time() - self._at < self.maxAge
+        ):
+            return self._fees
+
+        history = self.history(self.blocks, [self.percentile])
+        baseFee = history["baseFeePerGas"][-1]
+        rewards = sorted(r[0] for r in history.get("reward") or [] if r and r[0] > 0)
+        priorityFee = max(
+            self.minPriorityFee, rewards[len(rewards) // 2] if rewards else 0
+        )
+
+        self._fees = Fees(baseFee, self.headroom * baseFee + priorityFee, priorityFee)
+        self._at = time.time()
+        return self._fees
+
+    def waitBelow(self, maxFeePerGas, waitBlock, onWait=None):
+        """Fees once the next block is affordable within `maxFeePerGas`.
+
+        `waitBlock` returns once a new block is mined, the max fee is capped
+        to `maxFeePerGas`.
+        """
+        fees = self.estimate()
+        if maxFeePerGas is None:
+            return fees
+
+        while fees.baseFee + fees.maxPriorityFeePerGas > maxFeePerGas:
+            if onWait is not None:
+                onWait(fees)
+            waitBlock()
+            fees = self.estimate(fresh=True)
+
+        return fees._replace(maxFeePerGas=min(fees.maxFeePerGas, maxFeePerGas))
+
+
+def waitNewBlock(pollInterval=1):
+    """waitBlock of a live chain."""
+    current = web3.eth.block_number
+    while web3.eth.block_number == current:
+        time.sleep(pollInterval)
+
+
+def useNetworkFees(maxFeePerGas=None, estimator=None, pollInterval=4):
+    """Estimated type-2 fees as brownie defaults, in place of a fixed gas price.
+
+    Waits while the next base fee and priority fee exceed `maxFeePerGas`.
+    """
+    estimator = estimator or FeeEstimator()
+    fees = estimator.waitBelow(
+        maxFeePerGas,
+        lambda: waitNewBlock(pollInterval),
+        lambda f: click.echo(f"Base fee {f.baseFee / 1e9:.2f} gwei, waiting"),
+    )
+    network.priority_fee(fees.maxPriorityFeePerGas)
+    network.max_fee(fees.maxFeePerGas)
+    return fees
+
+
+class CostReport:
+    """Gas and ETH actually paid, replaces summing gas_used over history."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.replaced = 0
+        self.gasUsed = 0
+        self.cost = 0
+
+    @classmethod
+    def fromHistory(cls, history):
+        report = cls()
+        for tx in history:
+            if tx.gas_used is not None:
+                report.add(tx.gas_used, tx.gas_price)
+        return report
+
+    def add(self, gasUsed, gasPrice):
+        self.transactions += 1
+        self.gasUsed += gasUsed
+        self.cost += gasUsed * gasPrice
+
+    def addReceipt(self, receipt, gasPrice=None):
+        """web3 receipt, `gasPrice` of the sent transaction for legacy nodes."""
+        self.add(receipt.gasUsed, receipt.get("effectiveGasPrice", gasPrice))
+
+    def averageGasPrice(self):
+        return self.cost // self.gasUsed if self.gasUsed else 0
+
+    def echo(self, account=None, initialBalance=None):
+        balance = ""
+        if account is not None:
+            balance = f"""
+Final Balance Deployer: {account.balance()/1e18} ETH"""
+            if initialBalance is not None:
+                balance += f"""
+           Total Spent: {(initialBalance - account.balance())/1e18} ETH"""
+        click.echo(
+            f"""
+            -------- Stats --------
+          Transactions: {self.transactions}
+              Replaced: {self.replaced}
+              TotalGas: {self.gasUsed}
+          Avg GasPrice: {self.averageGasPrice()/1e9:.2f} gwei
+             Total Fee: {self.cost/1e18} ETH{balance}
+            -----------------------
+         """
+        )
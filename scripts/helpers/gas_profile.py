@@ -0,0 +1,334 @@
+import json
+import os
+
+import click
+
+from brownie import (
+    DummyCollectionLibrary,
+    DummyERC1155,
+    WETH,
+    chain,
+)
+
+from scripts.helpers.local_stack import deployLocalStack, eth
+from scripts.sdk import RentalConditions
+
+PAYMENTS = ("eth", "erc20", "erc1155")
+
+
+def opcodeProfile(tx, top=15):
+    """Gas and count per opcode from the debug trace, heaviest first."""
+    profile = {}
+    for step in tx.trace:
+        count, gas = profile.get(step["op"], (0, 0))
+        profile[step["op"]] = (count + 1, gas + step["gasCost"])
+
+    heaviest = sorted(profile.items(), key=lambda kv: -kv[1][1])[:top]
+    return {op: {"count": count, "gas": gas} for op, (count, gas) in heaviest}
+
+
+def compare(results, baseline, threshold=0.02):
+    """(name, baseline gas, gas, delta) for scenarios above threshold."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["gas"], result["gas"]
+        delta = (after - before) / before
+        if delta > threshold:
+            regressions.append((name, before, after, delta))
+    return regressions
+
+
+def savings(
+    results,
+    baseline,
+    operations=("rent/", "expireRental/", "withdraw/", "depositAndList/"),
+):
+    """(name, baseline gas, gas) of the hot path scenarios in both runs."""
+    return [
+        (name, baseline[name]["gas"], results[name]["gas"])
+        for name in sorted(results)
+        if name in baseline and name.startswith(operations)
+    ]
+
+
+def loadBaseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def saveResults(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+class GasBenchmark:
+    """Run Rentable hot paths on a local stack and record gas per scenario.
+
+    Scenario names are `<operation>/<payment>/<lib|nolib>`, expireRentals
+    batches are `expireRentals/<size>`, rentBatch ones `rentBatch/<size>`
+    next to `rentSeparate/<size>` for as many separate rent calls, and
+    depositAndListBatch ones `depositAndListBatch[PerToken]/<size>` next to
+    `depositSeparate/<size>` for as many safeTransferFrom listings. Hot
+    paths with the O/W owner enumeration enabled end in `/enumerable`.
+    """
+
+    def __init__(self, dev, renter, receiver, profile=True):
+        self.dev = dev
+        self.renter = renter
+        self.receiver = receiver
+        self.profile = profile
+        self.results = {}
+        self.nextTokenId = 1
+
+        self.stack = deployLocalStack(dev)
+        self.r = self.stack["Rentable"]
+        self.rb = self.stack["RentableBatch"]
+        self.testNFT = self.stack["TestNFT"]
+        self.library = DummyCollectionLibrary.deploy(False, {"from": dev})
+        self.r.setFee(500, {"from": dev})
+
+        # wallet creation would otherwise land in the first measured rent
+        self.r.createWalletForUser(renter, {"from": dev})
+        self.r.createWalletForUser(receiver, {"from": dev})
+
+        self.weth = WETH.deploy({"from": dev})
+        self.r.enablePaymentToken(self.weth, {"from": dev})
+        self.weth.deposit({"from": renter, "value": 10**20})
+        self.weth.approve(self.r, 2**256 - 1, {"from": renter})
+
+        self.erc1155 = DummyERC1155.deploy({"from": dev})
+        self.r.enable1155PaymentToken(self.erc1155, {"from": dev})
+        self.erc1155.deposit(0, {"from": renter, "value": 10**20})
+        self.erc1155.setApprovalForAll(self.r, True, {"from": renter})
+
+    def record(self, name, tx):
+        result = {"gas": tx.gas_used}
+        if self.profile:
+            result["opcodes"] = opcodeProfile(tx)
+        self.results[name] = result
+        return tx
+
+    def _payment(self, payment):
+        # (paymentTokenId, paymentTokenAddress)
+        return {
+            "eth": (0, eth),
+            "erc20": (0, self.weth.address),
+            "erc1155": (0, self.erc1155.address),
+        }[payment]
+
+    def _mint(self, count):
+        ids = list(range(self.nextTokenId, self.nextTokenId + count))
+        self.nextTokenId += count
+        self.testNFT.mintBatch(
+            [self.dev] * count, ids, [""] * count, {"from": self.dev}
+        )
+        return ids
+
+    def _conditions(self, payment, pricePerSecond):
+        paymentTokenId, paymentTokenAddress = self._payment(payment)
+        return RentalConditions.listing(
+            3600, pricePerSecond, paymentTokenAddress, paymentTokenId
+        ).encode()
+
+    def _depositAndList(self, tokenId, payment, pricePerSecond=1):
+        return self.testNFT.safeTransferFrom["address,address,uint256,bytes"](
+            self.dev,
+            self.r,
+            tokenId,
+            self._conditions(payment, pricePerSecond),
+            {"from": self.dev},
+        )
+
+    def _rent(self, tokenId, payment, duration, pricePerSecond=1):
+        value = pricePerSecond * duration if payment == "eth" else 0
+        return self.r.rent(
+            self.testNFT,
+            tokenId,
+            duration,
+            {"from": self.renter, "value": value},
+        )
+
+    def scenario(self, payment, withLibrary, enumerable=False):
+        suffix = f"{payment}/{'lib' if withLibrary else 'nolib'}"
+        if enumerable:
+            suffix += "/enumerable"
+        library = self.library if withLibrary else eth
+        self.r.setLibrary(self.testNFT, library, {"from": self.dev})
+
+        deposited, listed = self._mint(2)
+        duration = 60
+
+        self.record(
+            f"deposit/{suffix}",
+            self.testNFT.safeTransferFrom["address,address,uint256"](
+                self.dev, self.r, deposited, {"from": self.dev}
+            ),
+        )
+        self.record(f"depositAndList/{suffix}", self._depositAndList(listed, payment))
+        self.record(f"rent/{suffix}", self._rent(listed, payment, duration))
+
+        wrentable = self.stack["WRentable"]
+        self.record(
+            f"afterWTokenTransfer/{suffix}",
+            wrentable.transferFrom(
+                self.renter, self.receiver, listed, {"from": self.renter}
+            ),
+        )
+
+        orentable = self.stack["ORentable"]
+        self.record(
+            f"afterOTokenTransfer/{suffix}",
+            orentable.transferFrom(
+                self.dev, self.receiver, deposited, {"from": self.dev}
+            ),
+        )
+
+        chain.sleep(duration + 1)
+        chain.mine()
+        self.record(
+            f"expireRental/{suffix}",
+            self.r.expireRental(self.testNFT, listed, {"from": self.dev}),
+        )
+        self.record(
+            f"withdraw/{suffix}",
+            self.r.withdraw(self.testNFT, listed, {"from": self.dev}),
+        )
+
+    def expireCurve(self, sizes=(1, 2, 4, 8, 16, 32, 64), payment="eth"):
+        self.r.setLibrary(self.testNFT, eth, {"from": self.dev})
+        curve = []
+        for size in sizes:
+            ids = self._mint(size)
+            for tokenId in ids:
+                self._depositAndList(tokenId, payment)
+                self._rent(tokenId, payment, 60)
+
+            chain.sleep(61)
+            chain.mine()
+            tx = self.r.expireRentals([self.testNFT] * size, ids, {"from": self.dev})
+            # per-opcode profile of large batches is not worth the trace
+            self.results[f"expireRentals/{size}"] = {"gas": tx.gas_used}
+            curve.append((size, tx.gas_used))
+        return curve
+
+    def rentBatchCurve(self, sizes=(1, 2, 4, 8, 16, 32), payment="eth"):
+        """(size, gas of size rent calls, gas of one rentBatch) per size."""
+        self.r.setLibrary(self.testNFT, eth, {"from": self.dev})
+        curve = []
+        for size in sizes:
+            ids = self._mint(2 * size)
+            for tokenId in ids:
+                self._depositAndList(tokenId, payment)
+
+            separate = sum(
+                self._rent(tokenId, payment, 60).gas_used for tokenId in ids[:size]
+            )
+            batched = self.rb.rentBatch(
+                [self.testNFT] * size,
+                ids[size:],
+                [60] * size,
+                {"from": self.renter, "value": 60 * size if payment == "eth" else 0},
+            ).gas_used
+
+            self.results[f"rentSeparate/{size}"] = {"gas": separate}
+            self.results[f"rentBatch/{size}"] = {"gas": batched}
+            curve.append((size, separate, batched))
+        return curve
+
+    def depositBatchCurve(self, sizes=(1, 2, 4, 8, 16, 32), payment="eth"):
+        """(size, gas of size safeTransferFrom listings, gas of one
+        depositAndListBatch with shared conditions, same with per token ones)
+        per size."""
+        self.r.setLibrary(self.testNFT, eth, {"from": self.dev})
+        self.testNFT.setApprovalForAll(self.r, True, {"from": self.dev})
+        paymentTokenId, paymentTokenAddress = self._payment(payment)
+
+        curve = []
+        for size in sizes:
+            ids = self._mint(3 * size)
+
+            separate = sum(
+                self._depositAndList(tokenId, payment).gas_used
+                for tokenId in ids[:size]
+            )
+            batched = [
+                self.rb.depositAndListBatch(
+                    self.testNFT,
+                    batchIds,
+                    [
+                        (0, 3600, 1 + i, paymentTokenId, paymentTokenAddress, eth)
+                        for i in range(count)
+                    ],
+                    {"from": self.dev},
+                ).gas_used
+                for batchIds, count in (
+                    (ids[size : 2 * size], 1),
+                    (ids[2 * size :], size),
+                )
+            ]
+
+            self.results[f"depositSeparate/{size}"] = {"gas": separate}
+            self.results[f"depositAndListBatch/{size}"] = {"gas": batched[0]}
+            self.results[f"depositAndListBatchPerToken/{size}"] = {"gas": batched[1]}
+            curve.append((size, separate, *batched))
+        return curve
+
+    def enumerationCost(self, payment="eth"):
+        """(scenario, gas, gas with the owner enumeration) of the hot paths.
+
+        Compared with the scenarios of run(). Enabling can't be undone, run
+        it after the other scenarios.
+        """
+        for token in (self.stack["ORentable"], self.stack["WRentable"]):
+            if not token.isEnumerable():
+                token.enableEnumeration({"from": self.dev})
+        self.scenario(payment, False, enumerable=True)
+
+        return [
+            (name, self.results[name]["gas"], self.results[f"{name}/enumerable"]["gas"])
+            for name in sorted(self.results)
+            if name.endswith(f"/{payment}/nolib")
+        ]
+
+    def run(self):
+        for payment in PAYMENTS:
+            for withLibrary in (False, True):
+                self.scenario(payment, withLibrary)
+        return self.results
+
+    def report(self, regressions=()):
+        click.echo("\n            -------- Gas --------")
+        for name in sorted(self.results):
+            click.echo(f"  {name:<40} {self.results[name]['gas']:>9}")
+        for name, before, after, delta in regressions:
+            click.echo(f"  REGRESSION {name}: {before} -> {after} (+{delta:.1%})")
+        click.echo("            ---------------------\n")
+
+
+def plotExpireCurve(curve, path):
+    # matplotlib is only needed for the plot, keep it out of the import path
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    sizes = [s for s, _ in curve]
+    gas = [g for _, g in curve]
+
+    fig, (total, perItem) = plt.subplots(1, 2, figsize=(10, 4))
+    total.plot(sizes, gas, marker="o")
+    total.set_xlabel("batch size")
+    total.set_ylabel("gas")
+    total.set_title("expireRentals gas")
+    perItem.plot(sizes, [g / s for s, g in curve], marker="o")
+    perItem.set_xlabel("batch size")
+    perItem.set_ylabel("gas / rental")
+    perItem.set_title("expireRentals gas per rental")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
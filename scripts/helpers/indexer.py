@@ -0,0 +1,548 @@
+import json
+import sqlite3
+import time
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from brownie import web3
+
+from scripts.helpers.codec import Codec, eventAbi
+from scripts.helpers.multicall import Multicall, RentableReader
+
+# IRentableEvents, (name, [(type, field, indexed)])
+EVENTS = [
+    (
+        "WalletCreated",
+        [("address", "user", True), ("address", "walletAddress", True)],
+    ),
+    (
+        "Deposit",
+        [
+            ("address", "who", True),
+            ("address", "tokenAddress", True),
+            ("uint256", "tokenId", True),
+        ],
+    ),
+    (
+        "Withdraw",
+        [("address", "tokenAddress", True), ("uint256", "tokenId", True)],
+    ),
+    (
+        "UpdateRentalConditions",
+        [
+            ("address", "tokenAddress", True),
+            ("uint256", "tokenId", True),
+            ("address", "paymentTokenAddress", False),
+            ("uint256", "paymentTokenId", False),
+            ("uint256", "minTimeDuration", False),
+            ("uint256", "maxTimeDuration", False),
+            ("uint256", "pricePerSecond", False),
+            ("address", "privateRenter", False),
+        ],
+    ),
+    (
+        "Rent",
+        [
+            ("address", "from", False),
+            ("address", "to", True),
+            ("address", "tokenAddress", True),
+            ("uint256", "tokenId", True),
+            ("address", "paymentTokenAddress", False),
+            ("uint256", "paymentTokenId", False),
+            ("uint256", "expiresAt", False),
+        ],
+    ),
+    (
+        "RentEnds",
+        [("address", "tokenAddress", True), ("uint256", "tokenId", True)],
+    ),
+    # IRentableAdminEvents
+    (
+        "FeeChanged",
+        [("uint16", "previousFee", True), ("uint16", "newFee", True)],
+    ),
+]
+
+# a few days before the Rentable mainnet deployment (May 2022)
+mainnetStartBlock = 14790000
+
+# sqlite integers are signed 64 bits
+MAX_INT = 2**63 - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    blockNumber INTEGER NOT NULL,
+    logIndex INTEGER NOT NULL,
+    blockHash TEXT NOT NULL,
+    txHash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    tokenAddress TEXT,
+    tokenId TEXT,
+    args TEXT NOT NULL,
+    PRIMARY KEY (blockNumber, logIndex)
+);
+CREATE INDEX IF NOT EXISTS events_token ON events (tokenAddress, tokenId);
+CREATE TABLE IF NOT EXISTS tokens (
+    tokenAddress TEXT NOT NULL,
+    tokenId TEXT NOT NULL,
+    depositor TEXT,
+    deposited INTEGER NOT NULL DEFAULT 0,
+    listed INTEGER NOT NULL DEFAULT 0,
+    paymentTokenAddress TEXT,
+    paymentTokenId TEXT,
+    minTimeDuration INTEGER,
+    maxTimeDuration INTEGER,
+    pricePerSecond TEXT,
+    privateRenter TEXT,
+    renter TEXT,
+    expiresAt INTEGER NOT NULL DEFAULT 0,
+    rented INTEGER NOT NULL DEFAULT 0,
+    updatedBlock INTEGER NOT NULL,
+    PRIMARY KEY (tokenAddress, tokenId)
+);
+CREATE INDEX IF NOT EXISTS tokens_expires_at ON tokens (expiresAt);
+CREATE TABLE IF NOT EXISTS wallets (
+    user TEXT PRIMARY KEY,
+    wallet TEXT NOT NULL,
+    blockNumber INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    blockNumber INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+"""
+
+TOKEN_COLUMNS = (
+    "tokenAddress",
+    "tokenId",
+    "depositor",
+    "deposited",
+    "listed",
+    "paymentTokenAddress",
+    "paymentTokenId",
+    "minTimeDuration",
+    "maxTimeDuration",
+    "pricePerSecond",
+    "privateRenter",
+    "renter",
+    "expiresAt",
+    "rented",
+    "updatedBlock",
+)
+
+
+def toHex(value):
+    value = HexBytes(value).hex()
+    return value if value.startswith("0x") else "0x" + value
+
+
+CODEC = Codec([eventAbi(name, fields) for name, fields in EVENTS])
+
+TOPICS = CODEC.topics()
+
+
+def decodeLogs(logs):
+    """Decode raw logs into event dicts, ordered by block and log index."""
+    decoded = [
+        {
+            "event": name,
+            "args": args,
+            "address": log["address"],
+            "blockNumber": log["blockNumber"],
+            "blockHash": toHex(log["blockHash"]),
+            "txHash": toHex(log["transactionHash"]),
+            "logIndex": log["logIndex"],
+        }
+        for name, args, log in CODEC.decode(logs)
+    ]
+    decoded.sort(key=lambda e: (e["blockNumber"], e["logIndex"]))
+    return decoded
+
+
+def applyEvent(state, event):
+    """Fold one event into a tokens row (dict), returns the updated row."""
+    args = event["args"]
+    name = event["event"]
+
+    if name == "Deposit":
+        state.update(
+            depositor=args["who"],
+            deposited=1,
+            listed=0,
+            renter=None,
+            rented=0,
+        )
+    elif name == "UpdateRentalConditions":
+        state.update(
+            listed=int(args["maxTimeDuration"] > 0),
+            paymentTokenAddress=args["paymentTokenAddress"],
+            paymentTokenId=str(args["paymentTokenId"]),
+            minTimeDuration=min(args["minTimeDuration"], MAX_INT),
+            maxTimeDuration=min(args["maxTimeDuration"], MAX_INT),
+            pricePerSecond=str(args["pricePerSecond"]),
+            privateRenter=args["privateRenter"],
+        )
+    elif name == "Rent":
+        state.update(
+            renter=args["to"],
+            expiresAt=min(args["expiresAt"], MAX_INT),
+            rented=1,
+        )
+    elif name == "RentEnds":
+        state.update(renter=None, rented=0)
+    elif name == "Withdraw":
+        state.update(deposited=0, listed=0, renter=None, rented=0)
+
+    state["updatedBlock"] = event["blockNumber"]
+    return state
+
+
+def emptyToken(tokenAddress, tokenId):
+    state = dict.fromkeys(TOKEN_COLUMNS)
+    state.update(
+        tokenAddress=tokenAddress,
+        tokenId=tokenId,
+        deposited=0,
+        listed=0,
+        expiresAt=0,
+        rented=0,
+    )
+    return state
+
+
+class RentableIndexer:
+    """Follow Rentable events into a local SQLite store.
+
+    Logs are fetched in adaptive block ranges, decoded per chunk and
+    folded into per-token state with bulk upserts. The last `reorgDepth`
+    blocks are rolled back and re-fetched when the chain tip changes.
+
+    deleteRentalConditions emits no event, with `rentable` the listed
+    tokens are checked against rentalConditions after each sync, without
+    it a delisted token stays listed until its next event.
+    """
+
+    def __init__(
+        self,
+        dbPath,
+        addresses,
+        fromBlock=0,
+        reorgDepth=12,
+        chunkSize=2000,
+        maxChunkSize=100000,
+        targetLogs=5000,
+        rentable=None,
+    ):
+        self.db = sqlite3.connect(dbPath)
+        self.db.executescript(SCHEMA)
+        self.addresses = [to_checksum_address(a) for a in addresses]
+        self.rentable = rentable
+        self.fromBlock = fromBlock
+        self.reorgDepth = reorgDepth
+        self.chunkSize = chunkSize
+        self.maxChunkSize = maxChunkSize
+        self.targetLogs = targetLogs
+
+    def _getMeta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _setMeta(self, key, value):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def lastBlock(self):
+        return int(self._getMeta("lastBlock", self.fromBlock - 1))
+
+    def rollbacks(self):
+        return int(self._getMeta("rollbacks", 0))
+
+    def _fetchLogs(self, fromBlock, toBlock):
+        return web3.eth.get_logs(
+            {
+                "fromBlock": fromBlock,
+                "toBlock": toBlock,
+                "address": self.addresses,
+                "topics": [TOPICS],
+            }
+        )
+
+    def _loadTokens(self, keys):
+        tokens = {}
+        for tokenAddress, tokenId in keys:
+            row = self.db.execute(
+                f"SELECT {', '.join(TOKEN_COLUMNS)} FROM tokens "
+                "WHERE tokenAddress = ? AND tokenId = ?",
+                (tokenAddress, tokenId),
+            ).fetchone()
+            tokens[(tokenAddress, tokenId)] = (
+                dict(zip(TOKEN_COLUMNS, row))
+                if row
+                else emptyToken(tokenAddress, tokenId)
+            )
+        return tokens
+
+    def _store(self, events):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO events "
+            "(blockNumber, logIndex, blockHash, txHash, address, event, tokenAddress, tokenId, args) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    e["blockNumber"],
+                    e["logIndex"],
+                    e["blockHash"],
+                    e["txHash"],
+                    e["address"],
+                    e["event"],
+                    e["args"].get("tokenAddress"),
+                    str(e["args"]["tokenId"]) if "tokenId" in e["args"] else None,
+                    json.dumps(e["args"], default=str),
+                )
+                for e in events
+            ],
+        )
+
+        self.db.executemany(
+            "INSERT OR REPLACE INTO wallets (user, wallet, blockNumber) VALUES (?, ?, ?)",
+            [
+                (e["args"]["user"], e["args"]["walletAddress"], e["blockNumber"])
+                for e in events
+                if e["event"] == "WalletCreated"
+            ],
+        )
+
+        tokenEvents = [e for e in events if "tokenId" in e["args"]]
+        keys = {
+            (e["args"]["tokenAddress"], str(e["args"]["tokenId"])) for e in tokenEvents
+        }
+        tokens = self._loadTokens(keys)
+        for e in tokenEvents:
+            key = (e["args"]["tokenAddress"], str(e["args"]["tokenId"]))
+            applyEvent(tokens[key], e)
+
+        self._upsertTokens(tokens.values())
+
+    def _upsertTokens(self, tokens):
+        self.db.executemany(
+            f"INSERT OR REPLACE INTO tokens ({', '.join(TOKEN_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(TOKEN_COLUMNS))})",
+            [tuple(t[c] for c in TOKEN_COLUMNS) for t in tokens],
+        )
+
+    def rollback(self, toBlock):
+        """Drop everything after toBlock and rebuild the affected tokens."""
+        keys = self.db.execute(
+            "SELECT DISTINCT tokenAddress, tokenId FROM events "
+            "WHERE blockNumber > ? AND tokenId IS NOT NULL",
+            (toBlock,),
+        ).fetchall()
+
+        self.db.execute("DELETE FROM events WHERE blockNumber > ?", (toBlock,))
+        self.db.execute("DELETE FROM wallets WHERE blockNumber > ?", (toBlock,))
+        self.db.execute("DELETE FROM blocks WHERE blockNumber > ?", (toBlock,))
+
+        rebuilt = []
+        for tokenAddress, tokenId in keys:
+            self.db.execute(
+                "DELETE FROM tokens WHERE tokenAddress = ? AND tokenId = ?",
+                (tokenAddress, tokenId),
+            )
+            rows = self.db.execute(
+                "SELECT event, args, blockNumber FROM events "
+                "WHERE tokenAddress = ? AND tokenId = ? ORDER BY blockNumber, logIndex",
+                (tokenAddress, tokenId),
+            ).fetchall()
+            if not rows:
+                continue
+
+            state = emptyToken(tokenAddress, tokenId)
+            for name, args, blockNumber in rows:
+                applyEvent(
+                    state,
+                    {
+                        "event": name,
+                        "args": json.loads(args),
+                        "blockNumber": blockNumber,
+                    },
+                )
+            rebuilt.append(state)
+
+        self._upsertTokens(rebuilt)
+        self._setMeta("lastBlock", str(toBlock))
+        self._setMeta("lastBlockHash", "")
+        # lets in-memory views built on the store know they must reload
+        self._setMeta("rollbacks", str(self.rollbacks() + 1))
+        self.db.commit()
+
+    def _checkReorg(self):
+        last = self.lastBlock()
+        lastHash = self._getMeta("lastBlockHash")
+        if last < self.fromBlock or not lastHash:
+            return
+
+        if toHex(web3.eth.get_block(last)["hash"]) != lastHash:
+            self.rollback(max(last - self.reorgDepth, self.fromBlock - 1))
+
+    def sync(self, toBlock=None, verbose=True):
+        """Index from the last synced block up to toBlock (default: head)."""
+        self._checkReorg()
+
+        if toBlock is None:
+            toBlock = web3.eth.block_number
+
+        start = self.lastBlock() + 1
+        indexed = 0
+        while start <= toBlock:
+            end = min(start + self.chunkSize - 1, toBlock)
+            try:
+                logs = self._fetchLogs(start, end)
+            except ValueError:
+                # too many results or range too wide for the node
+                if self.chunkSize == 1:
+                    raise
+                self.chunkSize = max(1, self.chunkSize // 2)
+                continue
+
+            events = decodeLogs(logs)
+            self._store(events)
+            self._setMeta("lastBlock", str(end))
+            self._setMeta("lastBlockHash", toHex(web3.eth.get_block(end)["hash"]))
+            self.db.commit()
+
+            indexed += len(events)
+            if verbose:
+                print(
+                    f"blocks {start}-{end}: {len(events)} events (chunk {self.chunkSize})"
+                )
+
+            # adapt the range to the log density
+            if len(logs) < self.targetLogs // 4:
+                self.chunkSize = min(self.chunkSize * 2, self.maxChunkSize)
+            elif len(logs) > self.targetLogs:
+                self.chunkSize = max(1, self.chunkSize // 2)
+
+            start = end + 1
+
+        if self.rentable is not None:
+            delisted = self.reconcileListings(toBlock)
+            if verbose and delisted:
+                print(f"block {toBlock}: {delisted} delisted")
+
+        return indexed
+
+    def reconcileListings(self, block):
+        """Clear `listed` on tokens without rental conditions at block."""
+        listed = self.listed()
+        if not listed:
+            return 0
+
+        multicall = Multicall(block=block)
+        try:
+            conditions = RentableReader(self.rentable, multicall).rentalConditions(
+                listed
+            )
+        finally:
+            multicall.close()
+
+        # failed reads (None) keep the indexed state
+        delisted = [
+            (block, a, str(i))
+            for (a, i), rc in zip(listed, conditions)
+            if rc is not None and rc.maxTimeDuration == 0
+        ]
+        self.db.executemany(
+            "UPDATE tokens SET listed = 0, updatedBlock = ? "
+            "WHERE tokenAddress = ? AND tokenId = ?",
+            delisted,
+        )
+        self.db.commit()
+        return len(delisted)
+
+    def follow(self, pollInterval=12):
+        while True:
+            self.sync(verbose=False)
+            time.sleep(pollInterval)
+
+    # queries
+
+    def listed(self, tokenAddress=None):
+        query = "SELECT tokenAddress, tokenId FROM tokens WHERE listed = 1 AND deposited = 1"
+        params = ()
+        if tokenAddress is not None:
+            query += " AND tokenAddress = ?"
+            params = (tokenAddress,)
+        return [(a, int(i)) for a, i in self.db.execute(query, params)]
+
+    def deposited(self, tokenAddress=None):
+        query = "SELECT tokenAddress, tokenId FROM tokens WHERE deposited = 1"
+        params = ()
+        if tokenAddress is not None:
+            query += " AND tokenAddress = ?"
+            params = (tokenAddress,)
+        return [(a, int(i)) for a, i in self.db.execute(query, params)]
+
+    def rented(self, now=None):
+        now = int(time.time()) if now is None else now
+        return [
+            (a, int(i), renter, expiresAt)
+            for a, i, renter, expiresAt in self.db.execute(
+                "SELECT tokenAddress, tokenId, renter, expiresAt FROM tokens "
+                "WHERE rented = 1 AND expiresAt > ? ORDER BY expiresAt",
+                (now,),
+            )
+        ]
+
+    def expiring(self, before, after=0):
+        """Rentals not settled on-chain with expiresAt in [after, before)."""
+        return [
+            (a, int(i), expiresAt)
+            for a, i, expiresAt in self.db.execute(
+                "SELECT tokenAddress, tokenId, expiresAt FROM tokens "
+                "WHERE rented = 1 AND expiresAt >= ? AND expiresAt < ? ORDER BY expiresAt",
+                (after, before),
+            )
+        ]
+
+    def getToken(self, tokenAddress, tokenId):
+        return self._loadTokens([(tokenAddress, str(tokenId))])[
+            (tokenAddress, str(tokenId))
+        ]
+
+    def rentedSince(self, block):
+        """Rentals (tokenAddress, tokenId, expiresAt) touched after block."""
+        return [
+            (a, int(i), expiresAt)
+            for a, i, expiresAt in self.db.execute(
+                "SELECT tokenAddress, tokenId, expiresAt FROM tokens "
+                "WHERE rented = 1 AND updatedBlock > ?",
+                (block,),
+            )
+        ]
+
+    def timestamps(self, blockNumbers):
+        """{blockNumber: timestamp}, fetched once and cached in the store."""
+        blockNumbers = set(blockNumbers)
+        cached = dict(self.db.execute("SELECT blockNumber, timestamp FROM blocks"))
+        missing = sorted(blockNumbers - set(cached))
+        if missing:
+            fetched = [(b, web3.eth.get_block(b)["timestamp"]) for b in missing]
+            self.db.executemany(
+                "INSERT OR REPLACE INTO blocks (blockNumber, timestamp) VALUES (?, ?)",
+                fetched,
+            )
+            self.db.commit()
+            cached.update(fetched)
+        return {b: cached[b] for b in blockNumbers}
+
+    def counts(self):
+        return self.db.execute(
+            "SELECT COUNT(*), SUM(deposited), SUM(listed), SUM(rented) FROM tokens"
+        ).fetchone()
@@ -0,0 +1,209 @@
+import heapq
+import queue
+import time
+from collections import deque
+
+import click
+
+from brownie import web3
+
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+
+def percentile(values, p):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class ExpiryKeeper:
+    """Settle expired rentals on-chain with batched expireRentals calls.
+
+    Deadlines come from the indexer (Rent events) into a min-heap keyed on
+    expiresAt. Due rentals are packed in batches sized on a gas budget with
+    a per-item gas model refined from receipts, each batch is sent with its
+    own gas estimate. An item, identified by (tokenAddress, tokenId,
+    expiresAt), is never submitted twice unless its batch failed: settled
+    items are dropped once the indexer has their block, and batches still
+    in flight when the keeper stops are resolved from `checkpointPath` on
+    the next start.
+    """
+
+    def __init__(
+        self,
+        indexer,
+        rentable,
+        account,
+        gasBudget=8000000,
+        window=1,
+        baseGas=30000,
+        gasMargin=1.25,
+        checkpointPath=None,
+    ):
+        self.indexer = indexer
+        self.rentable = rentable
+        self.account = account
+        self.gasBudget = gasBudget
+        self.baseGas = baseGas
+        self.gasMargin = gasMargin
+        self.perItemGas = None
+
+        self.heap = []
+        self.scheduled = set()
+        self.submitted = set()
+        # (blockNumber, batch) confirmed, pruned from submitted once indexed
+        self.settled = deque()
+        self.lastSeenBlock = -1
+
+        self.batches = {}
+        self.lags = []
+        self.expired = 0
+        self._receipts = queue.SimpleQueue()
+
+        # batches left in flight by a previous run are waited for here
+        self.checkpoint = Checkpoint(checkpointPath)
+        self.pipeline = TxPipeline(
+            account,
+            window=window,
+            checkpoint=self.checkpoint,
+            gasMargin=gasMargin,
+            onReceipt=lambda key, receipt: self._receipts.put((key, receipt)),
+        )
+
+    def _schedule(self, item):
+        if item not in self.scheduled and item not in self.submitted:
+            self.scheduled.add(item)
+            heapq.heappush(self.heap, (item[2], item))
+
+    def refresh(self):
+        self.indexer.sync(verbose=False)
+        for item in self.indexer.rentedSince(self.lastSeenBlock):
+            self._schedule(item)
+        self.lastSeenBlock = self.indexer.lastBlock()
+
+        # the indexer has the expirations, due() sees them as stale
+        while self.settled and self.settled[0][0] <= self.lastSeenBlock:
+            _, batch = self.settled.popleft()
+            self.submitted.difference_update(batch)
+
+    def _isStale(self, item):
+        # rental already settled or renewed with a different expiration
+        tokenAddress, tokenId, expiresAt = item
+        state = self.indexer.getToken(tokenAddress, tokenId)
+        return not state["rented"] or state["expiresAt"] != expiresAt
+
+    def due(self, now):
+        items = []
+        while self.heap and self.heap[0][0] <= now:
+            _, item = heapq.heappop(self.heap)
+            self.scheduled.discard(item)
+            if item not in self.submitted and not self._isStale(item):
+                items.append(item)
+        return items
+
+    def _measure(self, items):
+        sample = items[: min(len(items), 10)]
+        gas = self.rentable.expireRentals.estimate_gas(
+            [a for a, _, _ in sample],
+            [i for _, i, _ in sample],
+            {"from": self.account},
+        )
+        self.perItemGas = max(1, (gas - self.baseGas) // len(sample))
+
+    def batchSize(self):
+        return max(
+            1,
+            int((self.gasBudget - self.baseGas) / (self.perItemGas * self.gasMargin)),
+        )
+
+    def submit(self, items):
+        if not items:
+            return
+        if self.perItemGas is None:
+            self._measure(items)
+
+        size = self.batchSize()
+        for start in range(0, len(items), size):
+            batch = items[start : start + size]
+            key = f"expire:{batch[0][0]}:{batch[0][1]}:{batch[0][2]}"
+            data = self.rentable.expireRentals.encode_input(
+                [a for a, _, _ in batch], [i for _, i, _ in batch]
+            )
+            try:
+                gas = self.pipeline.estimateGas(self.rentable.address, data)
+            except ValueError:
+                # reverts as a whole (e.g. paused), retry on the next tick
+                for item in batch:
+                    self._schedule(item)
+                continue
+
+            self.submitted.update(batch)
+            self.batches[key] = batch
+            if self.pipeline.send(key, self.rentable.address, data, gas=gas) is None:
+                # confirmed by a previous run, pruned once indexed
+                self.batches.pop(key)
+                self.settled.append((web3.eth.block_number, batch))
+
+    def _processReceipts(self):
+        while True:
+            try:
+                key, receipt = self._receipts.get_nowait()
+            except queue.Empty:
+                return
+
+            batch = self.batches.pop(key)
+            if receipt.status != 1:
+                # retry on the next tick
+                self.submitted.difference_update(batch)
+                for item in batch:
+                    self._schedule(item)
+                continue
+
+            self.settled.append((receipt.blockNumber, batch))
+            minedAt = web3.eth.get_block(receipt.blockNumber).timestamp
+            self.lags.extend(minedAt - expiresAt for _, _, expiresAt in batch)
+            self.expired += len(batch)
+
+            # refine the gas model, smoothing out library specific costs
+            measured = max(1, (receipt.gasUsed - self.baseGas) // len(batch))
+            self.perItemGas = int(0.8 * self.perItemGas + 0.2 * measured)
+
+    def tick(self):
+        self._processReceipts()
+        self.refresh()
+        now = web3.eth.get_block("latest").timestamp
+        items = self.due(now)
+        self.submit(items)
+        return len(items)
+
+    def run(self, pollInterval=12, maxIterations=None):
+        iteration = 0
+        while maxIterations is None or iteration < maxIterations:
+            submitted = self.tick()
+            if submitted:
+                click.echo(
+                    f"submitted {submitted} expirations, "
+                    f"{self.pipeline.inflight()} tx in flight, {len(self.heap)} scheduled"
+                )
+            iteration += 1
+            time.sleep(pollInterval)
+
+    def stop(self):
+        self.pipeline.join()
+        self._processReceipts()
+
+    def report(self):
+        click.echo(
+            f"""
+            -------- Keeper --------
+               Expired: {self.expired}
+             Scheduled: {len(self.heap)}
+            PerItemGas: {self.perItemGas}
+             BatchSize: {self.batchSize() if self.perItemGas else '-'}
+               Lag p50: {percentile(self.lags, 50)} s
+               Lag p99: {percentile(self.lags, 99)} s
+               Lag max: {max(self.lags, default=0)} s
+            ------------------------
+         """
+        )
@@ -0,0 +1,202 @@
+from typing import NamedTuple
+
+import click
+import eth_abi
+from eth_utils import to_checksum_address
+
+from brownie import web3
+
+from scripts.helpers.codec import selector
+from scripts.helpers.multicall import Call, Multicall
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+ZERO = "0x0000000000000000000000000000000000000000"
+
+SYNC_SIGNATURE = "syncUpdateOperators(uint256[])"
+
+# drift reasons, only the first two can be fixed by OLandRegistry
+EXPIRED = "expired"  # rental ended without settlement, renter still operator
+RESET = "reset"  # no operator, e.g. deposited before the library was set
+RENTED = "rented"  # the renter wallet holds the land, fixed at expiration
+FIXABLE = (EXPIRED, RESET)
+
+
+class LandState(NamedTuple):
+    tokenId: int
+    operator: str  # ILandRegistry.updateOperator
+    depositor: str  # OLandRegistry.ownerOf
+    renter: str  # WRentable.ownerOf(tokenId, true), None without rental
+
+
+class Drift(NamedTuple):
+    tokenId: int
+    operator: str
+    expected: str
+    reason: str
+
+
+def _address(value):
+    return to_checksum_address(value) if value is not None else None
+
+
+def encodeSync(tokenIds):
+    return (
+        "0x"
+        + (
+            selector(SYNC_SIGNATURE) + eth_abi.encode_abi(["uint256[]"], [tokenIds])
+        ).hex()
+    )
+
+
+class OperatorReconciler:
+    """Restore Decentraland LAND update operators drifted from the rentals.
+
+    The expected operator of a deposited land is the WToken owner during a
+    rental and the depositor (OToken owner) otherwise, rentals come from the
+    indexer. Live operators and owners are read through Multicall, drifted
+    lands are fixed with OLandRegistry.syncUpdateOperators batches sent by
+    its owner: expired rentals are settled (the library hook resets the
+    operator) and lands without operator get the depositor back. Another
+    operator set while not rented is a depositor delegation, left alone.
+    """
+
+    def __init__(
+        self,
+        indexer,
+        land,
+        oland,
+        wrentable,
+        account=None,
+        multicall=None,
+        batchSize=50,
+        window=8,
+        checkpointPath=None,
+    ):
+        self.indexer = indexer
+        self.land = to_checksum_address(str(land))
+        self.oland = to_checksum_address(str(oland))
+        self.wrentable = to_checksum_address(str(wrentable))
+        self.account = account
+        self.multicall = multicall or Multicall()
+        self.batchSize = batchSize
+        self.window = window
+        self.checkpoint = Checkpoint(checkpointPath)
+
+        self.checked = 0
+        self.block = None
+        self.delegated = 0
+        self.drifts = []
+        self.left = []
+        self.fixed = 0
+        self.transactions = 0
+        self.gasUsed = 0
+
+    def states(self, tokenIds):
+        calls = []
+        for tokenId in tokenIds:
+            calls.append(
+                Call(self.land, "updateOperator(uint256)", (tokenId,), ("address",))
+            )
+            calls.append(Call(self.oland, "ownerOf(uint256)", (tokenId,), ("address",)))
+            calls.append(
+                Call(
+                    self.wrentable,
+                    "ownerOf(uint256,bool)",
+                    (tokenId, True),
+                    ("address",),
+                )
+            )
+
+        values = [_address(v) for v in self.multicall.call(calls)]
+        return [
+            LandState(tokenId, *values[3 * i : 3 * i + 3])
+            for i, tokenId in enumerate(tokenIds)
+        ]
+
+    def drift(self, now=None):
+        """Lands whose operator differs from the expected one."""
+        self.indexer.sync(verbose=False)
+        now = web3.eth.get_block("latest").timestamp if now is None else now
+
+        rented = {i for a, i, _, _ in self.indexer.rented(now) if a == self.land}
+        expired = {i for a, i, _ in self.indexer.expiring(now) if a == self.land}
+        tokenIds = sorted(i for a, i in self.indexer.deposited(self.land))
+
+        drifts = []
+        self.delegated = 0
+        for s in self.states(tokenIds):
+            if s.depositor is None:
+                # withdrawn since the last sync
+                continue
+            if s.tokenId in expired:
+                drifts.append(Drift(s.tokenId, s.operator, s.depositor, EXPIRED))
+            elif s.tokenId in rented:
+                if s.operator != s.renter:
+                    drifts.append(Drift(s.tokenId, s.operator, s.renter, RENTED))
+            elif s.operator is None or s.operator == ZERO:
+                drifts.append(Drift(s.tokenId, s.operator, s.depositor, RESET))
+            elif s.operator != s.depositor:
+                self.delegated += 1
+
+        self.checked = len(tokenIds)
+        self.block = self.indexer.lastBlock()
+        self.drifts = drifts
+        return drifts
+
+    def batches(self, drifts):
+        tokenIds = sorted(d.tokenId for d in drifts if d.reason in FIXABLE)
+        return [
+            tokenIds[i : i + self.batchSize]
+            for i in range(0, len(tokenIds), self.batchSize)
+        ]
+
+    def calls(self, drifts):
+        """(to, data) of each syncUpdateOperators call, e.g. for a multisig."""
+        return [(self.oland, encodeSync(b)) for b in self.batches(drifts)]
+
+    def fix(self, drifts):
+        pipeline = TxPipeline(
+            self.account, window=self.window, checkpoint=self.checkpoint
+        )
+        for batch in self.batches(drifts):
+            pipeline.send(
+                f"operators:{self.land}:{self.block}:{batch[0]}:{len(batch)}",
+                self.oland,
+                encodeSync(batch),
+            )
+        pipeline.join()
+
+        self.transactions += pipeline.sent
+        self.gasUsed += pipeline.gasUsed
+        return pipeline.failures
+
+    def reconcile(self):
+        """Fix the drifted lands, returns the drift left afterwards."""
+        found = self.drift()
+        before = [d for d in found if d.reason in FIXABLE]
+        if before:
+            self.fix(before)
+
+        self.left = self.drift()
+        left = {d.tokenId for d in self.left if d.reason in FIXABLE}
+        self.fixed += sum(1 for d in before if d.tokenId not in left)
+        self.drifts = found
+        return self.left
+
+    def report(self):
+        reasons = [d.reason for d in self.drifts]
+        click.echo(
+            f"""
+            -------- LAND operators --------
+               Checked: {self.checked}
+             Delegated: {self.delegated}
+               Expired: {reasons.count(EXPIRED)}
+                 Reset: {reasons.count(RESET)}
+                Rented: {reasons.count(RENTED)}
+                 Fixed: {self.fixed}
+                  Left: {len(self.left)}
+          Transactions: {self.transactions}
+              Gas used: {self.gasUsed}
+            --------------------------------
+         """
+        )
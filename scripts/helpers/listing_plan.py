@@ -0,0 +1,207 @@
+import numpy as np
+
+from scripts.helpers.codec import RENTAL_CONDITIONS_TUPLE, selector
+from scripts.sdk.structs import RentalConditions
+
+address0 = "0x0000000000000000000000000000000000000000"
+
+day = 24 * 60 * 60
+
+# RentableTypes.RentalConditions abi layout, one 32 bytes word per field
+WORD = 32
+FIELDS = RentalConditions.FIELDS
+PAYLOAD_SIZE = WORD * len(FIELDS)
+
+DEPOSIT_AND_LIST_BATCH = selector(
+    f"depositAndListBatch(address,uint256[],{RENTAL_CONDITIONS_TUPLE}[])"
+)
+
+
+def _snap(values, low, high, step):
+    # round to the step grid and keep within [low, high), like random.randrange
+    top = low + ((high - 1 - low) // step) * step
+    values = low + np.floor((values - low) / step) * step
+    return np.clip(values, low, top).astype(np.uint64)
+
+
+def _addressTable(addresses):
+    return np.array(
+        [np.frombuffer(bytes.fromhex(a[2:]), dtype=np.uint8) for a in addresses],
+        dtype=np.uint8,
+    ).reshape(len(addresses), 20)
+
+
+def _tokenIdColumn(tokenIds):
+    # collections like LAND use full uint256 ids, keep them as decimal strings
+    tokenIds = list(tokenIds)
+    try:
+        return np.asarray(tokenIds, dtype=np.uint64)
+    except OverflowError:
+        return np.array([str(t) for t in tokenIds])
+
+
+def generatePlan(
+    tokenIds,
+    seed=0,
+    minTimeDuration=1,
+    maxTimeDurationRange=(3 * day, 15 * day, day // 2),
+    priceRange=(int(0.1e18 / day), int(5e18 / day), int(0.2e18 / day)),
+    priceDistribution="uniform",
+    paymentTokens=(address0,),
+    paymentTokenWeights=None,
+    paymentTokenIds=None,
+    privateRenters=(),
+    privateShare=0.0,
+):
+    """Draw rental conditions for all tokenIds at once.
+
+    Durations and prices are (low, high, step) grids like random.randrange.
+    priceDistribution is "uniform" or "lognormal" (centered in the range).
+    paymentTokenIds optionally maps each payment token to its ERC1155 id.
+    A privateShare fraction of listings is reserved to one of privateRenters.
+    """
+    rng = np.random.default_rng(seed)
+    tokenIds = _tokenIdColumn(tokenIds)
+    n = len(tokenIds)
+
+    low, high, step = maxTimeDurationRange
+    maxTimeDuration = _snap(rng.uniform(low, high, n), low, high, step)
+
+    low, high, step = priceRange
+    if priceDistribution == "uniform":
+        prices = rng.uniform(low, high, n)
+    elif priceDistribution == "lognormal":
+        prices = rng.lognormal(np.log((low + high) / 2), 0.5, n)
+    else:
+        raise ValueError(f"Unknown price distribution {priceDistribution}")
+    pricePerSecond = _snap(prices, low, high, step)
+
+    paymentTokenIndex = rng.choice(
+        len(paymentTokens), size=n, p=paymentTokenWeights
+    ).astype(np.uint16)
+    paymentTokenIdTable = np.asarray(
+        paymentTokenIds or [0] * len(paymentTokens), dtype=np.uint64
+    )
+
+    # index 0 is reserved for the public listing (no private renter)
+    privateRenters = (address0,) + tuple(privateRenters)
+    privateRenterIndex = np.zeros(n, dtype=np.uint16)
+    if len(privateRenters) > 1 and privateShare > 0:
+        private = rng.random(n) < privateShare
+        privateRenterIndex[private] = rng.integers(
+            1, len(privateRenters), size=int(private.sum())
+        )
+
+    return {
+        "seed": np.uint64(seed),
+        "tokenIds": tokenIds,
+        "minTimeDuration": np.full(n, minTimeDuration, dtype=np.uint64),
+        "maxTimeDuration": maxTimeDuration,
+        "pricePerSecond": pricePerSecond,
+        "paymentTokenId": paymentTokenIdTable[paymentTokenIndex],
+        "paymentTokenIndex": paymentTokenIndex,
+        "privateRenterIndex": privateRenterIndex,
+        "paymentTokens": np.array(paymentTokens),
+        "privateRenters": np.array(privateRenters),
+    }
+
+
+def _putUint(payloads, field, values):
+    # uint256 big endian, values fit in the low 8 bytes
+    offset = FIELDS.index(field) * WORD
+    payloads[:, offset + 24 : offset + WORD] = (
+        values.astype(">u8").view(np.uint8).reshape(-1, 8)
+    )
+
+
+def _putAddress(payloads, field, table, index):
+    offset = FIELDS.index(field) * WORD
+    payloads[:, offset + 12 : offset + WORD] = table[index]
+
+
+def encodePayloads(plan):
+    """ABI encode all RentalConditions, one onERC721Received data per row."""
+    n = len(plan["tokenIds"])
+    payloads = np.zeros((n, PAYLOAD_SIZE), dtype=np.uint8)
+
+    for field in FIELDS[:4]:
+        _putUint(payloads, field, plan[field])
+
+    _putAddress(
+        payloads,
+        "paymentTokenAddress",
+        _addressTable(plan["paymentTokens"]),
+        plan["paymentTokenIndex"],
+    )
+    _putAddress(
+        payloads,
+        "privateRenter",
+        _addressTable(plan["privateRenters"]),
+        plan["privateRenterIndex"],
+    )
+
+    return payloads
+
+
+def iterListings(plan, payloads=None):
+    """Yield (tokenId, data) pairs ready for safeTransferFrom."""
+    if payloads is None:
+        payloads = encodePayloads(plan)
+    for tokenId, row in zip(plan["tokenIds"].tolist(), payloads):
+        yield int(tokenId), row.tobytes()
+
+
+def _word(value):
+    return int(value).to_bytes(WORD, "big")
+
+
+def encodeDepositAndListBatch(tokenAddress, tokenIds, payloads):
+    """Rentable.depositAndListBatch calldata.
+
+    payloads: encodePayloads rows, one per token or a single shared one.
+    RentalConditions is a static struct, so the array body is just the rows
+    one after the other.
+    """
+    tokenIds = list(tokenIds)
+    payloads = np.ascontiguousarray(payloads, dtype=np.uint8).reshape(-1, PAYLOAD_SIZE)
+    if len(payloads) not in (0, 1, len(tokenIds)):
+        raise ValueError(
+            f"{len(payloads)} payloads for {len(tokenIds)} tokens,"
+            " expected one shared payload or one per token"
+        )
+
+    idsOffset = 3 * WORD
+    payloadsOffset = idsOffset + WORD * (1 + len(tokenIds))
+    return b"".join(
+        [
+            DEPOSIT_AND_LIST_BATCH,
+            bytes(12) + bytes.fromhex(tokenAddress[2:]),
+            _word(idsOffset),
+            _word(payloadsOffset),
+            _word(len(tokenIds)),
+            *(_word(t) for t in tokenIds),
+            _word(len(payloads)),
+            payloads.tobytes(),
+        ]
+    )
+
+
+def iterBatches(tokenAddress, plan, payloads=None, batchSize=100):
+    """Yield (tokenIds, calldata) of depositAndListBatch over the plan."""
+    if payloads is None:
+        payloads = encodePayloads(plan)
+    tokenIds = plan["tokenIds"].tolist()
+    for i in range(0, len(tokenIds), batchSize):
+        ids = [int(t) for t in tokenIds[i : i + batchSize]]
+        yield ids, encodeDepositAndListBatch(
+            tokenAddress, ids, payloads[i : i + batchSize]
+        )
+
+
+def savePlan(path, plan):
+    np.savez_compressed(path, **plan)
+
+
+def loadPlan(path):
+    with np.load(path) as f:
+        return {k: f[k] for k in f.files}
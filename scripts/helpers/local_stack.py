@@ -0,0 +1,149 @@
+from brownie import (
+    network,
+    project,
+    Rentable,
+    RentableBatch,
+    ORentable,
+    WRentable,
+    SimpleWallet,
+    WalletFactory,
+    TestNFT,
+    ImmutableAdminTransparentUpgradeableProxy,
+    ImmutableAdminUpgradeableBeaconProxy,
+)
+
+from scripts.helpers.listing_plan import generatePlan, iterListings
+
+eth = "0x0000000000000000000000000000000000000000"
+
+_oz = None
+
+
+def loadOz():
+    """Load (once) the OpenZeppelin project for beacons and proxy admin."""
+    global _oz
+    if _oz is None:
+        _oz = project.load("./lib/openzeppelin-contracts")
+    return _oz
+
+
+def isDevelopment():
+    return network.show_active() == "development"
+
+
+def deployBeaconProxy(container, beacon, proxyAdmin, initData, dev):
+    proxy = ImmutableAdminUpgradeableBeaconProxy.deploy(
+        beacon, proxyAdmin, initData, {"from": dev}
+    )
+
+    address = proxy.address
+    ImmutableAdminUpgradeableBeaconProxy.remove(proxy)  # otw direct cast not work
+
+    return container.at(address, dev)
+
+
+def batchAt(rentable, owner=None):
+    """Rentable with the RentableBatch ABI, for the batch entrypoints it delegates."""
+    return RentableBatch.at(rentable.address, owner)
+
+
+def deployLocalStack(dev, collection=None):
+    """Deploy a full Rentable stack on the local dev chain, dev holds all roles."""
+    oz = loadOz()
+
+    if collection is None:
+        collection = TestNFT.deploy({"from": dev})
+
+    proxyAdmin = oz.ProxyAdmin.deploy({"from": dev})
+    rLogic = Rentable.deploy(dev, dev, {"from": dev})
+    rLogic.SCRAM({"from": dev})
+
+    proxy = ImmutableAdminTransparentUpgradeableProxy.deploy(
+        rLogic,
+        proxyAdmin,
+        rLogic.initialize.encode_input(dev, dev),
+        {"from": dev},
+    )
+
+    r = proxy.address
+    ImmutableAdminTransparentUpgradeableProxy.remove(proxy)
+
+    r = Rentable.at(r, dev)
+
+    orentableLogic = ORentable.deploy(collection, eth, eth, {"from": dev})
+    obeacon = oz.UpgradeableBeacon.deploy(orentableLogic, {"from": dev})
+    orentable = deployBeaconProxy(
+        ORentable,
+        obeacon,
+        proxyAdmin,
+        orentableLogic.initialize.encode_input(collection, dev, r),
+        dev,
+    )
+    r.setORentable(collection, orentable, {"from": dev})
+
+    wrentableLogic = WRentable.deploy(collection, eth, eth, {"from": dev})
+    wbeacon = oz.UpgradeableBeacon.deploy(wrentableLogic, {"from": dev})
+    wrentable = deployBeaconProxy(
+        WRentable,
+        wbeacon,
+        proxyAdmin,
+        wrentableLogic.initialize.encode_input(collection, dev, r),
+        dev,
+    )
+    r.setWRentable(collection, wrentable, {"from": dev})
+
+    simpleWalletLogic = SimpleWallet.deploy(r, eth, {"from": dev})
+    simpleWalletBeacon = oz.UpgradeableBeacon.deploy(simpleWalletLogic, {"from": dev})
+    walletFactory = WalletFactory.deploy(simpleWalletBeacon, {"from": dev})
+
+    r.setWalletFactory(walletFactory, {"from": dev})
+
+    r.enablePaymentToken(eth, {"from": dev})
+    r.setFeeCollector(dev, {"from": dev})
+
+    return {
+        "ProxyAdmin": proxyAdmin,
+        "Rentable": r,
+        "RentableBatch": batchAt(r, dev),
+        "RentableLogic": rLogic,
+        "OLogic": orentableLogic,
+        "OBeacon": obeacon,
+        "WLogic": wrentableLogic,
+        "WBeacon": wbeacon,
+        "SimpleWalletLogic": simpleWalletLogic,
+        "SimpleWalletBeacon": simpleWalletBeacon,
+        "WalletFactory": walletFactory,
+        "TestNFT": collection,
+        "ORentable": orentable,
+        "WRentable": wrentable,
+    }
+
+
+def seedLocalActivity(stack, dev, renters, startId=1, listings=10, duration=3600):
+    """Mint and deposit-and-list tokens, then rent one per renter.
+
+    Returns the list of (tokenId, renter) rentals.
+    """
+    testNFT = stack["TestNFT"]
+    r = stack["Rentable"]
+
+    ids = list(range(startId, startId + listings))
+    testNFT.mintBatch([dev] * len(ids), ids, [""] * len(ids), {"from": dev})
+
+    plan = generatePlan(ids, seed=startId)
+    for tokenId, data in iterListings(plan):
+        testNFT.safeTransferFrom(dev, r, tokenId, data, {"from": dev})
+
+    rentals = []
+    for tokenId, pricePerSecond, renter in zip(
+        ids, plan["pricePerSecond"].tolist(), renters
+    ):
+        r.rent(
+            testNFT,
+            tokenId,
+            duration,
+            {"from": renter, "value": pricePerSecond * duration},
+        )
+        rentals.append((tokenId, renter))
+
+    return rentals
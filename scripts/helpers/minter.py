@@ -0,0 +1,207 @@
+import queue
+import time
+
+import click
+
+from brownie import web3
+
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+
+def iterUris(path, startId=1):
+    """Yield (tokenId, uri) from a fixture file, one line at a time."""
+    tokenId = startId
+    with open(path) as f:
+        for line in f:
+            uri = line.strip()
+            if not uri:
+                continue
+            yield tokenId, uri
+            tokenId += 1
+
+
+def confirmedRanges(checkpoint):
+    ranges = []
+    for key in checkpoint.confirmed:
+        if key.startswith("mint:"):
+            first, last = key[len("mint:") :].split("-")
+            ranges.append((int(first), int(last)))
+    return sorted(ranges)
+
+
+def lastConfirmedId(ranges):
+    """Highest token id such that every id from the first range is confirmed."""
+    if not ranges:
+        return None
+    last = ranges[0][0] - 1
+    for first, end in ranges:
+        if first > last + 1:
+            break
+        last = max(last, end)
+    return last
+
+
+class BulkMinter:
+    """mintBatch a stream of URIs with gas-sized batches sent concurrently.
+
+    Batch size follows a base + perItem gas model, measured with
+    estimate_gas and refined from receipts, against a fraction of the block
+    gas limit. Confirmed ranges are checkpointed so a run can resume.
+    """
+
+    def __init__(
+        self,
+        token,
+        account,
+        to=None,
+        checkpointPath=None,
+        window=4,
+        gasFraction=0.5,
+        gasMargin=1.2,
+        maxBatchSize=1000,
+    ):
+        self.token = token
+        self.account = account
+        self.to = to or account.address
+        self.gasMargin = gasMargin
+        self.maxBatchSize = maxBatchSize
+        self.gasBudget = int(web3.eth.get_block("latest").gasLimit * gasFraction)
+
+        self.baseGas = None
+        self.perItemGas = None
+
+        self.batches = {}
+        self.retries = queue.SimpleQueue()
+        # keys of retried batches reverting at estimation, never sent
+        self.failedRetries = []
+        self._receipts = queue.SimpleQueue()
+        self.minted = 0
+        self.elapsed = 0
+
+        self.checkpoint = Checkpoint(checkpointPath)
+        self.pipeline = TxPipeline(
+            account,
+            window=window,
+            checkpoint=self.checkpoint,
+            onReceipt=lambda key, receipt: self._receipts.put((key, receipt)),
+        )
+        self.ranges = confirmedRanges(self.checkpoint)
+
+    def _isConfirmed(self, tokenId):
+        return any(first <= tokenId <= last for first, last in self.ranges)
+
+    def _estimate(self, items):
+        return self.token.mintBatch.estimate_gas(
+            [self.to] * len(items),
+            [i for i, _ in items],
+            [u for _, u in items],
+            {"from": self.account},
+        )
+
+    def _measure(self, items):
+        small, large = items[:1], items[: min(len(items), 20)]
+        gasSmall = self._estimate(small)
+        if len(large) == 1:
+            self.perItemGas = gasSmall
+            self.baseGas = 0
+            return
+        gasLarge = self._estimate(large)
+        self.perItemGas = max(1, (gasLarge - gasSmall) // (len(large) - 1))
+        self.baseGas = max(0, gasSmall - self.perItemGas)
+
+    def batchSize(self):
+        size = (self.gasBudget - self.baseGas) / (self.perItemGas * self.gasMargin)
+        return max(1, min(self.maxBatchSize, int(size)))
+
+    def _processReceipts(self):
+        while True:
+            try:
+                key, receipt = self._receipts.get_nowait()
+            except queue.Empty:
+                return
+
+            items = self.batches.pop(key)
+            if receipt.status != 1:
+                self.retries.put(items)
+                continue
+
+            self.minted += len(items)
+            # follow increases at once (out of gas risk), decreases slowly
+            measured = (receipt.gasUsed - self.baseGas) // len(items)
+            self.perItemGas = max(measured, int(0.8 * self.perItemGas + 0.2 * measured))
+
+    def _send(self, items, estimate=False):
+        """Queue a batch, estimated retries reverting again are not sent."""
+        key = f"mint:{items[0][0]}-{items[-1][0]}"
+        data = self.token.mintBatch.encode_input(
+            [self.to] * len(items),
+            [i for i, _ in items],
+            [u for _, u in items],
+        )
+        if estimate:
+            try:
+                gas = self.pipeline.estimateGas(self.token.address, data)
+            except ValueError:
+                # e.g. ids minted meanwhile, counted failed and left to a rerun
+                self.failedRetries.append(key)
+                return
+        else:
+            gas = int((self.baseGas + self.perItemGas * len(items)) * self.gasMargin)
+            gas = min(gas, self.gasBudget)
+
+        self.batches[key] = items
+        self.pipeline.send(key, self.token.address, data, gas=gas)
+
+    def _batches(self, items):
+        batch = []
+        for item in items:
+            if self._isConfirmed(item[0]):
+                continue
+            # ids must be contiguous within a batch for range checkpoints
+            if batch and item[0] != batch[-1][0] + 1:
+                yield batch
+                batch = []
+            batch.append(item)
+            if self.perItemGas is None and len(batch) == 20:
+                self._measure(batch)
+            if self.perItemGas is not None and len(batch) >= self.batchSize():
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def mint(self, items):
+        startedAt = time.time()
+        for batch in self._batches(items):
+            if self.perItemGas is None:
+                self._measure(batch)
+            self._processReceipts()
+            self._send(batch)
+
+        # failed batches are retried once, after everything else
+        self.pipeline.drain()
+        self._processReceipts()
+        while not self.retries.empty():
+            self._send(self.retries.get(), estimate=True)
+        self.pipeline.join()
+        self._processReceipts()
+        self.elapsed = time.time() - startedAt
+
+        self.ranges = confirmedRanges(self.checkpoint)
+        return lastConfirmedId(self.ranges)
+
+    def report(self):
+        click.echo(
+            f"""
+            -------- Mint --------
+                Minted: {self.minted}
+           LastTokenId: {lastConfirmedId(self.ranges)}
+               Batches: {self.pipeline.confirmed}
+                Failed: {len(self.pipeline.failures) + len(self.failedRetries)}
+            PerItemGas: {self.perItemGas}
+             BatchSize: {self.batchSize() if self.perItemGas else '-'}
+              Gas/item: {self.pipeline.gasUsed // max(1, self.minted)}
+             Items/sec: {self.minted / self.elapsed if self.elapsed else 0:.2f}
+            ----------------------
+         """
+        )
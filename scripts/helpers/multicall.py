@@ -0,0 +1,366 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import eth_abi
+from eth_utils import keccak, to_checksum_address
+
+from brownie import accounts, web3
+
+from scripts.helpers.codec import RENTAL_CONDITIONS_TUPLE, selector, signatureTypes
+from scripts.helpers.local_stack import isDevelopment
+from scripts.sdk.structs import RentalConditions
+from scripts.sdk.words import decodeAggregate3
+
+# canonical Multicall3, same address on most chains
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3 = keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+_localMulticall = None
+
+
+class Call(NamedTuple):
+    target: str
+    signature: str
+    args: tuple
+    outputTypes: tuple
+
+    def encode(self):
+        return selector(self.signature) + eth_abi.encode_abi(
+            signatureTypes(self.signature), self.args
+        )
+
+    def decode(self, data):
+        values = eth_abi.decode_abi(self.outputTypes, data)
+        return values[0] if len(values) == 1 else values
+
+
+def getMulticall():
+    """Multicall3 address, a local one is deployed on development chains."""
+    global _localMulticall
+
+    if web3.eth.get_code(MULTICALL3):
+        return MULTICALL3
+
+    if not isDevelopment():
+        raise ValueError("Multicall3 not deployed on this chain")
+
+    # reverted away by a chain revert (e.g. test isolation)
+    if _localMulticall is None or not web3.eth.get_code(_localMulticall):
+        from brownie import Multicall3
+
+        _localMulticall = Multicall3.deploy({"from": accounts[0]}).address
+
+    return _localMulticall
+
+
+class Multicall:
+    """Pack many view calls into aggregate3 calls run on a fixed thread pool.
+
+    With an AsyncRpc the aggregate3 calls go out as one JSON-RPC batch
+    instead. Failed calls (e.g. owner() on a non ownable contract) return None.
+    """
+
+    def __init__(
+        self, address=None, batchSize=500, workers=8, block="latest", rpc=None
+    ):
+        self.address = address or getMulticall()
+        self.batchSize = batchSize
+        self.block = block
+        self.rpc = rpc
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.roundTrips = 0
+        self._lock = threading.Lock()
+
+    def _encode(self, calls):
+        return AGGREGATE3 + eth_abi.encode_abi(
+            ["(address,bool,bytes)[]"],
+            [[(c.target, True, c.encode()) for c in calls]],
+        )
+
+    def _decode(self, calls, raw):
+        (results,) = eth_abi.decode_abi(["(bool,bytes)[]"], raw)
+        return [
+            c.decode(returnData) if success and returnData else None
+            for c, (success, returnData) in zip(calls, results)
+        ]
+
+    def _aggregate(self, calls, raw=False):
+        data = web3.eth.call(
+            {"to": self.address, "data": self._encode(calls)}, self.block
+        )
+
+        with self._lock:
+            self.roundTrips += 1
+
+        return decodeAggregate3(data) if raw else self._decode(calls, data)
+
+    def _rpcBlock(self):
+        return hex(self.block) if isinstance(self.block, int) else self.block
+
+    def call(self, calls, batchSize=None, raw=False):
+        """Decoded results, `batchSize` overrides the calls per aggregate3.
+
+        With raw, the return data of each call as a memoryview (None when
+        failed) for the caller to decode, see scripts/sdk.
+        """
+        calls = list(calls)
+        batchSize = batchSize or self.batchSize
+        batches = [calls[i : i + batchSize] for i in range(0, len(calls), batchSize)]
+
+        results = []
+        if self.rpc is not None:
+            raws = self.rpc.map(
+                "eth_call",
+                [
+                    (
+                        {"to": self.address, "data": "0x" + self._encode(b).hex()},
+                        self._rpcBlock(),
+                    )
+                    for b in batches
+                ],
+            )
+            # one round trip, the JSON-RPC batches of a map are sent at once
+            with self._lock:
+                self.roundTrips += 1
+            for batch, data in zip(batches, raws):
+                data = bytes.fromhex(data[2:])
+                results.extend(
+                    decodeAggregate3(data) if raw else self._decode(batch, data)
+                )
+            return results
+
+        for batch in self.pool.map(lambda b: self._aggregate(b, raw), batches):
+            results.extend(batch)
+        return results
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class TokenState(NamedTuple):
+    tokenAddress: str
+    tokenId: int
+    rentalConditions: RentalConditions
+    expiresAt: int
+    isExpired: bool
+
+
+class Collection(NamedTuple):
+    tokenAddress: str
+    oRentable: str
+    wRentable: str
+    library: str
+
+
+class ProtocolState(NamedTuple):
+    governance: str
+    pendingGovernance: str
+    operator: str
+    walletFactory: str
+    fee: int
+    feeCollector: str
+    paused: bool
+
+
+def _address(value):
+    return to_checksum_address(value) if value is not None else None
+
+
+def _rentalConditions(value):
+    if value is None:
+        return None
+    return RentalConditions(*value[:4], *(_address(a) for a in value[4:]))
+
+
+class RentableReader:
+    """Bulk reads of IRentable views and registry getters through Multicall."""
+
+    def __init__(self, rentable, multicall=None):
+        self.rentable = to_checksum_address(str(rentable))
+        self.multicall = multicall or Multicall()
+
+    def _call(self, signature, args, outputTypes):
+        return Call(self.rentable, signature, args, outputTypes)
+
+    def rentalConditions(self, pairs):
+        return [
+            _rentalConditions(v)
+            for v in self.multicall.call(
+                self._call(
+                    "rentalConditions(address,uint256)", p, (RENTAL_CONDITIONS_TUPLE,)
+                )
+                for p in pairs
+            )
+        ]
+
+    def expiresAt(self, pairs):
+        return self.multicall.call(
+            self._call("expiresAt(address,uint256)", p, ("uint256",)) for p in pairs
+        )
+
+    def isExpired(self, pairs):
+        return self.multicall.call(
+            self._call("isExpired(address,uint256)", p, ("bool",)) for p in pairs
+        )
+
+    def userWallet(self, users):
+        return [
+            _address(v)
+            for v in self.multicall.call(
+                self._call("userWallet(address)", (u,), ("address",)) for u in users
+            )
+        ]
+
+    def tokenStates(self, pairs):
+        """rentalConditions, expiresAt and isExpired for each pair in one pass."""
+        pairs = list(pairs)
+        calls = []
+        for p in pairs:
+            calls.append(
+                self._call(
+                    "rentalConditions(address,uint256)", p, (RENTAL_CONDITIONS_TUPLE,)
+                )
+            )
+            calls.append(self._call("expiresAt(address,uint256)", p, ("uint256",)))
+            calls.append(self._call("isExpired(address,uint256)", p, ("bool",)))
+
+        values = self.multicall.call(calls)
+        return [
+            TokenState(
+                _address(tokenAddress),
+                tokenId,
+                _rentalConditions(values[3 * i]),
+                values[3 * i + 1],
+                values[3 * i + 2],
+            )
+            for i, (tokenAddress, tokenId) in enumerate(pairs)
+        ]
+
+    def collections(self, tokenAddresses):
+        tokenAddresses = list(tokenAddresses)
+        calls = []
+        for t in tokenAddresses:
+            for getter in ("getORentable", "getWRentable", "getLibrary"):
+                calls.append(self._call(f"{getter}(address)", (t,), ("address",)))
+
+        values = [_address(v) for v in self.multicall.call(calls)]
+        return [
+            Collection(_address(t), *values[3 * i : 3 * i + 3])
+            for i, t in enumerate(tokenAddresses)
+        ]
+
+    def protocol(self):
+        values = self.multicall.call(
+            [
+                self._call("getGovernance()", (), ("address",)),
+                self._call("getPendingGovernance()", (), ("address",)),
+                self._call("getOperator()", (), ("address",)),
+                self._call("getWalletFactory()", (), ("address",)),
+                self._call("getFee()", (), ("uint16",)),
+                self._call("getFeeCollector()", (), ("address",)),
+                self._call("paused()", (), ("bool",)),
+            ]
+        )
+        return ProtocolState(
+            *(_address(v) for v in values[:4]),
+            values[4],
+            _address(values[5]),
+            values[6],
+        )
+
+
+def owners(multicall, addresses):
+    """IOwnable.owner() for each address, None when not ownable."""
+    return [
+        _address(v)
+        for v in multicall.call(Call(a, "owner()", (), ("address",)) for a in addresses)
+    ]
+
+
+# tokens read per aggregate3 by the pagers, keeps eth_call under the node gas
+# cap (50M on geth): about 2.5k gas per enumerated token, 6k with expiresAt
+TOKENS_PER_CALL = 5000
+
+
+def ownedTokensCount(multicall, token, owners):
+    return multicall.call(
+        Call(token, "ownedTokensCount(address)", (o,), ("uint256",)) for o in owners
+    )
+
+
+def enumeratedTokens(multicall, token, owner):
+    """ownedTokensCount of one owner, fails on tokens without enumeration."""
+    (count,) = ownedTokensCount(multicall, token, [owner])
+    if count is None:
+        raise ValueError(
+            f"{token} has no owner enumeration, upgrade it and enableEnumeration"
+        )
+    return count
+
+
+def readPages(multicall, calls, pageSize, raw=False):
+    """Results of paged calls, TOKENS_PER_CALL tokens per aggregate3.
+
+    Failed pages (e.g. out of gas late in a large aggregate3) are retried
+    one per aggregate3, a page failing again raises.
+    """
+    calls = list(calls)
+    pages = multicall.call(
+        calls, batchSize=max(1, TOKENS_PER_CALL // pageSize), raw=raw
+    )
+
+    failed = [i for i, page in enumerate(pages) if page is None]
+    if failed:
+        retried = multicall.call([calls[i] for i in failed], batchSize=1, raw=raw)
+        for i, page in zip(failed, retried):
+            if page is None:
+                call = calls[i]
+                raise ValueError(
+                    f"{call.signature} failed on {call.target} with {call.args}"
+                )
+            pages[i] = page
+    return pages
+
+
+def tokensOfOwner(multicall, token, owner, pageSize=1000):
+    """Token ids of `owner` in an O/W token, all the pages read in one pass."""
+    count = enumeratedTokens(multicall, token, owner)
+    pages = readPages(
+        multicall,
+        (
+            Call(
+                token,
+                "tokensOfOwner(address,uint256,uint256)",
+                (owner, offset, pageSize),
+                ("uint256[]",),
+            )
+            for offset in range(0, count, pageSize)
+        ),
+        pageSize,
+    )
+    return [tokenId for page in pages for tokenId in page]
+
+
+def activeRentalsOf(multicall, wtoken, user, pageSize=500):
+    """(tokenId, expiresAt) of the rentals of `user` not expired yet."""
+    count = enumeratedTokens(multicall, wtoken, user)
+    pages = readPages(
+        multicall,
+        (
+            Call(
+                wtoken,
+                "activeRentalsOf(address,uint256,uint256)",
+                (user, offset, pageSize),
+                ("uint256[]", "uint256[]"),
+            )
+            for offset in range(0, count, pageSize)
+        ),
+        pageSize,
+    )
+    return [
+        (tokenId, expiresAt)
+        for tokenIds, expirations in pages
+        for tokenId, expiresAt in zip(tokenIds, expirations)
+    ]
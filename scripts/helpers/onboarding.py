@@ -0,0 +1,254 @@
+import json
+import os
+import time
+
+import click
+from eth_utils import to_checksum_address
+
+from brownie import (
+    ORentable,
+    WRentable,
+    ImmutableAdminUpgradeableBeaconProxy,
+    web3,
+)
+
+from scripts.helpers.deploy_engine import createAddress, deployData
+from scripts.helpers.multicall import RentableReader
+from scripts.helpers.pipeline import TxPipeline
+
+
+def _isSet(address):
+    return address is not None and int(address, 16) != 0
+
+
+class CollectionOnboarding:
+    """Wire many collections to Rentable in one pipelined run.
+
+    O/W beacon proxies are deployed with their initializer in the
+    constructor, all sent at once with pre-assigned nonces. Setters are
+    packed in governanceMulticall batches, or returned as calldata when
+    the account is not governance.
+
+    Runs resume per step: setters already applied on chain are skipped and
+    proxies predicted by an earlier run (journaled at `checkpointPath`) are
+    reused once deployed, instead of deploying new ones.
+    """
+
+    def __init__(
+        self,
+        rentable,
+        proxyAdmin,
+        oBeacon,
+        wBeacon,
+        account,
+        governance=None,
+        window=64,
+        batchSize=60,
+        checkpointPath=None,
+    ):
+        self.rentable = rentable
+        self.proxyAdmin = proxyAdmin
+        self.oBeacon = oBeacon
+        self.wBeacon = wBeacon
+        self.account = account
+        self.governance = governance or rentable.getGovernance()
+        self.window = window
+        self.batchSize = batchSize
+
+        # token => {"o", "w", "gas", "confirmedAt"}
+        self.collections = {}
+        self.deferred = []
+        self.elapsed = 0
+
+        # token => {"o", "w"} proxy addresses predicted by earlier runs
+        self.checkpointPath = checkpointPath
+        self.proxies = {}
+        if checkpointPath is not None and os.path.exists(checkpointPath):
+            with open(checkpointPath) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        proxies = self.proxies.setdefault(entry["token"], {})
+                        proxies[entry["kind"]] = entry["address"]
+
+    def _journalProxy(self, token, kind, address):
+        # written before the deploy is sent, a failed run still finds it
+        self.proxies.setdefault(token, {})[kind] = address
+        if self.checkpointPath is None:
+            return
+        os.makedirs(
+            os.path.dirname(os.path.abspath(self.checkpointPath)), exist_ok=True
+        )
+        with open(self.checkpointPath, "a") as f:
+            f.write(json.dumps({"token": token, "kind": kind, "address": address}))
+            f.write("\n")
+
+    def _steps(self, tokens, library):
+        """token => (proxies to deploy, setters to call), wired tokens left out.
+
+        Proxy addresses already known, on chain or journaled and deployed,
+        are filled in self.collections.
+        """
+        reader = RentableReader(self.rentable)
+        existing = reader.collections(tokens)
+        reader.multicall.close()
+
+        steps = {}
+        for token, current in zip(tokens, existing):
+            c = {"gas": 0}
+            deploy, setters = [], []
+            for kind, wired in (("o", current.oRentable), ("w", current.wRentable)):
+                if _isSet(wired):
+                    c[kind] = wired
+                    continue
+                setters.append(kind)
+                proxy = self.proxies.get(token, {}).get(kind)
+                if proxy is not None and len(web3.eth.get_code(proxy)) > 0:
+                    c[kind] = proxy
+                else:
+                    deploy.append(kind)
+            if library is not None and current.library != library:
+                setters.append("library")
+
+            if setters:
+                self.collections[token] = c
+                steps[token] = (deploy, setters)
+        return steps
+
+    def _proxyData(self, beacon, logic, token):
+        return deployData(
+            ImmutableAdminUpgradeableBeaconProxy,
+            beacon,
+            self.proxyAdmin,
+            logic.initialize.encode_input(token, self.governance, self.rentable),
+        )
+
+    def _setterCalls(self, token, setters, library):
+        c = self.collections[token]
+        calls = []
+        if "o" in setters:
+            calls.append(self.rentable.setORentable.encode_input(token, c["o"]))
+        if "w" in setters:
+            calls.append(self.rentable.setWRentable.encode_input(token, c["w"]))
+        if "library" in setters:
+            calls.append(self.rentable.setLibrary.encode_input(token, library))
+        return calls
+
+    def _confirmed(self, receipts, key, step):
+        """(receipt, confirmedAt) of a sent step, raises naming it otherwise."""
+        if key not in receipts:
+            raise ValueError(f"{step} ({key}) dropped, its nonce was used elsewhere")
+        receipt, confirmedAt = receipts[key]
+        if receipt.status != 1:
+            raise ValueError(
+                f"{step} ({key}) reverted in {receipt.transactionHash.hex()}"
+            )
+        return receipt, confirmedAt
+
+    def onboard(self, tokens, library=None):
+        tokens = [to_checksum_address(str(t)) for t in tokens]
+        if library is not None:
+            library = to_checksum_address(str(library))
+
+        # skip what is already wired, per step
+        steps = self._steps(tokens, library)
+        tokens = [t for t in tokens if t in steps]
+        if not tokens:
+            return []
+
+        startedAt = time.time()
+        receipts = {}
+        # a resynced nonce would deploy away from the predicted addresses
+        pipeline = TxPipeline(
+            self.account,
+            window=self.window,
+            resync=False,
+            onReceipt=lambda key, receipt: receipts.__setitem__(
+                key, (receipt, time.time())
+            ),
+        )
+
+        # 1. missing proxies, addresses known from the pre-assigned nonces
+        beacons = {"o": (self.oBeacon, ORentable), "w": (self.wBeacon, WRentable)}
+        for token in tokens:
+            c = self.collections[token]
+            c["confirmedAt"] = startedAt
+            for kind in steps[token][0]:
+                beacon, logic = beacons[kind]
+                c[kind] = createAddress(self.account.address, pipeline.nonce)
+                self._journalProxy(token, kind, c[kind])
+                pipeline.send(
+                    f"{token}:{kind}",
+                    None,
+                    self._proxyData(beacon, logic, token),
+                )
+        pipeline.drain()
+
+        for token in tokens:
+            c = self.collections[token]
+            for kind in steps[token][0]:
+                receipt, confirmedAt = self._confirmed(
+                    receipts, f"{token}:{kind}", f"{kind.upper()}Rentable proxy"
+                )
+                if receipt.contractAddress != c[kind]:
+                    raise ValueError(
+                        f"{kind.upper()}Rentable proxy of {token} deployed at"
+                        f" {receipt.contractAddress}, predicted {c[kind]}"
+                    )
+                c["gas"] += receipt.gasUsed
+                c["confirmedAt"] = max(c["confirmedAt"], confirmedAt)
+
+        # 2. setters, batched
+        isGovernance = self.governance == self.account.address
+        for start in range(0, len(tokens), self.batchSize):
+            batch = tokens[start : start + self.batchSize]
+            calls = [
+                call
+                for t in batch
+                for call in self._setterCalls(t, steps[t][1], library)
+            ]
+            data = self.rentable.governanceMulticall.encode_input(calls)
+            if not isGovernance:
+                self.deferred.append((self.rentable.address, data))
+                continue
+            pipeline.send(f"setters:{start}", self.rentable.address, data)
+        pipeline.drain()
+        pipeline.join()
+
+        # deferred setters were not sent
+        for start in range(0, len(tokens) if isGovernance else 0, self.batchSize):
+            receipt, confirmedAt = self._confirmed(
+                receipts, f"setters:{start}", "governanceMulticall setters"
+            )
+            batch = tokens[start : start + self.batchSize]
+            for t in batch:
+                c = self.collections[t]
+                c["gas"] += receipt.gasUsed // len(batch)
+                c["confirmedAt"] = max(c["confirmedAt"], confirmedAt)
+
+        for t in tokens:
+            self.collections[t]["elapsed"] = (
+                self.collections[t]["confirmedAt"] - startedAt
+            )
+        self.elapsed = time.time() - startedAt
+        return tokens
+
+    def report(self):
+        for token, c in self.collections.items():
+            click.echo(
+                f"  {token}: O {c['o']} W {c['w']}"
+                f" gas {c['gas']} time {c['elapsed']:.2f} s"
+            )
+
+        totalGas = sum(c["gas"] for c in self.collections.values())
+        click.echo(
+            f"""
+            -------- Onboarding --------
+           Collections: {len(self.collections)}
+              TotalGas: {totalGas}
+        Gas/collection: {totalGas // max(1, len(self.collections))}
+               Elapsed: {self.elapsed:.2f} s
+              Deferred: {len(self.deferred)} governance batches
+            ----------------------------
+         """
+        )
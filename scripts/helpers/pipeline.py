@@ -0,0 +1,429 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import click
+
+from brownie import web3
+from web3.exceptions import TransactionNotFound
+
+from scripts.helpers.fees import (
+    BUMP_DENOMINATOR,
+    BUMP_NUMERATOR,
+    CostReport,
+    FeeEstimator,
+    Fees,
+    london,
+)
+
+# node errors meaning the nonce was consumed, by us or another sender
+NONCE_ERRORS = ("nonce too low", "already known", "known transaction")
+
+
+def _errorMessage(error):
+    message = error.args[0] if error.args else ""
+    if isinstance(message, dict):
+        message = message.get("message", "")
+    return str(message).lower()
+
+
+def isNonceError(error):
+    message = _errorMessage(error)
+    return any(m in message for m in NONCE_ERRORS)
+
+
+class Checkpoint:
+    """Append-only journal of sent/confirmed operations, used to resume runs."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.sent = {}  # key => tx hashes (replacements last), not confirmed yet
+        self.confirmed = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is None:
+            return
+
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        self._replay(json.loads(line))
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a")
+
+    def _replay(self, entry):
+        key = entry["key"]
+        if entry["status"] == "sent":
+            self.sent.setdefault(key, []).append(entry["tx"])
+        elif entry["status"] == "confirmed":
+            self.confirmed.add(key)
+            self.sent.pop(key, None)
+        else:
+            self.sent.pop(key, None)
+
+    def _append(self, entry):
+        with self._lock:
+            self._replay(entry)
+            if self._file is not None:
+                self._file.write(json.dumps(entry) + "\n")
+                self._file.flush()
+
+    def isDone(self, key):
+        return key in self.confirmed
+
+    def markSent(self, key, txHash):
+        self._append({"key": key, "status": "sent", "tx": txHash})
+
+    def markConfirmed(self, key, txHash):
+        self._append({"key": key, "status": "confirmed", "tx": txHash})
+
+    def markFailed(self, key, txHash):
+        self._append({"key": key, "status": "failed", "tx": txHash})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TxPipeline:
+    """Send many transactions from one account without waiting for each receipt.
+
+    Nonces are assigned locally, at most `window` transactions are in flight
+    and receipts are confirmed by a background thread in nonce order.
+
+    Without `gasPrice` transactions are type-2, priced by `fees` (a
+    FeeEstimator) and never above `maxFeePerGas`. The oldest one still
+    pending after `stuckBlocks` blocks is replaced with bumped fees, up to
+    `replaceRetries` rejected replacements. A transaction whose nonce was
+    taken by another sender is dropped from the window and counted failed.
+
+    A send rejected for its nonce is retried once past our in-flight
+    nonces, unless `resync` is off for callers that pre-assigned nonces
+    (e.g. predicted CREATE addresses), then the error is raised.
+    """
+
+    def __init__(
+        self,
+        account,
+        window=32,
+        gasPrice=None,
+        checkpoint=None,
+        pollInterval=0.2,
+        gasMargin=1.2,
+        onReceipt=None,
+        fees=None,
+        maxFeePerGas=None,
+        stuckBlocks=3,
+        replaceRetries=5,
+        resync=True,
+    ):
+        self.account = account
+        self.window = window
+        self.gasPrice = gasPrice
+        self.fees = None
+        if gasPrice is None:
+            if london():
+                self.fees = fees or FeeEstimator()
+            else:
+                self.gasPrice = web3.eth.gas_price
+        self.maxFeePerGas = maxFeePerGas
+        self.stuckBlocks = stuckBlocks
+        self.replaceRetries = replaceRetries
+        self.resync = resync
+        self.checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+        self.pollInterval = pollInterval
+        self.gasMargin = gasMargin
+        # called from the confirmer thread with (key, receipt)
+        self.onReceipt = onReceipt
+
+        self.chainId = web3.eth.chain_id
+        self._privateKey = getattr(account, "private_key", None)
+
+        # stats
+        self.sent = 0
+        self.confirmed = 0
+        self.skipped = 0
+        self.gasUsed = 0
+        self.failures = []
+        self.costs = CostReport()
+
+        self._inflight = deque()
+        self._cond = threading.Condition()
+        # nonce assignment and sends, from the caller and the confirmer thread
+        self._sendLock = threading.Lock()
+        self._closing = False
+
+        self._reconcile()
+
+        self.nonce = web3.eth.get_transaction_count(account.address, "pending")
+        self.startedAt = time.time()
+
+        self._confirmer = threading.Thread(target=self._confirmLoop, daemon=True)
+        self._confirmer.start()
+
+    def _reconcile(self):
+        # resolve what a previous (crashed) run left in flight
+        for key, hashes in list(self.checkpoint.sent.items()):
+            receipt = self._waitReceipt(hashes)
+            if receipt is not None and receipt.status == 1:
+                self.checkpoint.markConfirmed(key, receipt.transactionHash.hex())
+            else:
+                self.checkpoint.markFailed(key, hashes[-1])
+
+    def _receipt(self, hashes):
+        # at most one of a transaction and its replacements is mined
+        for txHash in hashes:
+            try:
+                return web3.eth.get_transaction_receipt(txHash)
+            except TransactionNotFound:
+                pass
+        return None
+
+    def _pending(self, hashes):
+        for txHash in hashes:
+            try:
+                web3.eth.get_transaction(txHash)
+                return True
+            except TransactionNotFound:
+                pass
+        return False
+
+    def _waitReceipt(self, hashes):
+        while True:
+            receipt = self._receipt(hashes)
+            if receipt is not None:
+                return receipt
+            if not self._pending(hashes):
+                # dropped from the mempool, never mined
+                return None
+            time.sleep(self.pollInterval)
+
+    def _price(self):
+        if self.fees is None:
+            return {"gasPrice": self.gasPrice}
+
+        fees = self.fees.estimate()
+        if self.maxFeePerGas is not None:
+            fees = fees._replace(maxFeePerGas=min(fees.maxFeePerGas, self.maxFeePerGas))
+        return fees.params()
+
+    def _replace(self, entry):
+        """Resend a stuck transaction with the same nonce and bumped fees.
+
+        Returns True when the transaction can't be mined anymore, its nonce
+        was used by another transaction.
+        """
+        key, hashes, tx, sentAt, errors = entry
+        block = web3.eth.block_number
+        if sentAt is None:
+            entry[3] = block
+            return False
+        if block - sentAt < self.stuckBlocks:
+            return False
+        if errors >= self.replaceRetries:
+            # no more replacements, wait for the last one or its drop
+            entry[3] = block
+            return not self._pending(hashes)
+
+        tx = dict(tx)
+        if self.fees is None:
+            tx["gasPrice"] = tx["gasPrice"] * BUMP_NUMERATOR // BUMP_DENOMINATOR + 1
+        else:
+            bumped = Fees(0, tx["maxFeePerGas"], tx["maxPriorityFeePerGas"]).bump()
+            fees = self.fees.estimate(fresh=True)
+            tx["maxPriorityFeePerGas"] = max(
+                bumped.maxPriorityFeePerGas, fees.maxPriorityFeePerGas
+            )
+            tx["maxFeePerGas"] = max(bumped.maxFeePerGas, fees.maxFeePerGas)
+            if self.maxFeePerGas is not None and tx["maxFeePerGas"] > self.maxFeePerGas:
+                # over the ceiling, keep waiting for the base fee to drop
+                entry[3] = block
+                return False
+
+        try:
+            with self._sendLock:
+                txHash = self._sendRaw(tx).hex()
+        except ValueError as error:
+            entry[3] = block
+            entry[4] += 1
+            if not isNonceError(error) or self._receipt(hashes) is not None:
+                # not accepted, or mined meanwhile, checked again
+                return False
+            # the nonce is used, by another sender unless ours is still mining
+            return not self._pending(hashes)
+
+        self.checkpoint.markSent(key, txHash)
+        with self._cond:
+            hashes.append(txHash)
+            entry[2] = tx
+            entry[3] = block
+            self.costs.replaced += 1
+        return False
+
+    def _confirmLoop(self):
+        while True:
+            with self._cond:
+                while not self._inflight and not self._closing:
+                    self._cond.wait()
+                if not self._inflight:
+                    return
+                entry = self._inflight[0]
+                key, hashes, tx = entry[0], list(entry[1]), entry[2]
+
+            receipt = self._receipt(hashes)
+            if receipt is None:
+                if not self._replace(entry):
+                    time.sleep(self.pollInterval)
+                    continue
+                # nonce used elsewhere, unless ours was mined meanwhile
+                receipt = self._receipt(hashes)
+                if receipt is None:
+                    self._drop(entry)
+                    continue
+            txHash = receipt.transactionHash.hex()
+
+            if receipt.status == 1:
+                self.checkpoint.markConfirmed(key, txHash)
+            else:
+                self.checkpoint.markFailed(key, txHash)
+
+            # before leaving the window, so drain() also waits for callbacks
+            if self.onReceipt is not None:
+                self.onReceipt(key, receipt)
+
+            with self._cond:
+                self._inflight.popleft()
+                self.gasUsed += receipt.gasUsed
+                self.costs.addReceipt(receipt, tx.get("gasPrice"))
+                if receipt.status == 1:
+                    self.confirmed += 1
+                else:
+                    self.failures.append((key, txHash))
+                self._cond.notify_all()
+
+    def _drop(self, entry):
+        key, hashes = entry[0], entry[1]
+        self.checkpoint.markFailed(key, hashes[-1])
+        with self._cond:
+            self._inflight.popleft()
+            self.failures.append((key, hashes[-1]))
+            self._cond.notify_all()
+
+    def _sendRaw(self, tx):
+        if self._privateKey is None:
+            tx["from"] = self.account.address
+            return web3.eth.send_transaction(tx)
+
+        signed = web3.eth.account.sign_transaction(tx, self._privateKey)
+        try:
+            return web3.eth.send_raw_transaction(signed.rawTransaction)
+        except ValueError as error:
+            if "known" in _errorMessage(error):
+                # this very transaction is in the pool already, e.g. a retried send
+                return signed.hash
+            raise
+
+    def estimateGas(self, to, data, value=0):
+        call = {"from": self.account.address, "data": data, "value": value}
+        if to is not None:
+            call["to"] = to
+        return int(web3.eth.estimate_gas(call) * self.gasMargin)
+
+    def send(self, key, to, data, value=0, gas=None):
+        """Queue a transaction, blocking while the in-flight window is full.
+
+        Returns the tx hash, or None when `key` is already confirmed.
+        """
+        if self.checkpoint.isDone(key):
+            self.skipped += 1
+            return None
+
+        with self._cond:
+            while len(self._inflight) >= self.window:
+                self._cond.wait()
+
+        if gas is None:
+            gas = self.estimateGas(to, data, value)
+
+        with self._sendLock:
+            tx = {
+                "data": data,
+                "value": value,
+                "gas": gas,
+                "nonce": self.nonce,
+                "chainId": self.chainId,
+                **self._price(),
+            }
+            if to is not None:
+                # None deploys a contract
+                tx["to"] = to
+
+            try:
+                txHash = self._sendRaw(tx)
+            except ValueError as error:
+                if not self.resync or not isNonceError(error):
+                    raise
+                # local nonce used by another sender, resync past our own
+                # in-flight nonces and retry once
+                tx["nonce"] = max(
+                    web3.eth.get_transaction_count(self.account.address, "pending"),
+                    self.nonce + 1,
+                )
+                txHash = self._sendRaw(tx)
+
+            txHash = txHash.hex()
+            self.nonce = tx["nonce"] + 1
+        self.checkpoint.markSent(key, txHash)
+
+        with self._cond:
+            self._inflight.append([key, [txHash], tx, None, 0])
+            self.sent += 1
+            self._cond.notify_all()
+
+        return txHash
+
+    def rate(self):
+        elapsed = time.time() - self.startedAt
+        return self.confirmed / elapsed if elapsed > 0 else 0.0
+
+    def inflight(self):
+        with self._cond:
+            return len(self._inflight)
+
+    def drain(self):
+        """Wait for every in-flight transaction, keeping the pipeline open."""
+        with self._cond:
+            while self._inflight:
+                self._cond.wait()
+
+    def join(self):
+        """Wait for every in-flight transaction to be confirmed."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._confirmer.join()
+        self.checkpoint.close()
+
+    def report(self, label="tx"):
+        elapsed = time.time() - self.startedAt
+        click.echo(
+            f"""
+            -------- Stats --------
+                  Sent: {self.sent}
+             Confirmed: {self.confirmed}
+               Skipped: {self.skipped}
+                Failed: {len(self.failures)}
+              Replaced: {self.costs.replaced}
+              TotalGas: {self.gasUsed}
+             Total Fee: {self.costs.cost/1e18} ETH
+               Elapsed: {elapsed:.2f} s
+            Throughput: {self.rate():.2f} {label}/s
+            -----------------------
+         """
+        )
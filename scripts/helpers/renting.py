@@ -0,0 +1,100 @@
+from typing import NamedTuple
+
+from eth_utils import to_checksum_address
+
+from scripts.helpers.local_stack import batchAt, eth
+from scripts.helpers.multicall import RentableReader
+
+
+class RentItem(NamedTuple):
+    tokenAddress: str
+    tokenId: int
+    duration: int
+
+
+class RentQuote(NamedTuple):
+    items: list  # rentable RentItems
+    dues: list  # (paymentTokenAddress, paymentTokenId, amount) per item
+    rejected: list  # (RentItem, revert reason)
+
+    def amounts(self):
+        """Total due per (paymentTokenAddress, paymentTokenId)."""
+        amounts = {}
+        for paymentTokenAddress, paymentTokenId, amount in self.dues:
+            key = (paymentTokenAddress, paymentTokenId)
+            amounts[key] = amounts.get(key, 0) + amount
+        return amounts
+
+    def value(self, start=0, end=None):
+        """ETH to send for items[start:end]."""
+        return sum(a for t, _, a in self.dues[start:end] if t == eth)
+
+
+def quoteRentBatch(reader, items, renter):
+    """Check items against Rentable.rent rules and total what is due.
+
+    Rejected items carry the revert reason the contract would give, so a
+    batch can be sent without them instead of reverting as a whole.
+    """
+    items = [RentItem(to_checksum_address(a), int(t), int(d)) for a, t, d in items]
+    renter = to_checksum_address(str(renter))
+    states = reader.tokenStates((i.tokenAddress, i.tokenId) for i in items)
+
+    accepted, dues, rejected, seen = [], [], [], set()
+    for item, state in zip(items, states):
+        rc = state.rentalConditions
+        key = (item.tokenAddress, item.tokenId)
+        if rc is None or rc.maxTimeDuration == 0:
+            reason = "Not available"
+        elif not state.isExpired or key in seen:
+            reason = "Current rent still pending"
+        elif item.duration == 0:
+            reason = "Duration cannot be zero"
+        elif item.duration < rc.minTimeDuration:
+            reason = "Duration lower than conditions"
+        elif item.duration > rc.maxTimeDuration:
+            reason = "Duration greater than conditions"
+        elif rc.privateRenter not in (eth, renter):
+            reason = "Rental reserved for another user"
+        else:
+            reason = None
+
+        if reason is not None:
+            rejected.append((item, reason))
+            continue
+
+        seen.add(key)
+        accepted.append(item)
+        dues.append(
+            (
+                rc.paymentTokenAddress,
+                rc.paymentTokenId,
+                rc.pricePerSecond * item.duration,
+            )
+        )
+
+    return RentQuote(accepted, dues, rejected)
+
+
+def rentBatch(rentable, items, renter, reader=None, batchSize=40):
+    """Rent items with rentBatch, `batchSize` per transaction.
+
+    ERC20 and ERC1155 payments need the usual approvals to Rentable.
+    Returns (transactions, quote).
+    """
+    reader = reader or RentableReader(rentable)
+    quote = quoteRentBatch(reader, items, renter)
+    batchRentable = batchAt(rentable)
+
+    txs = []
+    for start in range(0, len(quote.items), batchSize):
+        batch = quote.items[start : start + batchSize]
+        txs.append(
+            batchRentable.rentBatch(
+                [i.tokenAddress for i in batch],
+                [i.tokenId for i in batch],
+                [i.duration for i in batch],
+                {"from": renter, "value": quote.value(start, start + batchSize)},
+            )
+        )
+    return txs, quote
@@ -0,0 +1,431 @@
+import json
+import os
+import time
+from typing import NamedTuple
+
+import click
+import eth_abi
+from eth_utils import to_checksum_address
+
+from brownie import web3
+
+from scripts.helpers.codec import abiSignature, loadAbi, selector
+
+# blocks per eth_getLogs request of the export
+LOG_CHUNK = 2000
+
+# status of a transaction the node refused to mine (e.g. not enough ETH)
+REJECTED = -1
+
+
+class ReplayError(Exception):
+    """JSON-RPC error of the node, args[0] is the error object."""
+
+
+class ReplayTx(NamedTuple):
+    hash: str
+    blockNumber: int
+    timestamp: int
+    sender: str
+    to: str
+    value: int
+    input: str
+    gas: int  # gas limit sent on chain
+    gasUsed: int
+    status: int
+
+
+class Outcome(NamedTuple):
+    gasUsed: int
+    status: int
+    error: str = None
+
+
+def _rpc(method, params, w3=None):
+    response = (w3 or web3).provider.make_request(method, list(params))
+    if "error" in response:
+        raise ReplayError(response["error"])
+    return response["result"]
+
+
+def _word(value):
+    return "0x" + int(value, 16).to_bytes(32, "big").hex()
+
+
+def saveJson(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def loadJson(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def saveBundle(path, transactions, **meta):
+    saveJson(path, dict(meta, transactions=[t._asdict() for t in transactions]))
+
+
+def loadBundle(path):
+    """(metadata, transactions) of a bundle written by saveBundle."""
+    bundle = loadJson(path)
+    transactions = [ReplayTx(**t) for t in bundle.pop("transactions")]
+    return bundle, transactions
+
+
+# ---------- export, needs the source chain ----------
+
+
+def rentableTransactions(rentable, fromBlock, toBlock, chunk=LOG_CHUNK):
+    """Hashes of the transactions emitting Rentable events, in chain order.
+
+    Reverted transactions emit no event and are not part of the traffic.
+    """
+    positions = {}
+    for start in range(fromBlock, toBlock + 1, chunk):
+        logs = web3.eth.get_logs(
+            {
+                "address": rentable,
+                "fromBlock": start,
+                "toBlock": min(start + chunk - 1, toBlock),
+            }
+        )
+        for log in logs:
+            positions.setdefault(
+                log.transactionHash.hex(), (log.blockNumber, log.transactionIndex)
+            )
+    return sorted(positions, key=positions.get)
+
+
+def bundleTransactions(hashes):
+    timestamps = {}
+    transactions = []
+    for txHash in hashes:
+        tx = web3.eth.get_transaction(txHash)
+        receipt = web3.eth.get_transaction_receipt(txHash)
+        if tx.blockNumber not in timestamps:
+            timestamps[tx.blockNumber] = web3.eth.get_block(tx.blockNumber).timestamp
+        transactions.append(
+            ReplayTx(
+                tx.hash.hex(),
+                tx.blockNumber,
+                timestamps[tx.blockNumber],
+                tx["from"],
+                tx.to,
+                tx.value,
+                tx.input,
+                tx.gas,
+                receipt.gasUsed,
+                receipt.status,
+            )
+        )
+    return transactions
+
+
+def prestate(hashes, extra=(), block="latest"):
+    """Accounts and storage read by the transactions, as before the first one
+    touching each of them, plus the `extra` (address, slots) read at `block`.
+
+    Needs debug_traceTransaction with the prestateTracer (geth or erigon
+    archive node). Slots the bundle never reads are missing from the
+    snapshot, a candidate reading other existing slots sees zeros.
+    """
+    accounts = {}
+    for txHash in hashes:
+        trace = _rpc("debug_traceTransaction", [txHash, {"tracer": "prestateTracer"}])
+        for address, account in trace.items():
+            state = accounts.setdefault(
+                to_checksum_address(address),
+                {
+                    "balance": account.get("balance", "0x0"),
+                    "nonce": account.get("nonce", 0),
+                    "code": account.get("code", "0x"),
+                    "storage": {},
+                },
+            )
+            for slot, value in (account.get("storage") or {}).items():
+                state["storage"].setdefault(slot, value)
+
+    for address, slots in extra:
+        address = to_checksum_address(address)
+        state = accounts.setdefault(
+            address,
+            {
+                "balance": hex(web3.eth.get_balance(address, block)),
+                "nonce": web3.eth.get_transaction_count(address, block),
+                "code": web3.eth.get_code(address, block).hex(),
+                "storage": {},
+            },
+        )
+        for slot in slots:
+            state["storage"].setdefault(
+                hex(slot), web3.eth.get_storage_at(address, slot, block).hex()
+            )
+
+    return {"block": block, "accounts": accounts}
+
+
+# ---------- replay, offline ----------
+
+
+def _errorField(error, field):
+    return error.args[0].get(field) if isinstance(error.args[0], dict) else None
+
+
+def _minedHash(error):
+    """Hash of a reverted transaction mined anyway, dev nodes put it in the
+    error data (hardhat as txHash, ganache as key)."""
+    data = _errorField(error, "data")
+    if isinstance(data, dict):
+        if "txHash" in data:
+            return data["txHash"]
+        for key in data:
+            if key.startswith("0x") and len(key) == 66:
+                return key
+    return None
+
+
+class ReplayNode:
+    """Local node the bundles are replayed on.
+
+    State snapshots are loaded through the hardhat_* methods, served by
+    hardhat and anvil without forking, e.g. `yarn network:replay`. Other
+    dev nodes (ganache) can only replay their own traffic, between
+    evm_snapshot and evm_revert, timestamps there are approximate.
+    """
+
+    def __init__(self, w3=None):
+        self.web3 = w3 or web3
+        client = self.web3.clientVersion.lower()
+        self.hardhat = client.startswith(("hardhatnetwork", "anvil"))
+        self.unlocked = set(self.web3.eth.accounts)
+
+    def rpc(self, method, params=()):
+        return _rpc(method, params, self.web3)
+
+    def loadState(self, state):
+        if not self.hardhat:
+            raise ReplayError("state snapshots need a hardhat or anvil node")
+
+        for address, account in state["accounts"].items():
+            self.rpc("hardhat_setCode", [address, account["code"]])
+            self.rpc("hardhat_setBalance", [address, hex(int(account["balance"], 16))])
+            if account["nonce"]:
+                self.rpc("hardhat_setNonce", [address, hex(account["nonce"])])
+            for slot, value in account["storage"].items():
+                self.rpc(
+                    "hardhat_setStorageAt",
+                    [address, hex(int(slot, 16)), _word(value)],
+                )
+
+    def checkClock(self, timestamp):
+        """Blocks can't go back in time, the node must start before the bundle."""
+        latest = self.web3.eth.get_block("latest").timestamp
+        if latest >= timestamp:
+            raise ReplayError(
+                f"node time {latest} is past the first transaction ({timestamp}),"
+                " start it earlier (INITIAL_DATE for hardhat, --timestamp for anvil)"
+            )
+
+    def impersonate(self, address):
+        if address in self.unlocked:
+            return
+        if self.hardhat:
+            self.rpc("hardhat_impersonateAccount", [address])
+        self.unlocked.add(address)
+
+    def setNextTimestamp(self, timestamp):
+        latest = self.web3.eth.get_block("latest").timestamp
+        if timestamp <= latest:
+            return latest + 1
+        if self.hardhat:
+            self.rpc("evm_setNextBlockTimestamp", [timestamp])
+        else:
+            # ganache has no absolute time, the clock keeps moving
+            self.rpc("evm_increaseTime", [timestamp - latest])
+        return timestamp
+
+    def snapshot(self):
+        return self.rpc("evm_snapshot")
+
+    def revert(self, snapshotId):
+        self.rpc("evm_revert", [snapshotId])
+
+
+def functionNames(contracts=("Rentable", "RentableBatch", "ORentable")):
+    """selector => function name of the compiled contracts."""
+    names = {}
+    for name in contracts:
+        for entry in loadAbi(name):
+            if entry["type"] == "function":
+                names.setdefault(selector(abiSignature(entry)), entry["name"])
+    return names
+
+
+class Replayer:
+    """Replay a bundle under the current Rentable logic, then a candidate one.
+
+    Each transaction is sent by its historical sender (impersonated) with its
+    gas limit, gas price 0 and its block timestamp, one per block, so gas
+    used and reverts compare with the chain. The candidate is swapped in with
+    ProxyAdmin.upgrade sent by the admin owner after reverting to the state
+    the baseline started from.
+    """
+
+    def __init__(self, node, rentable, proxyAdmin, transactions, names=None):
+        self.node = node
+        self.rentable = to_checksum_address(rentable)
+        self.proxyAdmin = to_checksum_address(proxyAdmin)
+        self.transactions = transactions
+        self.names = names if names is not None else functionNames()
+
+        self.outcomes = {}
+        self.elapsed = {}
+
+    def label(self, tx):
+        data = bytes.fromhex(tx.input[2:10])
+        name = self.names.get(data, "0x" + data.hex())
+        target = "Rentable" if tx.to == self.rentable else "token"
+        return f"{target}.{name}"
+
+    def _send(self, tx):
+        self.node.impersonate(tx.sender)
+        self.node.setNextTimestamp(tx.timestamp)
+        params = {
+            "from": tx.sender,
+            "to": tx.to,
+            "data": tx.input,
+            "value": hex(tx.value),
+            "gas": hex(tx.gas),
+            "gasPrice": "0x0",
+        }
+        error = None
+        try:
+            txHash = self.node.rpc("eth_sendTransaction", [params])
+        except ReplayError as e:
+            txHash, error = _minedHash(e), _errorField(e, "message") or str(e)
+            if txHash is None:
+                return Outcome(0, REJECTED, error)
+
+        receipt = self.node.rpc("eth_getTransactionReceipt", [txHash])
+        return Outcome(int(receipt["gasUsed"], 16), int(receipt["status"], 16), error)
+
+    def run(self, name):
+        t = time.perf_counter()
+        outcomes = [self._send(tx) for tx in self.transactions]
+        self.elapsed[name] = time.perf_counter() - t
+        self.outcomes[name] = outcomes
+        return outcomes
+
+    def upgrade(self, implementation):
+        (owner,) = eth_abi.decode_abi(
+            ["address"],
+            bytes.fromhex(
+                self.node.rpc(
+                    "eth_call",
+                    [{"to": self.proxyAdmin, "data": "0x8da5cb5b"}, "latest"],
+                )[2:]
+            ),
+        )
+        owner = to_checksum_address(owner)
+        data = selector("upgrade(address,address)") + eth_abi.encode_abi(
+            ["address", "address"], [self.rentable, implementation]
+        )
+        self.node.impersonate(owner)
+        self.node.rpc(
+            "eth_sendTransaction",
+            [{"from": owner, "to": self.proxyAdmin, "data": "0x" + data.hex()}],
+        )
+
+    def compare(self, candidate):
+        """Replay under the current logic, then under `candidate` (address)."""
+        snapshotId = self.node.snapshot()
+        self.run("baseline")
+        self.node.revert(snapshotId)
+        self.upgrade(candidate)
+        self.run("candidate")
+
+    def functions(self):
+        """label => (count, baseline gas, candidate gas), both runs succeeded."""
+        gas = {}
+        for tx, before, after in zip(
+            self.transactions, self.outcomes["baseline"], self.outcomes["candidate"]
+        ):
+            if before.status != 1 or after.status != 1:
+                continue
+            count, baseline, candidate = gas.get(self.label(tx), (0, 0, 0))
+            gas[self.label(tx)] = (
+                count + 1,
+                baseline + before.gasUsed,
+                candidate + after.gasUsed,
+            )
+        return gas
+
+    def divergent(self, name="candidate"):
+        """(tx, baseline, outcome) whose status differs from the baseline."""
+        return [
+            (tx, before, after)
+            for tx, before, after in zip(
+                self.transactions, self.outcomes["baseline"], self.outcomes[name]
+            )
+            if before.status != after.status
+        ]
+
+    def unfaithful(self):
+        """(tx, outcome) of the baseline run not matching the chain."""
+        return [
+            (tx, outcome)
+            for tx, outcome in zip(self.transactions, self.outcomes["baseline"])
+            if outcome.status != tx.status or outcome.gasUsed != tx.gasUsed
+        ]
+
+    def throughput(self, name):
+        return len(self.transactions) / self.elapsed[name] if self.elapsed[name] else 0
+
+    def results(self):
+        return {
+            "functions": {
+                label: {"count": count, "baseline": before, "candidate": after}
+                for label, (count, before, after) in self.functions().items()
+            },
+            "divergent": [
+                {
+                    "hash": tx.hash,
+                    "function": self.label(tx),
+                    "baseline": before.status,
+                    "candidate": after.status,
+                    "error": after.error or before.error,
+                }
+                for tx, before, after in self.divergent()
+            ],
+            "unfaithful": [tx.hash for tx, _ in self.unfaithful()],
+            "throughput": {
+                name: self.throughput(name) for name in ("baseline", "candidate")
+            },
+        }
+
+    def report(self):
+        click.echo("\n            -------- Replay --------")
+        click.echo(f"  {'function':<36} {'count':>6} {'baseline':>9} {'candidate':>9}")
+        for label, (count, before, after) in sorted(self.functions().items()):
+            delta = (after - before) / before if before else 0
+            click.echo(
+                f"  {label:<36} {count:>6} {before // count:>9} {after // count:>9}"
+                f" ({delta:+.2%})"
+            )
+        for tx, before, after in self.divergent():
+            click.echo(
+                f"  DIVERGENT {tx.hash} {self.label(tx)}:"
+                f" {before.status} -> {after.status} {after.error or ''}"
+            )
+        click.echo(
+            f"""
+          Transactions: {len(self.transactions)}
+             Divergent: {len(self.divergent())}
+            Unfaithful: {len(self.unfaithful())} (baseline vs chain)
+   Baseline throughput: {self.throughput('baseline'):.1f} tx/s
+  Candidate throughput: {self.throughput('candidate'):.1f} tx/s
+            ------------------------
+         """
+        )
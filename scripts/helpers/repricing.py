@@ -0,0 +1,175 @@
+from fractions import Fraction
+from typing import NamedTuple
+
+import eth_abi
+from eth_utils import to_checksum_address
+
+from brownie import web3
+
+from scripts.helpers.codec import RENTAL_CONDITIONS_TUPLE, selector
+from scripts.helpers.multicall import Call, RentableReader
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+from scripts.sdk.structs import RentalConditions
+
+BATCH_SIGNATURE = (
+    "createOrUpdateRentalConditionsBatch(address[],uint256[],"
+    f"{RENTAL_CONDITIONS_TUPLE}[])"
+)
+
+
+class Listing(NamedTuple):
+    tokenAddress: str
+    tokenId: int
+    rentalConditions: RentalConditions
+
+
+def scalePrices(prices, factor, floor=1, ceiling=None):
+    """Prices times factor (exact, on integers), clipped to [floor, ceiling]."""
+    factor = Fraction(str(factor))
+    scaled = [p * factor.numerator // factor.denominator for p in prices]
+    return [max(floor, p if ceiling is None else min(ceiling, p)) for p in scaled]
+
+
+def utilizationPrices(prices, rented, up=1.1, down=0.95, floor=1, ceiling=None):
+    """Raise the price of tokens rented in the window, lower the idle ones."""
+    raised = scalePrices(prices, up, floor, ceiling)
+    lowered = scalePrices(prices, down, floor, ceiling)
+    return [r if busy else lw for r, lw, busy in zip(raised, lowered, rented)]
+
+
+def encodeBatch(listings, prices):
+    """createOrUpdateRentalConditionsBatch calldata, other conditions kept."""
+    rcs = [
+        (
+            rc.minTimeDuration,
+            rc.maxTimeDuration,
+            price,
+            rc.paymentTokenId,
+            rc.paymentTokenAddress,
+            rc.privateRenter,
+        )
+        for (_, _, rc), price in zip(listings, prices)
+    ]
+    return (
+        "0x"
+        + (
+            selector(BATCH_SIGNATURE)
+            + eth_abi.encode_abi(
+                ["address[]", "uint256[]", f"{RENTAL_CONDITIONS_TUPLE}[]"],
+                [
+                    [listing.tokenAddress for listing in listings],
+                    [listing.tokenId for listing in listings],
+                    rcs,
+                ],
+            )
+        ).hex()
+    )
+
+
+class Repricer:
+    """Update pricePerSecond of a whole inventory in gas-sized batches.
+
+    Only listed tokens still owned by `account` whose price changes are
+    sent, sorted by collection so the ORentable lookup is shared across a
+    batch. Batch size comes from the marginal gas of one more listing,
+    measured with estimate_gas, to fit `gasLimit`.
+    """
+
+    def __init__(
+        self,
+        rentable,
+        account,
+        reader=None,
+        gasLimit=10_000_000,
+        window=8,
+        checkpointPath=None,
+    ):
+        self.rentable = rentable
+        self.account = account
+        self.reader = reader or RentableReader(rentable)
+        self.gasLimit = gasLimit
+        self.window = window
+        self.checkpoint = Checkpoint(checkpointPath)
+
+        self.batchSize = None
+        self.updated = 0
+        self.transactions = 0
+        self.gasUsed = 0
+
+    def inventory(self, pairs):
+        """Listings among (tokenAddress, tokenId) pairs owned by the account."""
+        pairs = sorted((to_checksum_address(a), int(t)) for a, t in pairs)
+        oRentables = {
+            c.tokenAddress: c.oRentable
+            for c in self.reader.collections({a for a, _ in pairs})
+        }
+        owners = self.reader.multicall.call(
+            Call(oRentables[a], "ownerOf(uint256)", (t,), ("address",))
+            for a, t in pairs
+        )
+        conditions = self.reader.rentalConditions(pairs)
+
+        owner = self.account.address.lower()
+        return [
+            Listing(a, t, rc)
+            for (a, t), o, rc in zip(pairs, owners, conditions)
+            if o is not None
+            and o.lower() == owner
+            and rc is not None
+            and rc.maxTimeDuration > 0
+        ]
+
+    def changes(self, listings, prices):
+        """(listings, prices) whose price differs from the current one."""
+        changed = [
+            (listing, price)
+            for listing, price in zip(listings, prices)
+            if price != listing.rentalConditions.pricePerSecond
+        ]
+        return [c[0] for c in changed], [c[1] for c in changed]
+
+    def _estimate(self, listings, prices):
+        return web3.eth.estimate_gas(
+            {
+                "from": self.account.address,
+                "to": self.rentable.address,
+                "data": encodeBatch(listings, prices),
+            }
+        )
+
+    def measureBatchSize(self, listings, prices, sample=8):
+        sample = min(sample, len(listings))
+        if sample < 2:
+            return max(1, len(listings))
+        one = self._estimate(listings[:1], prices[:1])
+        many = self._estimate(listings[:sample], prices[:sample])
+        perListing = (many - one) / (sample - 1)
+        overhead = one - perListing
+        # 20% headroom, estimates of later batches can differ slightly
+        return max(1, int((self.gasLimit * 0.8 - overhead) // perListing))
+
+    def reprice(self, listings, prices):
+        listings, prices = self.changes(listings, prices)
+        if not listings:
+            return 0
+
+        self.batchSize = self.measureBatchSize(listings, prices)
+        pipeline = TxPipeline(
+            self.account, window=self.window, checkpoint=self.checkpoint
+        )
+        for start in range(0, len(listings), self.batchSize):
+            batch = listings[start : start + self.batchSize]
+            first = batch[0]
+            pipeline.send(
+                f"reprice:{first.tokenAddress}:{first.tokenId}:{len(batch)}",
+                self.rentable.address,
+                encodeBatch(batch, prices[start : start + self.batchSize]),
+            )
+        pipeline.join()
+
+        self.updated += len(listings) - sum(
+            int(key.rsplit(":", 1)[1]) for key, _ in pipeline.failures
+        )
+        self.transactions += pipeline.sent
+        self.gasUsed += pipeline.gasUsed
+        return self.updated
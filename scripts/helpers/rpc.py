@@ -0,0 +1,245 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+# JSON-RPC "limit exceeded" (EIP-1474), some providers also return 429
+RATE_LIMIT_CODES = (-32005, 429)
+
+
+class RpcError(Exception):
+    def __init__(self, code, message, data=None):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class _RateLimited(Exception):
+    def __init__(self, retryAfter=None):
+        super().__init__("rate limited")
+        self.retryAfter = retryAfter
+
+
+class _Endpoint:
+    def __init__(self, url, maxConcurrency):
+        self.url = url
+        self.semaphore = asyncio.Semaphore(maxConcurrency)
+        self.inflight = 0
+        self.downUntil = 0
+        self.failures = 0
+
+
+def _isRateLimit(error):
+    return (
+        error.get("code") in RATE_LIMIT_CODES
+        or "rate limit" in str(error.get("message", "")).lower()
+    )
+
+
+class AsyncRpc:
+    """JSON-RPC over pooled aiohttp sessions, batching concurrent requests.
+
+    Requests issued within `batchDelay` of each other go out as one JSON-RPC
+    batch (up to `batchSize`). Each endpoint is capped at `maxConcurrency`
+    in-flight batches, rate limited items are retried with exponential
+    backoff and an endpoint failing at the transport level is skipped for
+    `cooldown` seconds while the others take over.
+
+        async with AsyncRpc(urls) as rpc:
+            code = await rpc.request("eth_getCode", [address, "latest"])
+
+    Synchronous scripts can use map(), which runs its own event loop.
+    """
+
+    def __init__(
+        self,
+        urls,
+        maxConcurrency=16,
+        batchSize=50,
+        batchDelay=0.001,
+        retries=5,
+        backoff=0.2,
+        timeout=30,
+        cooldown=30,
+    ):
+        self.urls = [urls] if isinstance(urls, str) else list(urls)
+        self.maxConcurrency = maxConcurrency
+        self.batchSize = batchSize
+        self.batchDelay = batchDelay
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cooldown = cooldown
+
+        self.session = None
+        self.endpoints = []
+        self._queue = []
+        self._timer = None
+        self._tasks = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.retried = 0
+        self.failovers = 0
+        self.latencies = []
+
+    async def __aenter__(self):
+        # asyncio primitives bind to the running loop, create them here
+        self.endpoints = [_Endpoint(u, self.maxConcurrency) for u in self.urls]
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.maxConcurrency * len(self.urls), keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.session.close()
+        self.session = None
+
+    async def request(self, method, params=()):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((method, list(params), future))
+        self.requests += 1
+
+        if len(self._queue) >= self.batchSize:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batchDelay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = self._queue[: self.batchSize]
+            del self._queue[: self.batchSize]
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _pick(self):
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if e.downUntil <= now]
+        if not healthy:
+            return min(self.endpoints, key=lambda e: e.downUntil)
+        return min(healthy, key=lambda e: e.inflight)
+
+    async def _post(self, endpoint, payload):
+        async with endpoint.semaphore:
+            endpoint.inflight += 1
+            startedAt = time.perf_counter()
+            try:
+                async with self.session.post(endpoint.url, json=payload) as response:
+                    if response.status == 429:
+                        retryAfter = response.headers.get("Retry-After")
+                        raise _RateLimited(float(retryAfter) if retryAfter else None)
+                    response.raise_for_status()
+                    body = await response.json(content_type=None)
+            finally:
+                endpoint.inflight -= 1
+            self.latencies.append(time.perf_counter() - startedAt)
+            self.batches += 1
+            return body
+
+    def _delay(self, attempt, retryAfter=None):
+        if retryAfter is not None:
+            return retryAfter
+        return self.backoff * 2**attempt * (0.5 + random.random())
+
+    async def _send(self, batch):
+        attempt = 0
+        while batch:
+            endpoint = self._pick()
+            payload = [
+                {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                for i, (method, params, _) in enumerate(batch)
+            ]
+            retry, retryAfter = [], None
+            try:
+                body = await self._post(endpoint, payload)
+            except _RateLimited as e:
+                retry, retryAfter = batch, e.retryAfter
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                endpoint.failures += 1
+                endpoint.downUntil = time.monotonic() + self.cooldown
+                if len(self.endpoints) > 1:
+                    self.failovers += 1
+                retry, error = batch, e
+            else:
+                endpoint.failures = 0
+                # some nodes answer a whole batch with a single error object
+                if isinstance(body, dict):
+                    body = [dict(body, id=i) for i in range(len(batch))]
+                results = {r.get("id"): r for r in body}
+                for i, item in enumerate(batch):
+                    result = results.get(i)
+                    future = item[2]
+                    if future.done():
+                        continue
+                    if result is None or (
+                        "error" in result and _isRateLimit(result["error"])
+                    ):
+                        retry.append(item)
+                    elif "error" in result:
+                        error = result["error"]
+                        future.set_exception(
+                            RpcError(
+                                error.get("code"),
+                                error.get("message"),
+                                error.get("data"),
+                            )
+                        )
+                    else:
+                        future.set_result(result["result"])
+                error = RpcError(-32005, "rate limited")
+
+            if not retry:
+                return
+            if attempt >= self.retries:
+                for _, _, future in retry:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+
+            self.retried += len(retry)
+            await asyncio.sleep(self._delay(attempt, retryAfter))
+            attempt += 1
+            batch = retry
+
+    async def gather(self, requests):
+        """Results of (method, params) requests, in order."""
+        return await asyncio.gather(*(self.request(m, p) for m, p in requests))
+
+    def map(self, method, paramsList):
+        """Run one method over many params from synchronous code."""
+
+        async def run():
+            async with self:
+                return await self.gather((method, p) for p in paramsList)
+
+        return asyncio.run(run())
+
+    def report(self):
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0
+        p99 = (
+            latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+            if latencies
+            else 0
+        )
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "retried": self.retried,
+            "failovers": self.failovers,
+            "batchP50": p50,
+            "batchP99": p99,
+        }
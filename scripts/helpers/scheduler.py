@@ -0,0 +1,116 @@
+from typing import NamedTuple, Optional
+
+import click
+
+from brownie import web3
+
+from scripts.helpers.fees import FeeEstimator, waitNewBlock
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+
+class Operation(NamedTuple):
+    key: str  # checkpoint key
+    to: Optional[str]
+    data: str
+    value: int = 0
+    gas: Optional[int] = None
+
+
+class TxScheduler:
+    """Spread a batch of operations over blocks within a cost ceiling.
+
+    Transactions are type-2 (see TxPipeline), sent only while the next base
+    fee plus the priority fee is at most `maxFeePerGas`, at most `perBlock`
+    per block, until the expected cost (gas at the next block price) of
+    what was sent reaches `budget` wei. What does not fit is returned by
+    run() and can be scheduled again later, confirmed keys are skipped.
+    `waitBlock` returns once a new block is mined (chain.mine on a dev chain).
+    """
+
+    def __init__(
+        self,
+        account,
+        maxFeePerGas=None,
+        budget=None,
+        perBlock=None,
+        fees=None,
+        window=32,
+        stuckBlocks=3,
+        checkpointPath=None,
+        waitBlock=None,
+    ):
+        self.account = account
+        self.maxFeePerGas = maxFeePerGas
+        self.budget = budget
+        self.perBlock = perBlock
+        self.fees = fees or FeeEstimator()
+        self.window = window
+        self.stuckBlocks = stuckBlocks
+        self.checkpointPath = checkpointPath
+        self.waitBlock = waitBlock or waitNewBlock
+
+        self.checkpoint = None
+        self.pipeline = None
+        self.expectedCost = 0
+        self.waitedBlocks = 0
+        self.blocks = {}  # block number when sent => transactions
+        self.deferred = []
+
+    def _wait(self):
+        self.waitedBlocks += 1
+        self.waitBlock()
+
+    def run(self, operations):
+        """Send `operations` (Operation), returns the ones left for later."""
+        self.checkpoint = Checkpoint(self.checkpointPath)
+        self.pipeline = TxPipeline(
+            self.account,
+            window=self.window,
+            checkpoint=self.checkpoint,
+            fees=self.fees,
+            maxFeePerGas=self.maxFeePerGas,
+            stuckBlocks=self.stuckBlocks,
+        )
+        self.deferred = []
+
+        operations = list(operations)
+        for i, op in enumerate(operations):
+            if self.checkpoint.isDone(op.key):
+                self.pipeline.skipped += 1
+                continue
+
+            fees = self.fees.waitBelow(self.maxFeePerGas, self._wait)
+            block = web3.eth.block_number
+            while self.perBlock and self.blocks.get(block, 0) >= self.perBlock:
+                self._wait()
+                fees = self.fees.waitBelow(self.maxFeePerGas, self._wait)
+                block = web3.eth.block_number
+
+            gas = op.gas or self.pipeline.estimateGas(op.to, op.data, op.value)
+            cost = gas * fees.expected()
+            if self.budget is not None and self.expectedCost + cost > self.budget:
+                self.deferred = operations[i:]
+                break
+
+            self.pipeline.send(op.key, op.to, op.data, op.value, gas)
+            self.expectedCost += cost
+            self.blocks[block] = self.blocks.get(block, 0) + 1
+
+        self.pipeline.join()
+        return self.deferred
+
+    def report(self, label="tx"):
+        self.pipeline.report(label)
+        costs = self.pipeline.costs
+        click.echo(
+            f"""
+            -------- Schedule --------
+                Blocks: {len(self.blocks)}
+                Waited: {self.waitedBlocks} blocks
+              Deferred: {len(self.deferred)}
+         Expected Cost: {self.expectedCost/1e18} ETH
+             Paid Cost: {costs.cost/1e18} ETH
+          Avg GasPrice: {costs.averageGasPrice()/1e9:.2f} gwei
+            --------------------------
+         """
+        )
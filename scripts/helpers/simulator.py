@@ -0,0 +1,438 @@
+import random
+from array import array
+
+from scripts.sdk.structs import RentalConditions
+
+eth = "0x0000000000000000000000000000000000000000"
+
+# RentableStorageV1 constants
+NOT_ALLOWED_TOKEN = 0
+ERC20_TOKEN = 1
+ERC1155_TOKEN = 2
+BASE_FEE = 10000
+
+# account index of the Rentable contract, -1 is address(0) in every column
+RENTABLE = 0
+NONE = -1
+
+# OpenZeppelin 4.4 ERC721 revert reasons
+NONEXISTENT_OWNER = "ERC721: owner query for nonexistent token"
+NONEXISTENT_OPERATOR = "ERC721: operator query for nonexistent token"
+NOT_OWNER_NOR_APPROVED = "ERC721: transfer caller is not owner nor approved"
+
+
+class SimulationError(Exception):
+    """The operation would revert on chain, args[0] is the revert reason."""
+
+
+class RentableSimulator:
+    """In-memory model of Rentable state, no chain needed.
+
+    Mirrors onERC721Received (deposit), createOrUpdateRentalConditions,
+    deleteRentalConditions, rent, expireRental, withdraw and the O/W
+    transfer hooks, including the fee split. Collection libraries, proxy
+    calls and payment token balances of the payer are not modelled:
+    payments are accounted as credits/debits in `balances`.
+
+    Accounts are interned to indexes and token state is kept in typed
+    arrays, one slot per (tokenAddress, tokenId). Durations and timestamps
+    are 64-bit, amounts are Python ints so the fee split is exact.
+    """
+
+    def __init__(self, fee=0, feeCollector=eth, now=0):
+        self.now = now
+        self.fee = fee
+
+        self.accounts = ["rentable"]
+        self._accountIndex = {"rentable": RENTABLE}
+        self.feeCollector = self._account(feeCollector)
+
+        self.collections = {}
+        self.paymentTokenAllowlist = {}
+        # user index => wallet index
+        self.wallets = {}
+        # (account index, payment token, payment token id) => amount
+        self.balances = {}
+
+        self._slots = {}
+        self.tokenIds = []
+        self.holder = array("i")
+        self.oOwner = array("i")
+        self.wOwner = array("i")
+        self.expiresAt = array("Q")
+        self.minTimeDuration = array("Q")
+        self.maxTimeDuration = array("Q")
+        self.privateRenter = array("i")
+        self.pricePerSecond = []
+        self.paymentTokenId = []
+        self.paymentTokenAddress = []
+
+        self.operations = 0
+
+    # ---------- accounts and slots ----------
+
+    def _account(self, address):
+        index = self._accountIndex.get(address)
+        if index is None:
+            if address == eth:
+                return NONE
+            index = self._accountIndex[address] = len(self.accounts)
+            self.accounts.append(address)
+        return index
+
+    def address(self, index):
+        return eth if index == NONE else self.accounts[index]
+
+    def _slot(self, tokenAddress, tokenId, create=False):
+        key = (tokenAddress, tokenId)
+        slot = self._slots.get(key)
+        if slot is None and create:
+            slot = self._slots[key] = len(self.tokenIds)
+            self.tokenIds.append(key)
+            for column in (self.holder, self.oOwner, self.wOwner, self.privateRenter):
+                column.append(NONE)
+            for column in (self.expiresAt, self.minTimeDuration, self.maxTimeDuration):
+                column.append(0)
+            self.pricePerSecond.append(0)
+            self.paymentTokenId.append(0)
+            self.paymentTokenAddress.append(eth)
+        return slot
+
+    def _getExistingORentable(self, tokenAddress):
+        if tokenAddress not in self.collections:
+            raise SimulationError("Token currently not supported")
+
+    def _getOrCreateWalletForUser(self, user):
+        wallet = self.wallets.get(user)
+        if wallet is None:
+            wallet = self.wallets[user] = self._account(("wallet", user))
+        return wallet
+
+    def _credit(self, account, paymentToken, paymentTokenId, amount):
+        key = (account, paymentToken, paymentTokenId)
+        self.balances[key] = self.balances.get(key, 0) + amount
+
+    # ---------- governance ----------
+
+    def addCollection(self, tokenAddress):
+        self.collections[tokenAddress] = len(self.collections)
+
+    def enablePaymentToken(self, paymentToken, status=ERC20_TOKEN):
+        self.paymentTokenAllowlist[paymentToken] = status
+
+    def setFee(self, fee):
+        if fee > BASE_FEE:
+            raise SimulationError("Fee greater than max value")
+        self.fee = fee
+
+    def setFeeCollector(self, feeCollector):
+        self.feeCollector = self._account(feeCollector)
+
+    # ---------- views ----------
+
+    def _isExpired(self, slot):
+        return self.now >= self.expiresAt[slot]
+
+    def isExpired(self, tokenAddress, tokenId):
+        slot = self._slot(tokenAddress, tokenId)
+        return slot is None or self._isExpired(slot)
+
+    def ownerOf(self, tokenAddress, tokenId):
+        """Owner of the underlying token, wallets as ("wallet", user)."""
+        slot = self._slot(tokenAddress, tokenId)
+        return self.address(NONE if slot is None else self.holder[slot])
+
+    def oOwnerOf(self, tokenAddress, tokenId):
+        slot = self._slot(tokenAddress, tokenId)
+        return self.address(NONE if slot is None else self.oOwner[slot])
+
+    def wOwnerOf(self, tokenAddress, tokenId, skipExpirationCheck=False):
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or not (skipExpirationCheck or not self._isExpired(slot)):
+            return eth
+        return self.address(self.wOwner[slot])
+
+    def rentalConditions(self, tokenAddress, tokenId):
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None:
+            return RentalConditions(0, 0, 0, 0, eth, eth)
+        return RentalConditions(
+            self.minTimeDuration[slot],
+            self.maxTimeDuration[slot],
+            self.pricePerSecond[slot],
+            self.paymentTokenId[slot],
+            self.paymentTokenAddress[slot],
+            self.address(self.privateRenter[slot]),
+        )
+
+    def userWallet(self, user):
+        wallet = self.wallets.get(self._accountIndex.get(user))
+        return self.address(NONE if wallet is None else wallet)
+
+    def balance(self, account, paymentToken=eth, paymentTokenId=0):
+        index = self._accountIndex.get(account)
+        return self.balances.get((index, paymentToken, paymentTokenId), 0)
+
+    # ---------- mutative ----------
+
+    def mint(self, to, tokenAddress, tokenId):
+        """Mint the underlying token, outside of Rentable."""
+        slot = self._slot(tokenAddress, tokenId, create=True)
+        if self.holder[slot] != NONE:
+            raise SimulationError("ERC721: token already minted")
+        self.holder[slot] = self._account(to)
+
+    def deposit(self, user, tokenAddress, tokenId, rc=None):
+        """safeTransferFrom of the underlying to Rentable, with listing data."""
+        self.operations += 1
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or self.holder[slot] == NONE:
+            raise SimulationError(NONEXISTENT_OPERATOR)
+        u = self._account(user)
+        if self.holder[slot] != u:
+            raise SimulationError(NOT_OWNER_NOR_APPROVED)
+        self._getExistingORentable(tokenAddress)
+
+        # all or nothing, validate before touching state
+        if rc is not None:
+            self._validateRentalConditions(rc)
+        self.holder[slot] = RENTABLE
+        self.oOwner[slot] = u
+        if rc is not None:
+            self._setRentalConditions(slot, rc)
+
+    def _validateRentalConditions(self, rc):
+        rc = RentalConditions(*rc)
+        if (
+            self.paymentTokenAllowlist.get(rc.paymentTokenAddress, 0)
+            == NOT_ALLOWED_TOKEN
+        ):
+            raise SimulationError("Not supported payment token")
+        if rc.minTimeDuration > rc.maxTimeDuration:
+            raise SimulationError("Minimum duration cannot be greater than maximum")
+        return rc
+
+    def _setRentalConditions(self, slot, rc):
+        rc = RentalConditions(*rc)
+        self.minTimeDuration[slot] = rc.minTimeDuration
+        self.maxTimeDuration[slot] = rc.maxTimeDuration
+        self.pricePerSecond[slot] = rc.pricePerSecond
+        self.paymentTokenId[slot] = rc.paymentTokenId
+        self.paymentTokenAddress[slot] = rc.paymentTokenAddress
+        self.privateRenter[slot] = self._account(rc.privateRenter)
+
+    def _onlyOTokenOwner(self, user, tokenAddress, tokenId):
+        self._getExistingORentable(tokenAddress)
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or self.oOwner[slot] == NONE:
+            raise SimulationError(NONEXISTENT_OWNER)
+        if self.oOwner[slot] != self._account(user):
+            raise SimulationError("The token must be yours")
+        return slot
+
+    def createOrUpdateRentalConditions(self, user, tokenAddress, tokenId, rc):
+        self.operations += 1
+        slot = self._onlyOTokenOwner(user, tokenAddress, tokenId)
+        self._setRentalConditions(slot, self._validateRentalConditions(rc))
+
+    def deleteRentalConditions(self, user, tokenAddress, tokenId):
+        self.operations += 1
+        slot = self._onlyOTokenOwner(user, tokenAddress, tokenId)
+        self.maxTimeDuration[slot] = 0
+
+    def _expireRental(self, slot, currentUserHolder=NONE, skipExistCheck=False):
+        if not (skipExistCheck or self.wOwner[slot] != NONE):
+            return False
+        if not self._isExpired(slot):
+            return True
+
+        renter = self.wOwner[slot] if currentUserHolder == NONE else currentUserHolder
+        # wallet transfers back to Rentable, no wallet means a revert there
+        if self.holder[slot] != self.wallets.get(renter):
+            raise SimulationError("Address: call to non-contract")
+        self.holder[slot] = RENTABLE
+        self.wOwner[slot] = NONE
+        return False
+
+    def expireRental(self, tokenAddress, tokenId):
+        self.operations += 1
+        if tokenAddress not in self.collections:
+            # exists() on address(0)
+            raise SimulationError("")
+        slot = self._slot(tokenAddress, tokenId)
+        return slot is not None and self._expireRental(slot)
+
+    def rent(self, renter, tokenAddress, tokenId, duration, value=None):
+        self.operations += 1
+        self._getExistingORentable(tokenAddress)
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or self.oOwner[slot] == NONE:
+            raise SimulationError(NONEXISTENT_OWNER)
+        rentee = self.oOwner[slot]
+
+        maxTimeDuration = self.maxTimeDuration[slot]
+        if maxTimeDuration == 0:
+            raise SimulationError("Not available")
+        if self._expireRental(slot):
+            raise SimulationError("Current rent still pending")
+        if duration == 0:
+            raise SimulationError("Duration cannot be zero")
+        if duration < self.minTimeDuration[slot]:
+            raise SimulationError("Duration lower than conditions")
+        if duration > maxTimeDuration:
+            raise SimulationError("Duration greater than conditions")
+
+        r = self._account(renter)
+        privateRenter = self.privateRenter[slot]
+        if privateRenter != NONE and privateRenter != r:
+            raise SimulationError("Rental reserved for another user")
+
+        paymentQty = self.pricePerSecond[slot] * duration
+        paymentToken = self.paymentTokenAddress[slot]
+        if paymentToken == eth and value is not None and value < paymentQty:
+            raise SimulationError("Not enough funds")
+
+        self.expiresAt[slot] = self.now + duration
+        self.wOwner[slot] = r
+        self.holder[slot] = self._getOrCreateWalletForUser(r)
+
+        feesForFeeCollector = paymentQty * self.fee // BASE_FEE
+        paymentTokenId = (
+            self.paymentTokenId[slot]
+            if self.paymentTokenAllowlist.get(paymentToken) == ERC1155_TOKEN
+            else 0
+        )
+        self._credit(r, paymentToken, paymentTokenId, -paymentQty)
+        if feesForFeeCollector > 0:
+            self._credit(
+                self.feeCollector, paymentToken, paymentTokenId, feesForFeeCollector
+            )
+        self._credit(
+            rentee, paymentToken, paymentTokenId, paymentQty - feesForFeeCollector
+        )
+
+    def withdraw(self, user, tokenAddress, tokenId):
+        self.operations += 1
+        slot = self._onlyOTokenOwner(user, tokenAddress, tokenId)
+        if self._expireRental(slot):
+            raise SimulationError("Current rent still pending")
+
+        self.maxTimeDuration[slot] = 0
+        self.oOwner[slot] = NONE
+        self.holder[slot] = self._account(user)
+
+    def transferO(self, sender, to, tokenAddress, tokenId):
+        """ORentable transferFrom(sender, to), then afterOTokenTransfer."""
+        self.operations += 1
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or self.oOwner[slot] == NONE:
+            raise SimulationError(NONEXISTENT_OPERATOR)
+        if self.oOwner[slot] != self._account(sender):
+            raise SimulationError(NOT_OWNER_NOR_APPROVED)
+
+        self.oOwner[slot] = self._account(to)
+        self._expireRental(slot)
+
+    def transferW(self, sender, to, tokenAddress, tokenId):
+        """WRentable transferFrom(sender, to), then afterWTokenTransfer."""
+        self.operations += 1
+        slot = self._slot(tokenAddress, tokenId)
+        if slot is None or self.wOwner[slot] == NONE:
+            raise SimulationError(NONEXISTENT_OPERATOR)
+        s = self._account(sender)
+        if self.wOwner[slot] != s:
+            raise SimulationError(NOT_OWNER_NOR_APPROVED)
+
+        t = self._account(to)
+        self.wOwner[slot] = t
+        if self._expireRental(slot, currentUserHolder=s, skipExistCheck=True):
+            self.holder[slot] = self._getOrCreateWalletForUser(t)
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def apply(self, operation):
+        """Run an (name, *args) operation, e.g. ("rent", renter, token, id, 60)."""
+        name, *args = operation
+        return getattr(self, name)(*args)
+
+    # ---------- state ----------
+
+    def state(self, tokenAddress, tokenId):
+        """Comparable per-token state, see Differential in tests/test_simulator."""
+        slot = self._slot(tokenAddress, tokenId)
+        return {
+            "holder": self.ownerOf(tokenAddress, tokenId),
+            "oOwner": self.oOwnerOf(tokenAddress, tokenId),
+            "wOwner": self.wOwnerOf(tokenAddress, tokenId, True),
+            "expiresAt": 0 if slot is None else self.expiresAt[slot],
+            "rentalConditions": self.rentalConditions(tokenAddress, tokenId),
+        }
+
+
+def randomOperations(sim, users, tokens, count, seed=0, rentalConditions=None):
+    """A mostly valid random operation stream, applied to sim as generated.
+
+    tokens are (tokenAddress, tokenId) already minted to users. Each step
+    is also yielded as ("sleep", seconds) or an operation tuple together
+    with the revert reason, if any.
+    """
+    rng = random.Random(seed)
+    rentalConditions = rentalConditions or (
+        lambda: RentalConditions(
+            rng.choice((0, 60)),
+            rng.choice((600, 3600)),
+            rng.randint(1, 10**6),
+            0,
+            eth,
+            eth,
+        )
+    )
+
+    for _ in range(count):
+        tokenAddress, tokenId = rng.choice(tokens)
+        o = sim.oOwnerOf(tokenAddress, tokenId)
+        w = sim.wOwnerOf(tokenAddress, tokenId, True)
+        user = rng.choice(users)
+
+        roll = rng.random()
+        if roll < 0.1:
+            operation = ("sleep", rng.choice((30, 300, 1800, 7200)))
+        elif o == eth:
+            operation = (
+                "deposit",
+                sim.ownerOf(tokenAddress, tokenId),
+                tokenAddress,
+                tokenId,
+                rentalConditions() if rng.random() < 0.8 else None,
+            )
+        elif roll < 0.45:
+            rc = sim.rentalConditions(tokenAddress, tokenId)
+            shortest = max(1, rc.minTimeDuration)
+            duration = rng.randint(shortest, max(shortest, rc.maxTimeDuration))
+            operation = ("rent", user, tokenAddress, tokenId, duration)
+        elif roll < 0.55:
+            operation = ("expireRental", tokenAddress, tokenId)
+        elif roll < 0.65:
+            operation = (
+                "createOrUpdateRentalConditions",
+                o,
+                tokenAddress,
+                tokenId,
+                rentalConditions(),
+            )
+        elif roll < 0.7:
+            operation = ("deleteRentalConditions", o, tokenAddress, tokenId)
+        elif roll < 0.8:
+            operation = ("transferO", o, user, tokenAddress, tokenId)
+        elif roll < 0.9 and w != eth:
+            operation = ("transferW", w, user, tokenAddress, tokenId)
+        else:
+            operation = ("withdraw", o, tokenAddress, tokenId)
+
+        try:
+            sim.apply(operation)
+            error = None
+        except SimulationError as e:
+            error = e.args[0]
+        yield operation, error
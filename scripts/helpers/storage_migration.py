@@ -0,0 +1,160 @@
+import json
+from typing import NamedTuple
+
+import eth_abi
+from eth_utils import to_checksum_address
+
+from scripts.helpers.codec import selector
+from scripts.helpers.multicall import RentableReader, TokenState
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+from scripts.sdk.structs import RentalConditions
+
+MIGRATE_SIGNATURE = "migrateRentals(address[],uint256[])"
+
+# RentableStorageV2.PackedRental expiresAt width, migration clamps to it
+MAX_EXPIRES_AT = 2**48 - 1
+
+
+class Mismatch(NamedTuple):
+    tokenAddress: str
+    tokenId: int
+    before: tuple  # multicall.TokenState
+    after: tuple
+
+
+def hasRental(state):
+    """Whether migrateRentals moves the token, as RentableStorageV2._migrateRental."""
+    return state.rentalConditions.maxTimeDuration > 0 or state.expiresAt > 0
+
+
+def encodeMigration(pairs):
+    return (
+        "0x"
+        + (
+            selector(MIGRATE_SIGNATURE)
+            + eth_abi.encode_abi(
+                ["address[]", "uint256[]"],
+                [[a for a, _ in pairs], [t for _, t in pairs]],
+            )
+        ).hex()
+    )
+
+
+class StorageMigration:
+    """Move Rentable listings and rentals to the RentableStorageV2 layout.
+
+    snapshot() reads the tokens through the V1 implementation, upgrade()
+    pauses Rentable and points the proxy to the V2 one, migrate() sends
+    migrateRentals in batches and verify() reads the tokens back. Rentable
+    is unpaused by finish() only when nothing differs: tokens not migrated
+    look unlisted and their rentals expired.
+    """
+
+    def __init__(
+        self,
+        rentable,
+        proxyAdmin,
+        governance,
+        reader=None,
+        batchSize=100,
+        window=8,
+        checkpointPath=None,
+    ):
+        self.rentable = rentable
+        self.proxyAdmin = proxyAdmin
+        self.governance = governance
+        self.reader = reader or RentableReader(rentable)
+        self.batchSize = batchSize
+        self.window = window
+        self.checkpoint = Checkpoint(checkpointPath)
+
+        self.states = []
+        self.migrated = 0
+        self.transactions = 0
+        self.gasUsed = 0
+
+    def snapshot(self, pairs):
+        pairs = sorted({(to_checksum_address(a), int(t)) for a, t in pairs})
+        self.states = self.reader.tokenStates(pairs)
+        return self.states
+
+    def saveSnapshot(self, path):
+        with open(path, "w") as f:
+            json.dump([[*s[:2], list(s[2]), *s[3:]] for s in self.states], f)
+
+    def loadSnapshot(self, path):
+        """Snapshot taken through the V1 implementation, before the upgrade."""
+        with open(path) as f:
+            self.states = [
+                TokenState(a, t, RentalConditions(*rc), expiresAt, isExpired)
+                for a, t, rc, expiresAt, isExpired in json.load(f)
+            ]
+        return self.states
+
+    def pairs(self):
+        """Tokens with something to move, sorted by collection."""
+        return [(s.tokenAddress, s.tokenId) for s in self.states if hasRental(s)]
+
+    def batches(self):
+        pairs = self.pairs()
+        return [
+            pairs[i : i + self.batchSize] for i in range(0, len(pairs), self.batchSize)
+        ]
+
+    def calls(self):
+        """(to, data) of each migrateRentals call, e.g. for a multisig."""
+        return [(self.rentable.address, encodeMigration(b)) for b in self.batches()]
+
+    def upgrade(self, implementation):
+        if not self.rentable.paused():
+            self.rentable.SCRAM({"from": self.governance})
+        self.proxyAdmin.upgrade(
+            self.rentable, implementation, {"from": self.governance}
+        )
+
+    def migrate(self):
+        pipeline = TxPipeline(
+            self.governance, window=self.window, checkpoint=self.checkpoint
+        )
+        for batch in self.batches():
+            tokenAddress, tokenId = batch[0]
+            pipeline.send(
+                f"migrate:{tokenAddress}:{tokenId}:{len(batch)}",
+                self.rentable.address,
+                encodeMigration(batch),
+            )
+        pipeline.join()
+
+        self.migrated += len(self.pairs()) - sum(
+            int(key.rsplit(":", 1)[1]) for key, _ in pipeline.failures
+        )
+        self.transactions += pipeline.sent
+        self.gasUsed += pipeline.gasUsed
+        return self.migrated
+
+    def verify(self):
+        """Tokens whose conditions or expiration changed with the upgrade."""
+        after = self.reader.tokenStates(
+            (s.tokenAddress, s.tokenId) for s in self.states
+        )
+        mismatches = []
+        for before, now in zip(self.states, after):
+            if hasRental(before):
+                same = (
+                    before.rentalConditions == now.rentalConditions
+                    and min(before.expiresAt, MAX_EXPIRES_AT) == now.expiresAt
+                )
+            else:
+                # nothing moved, stale fields of delisted tokens are dropped
+                same = not hasRental(now)
+            if not same:
+                mismatches.append(
+                    Mismatch(before.tokenAddress, before.tokenId, before, now)
+                )
+        return mismatches
+
+    def finish(self):
+        mismatches = self.verify()
+        if not mismatches:
+            self.rentable.unpause({"from": self.governance})
+        return mismatches
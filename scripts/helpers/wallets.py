@@ -0,0 +1,154 @@
+import time
+
+import eth_abi
+from eth_utils import keccak, to_bytes, to_checksum_address
+
+from brownie import DeterministicWalletFactory, web3
+
+from scripts.helpers.codec import selector
+from scripts.helpers.local_stack import loadOz
+from scripts.helpers.multicall import AGGREGATE3, Call, Multicall
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+
+def walletSalt(creator, user):
+    """DeterministicWalletFactory salt, keccak256(abi.encode(creator, user))."""
+    return keccak(eth_abi.encode_abi(["address", "address"], [creator, user]))
+
+
+def create2Address(deployer, salt, initCodeHash):
+    return to_checksum_address(
+        keccak(b"\xff" + to_bytes(hexstr=deployer) + salt + initCodeHash)[12:]
+    )
+
+
+class WalletAddresses:
+    """Offline SimpleWallet addresses of a DeterministicWalletFactory.
+
+    Addresses depend on the factory beacon: they hold as long as the
+    beacon set on the factory does not change.
+    """
+
+    def __init__(self, factory, beacon, creator, owner=None, proxyBytecode=None):
+        self.factory = to_checksum_address(factory)
+        self.beacon = to_checksum_address(beacon)
+        self.creator = to_checksum_address(creator)
+        # Rentable creates wallets for itself
+        self.owner = to_checksum_address(owner or creator)
+        if proxyBytecode is None:
+            proxyBytecode = loadOz()["BeaconProxy"].bytecode
+        self.proxyBytecode = to_bytes(hexstr=proxyBytecode)
+        self._initialize = selector("initialize(address,address)")
+
+    def initCodeHash(self, user):
+        data = self._initialize + eth_abi.encode_abi(
+            ["address", "address"], [self.owner, user]
+        )
+        return keccak(
+            self.proxyBytecode
+            + eth_abi.encode_abi(["address", "bytes"], [self.beacon, data])
+        )
+
+    def address(self, user):
+        return create2Address(
+            self.factory, walletSalt(self.creator, user), self.initCodeHash(user)
+        )
+
+    def addresses(self, users):
+        return {to_checksum_address(u): self.address(u) for u in users}
+
+    @classmethod
+    def of(cls, rentable, **kwargs):
+        """For a deployed Rentable, factory and beacon are read once."""
+        factory = DeterministicWalletFactory.at(rentable.getWalletFactory())
+        return cls(factory.address, factory.getBeacon(), rentable.address, **kwargs)
+
+
+class WalletProvisioner:
+    """Create renter wallets ahead of their first rent.
+
+    createWalletForUser calls are packed `batchSize` per Multicall3
+    aggregate3 transaction (allowFailure, a wallet created meanwhile does
+    not revert the batch) and only sent while the base fee is at most
+    `maxBaseFee`.
+    """
+
+    def __init__(
+        self,
+        rentable,
+        account,
+        multicall=None,
+        batchSize=40,
+        maxBaseFee=None,
+        pollInterval=12,
+        window=16,
+        checkpointPath=None,
+    ):
+        self.rentable = rentable
+        self.account = account
+        self.multicall = multicall or Multicall()
+        self.batchSize = batchSize
+        self.maxBaseFee = maxBaseFee
+        self.pollInterval = pollInterval
+        self.window = window
+        self.checkpoint = Checkpoint(checkpointPath)
+        self._create = selector("createWalletForUser(address)")
+
+        self.created = 0
+        self.gasUsed = 0
+        self.waited = 0
+
+    def missing(self, users):
+        users = [to_checksum_address(u) for u in users]
+        wallets = self.multicall.call(
+            Call(self.rentable.address, "userWallet(address)", (u,), ("address",))
+            for u in users
+        )
+        return [u for u, w in zip(users, wallets) if w is None or int(w, 16) == 0]
+
+    def _baseFee(self):
+        return web3.eth.get_block("latest").get("baseFeePerGas", 0)
+
+    def _waitQuiet(self):
+        while self.maxBaseFee is not None and self._baseFee() > self.maxBaseFee:
+            time.sleep(self.pollInterval)
+            self.waited += self.pollInterval
+
+    def batchData(self, users):
+        calls = [
+            (
+                self.rentable.address,
+                True,
+                self._create + eth_abi.encode_abi(["address"], [u]),
+            )
+            for u in users
+        ]
+        return (
+            "0x"
+            + (
+                AGGREGATE3 + eth_abi.encode_abi(["(address,bool,bytes)[]"], [calls])
+            ).hex()
+        )
+
+    def provision(self, users):
+        """Create the missing wallets of `users`, returns the users served."""
+        users = self.missing(users)
+        if not users:
+            return []
+
+        pipeline = TxPipeline(
+            self.account, window=self.window, checkpoint=self.checkpoint
+        )
+        for i in range(0, len(users), self.batchSize):
+            batch = users[i : i + self.batchSize]
+            self._waitQuiet()
+            pipeline.send(
+                f"wallets:{batch[0]}:{len(batch)}",
+                self.multicall.address,
+                self.batchData(batch),
+            )
+        pipeline.join()
+
+        self.gasUsed += pipeline.gasUsed
+        self.created += len(users) - len(self.missing(users))
+        return users
@@ -0,0 +1,44 @@
+import json
+import time
+
+import click
+
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+
+
+def summary(indexer):
+    tokens, deposited, listed, rented = indexer.counts()
+    click.echo(
+        f"""
+            -------- Index --------
+             LastBlock: {indexer.lastBlock()}
+                Tokens: {tokens}
+             Deposited: {deposited or 0}
+                Listed: {listed or 0}
+                Rented: {rented or 0}
+              Expiring: {len(indexer.expiring(int(time.time()) + 24 * 60 * 60))} (next 24h)
+            -----------------------
+         """
+    )
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    fromBlock=mainnetStartBlock,
+):
+    """Sync the event index of a deployment and print a summary.
+
+    Delistings emit no event, the listed tokens are checked against the
+    on-chain rentalConditions after each sync.
+    """
+    deployment = json.load(open(deploymentPath))
+
+    indexer = RentableIndexer(
+        dbPath,
+        deployment.values(),
+        fromBlock=int(fromBlock),
+        rentable=deployment["Rentable"],
+    )
+    indexer.sync()
+    summary(indexer)
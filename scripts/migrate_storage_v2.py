@@ -0,0 +1,92 @@
+import json
+import os
+
+import click
+
+from brownie import Rentable, accounts, project
+
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+from scripts.helpers.storage_migration import StorageMigration
+
+
+def report(migration):
+    click.echo(
+        f"""
+            -------- Storage V2 migration --------
+                Tokens: {len(migration.states)}
+              Migrated: {migration.migrated}
+          Transactions: {migration.transactions}
+              Gas used: {migration.gasUsed}
+         Gas per token: {migration.gasUsed // max(1, migration.migrated)}
+         """
+    )
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    implementation=None,
+    batchSize=100,
+    execute="false",
+):
+    """Upgrade Rentable to the packed storage layout and move its rentals.
+
+    The first run snapshots every deposited token through the V1
+    implementation. Without execute, the migrateRentals calls are written
+    for the governance multisig (to run between SCRAM + upgrade and
+    unpause) and later runs check the migrated state against the snapshot.
+    """
+    execute = str(execute).lower() in ("1", "true", "yes")
+
+    deployment = json.load(open(deploymentPath))
+    r = Rentable.at(deployment["Rentable"])
+    oz = project.load("./lib/openzeppelin-contracts")
+    proxyAdmin = oz.ProxyAdmin.at(deployment["ProxyAdmin"])
+
+    governance = accounts.load("rentable-deployer") if execute else None
+    migration = StorageMigration(
+        r,
+        proxyAdmin,
+        governance,
+        batchSize=int(batchSize),
+        checkpointPath=f"checkpoints/storage-v2-{r.address}.jsonl",
+    )
+
+    snapshotPath = f"migrations/storage-v2-{r.address}-snapshot.json"
+    if os.path.exists(snapshotPath):
+        migration.loadSnapshot(snapshotPath)
+    else:
+        indexer = RentableIndexer(
+            dbPath, deployment.values(), fromBlock=mainnetStartBlock
+        )
+        indexer.sync(verbose=False)
+        migration.snapshot(indexer.deposited())
+        os.makedirs(os.path.dirname(snapshotPath), exist_ok=True)
+        migration.saveSnapshot(snapshotPath)
+    click.echo(f"{len(migration.pairs())} of {len(migration.states)} tokens to migrate")
+
+    if not execute:
+        if r.paused():
+            mismatches = migration.verify()
+            click.echo(f"{len(mismatches)} tokens differ from the snapshot")
+            return
+
+        callsPath = f"migrations/storage-v2-{r.address}.json"
+        with open(callsPath, "w") as f:
+            json.dump(
+                {
+                    "implementation": implementation,
+                    "calls": [{"to": to, "data": d} for to, d in migration.calls()],
+                },
+                f,
+                indent=2,
+            )
+        click.echo(f"migrateRentals calls written to {callsPath}")
+        return
+
+    migration.upgrade(implementation)
+    migration.migrate()
+    mismatches = migration.finish()
+    report(migration)
+    for m in mismatches:
+        click.echo(f"MISMATCH {m.tokenAddress} {m.tokenId}: {m.before} -> {m.after}")
@@ -0,0 +1,33 @@
+import json
+
+from brownie import Rentable, accounts
+
+from scripts.helpers.onboarding import CollectionOnboarding
+
+
+def main(
+    tokens="",
+    library=None,
+    deploymentPath="deployments/ethereum-mainnet.json",
+):
+    tokens = [t.strip() for t in tokens.split(",") if t.strip()]
+    if not tokens:
+        raise SystemExit("no tokens given, pass the collections comma separated")
+
+    dev = accounts.load("rentable-deployer")
+    accounts.default = dev
+
+    deployment = json.load(open(deploymentPath))
+    onboarding = CollectionOnboarding(
+        Rentable.at(deployment["Rentable"]),
+        deployment["ProxyAdmin"],
+        deployment["OBeacon"],
+        deployment["WBeacon"],
+        dev,
+        checkpointPath=f"checkpoints/onboarding-{deployment['Rentable']}.jsonl",
+    )
+    onboarding.onboard(tokens, library)
+    onboarding.report()
+
+    for to, data in onboarding.deferred:
+        print(f"Governance batch\n  to: {to}\n  data: {data}")
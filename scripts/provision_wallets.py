@@ -0,0 +1,48 @@
+import json
+
+import click
+from eth_utils import to_checksum_address
+
+from brownie import Rentable, accounts
+
+from scripts.helpers.wallets import WalletAddresses, WalletProvisioner
+
+
+def main(
+    usersPath=None,
+    deploymentPath="deployments/ethereum-mainnet.json",
+    batchSize=40,
+    maxBaseFee=None,
+    dryRun="false",
+):
+    """Compute renter wallet addresses offline and create the missing ones.
+
+    usersPath is a file with one address per line. maxBaseFee (gwei)
+    holds batches until the base fee drops below it.
+    """
+    maxBaseFee = int(float(maxBaseFee) * 10**9) if maxBaseFee else None
+
+    deployment = json.load(open(deploymentPath))
+    r = Rentable.at(deployment["Rentable"])
+    with open(usersPath) as f:
+        users = [to_checksum_address(line.strip()) for line in f if line.strip()]
+
+    for user, wallet in WalletAddresses.of(r).addresses(users).items():
+        click.echo(f"{user} {wallet}")
+
+    if str(dryRun).lower() in ("1", "true", "yes"):
+        return
+
+    dev = accounts.load("rentable-deployer")
+    provisioner = WalletProvisioner(
+        r,
+        dev,
+        batchSize=int(batchSize),
+        maxBaseFee=maxBaseFee,
+        checkpointPath="checkpoints/provision-wallets.jsonl",
+    )
+    served = provisioner.provision(users)
+    click.echo(
+        f"{provisioner.created}/{len(served)} wallets created, "
+        f"{provisioner.gasUsed} gas"
+    )
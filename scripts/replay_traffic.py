@@ -0,0 +1,85 @@
+import json
+
+import click
+
+from brownie import Rentable, accounts, web3
+
+from scripts.helpers.replay import (
+    ReplayNode,
+    Replayer,
+    bundleTransactions,
+    loadBundle,
+    loadJson,
+    prestate,
+    rentableTransactions,
+    saveBundle,
+    saveJson,
+)
+
+
+def _deployCandidate(dev):
+    """Rentable logic of the working tree, initialized and locked as in deploy."""
+    candidate = Rentable.deploy(dev, dev, {"from": dev})
+    candidate.SCRAM({"from": dev})
+    return candidate.address
+
+
+def export(
+    fromBlock,
+    toBlock,
+    deploymentPath="deployments/ethereum-mainnet.json",
+    outPath="replays/rentable",
+):
+    """Save the Rentable traffic of a block range and the state it reads.
+
+    Runs against an archive node with the prestateTracer, writes
+    `{outPath}-{fromBlock}-{toBlock}.bundle.json` and `.state.json`.
+    """
+    fromBlock, toBlock = int(fromBlock), int(toBlock)
+    deployment = json.load(open(deploymentPath))
+
+    hashes = rentableTransactions(deployment["Rentable"], fromBlock, toBlock)
+    click.echo(f"{len(hashes)} transactions, tracing")
+    transactions = bundleTransactions(hashes)
+    # ProxyAdmin owner (slot 0) swaps the candidate in, no traffic reads it
+    state = prestate(hashes, [(deployment["ProxyAdmin"], [0])], fromBlock - 1)
+
+    name = f"{outPath}-{fromBlock}-{toBlock}"
+    saveBundle(
+        f"{name}.bundle.json",
+        transactions,
+        chainId=web3.eth.chain_id,
+        rentable=deployment["Rentable"],
+        proxyAdmin=deployment["ProxyAdmin"],
+        fromBlock=fromBlock,
+        toBlock=toBlock,
+    )
+    saveJson(f"{name}.state.json", state)
+    click.echo(
+        f"Bundle written to {name}.bundle.json, {len(state['accounts'])} accounts"
+    )
+
+
+def main(bundlePath=None, statePath=None, resultsPath=None):
+    """Replay a bundle under the deployed Rentable logic and the working tree.
+
+    Offline on a node without forking, e.g. `yarn network:replay` and
+    `--network hardhat`. Exits with an error on divergent reverts.
+    """
+    node = ReplayNode()
+
+    meta, transactions = loadBundle(bundlePath)
+    node.checkClock(transactions[0].timestamp)
+    node.loadState(loadJson(statePath))
+
+    replayer = Replayer(node, meta["rentable"], meta["proxyAdmin"], transactions)
+    replayer.compare(_deployCandidate(accounts[0]))
+    replayer.report()
+
+    if resultsPath:
+        saveJson(resultsPath, replayer.results())
+        click.echo(f"Results written to {resultsPath}")
+
+    divergent = replayer.divergent()
+    if divergent:
+        raise SystemExit(f"{len(divergent)} transactions diverge from the baseline")
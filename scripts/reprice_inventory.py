@@ -0,0 +1,75 @@
+import json
+import time
+
+import click
+
+from brownie import Rentable, accounts, web3
+
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+from scripts.helpers.repricing import Repricer, scalePrices, utilizationPrices
+
+
+def newPrices(listings, strategy, factor, rented):
+    prices = [listing.rentalConditions.pricePerSecond for listing in listings]
+    if strategy == "scale":
+        return scalePrices(prices, factor)
+    if strategy == "utilization":
+        return utilizationPrices(
+            prices,
+            [(listing.tokenAddress, listing.tokenId) in rented for listing in listings],
+        )
+    raise ValueError(f"Unknown strategy {strategy}")
+
+
+def report(repricer, listings, elapsed):
+    click.echo(
+        f"""
+            -------- Repricing --------
+              Listings: {len(listings)}
+               Updated: {repricer.updated}
+            Batch size: {repricer.batchSize}
+          Transactions: {repricer.transactions}
+              Gas used: {repricer.gasUsed}
+       Gas per listing: {repricer.gasUsed // max(1, repricer.updated)}
+               Elapsed: {elapsed:.1f} s
+         """
+    )
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    strategy="utilization",
+    factor=1.0,
+    windowBlocks=50000,
+    gasLimit=10_000_000,
+):
+    """Reprice every listing of the account.
+
+    strategy "scale" multiplies prices by factor, "utilization" raises the
+    price of tokens rented in the last windowBlocks and lowers idle ones.
+    """
+    deployment = json.load(open(deploymentPath))
+    dev = accounts.load("rentable-deployer")
+    r = Rentable.at(deployment["Rentable"])
+
+    indexer = RentableIndexer(
+        dbPath,
+        deployment.values(),
+        fromBlock=mainnetStartBlock,
+        rentable=deployment["Rentable"],
+    )
+    indexer.sync(verbose=False)
+    since = web3.eth.block_number - int(windowBlocks)
+    rented = {(a, i) for a, i, _ in indexer.rentedSince(since)}
+
+    startedAt = time.time()
+    repricer = Repricer(
+        r,
+        dev,
+        gasLimit=int(gasLimit),
+        checkpointPath=f"checkpoints/reprice-{dev.address}.jsonl",
+    )
+    inventory = repricer.inventory(indexer.listed())
+    repricer.reprice(inventory, newPrices(inventory, strategy, factor, rented))
+    report(repricer, inventory, time.time() - startedAt)
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from brownie import web3
+
+from scripts.helpers.keeper import percentile
+from scripts.helpers.rpc import AsyncRpc
+
+
+def _addresses(count, seed):
+    rng = random.Random(seed)
+    return ["0x%040x" % rng.getrandbits(160) for _ in range(count)]
+
+
+def _row(title, concurrency, latencies, elapsed):
+    latencies = [latency * 1000 for latency in latencies]
+    click.echo(
+        f"  {title:<16} {concurrency:>5} {len(latencies) / elapsed:>10,.0f}"
+        f" {percentile(latencies, 50):>9.2f} {percentile(latencies, 99):>9.2f}"
+    )
+
+
+def syncRun(addresses, concurrency):
+    """web3 over its requests session, one request per thread."""
+
+    def request(address):
+        t = time.perf_counter()
+        web3.eth.get_balance(web3.toChecksumAddress(address))
+        return time.perf_counter() - t
+
+    startedAt = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(request, addresses))
+    return latencies, time.time() - startedAt
+
+
+def asyncRun(urls, addresses, concurrency, batchSize):
+    rpc = AsyncRpc(urls, maxConcurrency=concurrency, batchSize=batchSize)
+
+    async def run():
+        limit = asyncio.Semaphore(concurrency * batchSize)
+
+        async def request(address):
+            async with limit:
+                t = time.perf_counter()
+                await rpc.request("eth_getBalance", (address, "latest"))
+                return time.perf_counter() - t
+
+        async with rpc:
+            return await asyncio.gather(*(request(a) for a in addresses))
+
+    startedAt = time.time()
+    latencies = asyncio.run(run())
+    return latencies, time.time() - startedAt, rpc
+
+
+def main(url=None, requests=2000, concurrency="1,4,16,64", batchSize=50, seed=0):
+    """Latency and throughput of eth_getBalance reads against a node.
+
+    Defaults to the node brownie is connected to, e.g. the local ganache.
+    """
+    url = url or web3.provider.endpoint_uri
+    levels = [int(c) for c in str(concurrency).split(",")]
+    addresses = _addresses(int(requests), int(seed))
+
+    click.echo(f"\n  {url}, {len(addresses)} requests per run\n")
+    click.echo(
+        f"  {'transport':<16} {'conc.':>5} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+    )
+    for c in levels:
+        latencies, elapsed = syncRun(addresses, c)
+        _row("web3 threads", c, latencies, elapsed)
+    for c in levels:
+        latencies, elapsed, _ = asyncRun(url, addresses, c, 1)
+        _row("async", c, latencies, elapsed)
+    for c in levels:
+        latencies, elapsed, rpc = asyncRun(url, addresses, c, int(batchSize))
+        _row(f"async batch {batchSize}", c, latencies, elapsed)
+
+    # a dead endpoint first in line, requests fail over to the live one
+    rpc = AsyncRpc(["http://127.0.0.1:1", url], backoff=0.01)
+    if len(rpc.map("eth_blockNumber", [()] * 10)) != 10:
+        raise SystemExit("failover lost requests")
+    click.echo(f"\n  failover: {rpc.report()}")
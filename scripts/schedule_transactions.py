@@ -0,0 +1,42 @@
+import json
+import os
+
+import click
+
+from brownie import accounts
+
+from scripts.helpers.scheduler import Operation, TxScheduler
+
+gwei = 10**9
+
+
+def main(callsPath=None, maxFeePerGas=None, budget=None, perBlock=None):
+    """Send a batch of calls ({"calls": [{"to", "data", "value"}]}).
+
+    maxFeePerGas (gwei) holds the batch while the base fee is higher, budget
+    (ETH) stops it once the expected cost is reached: re-run to send the rest.
+    """
+    maxFeePerGas = int(float(maxFeePerGas) * gwei) if maxFeePerGas else None
+    budget = int(float(budget) * 10**18) if budget else None
+    perBlock = int(perBlock) if perBlock else None
+
+    with open(callsPath) as f:
+        calls = json.load(f)["calls"]
+    operations = [
+        Operation(f"call:{i}:{c['to']}", c["to"], c["data"], int(c.get("value", 0)))
+        for i, c in enumerate(calls)
+    ]
+
+    dev = accounts.load("rentable-deployer")
+    name = os.path.splitext(os.path.basename(callsPath))[0]
+    scheduler = TxScheduler(
+        dev,
+        maxFeePerGas=maxFeePerGas,
+        budget=budget,
+        perBlock=perBlock,
+        checkpointPath=f"checkpoints/schedule-{name}.jsonl",
+    )
+    left = scheduler.run(operations)
+    scheduler.report("call")
+    if left:
+        click.echo(f"{len(left)} calls over budget, re-run to send them")
@@ -0,0 +1,19 @@
+"""Typed Rentable structs, in place ABI decoding and columnar batches.
+
+The Multicall based reader is scripts.sdk.reader.SdkReader, not imported
+here as scripts.helpers.multicall depends on this package.
+"""
+
+from scripts.sdk.batches import Accounts, RentalBatch, RentalConditionsBatch
+from scripts.sdk.structs import Rental, RentalConditions, Wallet
+from scripts.sdk.words import decodeAggregate3
+
+__all__ = [
+    "Accounts",
+    "Rental",
+    "RentalBatch",
+    "RentalConditions",
+    "RentalConditionsBatch",
+    "Wallet",
+    "decodeAggregate3",
+]
@@ -0,0 +1,190 @@
+from abc import ABC, abstractmethod
+from array import array
+
+from scripts.sdk.structs import Rental, RentalConditions
+from scripts.sdk.words import WORD, addressAt, eth
+
+# account index of address(0) in every address column
+NONE = -1
+
+# uint64 columns, larger values (and the marker itself) live in a side dict
+BIG = 2**64 - 1
+
+
+class Accounts:
+    """Addresses interned to indexes, shared by the columns of a batch."""
+
+    __slots__ = ("addresses", "_index")
+
+    def __init__(self):
+        self.addresses = []
+        self._index = {}
+
+    def index(self, address):
+        if address == eth:
+            return NONE
+        index = self._index.get(address)
+        if index is None:
+            index = self._index[address] = len(self.addresses)
+            self.addresses.append(address)
+        return index
+
+    def address(self, index):
+        return eth if index == NONE else self.addresses[index]
+
+
+class _Batch(ABC):
+    """Records kept column-wise in typed arrays: uint64 ("Q") numbers and
+    interned addresses ("i"), a few bytes per field instead of an object."""
+
+    __slots__ = ("accounts", "_big")
+
+    def __init__(self, accounts=None):
+        self.accounts = accounts or Accounts()
+        # (column, index) => value not fitting uint64
+        self._big = {}
+
+    def _putUint(self, name, column, value):
+        if value >= BIG:
+            self._big[(name, len(column))] = value
+            value = BIG
+        column.append(value)
+
+    def _uint(self, name, column, i):
+        value = column[i]
+        return self._big[(name, i)] if value == BIG else value
+
+    @abstractmethod
+    def _columns(self):
+        """Typed arrays of the batch, one per field."""
+
+    def nbytes(self):
+        """Bytes held by the columns, interned addresses not included."""
+        return sum(c.itemsize * len(c) for c in self._columns())
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class RentalConditionsBatch(_Batch):
+    """RentalConditions in columns, 40 bytes each."""
+
+    __slots__ = (
+        "minTimeDuration",
+        "maxTimeDuration",
+        "pricePerSecond",
+        "paymentTokenId",
+        "paymentTokenAddress",
+        "privateRenter",
+    )
+
+    def __init__(self, accounts=None):
+        super().__init__(accounts)
+        self.minTimeDuration = array("Q")
+        self.maxTimeDuration = array("Q")
+        self.pricePerSecond = array("Q")
+        self.paymentTokenId = array("Q")
+        self.paymentTokenAddress = array("i")
+        self.privateRenter = array("i")
+
+    def _columns(self):
+        return (
+            self.minTimeDuration,
+            self.maxTimeDuration,
+            self.pricePerSecond,
+            self.paymentTokenId,
+            self.paymentTokenAddress,
+            self.privateRenter,
+        )
+
+    def __len__(self):
+        return len(self.maxTimeDuration)
+
+    def append(self, rc):
+        self._putUint("minTimeDuration", self.minTimeDuration, rc.minTimeDuration)
+        self._putUint("maxTimeDuration", self.maxTimeDuration, rc.maxTimeDuration)
+        self._putUint("pricePerSecond", self.pricePerSecond, rc.pricePerSecond)
+        self._putUint("paymentTokenId", self.paymentTokenId, rc.paymentTokenId)
+        self.paymentTokenAddress.append(self.accounts.index(rc.paymentTokenAddress))
+        self.privateRenter.append(self.accounts.index(rc.privateRenter))
+
+    def appendWords(self, view, offset=0):
+        """Append the encoded struct at `offset`, no intermediate object."""
+        words = view[offset : offset + RentalConditions.WORDS * WORD]
+        self._putUint(
+            "minTimeDuration", self.minTimeDuration, int.from_bytes(words[0:32], "big")
+        )
+        self._putUint(
+            "maxTimeDuration", self.maxTimeDuration, int.from_bytes(words[32:64], "big")
+        )
+        self._putUint(
+            "pricePerSecond", self.pricePerSecond, int.from_bytes(words[64:96], "big")
+        )
+        self._putUint(
+            "paymentTokenId", self.paymentTokenId, int.from_bytes(words[96:128], "big")
+        )
+        self.paymentTokenAddress.append(self.accounts.index(addressAt(words, 128)))
+        self.privateRenter.append(self.accounts.index(addressAt(words, 160)))
+
+    def appendEmpty(self):
+        """Conditions of a token not listed (or a failed read)."""
+        for column in (
+            self.minTimeDuration,
+            self.maxTimeDuration,
+            self.pricePerSecond,
+            self.paymentTokenId,
+        ):
+            column.append(0)
+        self.paymentTokenAddress.append(NONE)
+        self.privateRenter.append(NONE)
+
+    def __getitem__(self, i):
+        return RentalConditions(
+            self._uint("minTimeDuration", self.minTimeDuration, i),
+            self._uint("maxTimeDuration", self.maxTimeDuration, i),
+            self._uint("pricePerSecond", self.pricePerSecond, i),
+            self._uint("paymentTokenId", self.paymentTokenId, i),
+            self.accounts.address(self.paymentTokenAddress[i]),
+            self.accounts.address(self.privateRenter[i]),
+        )
+
+    def listed(self):
+        """Indexes of the listed records."""
+        return [i for i, d in enumerate(self.maxTimeDuration) if d > 0]
+
+
+class RentalBatch(_Batch):
+    """Rentals in columns, 24 bytes each."""
+
+    __slots__ = ("tokenAddress", "tokenId", "renter", "expiresAt")
+
+    def __init__(self, accounts=None):
+        super().__init__(accounts)
+        self.tokenAddress = array("i")
+        self.tokenId = array("Q")
+        self.renter = array("i")
+        self.expiresAt = array("Q")
+
+    def _columns(self):
+        return (self.tokenAddress, self.tokenId, self.renter, self.expiresAt)
+
+    def __len__(self):
+        return len(self.tokenId)
+
+    def append(self, rental):
+        self.tokenAddress.append(self.accounts.index(rental.tokenAddress))
+        self._putUint("tokenId", self.tokenId, rental.tokenId)
+        self.renter.append(self.accounts.index(rental.renter))
+        self._putUint("expiresAt", self.expiresAt, rental.expiresAt)
+
+    def __getitem__(self, i):
+        return Rental(
+            self.accounts.address(self.tokenAddress[i]),
+            self._uint("tokenId", self.tokenId, i),
+            self.accounts.address(self.renter[i]),
+            self._uint("expiresAt", self.expiresAt, i),
+        )
+
+    def active(self, now):
+        """Indexes of the rentals not expired at `now`."""
+        return [i for i, e in enumerate(self.expiresAt) if now < e]
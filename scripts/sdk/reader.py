@@ -0,0 +1,112 @@
+from eth_utils import to_checksum_address
+
+from scripts.helpers.multicall import (
+    Call,
+    Multicall,
+    enumeratedTokens,
+    readPages,
+)
+from scripts.sdk.batches import RentalBatch, RentalConditionsBatch
+from scripts.sdk.structs import Rental, Wallet
+from scripts.sdk.words import WORD, addressAt, eth, uintArrayAt, uintAt
+
+
+class SdkReader:
+    """Rentable views through Multicall, decoded in place into SDK types.
+
+    Same calls as RentableReader, the raw return data is sliced as
+    memoryviews and read word by word instead of going through eth_abi.
+    """
+
+    def __init__(self, rentable, multicall=None):
+        self.rentable = to_checksum_address(str(rentable))
+        self.multicall = multicall or Multicall()
+
+    def _raw(self, calls):
+        return self.multicall.call(calls, raw=True)
+
+    def rentalConditions(self, pairs, batch=None):
+        """RentalConditionsBatch of (tokenAddress, tokenId) pairs, in order."""
+        batch = batch if batch is not None else RentalConditionsBatch()
+        views = self._raw(
+            Call(self.rentable, "rentalConditions(address,uint256)", p, ())
+            for p in pairs
+        )
+        for view in views:
+            if view is None:
+                batch.appendEmpty()
+            else:
+                batch.appendWords(view)
+        return batch
+
+    def rentals(self, tokenAddress, wrentable, tokenIds, batch=None):
+        """RentalBatch with expiration and WToken owner (expired included)."""
+        tokenIds = list(tokenIds)
+        batch = batch if batch is not None else RentalBatch()
+        calls = []
+        for tokenId in tokenIds:
+            calls.append(
+                Call(
+                    self.rentable,
+                    "expiresAt(address,uint256)",
+                    (tokenAddress, tokenId),
+                    (),
+                )
+            )
+            calls.append(Call(wrentable, "ownerOf(uint256,bool)", (tokenId, True), ()))
+
+        views = self._raw(calls)
+        for i, tokenId in enumerate(tokenIds):
+            expiresAt, owner = views[2 * i], views[2 * i + 1]
+            batch.append(
+                Rental(
+                    tokenAddress,
+                    tokenId,
+                    eth if owner is None else addressAt(owner, 0),
+                    0 if expiresAt is None else uintAt(expiresAt, 0),
+                )
+            )
+        return batch
+
+    def activeRentalsOf(self, tokenAddress, wrentable, user, pageSize=500):
+        """RentalBatch of the rentals of `user` not expired yet."""
+        count = enumeratedTokens(self.multicall, wrentable, user)
+        views = readPages(
+            self.multicall,
+            (
+                Call(
+                    wrentable,
+                    "activeRentalsOf(address,uint256,uint256)",
+                    (user, offset, pageSize),
+                    (),
+                )
+                for offset in range(0, count, pageSize)
+            ),
+            pageSize,
+            raw=True,
+        )
+
+        batch = RentalBatch()
+        for view in views:
+            tokenIds, length = uintArrayAt(view, 0)
+            expirations, _ = uintArrayAt(view, WORD)
+            for j in range(0, WORD * length, WORD):
+                batch.append(
+                    Rental(
+                        tokenAddress,
+                        uintAt(tokenIds, j),
+                        user,
+                        uintAt(expirations, j),
+                    )
+                )
+        return batch
+
+    def wallets(self, users):
+        users = list(users)
+        views = self._raw(
+            Call(self.rentable, "userWallet(address)", (u,), ()) for u in users
+        )
+        return [
+            Wallet(u, eth if view is None else addressAt(view, 0))
+            for u, view in zip(users, views)
+        ]
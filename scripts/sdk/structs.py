@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+
+from scripts.sdk.words import WORD, addressAt, addressWord, eth, uintAt, uintWord
+
+
+@dataclass(frozen=True)
+class RentalConditions:
+    """RentableTypes.RentalConditions, 6 static words once encoded.
+
+    The one Python type of the struct, FIELDS and TYPES give its ABI layout
+    to the codecs working on raw words or columns.
+    """
+
+    __slots__ = (
+        "minTimeDuration",
+        "maxTimeDuration",
+        "pricePerSecond",
+        "paymentTokenId",
+        "paymentTokenAddress",
+        "privateRenter",
+    )
+
+    minTimeDuration: int
+    maxTimeDuration: int
+    pricePerSecond: int
+    paymentTokenId: int
+    paymentTokenAddress: str
+    privateRenter: str
+
+    # struct order
+    FIELDS = __slots__
+    TYPES = ("uint256", "uint256", "uint256", "uint256", "address", "address")
+    WORDS = len(TYPES)
+
+    @classmethod
+    def listing(
+        cls,
+        maxTimeDuration,
+        pricePerSecond,
+        paymentTokenAddress=eth,
+        paymentTokenId=0,
+        minTimeDuration=1,
+        privateRenter=eth,
+    ):
+        """Public listing paid in ETH unless a payment token is given."""
+        return cls(
+            minTimeDuration,
+            maxTimeDuration,
+            pricePerSecond,
+            paymentTokenId,
+            paymentTokenAddress,
+            privateRenter,
+        )
+
+    @classmethod
+    def decode(cls, view, offset=0):
+        return cls(
+            uintAt(view, offset),
+            uintAt(view, offset + WORD),
+            uintAt(view, offset + 2 * WORD),
+            uintAt(view, offset + 3 * WORD),
+            addressAt(view, offset + 4 * WORD),
+            addressAt(view, offset + 5 * WORD),
+        )
+
+    def encode(self):
+        """ABI encoding, also the onERC721Received data of a listing."""
+        return b"".join(
+            (
+                uintWord(self.minTimeDuration),
+                uintWord(self.maxTimeDuration),
+                uintWord(self.pricePerSecond),
+                uintWord(self.paymentTokenId),
+                addressWord(self.paymentTokenAddress),
+                addressWord(self.privateRenter),
+            )
+        )
+
+    def __iter__(self):
+        # unpacks as the struct tuple brownie and eth_abi expect
+        return iter(
+            (
+                self.minTimeDuration,
+                self.maxTimeDuration,
+                self.pricePerSecond,
+                self.paymentTokenId,
+                self.paymentTokenAddress,
+                self.privateRenter,
+            )
+        )
+
+    def astuple(self):
+        return tuple(self)
+
+    @property
+    def listed(self):
+        return self.maxTimeDuration > 0
+
+
+@dataclass
+class Rental:
+    """A rental, the renter is the WToken owner (address(0) when none)."""
+
+    __slots__ = ("tokenAddress", "tokenId", "renter", "expiresAt")
+
+    tokenAddress: str
+    tokenId: int
+    renter: str
+    expiresAt: int
+
+    def active(self, now):
+        return now < self.expiresAt
+
+
+@dataclass
+class Wallet:
+    """SimpleWallet of a user, address(0) before the first rental."""
+
+    __slots__ = ("user", "wallet")
+
+    user: str
+    wallet: str
@@ -0,0 +1,66 @@
+"""32 bytes ABI words read in place from memoryviews of raw return data."""
+
+from eth_utils import to_checksum_address
+
+WORD = 32
+
+eth = "0x0000000000000000000000000000000000000000"
+
+
+class _Addresses(dict):
+    # checksums cost a keccak each, addresses repeat a lot in logs
+    def __missing__(self, raw):
+        value = self[raw] = to_checksum_address(raw)
+        return value
+
+
+# raw 20 bytes => checksummed address, shared by the decoders
+ADDRESSES = _Addresses()
+
+
+def uintAt(view, offset):
+    return int.from_bytes(view[offset : offset + WORD], "big")
+
+
+def boolAt(view, offset):
+    return view[offset + WORD - 1] != 0
+
+
+def addressAt(view, offset):
+    return ADDRESSES[bytes(view[offset + 12 : offset + WORD])]
+
+
+def uintWord(value):
+    return value.to_bytes(WORD, "big")
+
+
+def addressWord(address):
+    return bytes(12) + bytes.fromhex(address[2:])
+
+
+def uintArrayAt(view, head, base=0):
+    """Items of a uint256[] whose offset (from `base`) is the word at `head`,
+    as a memoryview of length * 32 bytes and the length."""
+    start = base + uintAt(view, head)
+    length = uintAt(view, start)
+    return view[start + WORD : start + WORD + WORD * length], length
+
+
+def decodeAggregate3(raw):
+    """Return data of each Multicall3.aggregate3 call, memoryviews into `raw`,
+    None for failed calls."""
+    view = memoryview(raw)
+    start = uintAt(view, 0)
+    count = uintAt(view, start)
+    items = start + WORD
+
+    results = []
+    for i in range(count):
+        result = items + uintAt(view, items + WORD * i)
+        if not boolAt(view, result):
+            results.append(None)
+            continue
+        data = result + uintAt(view, result + WORD)
+        length = uintAt(view, data)
+        results.append(view[data + WORD : data + WORD + length] if length else None)
+    return results
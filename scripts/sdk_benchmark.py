@@ -0,0 +1,156 @@
+import random
+import time
+import tracemalloc
+
+import click
+import eth_abi
+from brownie.convert.normalize import format_output
+from eth_utils import to_checksum_address
+
+from scripts.sdk import RentalConditions, RentalConditionsBatch, decodeAggregate3
+from scripts.sdk.words import eth
+
+# Rentable.rentalConditions, as brownie sees it
+RENTAL_CONDITIONS_ABI = {
+    "type": "function",
+    "name": "rentalConditions",
+    "stateMutability": "view",
+    "inputs": [
+        {"name": "tokenAddress", "type": "address"},
+        {"name": "tokenId", "type": "uint256"},
+    ],
+    "outputs": [
+        {
+            "name": "",
+            "type": "tuple",
+            "internalType": "struct RentableTypes.RentalConditions",
+            "components": [
+                {"name": "minTimeDuration", "type": "uint256"},
+                {"name": "maxTimeDuration", "type": "uint256"},
+                {"name": "pricePerSecond", "type": "uint256"},
+                {"name": "paymentTokenId", "type": "uint256"},
+                {"name": "paymentTokenAddress", "type": "address"},
+                {"name": "privateRenter", "type": "address"},
+            ],
+        }
+    ],
+}
+
+OUTPUT_TYPES = ["(uint256,uint256,uint256,uint256,address,address)"]
+
+
+def _word(value):
+    return value.to_bytes(32, "big")
+
+
+def syntheticAggregates(count, seed=0, batchSize=500, paymentTokens=20):
+    """Raw aggregate3 results of rentalConditions calls, batchSize per call."""
+    rng = random.Random(seed)
+    tokens = [eth] + [
+        to_checksum_address(_word(rng.getrandbits(160))[12:])
+        for _ in range(paymentTokens)
+    ]
+    renters = [eth] * 9 + [to_checksum_address(_word(rng.getrandbits(160))[12:])]
+
+    raws = []
+    for start in range(0, count, batchSize):
+        n = min(batchSize, count - start)
+        # (bool success, bytes returnData) tuples, 6 words of data each
+        size = 3 * 32 + RentalConditions.WORDS * 32
+        results = [
+            _word(1)
+            + _word(64)
+            + _word(RentalConditions.WORDS * 32)
+            + RentalConditions(
+                rng.randrange(3600),
+                rng.randrange(3600, 10**7),
+                rng.randrange(10**15),
+                0,
+                rng.choice(tokens),
+                rng.choice(renters),
+            ).encode()
+            for _ in range(n)
+        ]
+        offsets = b"".join(_word(32 * n + i * size) for i in range(n))
+        raws.append(_word(32) + _word(n) + offsets + b"".join(results))
+    return raws
+
+
+def brownieDecode(data):
+    """eth_abi decode and ReturnValue wrapping, ContractCall.decode_output."""
+    values = eth_abi.decode_abi(OUTPUT_TYPES, data)
+    return format_output(RENTAL_CONDITIONS_ABI, values)[0]
+
+
+def _rate(title, count, elapsed, baseline=None):
+    speedup = f" ({count / elapsed / baseline:.1f}x)" if baseline else ""
+    click.echo(f"  {title:<28} {count / elapsed:>12,.0f} records/s{speedup}")
+    return count / elapsed
+
+
+def _memory(build):
+    """(result, bytes allocated while building it)."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(records=1000000, brownieSample=100000, memorySample=100000, seed=0):
+    records, brownieSample = int(records), int(brownieSample)
+    memorySample = min(int(memorySample), records)
+
+    raws = syntheticAggregates(records, int(seed))
+    views = [v for raw in raws for v in decodeAggregate3(raw)]
+    if len(views) != records:
+        raise SystemExit(f"{len(views)} views decoded out of {records} records")
+
+    # brownie is slow enough to measure on a sample
+    sample = [bytes(v) for v in views[:brownieSample]]
+    startedAt = time.time()
+    expected = [brownieDecode(data) for data in sample]
+    baseline = _rate(
+        "brownie ReturnValue (sample)", len(sample), time.time() - startedAt
+    )
+
+    startedAt = time.time()
+    decoded = [RentalConditions.decode(v) for v in views]
+    _rate("sdk dataclasses", records, time.time() - startedAt, baseline)
+
+    startedAt = time.time()
+    batch = RentalConditionsBatch()
+    for v in views:
+        batch.appendWords(v)
+    _rate("sdk batch", records, time.time() - startedAt, baseline)
+
+    # same values either way
+    for i, rc in enumerate(expected[:1000]):
+        if not tuple(rc) == tuple(decoded[i]) == tuple(batch[i]):
+            raise SystemExit(f"record {i} decodes differently from brownie")
+
+    scale = records / memorySample
+    _, brownieBytes = _memory(
+        lambda: [brownieDecode(bytes(v)) for v in views[:memorySample]]
+    )
+    _, dataclassBytes = _memory(
+        lambda: [RentalConditions.decode(v) for v in views[:memorySample]]
+    )
+
+    def fill():
+        b = RentalConditionsBatch()
+        for v in views[:memorySample]:
+            b.appendWords(v)
+        return b
+
+    _, batchBytes = _memory(fill)
+
+    click.echo(
+        f"""
+            -------- Memory ({records} records) --------
+     brownie ReturnValue: {brownieBytes * scale / 2**20:>8.1f} MB
+         sdk dataclasses: {dataclassBytes * scale / 2**20:>8.1f} MB
+               sdk batch: {batchBytes * scale / 2**20:>8.1f} MB ({batch.nbytes() / 2**20:.1f} MB of columns)
+            ---------------------------------------------
+         """
+    )
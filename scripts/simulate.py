@@ -0,0 +1,45 @@
+import time
+
+import click
+
+from scripts.helpers.local_stack import eth
+from scripts.helpers.simulator import RentableSimulator, randomOperations
+
+
+def benchmark(operations, seed, users=20, collections=5, tokensPerCollection=2000):
+    sim = RentableSimulator(fee=500, feeCollector="feeCollector")
+    sim.enablePaymentToken(eth)
+    users = [f"user{i}" for i in range(users)]
+    tokens = []
+    for c in range(collections):
+        sim.addCollection(f"collection{c}")
+        for tokenId in range(tokensPerCollection):
+            sim.mint(users[tokenId % len(users)], f"collection{c}", tokenId)
+            tokens.append((f"collection{c}", tokenId))
+
+    startedAt = time.time()
+    reverted = sum(
+        1
+        for _, error in randomOperations(sim, users, tokens, operations, seed)
+        if error
+    )
+    elapsed = time.time() - startedAt
+
+    # every payment is credited to rentee and fee collector
+    if sum(sim.balances.values()) != 0:
+        raise SystemExit("payments do not balance out")
+
+    click.echo(
+        f"""
+            -------- Simulation --------
+            Operations: {sim.operations}
+              Reverted: {reverted}
+               Elapsed: {elapsed:.2f} s
+               Ops/min: {sim.operations / elapsed * 60:,.0f}
+            ----------------------------
+         """
+    )
+
+
+def main(operations=1000000, seed=0):
+    benchmark(int(operations), int(seed))
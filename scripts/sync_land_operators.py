@@ -0,0 +1,58 @@
+import json
+import os
+
+import click
+
+from brownie import accounts
+
+from scripts.helpers.indexer import RentableIndexer, mainnetStartBlock
+from scripts.helpers.land_operators import OperatorReconciler
+
+landAddress = "0xF87E31492Faf9A91B02Ee0dEAAd50d51d56D5d4d"
+
+
+def main(
+    dbPath="rentable-index.sqlite",
+    deploymentPath="deployments/ethereum-mainnet.json",
+    land=landAddress,
+    batchSize=50,
+    execute="false",
+):
+    """Find LAND parcels whose update operator drifted and restore it.
+
+    Needs the OLandRegistry implementation with syncUpdateOperators. Without
+    execute, the calls for the OLand owner are written to a file (see
+    scripts/schedule_transactions.py).
+    """
+    execute = str(execute).lower() in ("1", "true", "yes")
+
+    deployment = json.load(open(deploymentPath))
+    indexer = RentableIndexer(dbPath, deployment.values(), fromBlock=mainnetStartBlock)
+    reconciler = OperatorReconciler(
+        indexer,
+        land,
+        deployment["OLand"],
+        deployment["WLand"],
+        accounts.load("rentable-deployer") if execute else None,
+        batchSize=int(batchSize),
+        checkpointPath=f"checkpoints/land-operators-{land}.jsonl",
+    )
+
+    if execute:
+        reconciler.reconcile()
+        reconciler.report()
+        for d in reconciler.left:
+            click.echo(f"DRIFT {d.tokenId} ({d.reason}): {d.operator} -> {d.expected}")
+        return
+
+    drifts = reconciler.drift()
+    reconciler.report()
+    callsPath = f"migrations/land-operators-{land}.json"
+    os.makedirs(os.path.dirname(callsPath), exist_ok=True)
+    with open(callsPath, "w") as f:
+        json.dump(
+            {"calls": [{"to": to, "data": d} for to, d in reconciler.calls(drifts)]},
+            f,
+            indent=2,
+        )
+    click.echo(f"syncUpdateOperators calls written to {callsPath}")
@@ -0,0 +1,46 @@
+import pytest
+
+from brownie import TestNFT, web3
+
+from scripts.helpers.deploy_engine import deployData
+from scripts.helpers.local_stack import deployLocalStack, seedLocalActivity
+from scripts.helpers.pipeline import TxPipeline
+
+
+@pytest.fixture(autouse=True)
+def isolate(fn_isolation):
+    # chain reverted after each test, module fixtures deploy once
+    pass
+
+
+@pytest.fixture(scope="module")
+def dev(accounts):
+    return accounts[0]
+
+
+@pytest.fixture(scope="module")
+def stack(dev):
+    """Full Rentable stack on the local chain, dev holds all roles."""
+    return deployLocalStack(dev)
+
+
+@pytest.fixture(scope="module")
+def rentals(stack, dev, accounts):
+    """Token ids 1-10 deposited and listed by dev, 1-3 rented by accounts[1:4]."""
+    return seedLocalActivity(stack, dev, accounts[1:4])
+
+
+@pytest.fixture(scope="module")
+def deployCollections(dev):
+    """Deploy count TestNFT collections through a pipeline, returns addresses."""
+
+    def deploy(count):
+        pipeline = TxPipeline(dev)
+        hashes = [
+            pipeline.send(f"collection:{i}", None, deployData(TestNFT))
+            for i in range(count)
+        ]
+        pipeline.join()
+        return [web3.eth.get_transaction_receipt(h).contractAddress for h in hashes]
+
+    return deploy
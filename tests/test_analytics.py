@@ -0,0 +1,26 @@
+from scripts.helpers.analytics import loadRentals, rollup
+from scripts.helpers.indexer import RentableIndexer
+from scripts.helpers.local_stack import seedLocalActivity
+
+
+def test_fees_match_fee_collector(stack, dev, accounts):
+    feeCollector = accounts[9]
+    r = stack["Rentable"]
+    r.setFeeCollector(feeCollector, {"from": dev})
+
+    initialBalance = feeCollector.balance()
+    seedLocalActivity(stack, dev, accounts[1:4])
+    r.setFee(500, {"from": dev})
+    seedLocalActivity(stack, dev, accounts[4:8], startId=100)
+    r.setFee(250, {"from": dev})
+    seedLocalActivity(stack, dev, accounts[1:3], startId=200)
+
+    indexer = RentableIndexer(":memory:", [r.address])
+    indexer.sync(verbose=False)
+    rentals = loadRentals(indexer)
+
+    assert len(rentals) == 9
+    # float64 amounts, equal up to rounding
+    collected = rollup(rentals)["feesForFeeCollector"][0]
+    received = feeCollector.balance() - initialBalance
+    assert abs(collected - received) <= 1e-9 * received
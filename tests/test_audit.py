@@ -0,0 +1,57 @@
+from brownie import web3
+
+from scripts.helpers.audit import GovernanceAudit
+from scripts.helpers.onboarding import CollectionOnboarding
+from scripts.helpers.rpc import AsyncRpc
+
+
+def _deployment(stack, dev, tokens):
+    onboarding = CollectionOnboarding(
+        stack["Rentable"],
+        stack["ProxyAdmin"],
+        stack["OBeacon"],
+        stack["WBeacon"],
+        dev,
+    )
+    onboarding.onboard(tokens)
+
+    deployment = {k: v.address for k, v in stack.items()}
+    for i, token in enumerate(tokens):
+        c = onboarding.collections[token]
+        deployment[f"O{i}"], deployment[f"W{i}"] = c["o"], c["w"]
+    return deployment
+
+
+def test_drifts(stack, dev, accounts, deployCollections):
+    deployment = _deployment(stack, dev, deployCollections(100))
+
+    audit = GovernanceAudit(deployment, dev)
+    audit.read()
+    assert audit.drifts() == []
+
+    # drift: a beacon owner, an O minter and Rentable paused
+    stack["OBeacon"].transferOwnership(accounts[5], {"from": dev})
+    stack["ORentable"].setMinter(accounts[6], {"from": dev})
+    stack["Rentable"].SCRAM({"from": dev})
+
+    audit = GovernanceAudit(deployment, dev)
+    audit.read()
+    drifts = audit.drifts()
+    assert {(d.name, d.field) for d in drifts} == {
+        ("OBeacon", "owner"),
+        ("ORentable", "minter"),
+        ("Rentable", "paused"),
+    }
+
+    sent, pending = audit.apply(drifts, {a.address: a for a in accounts})
+    assert len(sent) == 3 and pending == []
+
+    audit = GovernanceAudit(deployment, dev)
+    audit.read()
+    assert audit.drifts() == []
+
+    # same state read over the async transport
+    rpcAudit = GovernanceAudit(
+        deployment, dev, rpc=AsyncRpc(web3.provider.endpoint_uri)
+    )
+    assert rpcAudit.read() == audit.state
@@ -0,0 +1,75 @@
+import json
+import urllib.request
+
+import pytest
+
+from brownie import chain
+
+from scripts.helpers.availability import AvailabilityIndex, serve
+from scripts.helpers.indexer import RentableIndexer
+from scripts.helpers.local_stack import seedLocalActivity
+from scripts.helpers.multicall import RentableReader
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+@pytest.fixture
+def api(stack, dev, accounts):
+    seedLocalActivity(stack, dev, accounts[1:4], listings=40)
+    indexer = RentableIndexer(":memory:", [stack["Rentable"].address])
+    indexer.sync(verbose=False)
+    index = AvailabilityIndex()
+    index.refresh(indexer)
+
+    server = serve(index, port=0)
+    host, port = server.server_address
+    yield indexer, index, f"http://{host}:{port}"
+    server.shutdown()
+
+
+def test_pages_match_chain(stack, api):
+    _, _, base = api
+    testNFT = stack["TestNFT"].address
+
+    # walk all pages and check them against the chain
+    now = chain.time()
+    tokenIds, cursor = [], ""
+    while cursor is not None:
+        page = get(
+            f"{base}/available?collection={testNFT}&at={now}&limit=7&cursor={cursor}"
+        )
+        tokenIds += [int(t["tokenId"]) for t in page["items"]]
+        cursor = page["cursor"] or None
+
+    reader = RentableReader(stack["Rentable"])
+    states = reader.tokenStates([(testNFT, i) for i in range(1, 41)])
+    reader.multicall.close()
+    expected = [
+        s.tokenId
+        for s in sorted(
+            states, key=lambda s: (s.rentalConditions.pricePerSecond, s.tokenId)
+        )
+        if s.rentalConditions.maxTimeDuration > 0 and s.isExpired
+    ]
+    assert tokenIds == expected
+    assert len(get(f"{base}/soon?collection={testNFT}&at={now}")["items"]) == 3
+
+
+def test_incremental_update(stack, api, accounts):
+    indexer, index, base = api
+    testNFT = stack["TestNFT"].address
+
+    page = get(f"{base}/available?collection={testNFT}&at={chain.time()}&limit=1")
+    tokenId = int(page["items"][0]["tokenId"])
+    stack["Rentable"].rent(
+        testNFT, tokenId, 60, {"from": accounts[5], "value": 10**18}
+    )
+
+    # one token updated on the new block
+    indexer.sync(verbose=False)
+    assert index.refresh(indexer) == 1
+    page = get(f"{base}/available?collection={testNFT}&at={chain.time()}&limit=100")
+    assert tokenId not in [int(t["tokenId"]) for t in page["items"]]
@@ -0,0 +1,52 @@
+import pytest
+
+from brownie import RentableBatch, TestNFT
+
+from scripts.codec_benchmark import naiveDecode, syntheticRentLogs
+from scripts.helpers.codec import Codec, eventAbi
+from scripts.helpers.indexer import CODEC
+
+token = "0x00000000000000000000000000000000000000bb"
+
+
+def test_rent_logs_decode():
+    logs = syntheticRentLogs(2000, seed=3)
+    columns = CODEC.columns(logs, "Rent")
+
+    # same values either way
+    for i, (log, event) in enumerate(zip(logs, CODEC.decode(logs))):
+        expected = naiveDecode(log)
+        assert event.name == "Rent" and event.args == expected
+        assert expected == {
+            k: v.item() if hasattr(v, "item") else v
+            for k, v in ((k, c[i]) for k, c in columns.items())
+        }
+
+
+def test_function_roundtrip(stack):
+    codec = Codec(RentableBatch.abi)
+    args = (token, (1, 2), ((1, 3600, 10**12, 0, token, token),) * 2)
+
+    data = codec["depositAndListBatch"].encode(*args)
+    assert "0x" + data.hex() == stack["RentableBatch"].depositAndListBatch.encode_input(
+        *args
+    )
+    assert codec.decodeCall(data) == ("depositAndListBatch", args)
+
+
+def test_overloaded_name():
+    codec = Codec(TestNFT.abi)
+    with pytest.raises(KeyError):
+        codec["safeTransferFrom"]
+    assert codec["safeTransferFrom(address,address,uint256)"]
+
+
+def test_invalid_input():
+    codec = Codec(RentableBatch.abi)
+    data = codec["withdrawBatch"].encode((token,), (1,))
+    with pytest.raises(ValueError):
+        codec["depositAndListBatch"].decodeInput(data)
+
+    dynamic = Codec([eventAbi("Dynamic", [("uint256[]", "ids", False)])])
+    with pytest.raises(ValueError):
+        dynamic.columns([], "Dynamic")
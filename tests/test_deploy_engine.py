@@ -0,0 +1,39 @@
+import pytest
+
+from brownie import Rentable, web3
+
+from scripts.deploy import apply
+from scripts.helpers.deploy_engine import loadManifest
+from scripts.helpers.rpc import AsyncRpc
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = loadManifest("manifests/development.yaml")
+    manifest["deployment"] = str(tmp_path / "development.json")
+    return manifest
+
+
+def test_apply(manifest, dev):
+    engine = apply(manifest, dev)
+
+    r = Rentable.at(engine.addresses["Rentable"])
+    testNFT = engine.addresses["TestNFT"]
+    assert r.getORentable(testNFT) == engine.addresses["ORentable"]
+    assert r.getWRentable(testNFT) == engine.addresses["WRentable"]
+
+    # idempotent: nothing left to send, also when verified in batch
+    assert apply(manifest, dev).sent == 0
+    rpc = AsyncRpc(web3.provider.endpoint_uri)
+    assert apply(manifest, dev, rpc=rpc).sent == 0
+    assert rpc.batches < rpc.requests
+
+
+def test_apply_sends_diff(manifest, dev):
+    apply(manifest, dev)
+
+    # onboarding a collection only sends the diff
+    manifest["contracts"]["TestNFT2"] = {"contract": "TestNFT"}
+    manifest["collections"]["TestNFT2"] = {"token": "$TestNFT2"}
+    engine = apply(manifest, dev)
+    assert engine.sent == 5 and engine.levels == 3
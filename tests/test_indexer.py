@@ -0,0 +1,48 @@
+from brownie import chain
+
+from scripts.helpers.indexer import RentableIndexer
+
+
+def test_sync(stack, rentals):
+    indexer = RentableIndexer(":memory:", [stack["Rentable"].address])
+    indexer.sync(verbose=False)
+
+    assert len(indexer.listed()) == 10
+    assert sorted(i for _, i, _, _ in indexer.rented(chain.time())) == sorted(
+        i for i, _ in rentals
+    )
+
+
+def test_reorg(stack, rentals, accounts):
+    indexer = RentableIndexer(":memory:", [stack["Rentable"].address])
+    indexer.sync(verbose=False)
+
+    # index a rent, revert it and check the index follows the new chain
+    chain.snapshot()
+    stack["Rentable"].rent(
+        stack["TestNFT"],
+        10,
+        60,
+        {"from": accounts[5], "value": 10**18},
+    )
+    indexer.sync(verbose=False)
+    assert len(indexer.rented(chain.time())) == len(rentals) + 1
+
+    chain.revert()
+    chain.mine(3)
+    indexer.sync(verbose=False)
+    assert len(indexer.rented(chain.time())) == len(rentals)
+
+
+def test_delisted(stack, rentals, dev):
+    indexer = RentableIndexer(
+        ":memory:", [stack["Rentable"].address], rentable=stack["Rentable"]
+    )
+    indexer.sync(verbose=False)
+
+    # no event for a delisting, read back from rentalConditions
+    stack["Rentable"].deleteRentalConditions(stack["TestNFT"], 10, {"from": dev})
+    indexer.sync(verbose=False)
+
+    assert (stack["TestNFT"].address, 10) not in indexer.listed()
+    assert len(indexer.listed()) == 9
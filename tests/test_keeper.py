@@ -0,0 +1,26 @@
+from brownie import chain
+
+from scripts.helpers.indexer import RentableIndexer
+from scripts.helpers.keeper import ExpiryKeeper
+from scripts.helpers.local_stack import seedLocalActivity
+
+
+def test_expire_in_batches(stack, dev, accounts):
+    rentals = seedLocalActivity(stack, dev, accounts[1:10], listings=20, duration=60)
+    r = stack["Rentable"]
+
+    indexer = RentableIndexer(":memory:", [r.address])
+    # small budget to exercise batching
+    keeper = ExpiryKeeper(indexer, r, dev, gasBudget=600000)
+
+    keeper.tick()
+    assert keeper.expired == 0
+
+    chain.sleep(120)
+    chain.mine()
+
+    keeper.run(pollInterval=0, maxIterations=3)
+    keeper.stop()
+
+    assert keeper.expired == len(rentals)
+    assert all(not stack["WRentable"].exists(tokenId) for tokenId, _ in rentals)
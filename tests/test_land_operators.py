@@ -0,0 +1,97 @@
+from brownie import (
+    DecentralandCollectionLibrary,
+    OLandRegistry,
+    TestLand,
+    WRentable,
+    chain,
+)
+
+from scripts.helpers.codec import selector
+from scripts.helpers.indexer import RentableIndexer
+from scripts.helpers.land_operators import FIXABLE, ZERO, OperatorReconciler
+from scripts.helpers.pipeline import TxPipeline
+from scripts.sdk import RentalConditions
+
+
+def _deployLand(stack, dev):
+    """TestLand with its OLandRegistry, WRentable and library on the local stack."""
+    r = stack["Rentable"]
+    land = TestLand.deploy({"from": dev})
+    oland = OLandRegistry.deploy(land, dev, r, {"from": dev})
+    wland = WRentable.deploy(land, dev, r, {"from": dev})
+    r.setORentable(land, oland, {"from": dev})
+    r.setWRentable(land, wland, {"from": dev})
+    r.setLibrary(
+        land, DecentralandCollectionLibrary.deploy({"from": dev}), {"from": dev}
+    )
+    r.enableProxyCall(
+        oland, selector("setUpdateOperator(uint256,address)"), True, {"from": dev}
+    )
+    return land, oland, wland
+
+
+def _seed(land, oland, r, dev, renters, delegate, parcels):
+    """Deposit parcels, rent a quarter shortly and a quarter for long."""
+    ids = list(range(1, parcels + 1))
+    pipeline = TxPipeline(dev, window=64)
+    for tokenId in ids:
+        pipeline.send(
+            f"mint:{tokenId}", land.address, land.mint.encode_input(dev, tokenId)
+        )
+    pipeline.drain()
+    data = RentalConditions.listing(7200, 1).encode()
+    deposit = land.safeTransferFrom["address,address,uint256,bytes"]
+    for tokenId in ids:
+        pipeline.send(
+            f"deposit:{tokenId}",
+            land.address,
+            deposit.encode_input(dev, r, tokenId, data),
+        )
+    pipeline.join()
+
+    short, long = ids[0::4], ids[1::4]
+    for i, tokenId in enumerate(short + long):
+        duration = 60 if tokenId in short else 7200
+        r.rent(
+            land,
+            tokenId,
+            duration,
+            {"from": renters[i % len(renters)], "value": duration},
+        )
+
+    # depositor delegations, lost operators look like a delegation to 0x0
+    delegated, reset = ids[2::8], ids[3::8]
+    for tokenId in delegated:
+        oland.setUpdateOperator(tokenId, delegate, {"from": dev})
+    for tokenId in reset:
+        oland.setUpdateOperator(tokenId, ZERO, {"from": dev})
+
+    return short, long, delegated, reset
+
+
+def test_reconcile(stack, dev, accounts):
+    r = stack["Rentable"]
+    land, oland, wland = _deployLand(stack, dev)
+    short, long, delegated, reset = _seed(
+        land, oland, r, dev, accounts[1:9], accounts[9], 200
+    )
+
+    chain.sleep(120)
+    chain.mine()
+
+    indexer = RentableIndexer(":memory:", [r.address])
+    reconciler = OperatorReconciler(indexer, land, oland, wland, dev, batchSize=50)
+    left = reconciler.reconcile()
+
+    assert reconciler.fixed == len(short) + len(reset)
+    assert not [d for d in left if d.reason in FIXABLE]
+    assert all(land.updateOperator(t) == dev for t in short + reset)
+    assert all(not wland.exists(t) for t in short)
+    assert all(land.updateOperator(t) == accounts[9] for t in delegated)
+    assert all(land.updateOperator(t) == wland.ownerOf(t) for t in long)
+
+    # nothing left to fix, nothing sent
+    transactions = reconciler.transactions
+    reconciler.reconcile()
+    assert reconciler.fixed == len(short) + len(reset)
+    assert reconciler.transactions == transactions
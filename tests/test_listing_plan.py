@@ -0,0 +1,89 @@
+import eth_abi
+import pytest
+
+from scripts.helpers.listing_plan import (
+    address0,
+    encodeDepositAndListBatch,
+    encodePayloads,
+    generatePlan,
+    iterListings,
+    loadPlan,
+    savePlan,
+)
+from scripts.sdk import RentalConditions
+
+renter = "0x00000000000000000000000000000000000000aa"
+token = "0x00000000000000000000000000000000000000bb"
+
+
+def _plan(tokenIds=range(1, 101)):
+    return generatePlan(
+        tokenIds,
+        seed=7,
+        priceDistribution="lognormal",
+        paymentTokens=(address0, token),
+        paymentTokenIds=(0, 3),
+        privateRenters=(renter,),
+        privateShare=0.5,
+    )
+
+
+def test_payloads_match_abi_encoding():
+    plan = _plan()
+    for i, (tokenId, data) in enumerate(iterListings(plan)):
+        assert tokenId == plan["tokenIds"][i]
+        assert data == eth_abi.encode_abi(
+            list(RentalConditions.TYPES),
+            (
+                int(plan["minTimeDuration"][i]),
+                int(plan["maxTimeDuration"][i]),
+                int(plan["pricePerSecond"][i]),
+                int(plan["paymentTokenId"][i]),
+                str(plan["paymentTokens"][plan["paymentTokenIndex"][i]]),
+                str(plan["privateRenters"][plan["privateRenterIndex"][i]]),
+            ),
+        )
+
+
+def test_plan_within_ranges():
+    plan = generatePlan(range(1000), seed=1, maxTimeDurationRange=(10, 100, 5))
+    assert plan["maxTimeDuration"].min() >= 10
+    assert plan["maxTimeDuration"].max() < 100
+    assert not ((plan["maxTimeDuration"] - 10) % 5).any()
+    assert (plan["privateRenterIndex"] == 0).all()
+
+
+def test_full_uint256_token_ids():
+    tokenIds = [2**255 + i for i in range(3)]
+    plan = generatePlan(tokenIds)
+    assert [t for t, _ in iterListings(plan)] == tokenIds
+
+
+def test_deposit_and_list_batch_calldata(stack):
+    plan = _plan(range(1, 11))
+    payloads = encodePayloads(plan)
+    tokenIds = plan["tokenIds"].tolist()
+    conditions = [RentalConditions.decode(p.tobytes()) for p in payloads]
+
+    expected = stack["RentableBatch"].depositAndListBatch.encode_input(
+        token, tokenIds, [c.astuple() for c in conditions]
+    )
+    assert "0x" + encodeDepositAndListBatch(token, tokenIds, payloads).hex() == (
+        expected
+    )
+
+
+def test_deposit_and_list_batch_payload_count():
+    payloads = encodePayloads(_plan(range(1, 4)))
+    with pytest.raises(ValueError):
+        encodeDepositAndListBatch(token, [1, 2], payloads)
+
+
+def test_save_and_load(tmp_path):
+    plan = _plan()
+    path = str(tmp_path / "plan.npz")
+    savePlan(path, plan)
+    loaded = loadPlan(path)
+
+    assert loaded.keys() == plan.keys()
+    assert (encodePayloads(loaded) == encodePayloads(plan)).all()
@@ -0,0 +1,24 @@
+from brownie import TestNFT
+
+from scripts.helpers.minter import BulkMinter, iterUris
+
+
+def test_mint_and_resume(dev, tmp_path):
+    testNFT = TestNFT.deploy({"from": dev})
+
+    # a fixture larger than a single block
+    items = 5000
+    fixture = str(tmp_path / "nfts.txt")
+    with open(fixture, "w") as f:
+        for i in range(items):
+            f.write(f"ipfs://QmPMc4tcBsMqLRuCQtPmPe84bpSjrC3Ky7t3JWuHXYB4aS/{i}\n")
+    checkpointPath = fixture + ".jsonl"
+
+    minter = BulkMinter(testNFT, dev, checkpointPath=checkpointPath)
+    assert minter.mint(iterUris(fixture)) == items
+    assert testNFT.ownerOf(items) == dev
+
+    # resume: everything is already confirmed
+    minter = BulkMinter(testNFT, dev, checkpointPath=checkpointPath)
+    assert minter.mint(iterUris(fixture)) == items
+    assert minter.pipeline.sent == 0
@@ -0,0 +1,65 @@
+from scripts.helpers.onboarding import CollectionOnboarding
+
+
+def _onboarding(stack, account, checkpointPath=None):
+    return CollectionOnboarding(
+        stack["Rentable"],
+        stack["ProxyAdmin"],
+        stack["OBeacon"],
+        stack["WBeacon"],
+        account,
+        checkpointPath=checkpointPath,
+    )
+
+
+def test_onboard(stack, dev, deployCollections):
+    tokens = deployCollections(50)
+    onboarding = _onboarding(stack, dev)
+    onboarding.onboard(tokens)
+
+    r = stack["Rentable"]
+    for t in tokens:
+        c = onboarding.collections[t]
+        assert r.getORentable(t) == c["o"] and r.getWRentable(t) == c["w"]
+
+    # second run is a no-op
+    assert onboarding.onboard(tokens) == []
+
+
+def test_resume_reuses_proxies(stack, dev, accounts, deployCollections, tmp_path):
+    tokens = deployCollections(5)
+    checkpointPath = str(tmp_path / "onboarding.jsonl")
+
+    # proxies deployed, setters not applied (deferred to governance)
+    first = _onboarding(stack, accounts[1], checkpointPath)
+    first.onboard(tokens)
+    assert len(first.deferred) == 1
+
+    nonce = dev.nonce
+    resumed = _onboarding(stack, dev, checkpointPath)
+    assert resumed.onboard(tokens) == tokens
+
+    # only the setters batch is sent, to the proxies of the first run
+    assert dev.nonce == nonce + 1
+    r = stack["Rentable"]
+    for t in tokens:
+        c = first.collections[t]
+        assert r.getORentable(t) == c["o"] and r.getWRentable(t) == c["w"]
+
+
+def test_resume_partially_wired(stack, dev, deployCollections):
+    token = deployCollections(1)[0]
+    onboarding = _onboarding(stack, dev)
+    onboarding.onboard([token])
+    o = onboarding.collections[token]["o"]
+
+    # W lost, O kept and a library to set
+    r = stack["Rentable"]
+    r.setWRentable(token, "0x" + "0" * 40, {"from": dev})
+    library = stack["TestNFT"].address
+    onboarding = _onboarding(stack, dev)
+    assert onboarding.onboard([token], library) == [token]
+
+    assert r.getORentable(token) == o
+    assert r.getWRentable(token) == onboarding.collections[token]["w"] != o
+    assert r.getLibrary(token) == library
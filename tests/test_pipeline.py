@@ -0,0 +1,66 @@
+from scripts.fill_marketplace import bulkDepositAndList, bulkListOnMarket
+from scripts.helpers.listing_plan import encodePayloads, generatePlan, iterListings
+from scripts.helpers.pipeline import Checkpoint, TxPipeline
+
+
+def _mint(stack, dev, tokenIds):
+    stack["TestNFT"].mintBatch(
+        [dev] * len(tokenIds), tokenIds, [""] * len(tokenIds), {"from": dev}
+    )
+
+
+def _assertListed(stack, plan):
+    r, testNFT = stack["Rentable"], stack["TestNFT"]
+    for tokenId, maxTimeDuration, pricePerSecond in zip(
+        plan["tokenIds"].tolist(),
+        plan["maxTimeDuration"].tolist(),
+        plan["pricePerSecond"].tolist(),
+    ):
+        rc = r.rentalConditions(testNFT, tokenId)
+        assert (rc[1], rc[2]) == (maxTimeDuration, pricePerSecond)
+
+
+def test_bulk_list_on_market(stack, dev, tmp_path):
+    tokenIds = list(range(1, 51))
+    _mint(stack, dev, tokenIds)
+    plan = generatePlan(tokenIds, seed=1)
+    path = str(tmp_path / "fill_marketplace.jsonl")
+
+    pipeline = TxPipeline(dev, window=8, checkpoint=Checkpoint(path))
+    bulkListOnMarket(
+        pipeline, dev, stack["TestNFT"], stack["Rentable"].address, iterListings(plan)
+    )
+    pipeline.join()
+
+    assert pipeline.confirmed == len(tokenIds) and not pipeline.failures
+    _assertListed(stack, plan)
+
+    # resumed from the checkpoint, nothing left to send
+    pipeline = TxPipeline(dev, checkpoint=Checkpoint(path))
+    bulkListOnMarket(
+        pipeline, dev, stack["TestNFT"], stack["Rentable"].address, iterListings(plan)
+    )
+    pipeline.join()
+
+    assert pipeline.sent == 0 and pipeline.skipped == len(tokenIds)
+
+
+def test_bulk_deposit_and_list(stack, dev):
+    tokenIds = list(range(1, 51))
+    _mint(stack, dev, tokenIds)
+    plan = generatePlan(tokenIds, seed=1)
+
+    pipeline = TxPipeline(dev, window=4)
+    bulkDepositAndList(
+        pipeline,
+        dev,
+        stack["TestNFT"],
+        stack["Rentable"].address,
+        plan,
+        encodePayloads(plan),
+        batchSize=20,
+    )
+    pipeline.join()
+
+    assert pipeline.confirmed == 3 and not pipeline.failures
+    _assertListed(stack, plan)
@@ -0,0 +1,41 @@
+from brownie import chain, web3
+
+from scripts.helpers.local_stack import seedLocalActivity
+from scripts.helpers.replay import ReplayNode, Replayer, bundleTransactions
+from scripts.replay_traffic import _deployCandidate
+
+
+def _localTraffic(stack, dev, renters):
+    """Hashes of deposits, rents, expirations and withdrawals on the dev chain."""
+    r, testNFT = stack["Rentable"], stack["TestNFT"]
+    start = web3.eth.block_number
+
+    rentals = seedLocalActivity(stack, dev, renters)
+    chain.sleep(3601)
+    chain.mine()
+    for tokenId, _ in rentals:
+        r.expireRental(testNFT, tokenId, {"from": dev})
+        r.withdraw(testNFT, tokenId, {"from": dev})
+
+    return [
+        tx.hex()
+        for n in range(start + 1, web3.eth.block_number + 1)
+        for tx in web3.eth.get_block(n).transactions
+    ]
+
+
+def test_replay_reproduces_chain(stack, dev, accounts):
+    node = ReplayNode()
+    snapshotId = node.snapshot()
+    transactions = bundleTransactions(_localTraffic(stack, dev, accounts[1:4]))
+    node.revert(snapshotId)
+
+    replayer = Replayer(
+        node, stack["Rentable"].address, stack["ProxyAdmin"].address, transactions
+    )
+    replayer.compare(_deployCandidate(dev))
+
+    # same code on both sides, the replay reproduces the chain
+    assert not replayer.unfaithful() and not replayer.divergent()
+    assert all(before == after for _, before, after in replayer.functions().values())
+    assert "Rentable.expireRental" in replayer.functions()
@@ -0,0 +1,41 @@
+from brownie import web3
+
+from scripts.fill_marketplace import bulkListOnMarket, chunks
+from scripts.helpers.indexer import RentableIndexer
+from scripts.helpers.listing_plan import generatePlan, iterListings
+from scripts.helpers.pipeline import TxPipeline
+from scripts.helpers.repricing import Repricer
+from scripts.reprice_inventory import newPrices
+
+
+def test_reprice_by_utilization(stack, dev, accounts):
+    testNFT, r = stack["TestNFT"], stack["Rentable"]
+
+    ids = list(range(1, 2001))
+    for c in chunks(ids, 120):
+        testNFT.mintBatch([dev] * len(c), c, [""] * len(c), {"from": dev})
+    pipeline = TxPipeline(dev, window=64)
+    bulkListOnMarket(pipeline, dev, testNFT, r, iterListings(generatePlan(ids)))
+    pipeline.join()
+
+    startBlock = web3.eth.block_number
+    for renter, tokenId in zip(accounts[1:], ids[::200]):
+        price = r.rentalConditions(testNFT, tokenId)[2]
+        r.rent(testNFT, tokenId, 60, {"from": renter, "value": price * 60})
+
+    indexer = RentableIndexer(":memory:", [r.address], fromBlock=0)
+    indexer.sync(verbose=False)
+    rented = {(a, i) for a, i, _ in indexer.rentedSince(startBlock)}
+    assert len(rented) == len(ids[::200][: len(accounts) - 1])
+
+    repricer = Repricer(r, dev, gasLimit=10_000_000)
+    inventory = repricer.inventory(indexer.listed())
+    prices = newPrices(inventory, "utilization", 1, rented)
+    repricer.reprice(inventory, prices)
+
+    onChain = repricer.reader.rentalConditions(
+        (listing.tokenAddress, listing.tokenId) for listing in inventory
+    )
+    assert [rc.pricePerSecond for rc in onChain] == prices
+    # a batch per few hundred listings, not a transaction each
+    assert repricer.transactions * 100 <= len(inventory)
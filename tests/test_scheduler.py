@@ -0,0 +1,71 @@
+from brownie import chain, web3
+
+from scripts.helpers.fees import FeeEstimator
+from scripts.helpers.scheduler import Operation, TxScheduler
+from scripts.sdk import RentalConditions
+
+gwei = 10**9
+
+# simulated base fee of the next block, by block number
+BASE_FEES = [20 * gwei, 35 * gwei, 60 * gwei, 90 * gwei, 70 * gwei, 45 * gwei]
+
+
+def simulatedHistory(baseFees):
+    """eth_feeHistory of a chain whose base fee follows `baseFees`."""
+
+    def history(blocks, percentiles):
+        return {
+            "baseFeePerGas": [baseFees[(web3.eth.block_number + 1) % len(baseFees)]]
+        }
+
+    return history
+
+
+def _deposits(stack, dev, tokenIds):
+    testNFT, r = stack["TestNFT"], stack["Rentable"]
+    testNFT.mintBatch(
+        [dev] * len(tokenIds), tokenIds, [""] * len(tokenIds), {"from": dev}
+    )
+    deposit = testNFT.safeTransferFrom["address,address,uint256,bytes"]
+    return [
+        Operation(
+            f"deposit:{testNFT.address}:{tokenId}",
+            testNFT.address,
+            deposit.encode_input(
+                dev, r, tokenId, RentalConditions.listing(3600, 1).encode()
+            ),
+        )
+        for tokenId in tokenIds
+    ]
+
+
+def test_fee_cap_and_budget(stack, dev):
+    fees = FeeEstimator(maxAge=0, history=simulatedHistory(BASE_FEES))
+    tokenIds = list(range(1, 31))
+    operations = _deposits(stack, dev, tokenIds)
+
+    cap = 50 * gwei
+    scheduler = TxScheduler(
+        dev, maxFeePerGas=cap, perBlock=2, fees=fees, waitBlock=chain.mine
+    )
+    left = scheduler.run(operations[: len(operations) // 2])
+    assert not left and scheduler.waitedBlocks > 0
+    # nothing sent while the simulated base fee was above the ceiling
+    for block in scheduler.blocks:
+        baseFee = BASE_FEES[(block + 1) % len(BASE_FEES)]
+        assert baseFee + fees.minPriorityFee <= cap, block
+
+    # a budget of about 3 deposits defers the rest, a later run sends them
+    rest = operations[len(operations) // 2 :]
+    threeDeposits = 3 * scheduler.expectedCost // scheduler.pipeline.confirmed
+    limited = TxScheduler(
+        dev, maxFeePerGas=cap, budget=threeDeposits, fees=fees, waitBlock=chain.mine
+    )
+    left = limited.run(rest)
+    assert 0 < len(left) < len(rest)
+    assert limited.expectedCost <= threeDeposits
+
+    TxScheduler(dev, fees=fees, waitBlock=chain.mine).run(left)
+    assert all(
+        stack["TestNFT"].ownerOf(tokenId) == stack["Rentable"] for tokenId in tokenIds
+    )
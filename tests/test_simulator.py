@@ -0,0 +1,215 @@
+import random
+
+from eth_utils import to_checksum_address
+
+from brownie import WETH, chain, web3
+from brownie.exceptions import VirtualMachineError
+
+from scripts.helpers.local_stack import eth
+from scripts.helpers.multicall import Call, RentableReader
+from scripts.helpers.simulator import (
+    RentableSimulator,
+    SimulationError,
+    randomOperations,
+)
+from scripts.sdk import RentalConditions
+
+
+class Differential:
+    """Replay an operation stream on a local stack and on a simulator.
+
+    The simulator clock follows the chain: each operation is applied with
+    the timestamp of the block that included the transaction, then reverts
+    and the final state of every token are compared.
+    """
+
+    def __init__(self, stack, dev, users, tokenIds):
+        self.dev = dev
+        self.users = [u.address for u in users]
+        self.stack = stack
+        self.r = self.stack["Rentable"]
+        self.testNFT = self.stack["TestNFT"]
+        self.tokenAddress = self.testNFT.address
+
+        self.weth = WETH.deploy({"from": dev})
+        self.r.enablePaymentToken(self.weth, {"from": dev})
+        self.r.setFee(500, {"from": dev})
+        for user in users:
+            self.weth.deposit({"from": user, "value": 10**21})
+            self.weth.approve(self.r, 2**256 - 1, {"from": user})
+
+        self.sim = RentableSimulator(fee=500, feeCollector=dev.address)
+        self.planner = RentableSimulator(fee=500, feeCollector=dev.address)
+        for sim in (self.sim, self.planner):
+            sim.addCollection(self.tokenAddress)
+            sim.enablePaymentToken(eth)
+            sim.enablePaymentToken(self.weth.address)
+
+        self.tokens = [(self.tokenAddress, tokenId) for tokenId in tokenIds]
+        owners = [self.users[i % len(self.users)] for i in range(len(tokenIds))]
+        self.testNFT.mintBatch(owners, tokenIds, [""] * len(tokenIds), {"from": dev})
+        for owner, (tokenAddress, tokenId) in zip(owners, self.tokens):
+            self.sim.mint(owner, tokenAddress, tokenId)
+            self.planner.mint(owner, tokenAddress, tokenId)
+
+        self.balances = {a: self.weth.balanceOf(a) for a in self.users + [dev.address]}
+        self.mismatches = []
+
+    def _send(self, operation):
+        name, *args = operation
+        r, o, w = self.r, self.stack["ORentable"], self.stack["WRentable"]
+        if name == "deposit":
+            user, _, tokenId, rc = args
+            if rc is None:
+                return self.testNFT.safeTransferFrom["address,address,uint256"](
+                    user, r, tokenId, {"from": user}
+                )
+            return self.testNFT.safeTransferFrom["address,address,uint256,bytes"](
+                user,
+                r,
+                tokenId,
+                RentalConditions(*rc).encode(),
+                {"from": user},
+            )
+        if name == "createOrUpdateRentalConditions":
+            user, tokenAddress, tokenId, rc = args
+            return r.createOrUpdateRentalConditions(
+                tokenAddress, tokenId, tuple(rc), {"from": user}
+            )
+        if name == "deleteRentalConditions":
+            user, tokenAddress, tokenId = args
+            return r.deleteRentalConditions(tokenAddress, tokenId, {"from": user})
+        if name == "rent":
+            renter, tokenAddress, tokenId, duration = args
+            return r.rent(tokenAddress, tokenId, duration, {"from": renter})
+        if name == "expireRental":
+            return r.expireRental(*args, {"from": self.dev})
+        if name == "withdraw":
+            user, tokenAddress, tokenId = args
+            return r.withdraw(tokenAddress, tokenId, {"from": user})
+        if name == "transferO":
+            sender, to, _, tokenId = args
+            return o.transferFrom(sender, to, tokenId, {"from": sender})
+        if name == "transferW":
+            sender, to, _, tokenId = args
+            return w.transferFrom(sender, to, tokenId, {"from": sender})
+        raise ValueError(f"unknown operation {name}")
+
+    def step(self, operation):
+        if operation[0] == "sleep":
+            chain.sleep(operation[1])
+            return
+
+        try:
+            tx = self._send(operation)
+            error, txid = None, tx.txid
+        except VirtualMachineError as e:
+            error, txid = e.revert_msg or "", e.txid
+
+        receipt = web3.eth.get_transaction_receipt(txid)
+        self.sim.now = web3.eth.get_block(receipt.blockNumber).timestamp
+        try:
+            self.sim.apply(operation)
+            expected = None
+        except SimulationError as e:
+            expected = e.args[0]
+
+        if error != expected:
+            self.mismatches.append((operation, "revert", error, expected))
+
+    def run(self, operations, seed):
+        stream = randomOperations(
+            self.planner,
+            self.users,
+            self.tokens,
+            operations,
+            seed,
+            rentalConditions=self._rentalConditions(seed),
+        )
+        for operation, _ in stream:
+            self.step(operation)
+            # keep the planner on the chain clock for sensible streams
+            self.planner.now = chain.time()
+        return self.compare()
+
+    def _rentalConditions(self, seed):
+        rng = random.Random(seed)
+        return lambda: RentalConditions(
+            rng.choice((0, 60)),
+            rng.choice((600, 3600)),
+            rng.randint(1, 10**9),
+            0,
+            self.weth.address,
+            eth,
+        )
+
+    def _wallet(self, holder):
+        if isinstance(holder, tuple):
+            return self.r.userWallet(self.sim.address(holder[1]))
+        return self.r.address if holder == "rentable" else holder
+
+    def compare(self):
+        reader = RentableReader(self.r)
+        multicall = reader.multicall
+        states = reader.tokenStates(self.tokens)
+        owners = multicall.call(
+            Call(target, signature, (tokenId, *extra), ("address",))
+            for _, tokenId in self.tokens
+            for target, signature, extra in (
+                (self.tokenAddress, "ownerOf(uint256)", ()),
+                (self.stack["ORentable"].address, "ownerOf(uint256)", ()),
+                (self.stack["WRentable"].address, "ownerOf(uint256,bool)", (True,)),
+            )
+        )
+
+        for i, (tokenAddress, tokenId) in enumerate(self.tokens):
+            expected = self.sim.state(tokenAddress, tokenId)
+            holder, oOwner, wOwner = (
+                to_checksum_address(a) if a else eth for a in owners[3 * i : 3 * i + 3]
+            )
+            actual = {
+                "holder": holder,
+                "oOwner": oOwner,
+                "wOwner": wOwner,
+                "expiresAt": states[i].expiresAt,
+                "rentalConditions": tuple(states[i].rentalConditions),
+            }
+            expected["holder"] = self._wallet(expected["holder"])
+            expected["rentalConditions"] = tuple(expected["rentalConditions"])
+            for field, value in actual.items():
+                if value != expected[field]:
+                    self.mismatches.append(
+                        ((tokenAddress, tokenId), field, value, expected[field])
+                    )
+
+        for account, before in self.balances.items():
+            actual = self.weth.balanceOf(account) - before
+            expected = self.sim.balance(account, self.weth.address)
+            if actual != expected:
+                self.mismatches.append((account, "balance", actual, expected))
+
+        multicall.close()
+        return self.mismatches
+
+
+def test_payments_balance_out():
+    sim = RentableSimulator(fee=500, feeCollector="feeCollector")
+    sim.enablePaymentToken(eth)
+    users = [f"user{i}" for i in range(5)]
+    tokens = []
+    for c in range(2):
+        sim.addCollection(f"collection{c}")
+        for tokenId in range(50):
+            sim.mint(users[tokenId % len(users)], f"collection{c}", tokenId)
+            tokens.append((f"collection{c}", tokenId))
+
+    for _ in randomOperations(sim, users, tokens, 20000, seed=1):
+        pass
+
+    # every payment is credited to rentee and fee collector
+    assert sim.operations and sum(sim.balances.values()) == 0
+
+
+def test_differential(stack, dev, accounts):
+    replay = Differential(stack, dev, accounts[1:6], list(range(1, 21)))
+    assert replay.run(300, 0) == []
@@ -0,0 +1,73 @@
+from brownie import DummyRentableV1Storage, chain
+
+from scripts.fill_marketplace import bulkListOnMarket, chunks
+from scripts.helpers.listing_plan import generatePlan, iterListings
+from scripts.helpers.pipeline import TxPipeline
+from scripts.helpers.storage_migration import StorageMigration
+
+
+def _listAndRent(stack, dev, renters, count):
+    testNFT, r = stack["TestNFT"], stack["Rentable"]
+
+    ids = list(range(1, count + 1))
+    for c in chunks(ids, 120):
+        testNFT.mintBatch([dev] * len(c), c, [""] * len(c), {"from": dev})
+    pipeline = TxPipeline(dev, window=64)
+    bulkListOnMarket(pipeline, dev, testNFT, r, iterListings(generatePlan(ids)))
+    pipeline.join()
+
+    for renter, tokenId in zip(renters, ids[::10]):
+        price = r.rentalConditions(testNFT, tokenId)[2]
+        r.rent(testNFT, tokenId, 3600, {"from": renter, "value": price * 3600})
+
+    return [(testNFT.address, tokenId) for tokenId in ids]
+
+
+def _moveToLegacy(stack, dev, states):
+    """Put rentals back in the V1 mappings, as before the upgrade."""
+    r = stack["Rentable"]
+    stack["ProxyAdmin"].upgrade(
+        r, DummyRentableV1Storage.deploy(dev, dev, {"from": dev}), {"from": dev}
+    )
+    legacy = DummyRentableV1Storage.at(r.address)
+
+    pipeline = TxPipeline(dev, window=64)
+    for s in states:
+        pipeline.send(
+            f"legacy:{s.tokenId}",
+            r.address,
+            legacy.setLegacyRental.encode_input(
+                s.tokenAddress, s.tokenId, s.rentalConditions, s.expiresAt
+            ),
+        )
+    pipeline.join()
+
+
+def test_migrate(stack, dev, accounts):
+    r = stack["Rentable"]
+
+    migration = StorageMigration(r, stack["ProxyAdmin"], dev, batchSize=100)
+    migration.snapshot(_listAndRent(stack, dev, accounts[1:], 500))
+    _moveToLegacy(stack, dev, migration.states)
+    assert len(migration.verify()) == len(migration.pairs())
+
+    migration.upgrade(stack["RentableLogic"])
+    migration.migrate()
+
+    assert migration.finish() == []
+    assert migration.migrated == len(migration.states)
+    assert not r.paused()
+
+    # a pending rental is still pending, listings can be rented
+    chain.sleep(60)
+    rented, listed = migration.states[0], migration.states[1]
+    assert not r.isExpired(rented.tokenAddress, rented.tokenId)
+    r.rent(
+        listed.tokenAddress,
+        listed.tokenId,
+        60,
+        {
+            "from": accounts[1],
+            "value": listed.rentalConditions.pricePerSecond * 60,
+        },
+    )
@@ -0,0 +1,61 @@
+import random
+
+from eth_utils import to_checksum_address
+
+from brownie import DeterministicWalletFactory
+
+from scripts.helpers.wallets import WalletAddresses, WalletProvisioner
+from scripts.sdk import RentalConditions
+
+
+def _randomUsers(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        to_checksum_address(rng.getrandbits(160).to_bytes(20, "big"))
+        for _ in range(count)
+    ]
+
+
+def _firstRentGas(stack, dev, renters, startId):
+    """Gas of the first rent of each renter, one listed token each."""
+    testNFT, r = stack["TestNFT"], stack["Rentable"]
+    ids = list(range(startId, startId + len(renters)))
+    testNFT.mintBatch([dev] * len(ids), ids, [""] * len(ids), {"from": dev})
+
+    gas = []
+    for tokenId, renter in zip(ids, renters):
+        testNFT.safeTransferFrom["address,address,uint256,bytes"](
+            dev,
+            r,
+            tokenId,
+            RentalConditions.listing(3600, 1).encode(),
+            {"from": dev},
+        )
+        tx = r.rent(testNFT, tokenId, 60, {"from": renter, "value": 60})
+        gas.append(tx.gas_used)
+    return gas
+
+
+def test_provision(stack, dev, accounts):
+    r = stack["Rentable"]
+    factory = DeterministicWalletFactory.deploy(
+        stack["SimpleWalletBeacon"], {"from": dev}
+    )
+    r.setWalletFactory(factory, {"from": dev})
+
+    bulk = _randomUsers(200)
+    predicted = WalletAddresses.of(r).addresses(
+        bulk + [a.address for a in accounts[1:]]
+    )
+
+    provisioner = WalletProvisioner(r, dev, batchSize=40)
+    provisioner.provision(bulk + [a.address for a in accounts[1:5]])
+    assert provisioner.missing(bulk) == []
+    assert all(r.userWallet(u) == predicted[u] for u in bulk)
+
+    # accounts[1:5] are provisioned, accounts[5:9] create on first rent
+    coldRenters, warmRenters = accounts[5:9], accounts[1:5]
+    cold = _firstRentGas(stack, dev, coldRenters, 1)
+    assert all(r.userWallet(a) == predicted[a.address] for a in coldRenters)
+    warm = _firstRentGas(stack, dev, warmRenters, 1 + len(coldRenters))
+    assert sum(warm) < sum(cold)